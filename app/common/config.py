@@ -5,8 +5,8 @@ from enum import Enum
 
 from PySide6.QtCore import QLocale
 from qfluentwidgets import (
-    QConfig, ConfigItem, OptionsConfigItem, BoolValidator,
-    OptionsValidator, Theme, ConfigSerializer, EnumSerializer as _ThemeEnumSerializer, qconfig
+    QConfig, ConfigItem, OptionsConfigItem, RangeConfigItem, BoolValidator,
+    OptionsValidator, RangeValidator, Theme, ConfigSerializer, EnumSerializer as _ThemeEnumSerializer, qconfig
 )
 
 
@@ -62,14 +62,27 @@ class Config(QConfig):
 
     rclonePath = ConfigItem("RClone", "Path", "environments/rclone.exe")
     rcloneConfigPath = ConfigItem("RClone", "ConfigPath", "config/rclone.conf")
+    rcdBackend = ConfigItem("RClone", "RcdBackend", False, BoolValidator())
 
     autoMount = ConfigItem("Mount", "AutoMount", False, BoolValidator())
+    # 所有挂载共用一个 rclone rcd 进程（mount/mount），而不是每个挂载一个 rclone mount 进程
+    mountHost = ConfigItem("Mount", "SingleProcessHost", False, BoolValidator())
     cacheDirMode = OptionsConfigItem(
         "Mount", "CacheDirMode", CacheDirMode.DEFAULT,
         OptionsValidator(CacheDirMode), EnumSerializer(CacheDirMode)
     )
     cacheDirCustomPath = ConfigItem("Mount", "CacheDirCustomPath", "")
 
+    transferConcurrency = RangeConfigItem("Transfer", "Concurrency", 4, RangeValidator(1, 16))
+    transferRetries = RangeConfigItem("Transfer", "Retries", 2, RangeValidator(0, 10))
+
+    maxConcurrentTasks = RangeConfigItem("Sync", "MaxConcurrentTasks", 3, RangeValidator(1, 32))
+    perRemoteTasks = RangeConfigItem("Sync", "PerRemoteTasks", 2, RangeValidator(1, 16))
+    maxShardProcesses = RangeConfigItem("Sync", "MaxShardProcesses", 8, RangeValidator(1, 64))
+    # 运行历史保留天数（0 为不限）与每个任务保留的条数
+    historyRetentionDays = RangeConfigItem("Sync", "HistoryRetentionDays", 90, RangeValidator(0, 365))
+    historyMaxRuns = RangeConfigItem("Sync", "HistoryMaxRuns", 500, RangeValidator(20, 2000))
+
     autoStart = ConfigItem("App", "AutoStart", False, BoolValidator())
     minimizeToTray = ConfigItem("App", "MinimizeToTray", False, BoolValidator())
     closeToTray = ConfigItem("App", "CloseToTray", False, BoolValidator())
@@ -0,0 +1,267 @@
+"""
+同步并发自动调优模块。
+
+不同存储适合的并发差别很大：SFTP 往往 2 路最快，S3 可以开到 32 路，
+部分 WebDAV 网盘超过 4 路就会限流。AutoTuner 在每次运行结束后，用
+rclone 的最终统计记录当前 ``--transfers`` 档位的有效吞吐、出错率和限流
+情况（按 EWMA 平滑），再在档位阶梯上最多移动一格：
+
+- 当前档位出错或被限流时降一档；
+- 相邻档位尚未测量时先试探一步（先向上，再向下）；
+- 相邻档位明显更快时移过去；
+- 每隔若干次运行重新测量一次相邻档位，避免旧数据让结果停滞。
+
+``--checkers`` 随 transfers 同步调整；目标端出现过限流时关闭多线程
+分块传输（``--multi-thread-streams 1``），避免连接数成倍增加。
+统计数据按任务保存在 SyncTask.tuning 中，源 / 目标的远程变化后重新开始。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .rclone_stats import TransferStats
+from .run_queue import task_remotes
+from ..common.logger import get_logger
+from ..models.sync_task import SyncTask
+
+logger = get_logger('auto_tuner')
+
+# 可选的 --transfers 档位
+LADDER = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+# rclone 默认的 --transfers
+DEFAULT_TRANSFERS = 4
+
+# 数据量太小或时间太短的运行不能反映吞吐
+MIN_SAMPLE_BYTES = 8 * 1024 * 1024
+MIN_SAMPLE_SECONDS = 5.0
+# 每个文件的固定开销折算的字节数，让小文件为主的任务也能比较吞吐
+FILE_OVERHEAD_BYTES = 256 * 1024
+
+EXPLORE_EVERY = 10
+_ALPHA = 0.5
+# 相邻档位至少快这么多才移动，避免在噪声中来回摆动
+_MIN_GAIN = 0.05
+_ERROR_LIMIT = 0.05
+_THROTTLE_LIMIT = 0.5
+
+
+def checkers_for(transfers: int) -> int:
+    """按 transfers 推算 --checkers：检查是轻量的元数据请求，取两倍并限制范围。"""
+    return max(4, min(64, transfers * 2))
+
+
+def ladder_index(transfers: int) -> int:
+    """返回最接近 transfers 的档位下标。"""
+    return min(range(len(LADDER)), key=lambda i: (abs(LADDER[i] - transfers), i))
+
+
+def remote_key(task: SyncTask) -> str:
+    return ','.join(sorted(task_remotes(task.source, task.destination)))
+
+
+@dataclass
+class RunSample:
+    """一次运行的测量结果。"""
+    transfers: int
+    bytes: int
+    files: int
+    seconds: float
+    errors: int = 0
+    retries: int = 0
+    throttled: bool = False
+
+    @classmethod
+    def from_stats(cls, transfers: int, stats: TransferStats,
+                   throttled: bool = False) -> 'RunSample':
+        return cls(
+            transfers=transfers,
+            bytes=stats.bytes,
+            files=stats.transfers,
+            seconds=stats.transfer_time or stats.elapsed,
+            errors=stats.errors,
+            retries=stats.retries,
+            throttled=throttled,
+        )
+
+    @property
+    def usable(self) -> bool:
+        # 限流或出错本身就是有用的信号，不要求数据量
+        if self.throttled or self.errors:
+            return True
+        return (self.seconds >= MIN_SAMPLE_SECONDS
+                and self.bytes + self.files * FILE_OVERHEAD_BYTES >= MIN_SAMPLE_BYTES)
+
+    @property
+    def throughput(self) -> float:
+        if self.seconds <= 0:
+            return 0.0
+        return (self.bytes + self.files * FILE_OVERHEAD_BYTES) / self.seconds
+
+    @property
+    def error_rate(self) -> float:
+        return min(1.0, (self.errors + self.retries) / max(1, self.files + self.errors))
+
+
+@dataclass
+class LevelStats:
+    """单个档位的平滑统计。"""
+    runs: int = 0
+    throughput: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    # 最近一次测量时 TuningState.runs 的值
+    last_run: int = 0
+
+    def add(self, sample: RunSample, seq: int, alpha: float = _ALPHA):
+        throttled = 1.0 if sample.throttled else 0.0
+        if self.runs == 0:
+            self.throughput = sample.throughput
+            self.error_rate = sample.error_rate
+            self.throttle_rate = throttled
+        else:
+            self.throughput += alpha * (sample.throughput - self.throughput)
+            self.error_rate += alpha * (sample.error_rate - self.error_rate)
+            self.throttle_rate += alpha * (throttled - self.throttle_rate)
+        self.runs += 1
+        self.last_run = seq
+
+    @property
+    def unstable(self) -> bool:
+        return self.error_rate > _ERROR_LIMIT or self.throttle_rate >= _THROTTLE_LIMIT
+
+    @property
+    def score(self) -> float:
+        penalty = 1.0 - 10 * self.error_rate - 0.5 * self.throttle_rate
+        return self.throughput * max(0.0, penalty)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'throughput': round(self.throughput, 1),
+            'error_rate': round(self.error_rate, 4),
+            'throttle_rate': round(self.throttle_rate, 4),
+            'last_run': self.last_run,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LevelStats':
+        return cls(
+            runs=int(data.get('runs', 0)),
+            throughput=float(data.get('throughput', 0.0)),
+            error_rate=float(data.get('error_rate', 0.0)),
+            throttle_rate=float(data.get('throttle_rate', 0.0)),
+            last_run=int(data.get('last_run', 0)),
+        )
+
+
+@dataclass
+class TuningState:
+    """一个任务在某组远程上的调优历史。"""
+    remotes: str = ''
+    runs: int = 0
+    levels: Dict[int, LevelStats] = field(default_factory=dict)
+
+    @property
+    def throttled(self) -> bool:
+        return any(level.throttle_rate > 0 for level in self.levels.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'remotes': self.remotes,
+            'runs': self.runs,
+            'levels': {str(k): v.to_dict() for k, v in sorted(self.levels.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'TuningState':
+        data = data or {}
+        levels = {}
+        for key, value in (data.get('levels') or {}).items():
+            try:
+                levels[int(key)] = LevelStats.from_dict(value)
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return cls(remotes=data.get('remotes', ''), runs=int(data.get('runs', 0)), levels=levels)
+
+
+class AutoTuner:
+    """根据运行结果调整任务的 transfers / checkers / multi_thread_streams。"""
+
+    def __init__(self, explore_every: int = EXPLORE_EVERY, alpha: float = _ALPHA):
+        self.explore_every = max(2, explore_every)
+        self.alpha = alpha
+
+    @staticmethod
+    def state_for(task: SyncTask) -> TuningState:
+        state = TuningState.from_dict(task.tuning)
+        key = remote_key(task)
+        if state.remotes != key:
+            # 远程变化后旧的测量不再适用
+            state = TuningState(remotes=key)
+        return state
+
+    @staticmethod
+    def prepare(task: SyncTask):
+        """首次自动调优的任务从 rclone 默认值开始。"""
+        if task.auto_tune and task.transfers <= 0:
+            task.transfers = DEFAULT_TRANSFERS
+            task.checkers = checkers_for(DEFAULT_TRANSFERS)
+
+    def record(self, task: SyncTask, sample: RunSample) -> bool:
+        """记录一次运行并更新任务的并发设置；样本不可用或未启用自动调优时返回 False。"""
+        if not task.auto_tune or not sample.usable:
+            return False
+        state = self.state_for(task)
+        state.runs += 1
+        level = ladder_index(sample.transfers)
+        state.levels.setdefault(LADDER[level], LevelStats()).add(sample, state.runs, self.alpha)
+
+        transfers = self.next_transfers(state, LADDER[level])
+        task.transfers = transfers
+        task.checkers = checkers_for(transfers)
+        task.multi_thread_streams = 1 if state.throttled else 0
+        task.tuning = state.to_dict()
+        stats = state.levels[LADDER[level]]
+        logger.info(f'[自动调优] {task.name}: transfers={sample.transfers} '
+                    f'吞吐 {stats.throughput / 1024 / 1024:.1f} MiB/s，出错率 {stats.error_rate:.0%}'
+                    f'{"，限流" if sample.throttled else ""} → 下次 transfers={transfers}')
+        return True
+
+    def next_transfers(self, state: TuningState, current: int) -> int:
+        """在档位阶梯上选择下一次运行的 transfers，每次最多移动一格。"""
+        idx = ladder_index(current)
+        here = state.levels.get(LADDER[idx])
+        if here is None or here.runs == 0:
+            return LADDER[idx]
+        if here.unstable:
+            return LADDER[max(0, idx - 1)]
+
+        neighbours = [i for i in (idx + 1, idx - 1) if 0 <= i < len(LADDER)]
+        known = {i: state.levels[LADDER[i]] for i in neighbours
+                 if LADDER[i] in state.levels and state.levels[LADDER[i]].runs > 0}
+        for i in neighbours:
+            if i in known:
+                continue
+            # 只朝变好的方向试探；向上试探还要求比下一档明显更快，避免在平台上白白加连接
+            opposite = known.get(2 * idx - i)
+            gain = 1 + _MIN_GAIN if i > idx else 1
+            if opposite is None or here.score >= opposite.score * gain:
+                return LADDER[i]
+
+        best, best_score = idx, here.score
+        for i, level in known.items():
+            if not level.unstable and level.score > best_score * (1 + _MIN_GAIN):
+                best, best_score = i, level.score
+        if best != idx:
+            return LADDER[best]
+        lower = known.get(idx - 1)
+        if lower is not None and not lower.unstable and lower.score * (1 + _MIN_GAIN) >= here.score:
+            # 吞吐相当时用更少的连接
+            return LADDER[idx - 1]
+
+        if state.runs % self.explore_every == 0:
+            # 定期重新测量相邻档位中最久未测的一个
+            stale = [i for i, level in known.items() if not level.unstable]
+            if stale:
+                return LADDER[min(stale, key=lambda i: known[i].last_run)]
+        return LADDER[idx]
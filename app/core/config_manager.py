@@ -12,11 +12,17 @@ class ConfigManager:
     def __init__(self, rclone: Optional[RClone] = None):
         self.rclone = rclone or RClone()
         self._remotes_cache: Dict[str, Remote] = {}
+        self._conf_stamp = None
         logger.debug('[ConfigManager] 初始化完成')
 
     def refresh(self):
         logger.info('[ConfigManager] 刷新远程存储配置缓存')
         self._remotes_cache.clear()
+        conf = self.rclone.conf_file()
+        if conf is not None:
+            # 文件被外部修改时立即失效缓存，而不必等到下次 stat
+            conf.watch()
+            self._conf_stamp = conf.stamp()
         config_dump = self.rclone.config_dump()
         logger.info(f'[ConfigManager] config_dump 返回 {len(config_dump)} 个配置')
 
@@ -29,14 +35,19 @@ class ConfigManager:
             )
             logger.debug(f'[ConfigManager] 缓存远程存储: {name} (type={remote_type})')
 
+    def _config_changed(self) -> bool:
+        """配置文件自上次刷新后是否被修改（包括在本程序之外修改）。"""
+        conf = self.rclone.conf_file()
+        return conf is not None and conf.stamp() != self._conf_stamp
+
     def list_remotes(self) -> List[Remote]:
-        if not self._remotes_cache:
+        if not self._remotes_cache or self._config_changed():
             self.refresh()
         logger.debug(f'[ConfigManager] list_remotes: 返回 {len(self._remotes_cache)} 个')
         return list(self._remotes_cache.values())
 
     def get_remote(self, name: str) -> Optional[Remote]:
-        if not self._remotes_cache:
+        if not self._remotes_cache or self._config_changed():
             self.refresh()
         remote = self._remotes_cache.get(name)
         if remote:
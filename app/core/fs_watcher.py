@@ -0,0 +1,260 @@
+"""
+本地目录监视模块。
+
+为源路径是本地目录的同步任务提供事件驱动的运行方式：DirectoryWatcher
+监视目录树，把变化的文件路径（相对于监视根目录）累积到 ChangeSet 中，
+在一段时间没有新变化后（防抖）一次性发出 changesReady，由 SyncManager
+用 ``--files-from`` 只传输这些文件。
+
+安装了 watchdog 时使用系统原生通知（Linux 上为 inotify），否则或原生
+监视启动失败（例如 inotify 监视数量达到上限）时退回定期扫描比对。
+变化的文件过多时 ChangeSet 标记为溢出，调用方应改为完整运行。
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from ..common.logger import get_logger
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+logger = get_logger('fs_watcher')
+
+# 单次累积超过该数量的文件时不再列出，直接要求完整运行
+MAX_FILES = 5000
+
+
+@dataclass
+class ChangeSet:
+    """一个防抖周期内累积的变化。"""
+    paths: Set[str] = field(default_factory=set)
+    deleted: bool = False
+    overflow: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.paths) or self.deleted or self.overflow
+
+
+def scan_tree(root: str) -> Dict[str, Tuple[int, int]]:
+    """扫描目录树，返回 {相对路径: (mtime_ns, size)}，不跟随目录符号链接。"""
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+                for entry in it:
+                    rel = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(rel)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            snapshot[rel] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return snapshot
+
+
+if WATCHDOG_AVAILABLE:
+    class _EventHandler(FileSystemEventHandler):
+
+        def __init__(self, watcher: 'DirectoryWatcher'):
+            super().__init__()
+            self.watcher = watcher
+
+        def on_any_event(self, event):
+            self.watcher._on_native_event(event)
+
+
+class DirectoryWatcher(QObject):
+    """监视一个本地目录，防抖后发出 changesReady(key, ChangeSet)。"""
+
+    changesReady = Signal(str, object)
+    _activity = Signal()
+
+    def __init__(self, key: str, root: str, debounce: float = 5.0, max_wait: float = 60.0,
+                 max_files: int = MAX_FILES, poll_interval: float = 30.0,
+                 native: Optional[bool] = None, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.root = os.path.abspath(root)
+        self.debounce = debounce
+        # 持续有写入时最多等待 max_wait 秒也要处理一次
+        self.max_wait = max_wait
+        self.max_files = max_files
+        self.poll_interval = poll_interval
+        self.native = WATCHDOG_AVAILABLE if native is None else native and WATCHDOG_AVAILABLE
+        self.backend: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._changes = ChangeSet()
+        self._first_change: Optional[float] = None
+        self._activity_pending = False
+        self._observer = None
+        self._poll_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # 定期扫描的基准快照建立后置位；原生监视启动后立即置位
+        self._ready = threading.Event()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+        self._activity.connect(self._on_activity)
+
+    def start(self) -> bool:
+        if self.backend is not None:
+            return True
+        if not os.path.isdir(self.root):
+            logger.warning(f'[监视] 目录不存在: {self.root}')
+            return False
+        self._stop_event.clear()
+        self._ready.clear()
+        if self.native and self._start_native():
+            self.backend = 'native'
+            self._ready.set()
+        else:
+            self._start_polling()
+            self.backend = 'polling'
+        logger.info(f'[监视] 开始监视 {self.root} ({self.backend})')
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=3)
+            except Exception as e:
+                logger.debug(f'[监视] 停止原生监视出错: {e}')
+            self._observer = None
+        if self._poll_thread is not None:
+            self._poll_thread.join(timeout=3)
+            self._poll_thread = None
+        self._timer.stop()
+        if self.backend is not None:
+            logger.info(f'[监视] 停止监视 {self.root}')
+        self.backend = None
+
+    def _start_native(self) -> bool:
+        try:
+            observer = Observer()
+            observer.schedule(_EventHandler(self), self.root, recursive=True)
+            observer.start()
+        except OSError as e:
+            logger.warning(f'[监视] 原生监视启动失败，改用定期扫描: {e}')
+            return False
+        self._observer = observer
+        return True
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """等待监视生效：定期扫描时即基准快照建立完成，此后的变化都会被报告。"""
+        return self._ready.wait(timeout)
+
+    def _start_polling(self):
+        self._poll_thread = threading.Thread(target=self._poll_loop, name=f'watch-{self.key}',
+                                             daemon=True)
+        self._poll_thread.start()
+
+    def _poll_loop(self):
+        # 大目录树的首次扫描可能很久，放在监视线程中，不阻塞调用 start() 的界面线程
+        snapshot = scan_tree(self.root)
+        self._ready.set()
+        while not self._stop_event.wait(self.poll_interval):
+            current = scan_tree(self.root)
+            changed = [path for path, stat in current.items() if snapshot.get(path) != stat]
+            added = sum(1 for path in changed if path not in snapshot)
+            deleted = len(snapshot) + added > len(current)
+            snapshot = current
+            for path in changed:
+                self._record(path)
+            if deleted:
+                self._record_deleted()
+
+    def _relative(self, path) -> Optional[str]:
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        rel = os.path.relpath(path, self.root)
+        if rel == '.' or rel.startswith('..'):
+            return None
+        return rel.replace(os.sep, '/')
+
+    def _on_native_event(self, event):
+        kind = event.event_type
+        if kind == 'moved':
+            self._record_deleted()
+            self._record_path(event.dest_path, event.is_directory)
+        elif kind == 'deleted':
+            self._record_deleted()
+        elif kind in ('created', 'modified', 'closed'):
+            if event.is_directory and kind == 'modified':
+                # 目录自身的修改时间变化由其中文件的事件覆盖
+                return
+            self._record_path(event.src_path, event.is_directory)
+
+    def _record_path(self, path, is_directory: bool):
+        rel = self._relative(path)
+        if rel is None:
+            return
+        if not is_directory:
+            self._record(rel)
+            return
+        # 整个目录移入时只有一个目录事件，需要列出其中的文件
+        for sub in scan_tree(os.path.join(self.root, rel)):
+            self._record(f'{rel}/{sub}')
+            if self._changes.overflow:
+                break
+
+    def _record(self, rel: str):
+        with self._lock:
+            changes = self._changes
+            if not changes.overflow:
+                changes.paths.add(rel)
+                if len(changes.paths) > self.max_files:
+                    changes.overflow = True
+                    changes.paths.clear()
+        self._notify()
+
+    def _record_deleted(self):
+        with self._lock:
+            self._changes.deleted = True
+        self._notify()
+
+    def _notify(self):
+        # 合并高频事件：上一次通知处理前不再重复发送
+        with self._lock:
+            if self._activity_pending:
+                return
+            self._activity_pending = True
+        self._activity.emit()
+
+    def _on_activity(self):
+        with self._lock:
+            self._activity_pending = False
+        now = time.monotonic()
+        if self._first_change is None:
+            self._first_change = now
+        if now - self._first_change < self.max_wait or not self._timer.isActive():
+            self._timer.start(int(self.debounce * 1000))
+
+    def _flush(self):
+        with self._lock:
+            changes, self._changes = self._changes, ChangeSet()
+            self._first_change = None
+        if not changes:
+            return
+        logger.debug(f'[监视] {self.root}: {len(changes.paths)} 个文件变化'
+                     f'{"，有删除" if changes.deleted else ""}{"，溢出" if changes.overflow else ""}')
+        self.changesReady.emit(self.key, changes)
@@ -0,0 +1,349 @@
+"""
+本地文件哈希缓存模块。
+
+带 ``--checksum`` 的同步每次运行都会让 rclone 重新读取并哈希全部本地
+文件。HashCache 把本地文件的哈希按 (路径, 大小, 修改时间, inode) 记录在
+SQLite 中，只有这四项任一变化的文件才重新计算；需要计算的文件交给多
+进程池并行读取。
+
+同步任务可以用缓存的本地哈希与 ``rclone hashsum`` 得到的远程哈希比对，
+只把内容不同或远程缺失的文件作为 ``--files-from`` 候选列表，而不必让
+rclone 重新哈希整个源目录。
+"""
+
+import hashlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..common.config import DEFAULT_CACHE_DIR
+from ..common.logger import get_logger
+
+logger = get_logger('hash_cache')
+
+HASH_DB = DEFAULT_CACHE_DIR / 'hashes.sqlite'
+
+# rclone 哈希名称 -> hashlib 名称
+SUPPORTED_HASHES = {'md5': 'md5', 'sha1': 'sha1', 'sha256': 'sha256', 'sha512': 'sha512'}
+
+# 待计算的文件少于该数量时直接在当前线程计算，避免启动进程池的开销
+_INLINE_LIMIT = 8
+_CHUNK_SIZE = 1024 * 1024
+_COMMIT_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (path, algorithm)
+);
+"""
+
+
+def hash_file(path: str, algorithm: str = 'md5') -> Optional[str]:
+    """计算单个文件的哈希；读取失败返回 None。在子进程中执行。"""
+    digest = hashlib.new(SUPPORTED_HASHES[algorithm])
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _hash_job(job: Tuple[str, str]) -> Optional[str]:
+    return hash_file(*job)
+
+
+def _glob_regex(pattern: str) -> str:
+    """把 rclone 过滤规则的 glob 语法转换为正则表达式。"""
+    out: List[str] = []
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end < 0:
+                raise ValueError(f'未闭合的字符类: {pattern}')
+            body = pattern[i + 1:end]
+            out.append('[' + ('^' + body[1:] if body.startswith('!') else body) + ']')
+            i = end + 1
+            continue
+        elif c == '{':
+            out.append('(?:')
+            depth += 1
+        elif c == ',' and depth:
+            out.append('|')
+        elif c == '}' and depth:
+            out.append(')')
+            depth -= 1
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def exclude_matcher(patterns: Iterable[str]) -> Callable[[str, bool], bool]:
+    """按 rclone ``--exclude`` 语义构造匹配函数 excluded(相对路径, 是否目录)。
+
+    以 / 开头的规则从根目录匹配，否则匹配路径末尾的若干段；以 / 结尾的规则
+    只匹配目录。无法解析的规则被忽略——遍历多包含的文件仍会被 rclone 自身
+    的 ``--exclude`` 过滤，漏掉的文件却不会再被传输。
+    """
+    files: List[re.Pattern] = []
+    dirs: List[re.Pattern] = []
+    for pattern in patterns:
+        body = pattern.rstrip('/')
+        if not body:
+            continue
+        prefix = '^' if body.startswith('/') else '(?:^|/)'
+        try:
+            regex = re.compile(prefix + _glob_regex(body.lstrip('/')) + '$')
+            (dirs if pattern.endswith('/') else files).append(regex)
+            if not pattern.endswith('/') and body.endswith('/**') and len(body) > 3:
+                # dir/** 排除目录下全部文件，等价于整棵子树不遍历
+                dirs.append(re.compile(prefix + _glob_regex(body[:-3].lstrip('/')) + '$'))
+        except (re.error, ValueError) as e:
+            logger.debug(f'[哈希缓存] 忽略无法解析的排除规则 {pattern!r}: {e}')
+
+    def excluded(rel: str, is_dir: bool) -> bool:
+        return any(regex.search(rel) for regex in (dirs if is_dir else files))
+    return excluded
+
+
+def iter_files(root: str, excluded: Optional[Callable[[str, bool], bool]] = None
+               ) -> Iterator[Tuple[str, str, os.stat_result]]:
+    """遍历目录树，产出 (相对路径, 绝对路径, stat)，相对路径使用 '/' 分隔。
+
+    excluded(相对路径, 是否目录) 为真的文件被跳过，目录则整棵子树不再遍历。
+    """
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+                for entry in it:
+                    rel = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if excluded is None or not excluded(rel, True):
+                                stack.append(rel)
+                        elif entry.is_file():
+                            if excluded is not None and excluded(rel, False):
+                                continue
+                            # Windows 上 DirEntry.stat() 不含 inode，需要单独 stat
+                            yield rel, entry.path, os.stat(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+@dataclass
+class HashComparison:
+    """本地与远程哈希的比对结果（路径均相对于比对根目录）。"""
+    changed: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+    same: int = 0
+
+    @property
+    def candidates(self) -> List[str]:
+        """需要传输的文件：内容不同或目标端缺失。"""
+        return sorted(self.changed + self.missing)
+
+
+def compare_hashes(local: Dict[str, str], remote: Dict[str, str]) -> HashComparison:
+    result = HashComparison()
+    for path, digest in local.items():
+        other = remote.get(path)
+        if other is None:
+            result.missing.append(path)
+        elif other.lower() != digest.lower():
+            result.changed.append(path)
+        else:
+            result.same += 1
+    result.extra = [path for path in remote if path not in local]
+    return result
+
+
+class HashCache:
+    """本地文件哈希数据库。"""
+
+    def __init__(self, db_path: Optional[Path] = None, workers: Optional[int] = None):
+        self.db_path = Path(db_path or HASH_DB)
+        if str(db_path) != ':memory:':
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 哈希以磁盘读取为主，进程数过多只会增加寻道
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM hashes').fetchone()[0]
+
+    def lookup(self, path: str, algorithm: str = 'md5') -> Optional[str]:
+        """返回文件的缓存哈希；文件已变化或未缓存时返回 None。"""
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT size, mtime_ns, inode, hash FROM hashes WHERE path = ? AND algorithm = ?',
+                (path, algorithm)).fetchone()
+        if row and row[:3] == (st.st_size, st.st_mtime_ns, st.st_ino):
+            return row[3]
+        return None
+
+    def _cached_under(self, root: str, algorithm: str) -> Dict[str, Tuple[int, int, int, str]]:
+        prefix = os.path.join(root, '')
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT path, size, mtime_ns, inode, hash FROM hashes '
+                'WHERE algorithm = ? AND substr(path, 1, ?) = ?',
+                (algorithm, len(prefix), prefix)).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def update(self, root: str, algorithm: str = 'md5',
+               progress: Optional[Callable[[int, int], None]] = None,
+               cancelled: Optional[Callable[[], bool]] = None,
+               excludes: Iterable[str] = ()) -> Optional[Dict[str, str]]:
+        """刷新 root 下全部文件的哈希，返回 {相对路径: 哈希}。
+
+        未变化的文件直接使用缓存；不再存在的文件从缓存中删除。
+        excludes 为 rclone 风格的排除规则，匹配的文件不参与遍历和计算。
+        progress(已计算, 需计算) 在计算过程中回调。取消或有文件无法读取时
+        返回 None，调用方无法据此得到完整的比对结果。
+        """
+        if algorithm not in SUPPORTED_HASHES:
+            raise ValueError(f'不支持的哈希类型: {algorithm}')
+        root = os.path.abspath(root)
+        start = time.monotonic()
+        cached = self._cached_under(root, algorithm)
+
+        result: Dict[str, str] = {}
+        pending: List[Tuple[str, str, os.stat_result]] = []
+        for rel, path, st in iter_files(root, exclude_matcher(excludes) if excludes else None):
+            row = cached.pop(path, None)
+            if row is not None and row[:3] == (st.st_size, st.st_mtime_ns, st.st_ino):
+                result[rel] = row[3]
+            else:
+                pending.append((rel, path, st))
+
+        if cached:
+            with self._lock:
+                self._conn.executemany('DELETE FROM hashes WHERE path = ? AND algorithm = ?',
+                                       [(path, algorithm) for path in cached])
+                self._conn.commit()
+
+        failed: List[str] = []
+        if pending and not self._hash_pending(pending, algorithm, result, failed,
+                                              progress, cancelled):
+            return None
+        if failed:
+            logger.warning(f'[哈希缓存] {root}: {len(failed)} 个文件无法读取，例如 {failed[0]}')
+            return None
+
+        logger.info(f'[哈希缓存] {root}: {len(result)} 个文件，重新计算 {len(pending)} 个，'
+                    f'耗时 {time.monotonic() - start:.1f}s')
+        return result
+
+    def _hash_pending(self, pending, algorithm, result, failed, progress, cancelled) -> bool:
+        jobs = [(path, algorithm) for _, path, _ in pending]
+        rows = []
+        done = 0
+
+        def store():
+            with self._lock:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO hashes '
+                    '(path, algorithm, size, mtime_ns, inode, hash, checked_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                self._conn.commit()
+            rows.clear()
+
+        executor = None
+        if len(jobs) < _INLINE_LIMIT or self.workers <= 1:
+            digests = map(_hash_job, jobs)
+        else:
+            # 在多线程的 Qt 进程里 fork 可能继承被其他线程持有的锁而死锁
+            executor = ProcessPoolExecutor(max_workers=self.workers,
+                                           mp_context=multiprocessing.get_context('spawn'))
+            chunksize = max(1, min(64, len(jobs) // (self.workers * 8)))
+            digests = executor.map(_hash_job, jobs, chunksize=chunksize)
+        try:
+            for (rel, path, st), digest in zip(pending, digests):
+                done += 1
+                if digest is None:
+                    failed.append(rel)
+                else:
+                    result[rel] = digest
+                    rows.append((path, algorithm, st.st_size, st.st_mtime_ns, st.st_ino,
+                                 digest, time.time()))
+                if len(rows) >= _COMMIT_EVERY:
+                    store()
+                if progress is not None:
+                    progress(done, len(jobs))
+                if cancelled is not None and cancelled():
+                    logger.info('[哈希缓存] 计算已取消')
+                    return False
+            return True
+        finally:
+            if rows:
+                store()
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM hashes')
+            self._conn.commit()
+
+
+_hash_cache: Optional[HashCache] = None
+_hash_cache_lock = threading.Lock()
+
+
+def get_hash_cache() -> HashCache:
+    global _hash_cache
+    with _hash_cache_lock:
+        if _hash_cache is None:
+            _hash_cache = HashCache()
+        return _hash_cache
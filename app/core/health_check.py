@@ -0,0 +1,195 @@
+"""
+远程存储健康检查模块。
+
+原先的连接测试在界面线程中同步执行 ``rclone lsd remote: --max-depth 1``，
+一次只能测一个，测试期间界面无响应。HealthChecker 把探测放到有上限的
+线程池中并发执行，记录每个远程存储的连接加列目录耗时、成功与否以及
+错误类别，并按 TTL 缓存结果；结果通过 resultReady 信号（排队到界面
+线程）送出，供远程存储卡片显示状态徽标。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from ..common.logger import get_logger
+
+logger = get_logger('health_check')
+
+
+class ErrorClass:
+    AUTH = 'auth'
+    NETWORK = 'network'
+    TIMEOUT = 'timeout'
+    NOT_FOUND = 'not_found'
+    CONFIG = 'config'
+    UNKNOWN = 'unknown'
+
+
+ERROR_CLASS_LABELS = {
+    ErrorClass.AUTH: '认证失败',
+    ErrorClass.NETWORK: '网络错误',
+    ErrorClass.TIMEOUT: '超时',
+    ErrorClass.NOT_FOUND: '路径不存在',
+    ErrorClass.CONFIG: '配置错误',
+    ErrorClass.UNKNOWN: '未知错误',
+}
+
+# 按顺序匹配，靠前的类别优先；例如 "dial tcp ... i/o timeout" 归为超时
+_ERROR_PATTERNS = [
+    (ErrorClass.TIMEOUT, ('timeout', 'timed out', 'deadline exceeded', '超时')),
+    (ErrorClass.AUTH, ('401', '403', 'unauthorized', 'forbidden', 'permission denied',
+                       'access denied', 'invalid_grant', 'token', 'authenticat',
+                       'invalid credentials', 'signaturedoesnotmatch',
+                       'invalidaccesskeyid', 'login')),
+    (ErrorClass.NETWORK, ('no such host', 'connection refused', 'connection reset',
+                          'network is unreachable', 'dial tcp', 'tls:', 'x509',
+                          'eof', 'broken pipe', 'no route to host')),
+    (ErrorClass.NOT_FOUND, ('404', 'not found', 'directory not found',
+                            'nosuchbucket', 'does not exist')),
+    (ErrorClass.CONFIG, ('didn\'t find section', 'config file', 'unknown backend',
+                         'couldn\'t find', 'failed to create file system')),
+]
+
+
+def classify_error(message: str) -> str:
+    """根据 rclone 的错误输出判断错误类别。"""
+    text = (message or '').lower()
+    for error_class, needles in _ERROR_PATTERNS:
+        if any(needle in text for needle in needles):
+            return error_class
+    return ErrorClass.UNKNOWN
+
+
+@dataclass
+class HealthResult:
+    remote: str
+    ok: bool
+    latency: float
+    error_class: Optional[str] = None
+    message: str = ''
+    checked_at: float = 0.0
+
+    @property
+    def summary(self) -> str:
+        if self.ok:
+            return f'{self.latency * 1000:.0f} ms'
+        return ERROR_CLASS_LABELS.get(self.error_class, ERROR_CLASS_LABELS[ErrorClass.UNKNOWN])
+
+
+class HealthChecker(QObject):
+    """并发探测远程存储并缓存结果。
+
+    同一远程存储同时最多只有一个探测在进行；TTL 内的结果直接复用，
+    除非调用方指定 force。
+    """
+
+    checkStarted = Signal(str)
+    resultReady = Signal(str, object)
+    allFinished = Signal()
+
+    def __init__(self, rclone, max_workers: int = 8, ttl: float = 300.0,
+                 timeout: int = 20, clock: Callable[[], float] = time.monotonic,
+                 parent=None):
+        super().__init__(parent)
+        self.rclone = rclone
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.timeout = timeout
+        self._clock = clock
+        self._results: Dict[str, HealthResult] = {}
+        self._pending: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='health')
+        return self._executor
+
+    def result(self, name: str) -> Optional[HealthResult]:
+        """返回最近一次结果（可能已过期）。"""
+        with self._lock:
+            return self._results.get(name)
+
+    def is_fresh(self, name: str) -> bool:
+        with self._lock:
+            return self._is_fresh_locked(name)
+
+    def _is_fresh_locked(self, name: str) -> bool:
+        result = self._results.get(name)
+        return result is not None and self._clock() - result.checked_at < self.ttl
+
+    def is_checking(self, name: str) -> bool:
+        with self._lock:
+            return name in self._pending
+
+    def probe(self, name: str) -> HealthResult:
+        """同步探测一个远程存储，在工作线程中调用。"""
+        start = self._clock()
+        try:
+            result = self.rclone.check(name, timeout=self.timeout)
+            ok, message = result.success, (result.stderr or '').strip()
+        except Exception as e:
+            ok, message = False, str(e)
+        end = self._clock()
+        error_class = None if ok else classify_error(message)
+        return HealthResult(remote=name, ok=ok, latency=end - start,
+                            error_class=error_class,
+                            message='' if ok else message[:500], checked_at=end)
+
+    def check(self, name: str, force: bool = False) -> bool:
+        """提交一次探测；已有新鲜结果或正在探测时返回 False。"""
+        return self.check_all([name], force=force) == 1
+
+    def check_all(self, names: Iterable[str], force: bool = False) -> int:
+        """为需要的远程存储提交探测，返回实际提交的数量。"""
+        submitted: List[str] = []
+        with self._lock:
+            for name in names:
+                if name in self._pending:
+                    continue
+                if not force and self._is_fresh_locked(name):
+                    continue
+                self._pending.add(name)
+                submitted.append(name)
+        if not submitted:
+            return 0
+        logger.info(f'[健康检查] 提交 {len(submitted)} 个探测（并发上限 {self.max_workers}）')
+        executor = self._get_executor()
+        for name in submitted:
+            self.checkStarted.emit(name)
+            executor.submit(self._run_probe, name)
+        return len(submitted)
+
+    def _run_probe(self, name: str):
+        result = self.probe(name)
+        with self._lock:
+            self._results[name] = result
+            self._pending.discard(name)
+            finished = not self._pending
+        if result.ok:
+            logger.info(f'[健康检查] {name} 正常，耗时 {result.latency:.2f}s')
+        else:
+            logger.warning(f'[健康检查] {name} 失败 ({result.error_class}): {result.message[:200]}')
+        self.resultReady.emit(name, result)
+        if finished:
+            self.allFinished.emit()
+
+    def invalidate(self, name: Optional[str] = None):
+        """丢弃缓存结果；name 为 None 时清空全部。"""
+        with self._lock:
+            if name is None:
+                self._results.clear()
+            else:
+                self._results.pop(name, None)
+
+    def shutdown(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
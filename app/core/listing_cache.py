@@ -0,0 +1,207 @@
+"""
+目录列表缓存模块。
+
+按 ``remote:path`` 缓存 lsjson 的结果，供文件浏览器在前进、后退、
+返回根目录时立即渲染，再在后台重新验证。
+
+- 每个远程存储可单独设置 TTL，过期条目仍可返回（标记为 stale）用于先渲染
+- 以目录数和总条目数双重上限做 LRU 淘汰，避免大目录长期占用内存
+- 文件操作完成后只失效受影响的父目录，而不是清空整个缓存
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..common.logger import get_logger
+
+logger = get_logger('listing_cache')
+
+
+# 不同后端类型的默认 TTL（秒）。对象存储列目录开销大且变动少，缓存更久
+DEFAULT_TTL = 30.0
+TTL_BY_TYPE: Dict[str, float] = {
+    's3': 120.0,
+    'b2': 120.0,
+    'azureblob': 120.0,
+    'gcs': 120.0,
+    'drive': 60.0,
+    'onedrive': 60.0,
+    'dropbox': 60.0,
+    'webdav': 30.0,
+    'sftp': 15.0,
+    'ftp': 15.0,
+    'local': 5.0,
+}
+
+
+def ttl_for_type(remote_type: str) -> float:
+    return TTL_BY_TYPE.get(remote_type, DEFAULT_TTL)
+
+
+def _split_key(remote_path: str) -> Optional[Tuple[str, str]]:
+    """把 ``remote:path`` 规范化为 (remote, path)，本地路径返回 None。"""
+    name, sep, path = remote_path.partition(':')
+    if not sep or not name or len(name) == 1 or '/' in name or '\\' in name:
+        return None
+    return name, path.replace('\\', '/').strip('/')
+
+
+def _parent(path: str) -> str:
+    return path.rsplit('/', 1)[0] if '/' in path else ''
+
+
+def listing_fingerprint(entries: List[dict]) -> Tuple[int, int]:
+    """目录列表的指纹：(条目数, 名称/大小/修改时间的哈希)，与条目顺序无关。
+
+    用于判断重新验证得到的列表是否有变化，避免在界面线程逐项比较字典。
+    """
+    return len(entries), hash(frozenset(
+        (e.get('Name'), e.get('Size'), e.get('ModTime'), e.get('IsDir')) for e in entries))
+
+
+@dataclass
+class CachedListing:
+    entries: List[dict]
+    fetched_at: float
+    fresh: bool
+    fingerprint: Tuple[int, int]
+
+
+class ListingCache:
+    """线程安全的目录列表缓存（LRU + 按远程存储的 TTL）。"""
+
+    def __init__(self, max_dirs: int = 512, max_entries: int = 200_000,
+                 default_ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_dirs = max_dirs
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._ttls: Dict[str, float] = {}
+        # (remote, path) -> (条目, 抓取时间, 指纹)
+        self._data: 'OrderedDict[Tuple[str, str], tuple]' = OrderedDict()
+        self._entry_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def set_ttl(self, remote: str, ttl: float):
+        with self._lock:
+            self._ttls[remote.rstrip(':')] = ttl
+
+    def ttl(self, remote: str) -> float:
+        return self._ttls.get(remote.rstrip(':'), self.default_ttl)
+
+    def get(self, remote_path: str) -> Optional[CachedListing]:
+        """返回缓存的列表；已过期的条目同样返回，但 fresh 为 False。"""
+        key = _split_key(remote_path)
+        if key is None:
+            return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            self._data.move_to_end(key)
+            entries, fetched_at, fingerprint = item
+            fresh = self._clock() - fetched_at < self.ttl(key[0])
+            return CachedListing(entries, fetched_at, fresh, fingerprint)
+
+    def put(self, remote_path: str, entries: List[dict],
+            fingerprint: Optional[Tuple[int, int]] = None):
+        """缓存一个目录列表；fingerprint 未给出时在此计算（最好由后台线程预先算好）。"""
+        key = _split_key(remote_path)
+        if key is None or len(entries) > self.max_entries:
+            return
+        if fingerprint is None:
+            fingerprint = listing_fingerprint(entries)
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (entries, self._clock(), fingerprint)
+            self._entry_count += len(entries)
+            self._evict()
+
+    def invalidate(self, remote_path: str):
+        """失效单个目录。"""
+        key = _split_key(remote_path)
+        if key is None:
+            return
+        with self._lock:
+            self._pop(key)
+
+    def invalidate_tree(self, remote_path: str):
+        """失效目录本身及其所有子目录（用于 purge 之后）。"""
+        key = _split_key(remote_path)
+        if key is None:
+            return
+        remote, path = key
+        prefix = path + '/' if path else ''
+        with self._lock:
+            stale = [k for k in self._data
+                     if k[0] == remote and (k[1] == path or k[1].startswith(prefix))]
+            for k in stale:
+                self._pop(k)
+
+    def invalidate_remote(self, remote: str):
+        remote = remote.rstrip(':')
+        with self._lock:
+            for k in [k for k in self._data if k[0] == remote]:
+                self._pop(k)
+
+    def invalidate_for_operation(self, op: tuple):
+        """根据 FileOperationWorker 的操作元组失效受影响的目录。
+
+        - copy(src, dst): dst 为远程目录时失效 dst（下载到本地不影响缓存）
+        - mkdir / delete_file(path): 失效 path 的父目录
+        - purge(path): 失效父目录以及 path 下的整棵子树
+        - bulk_delete(dir, files, dirs): 失效 dir 以及被删除的各个子目录树
+        """
+        operation, args = op[0], op[1:]
+        if operation == 'copy' and len(args) >= 2:
+            self.invalidate(args[1])
+        elif operation in ('mkdir', 'delete_file', 'purge') and args:
+            key = _split_key(args[0])
+            if key is None:
+                return
+            remote, path = key
+            self.invalidate(f'{remote}:{_parent(path)}')
+            if operation == 'purge':
+                self.invalidate_tree(args[0])
+        elif operation == 'bulk_delete' and len(args) >= 3:
+            self.invalidate(args[0])
+            base = args[0] if args[0].endswith(':') else args[0].rstrip('/') + '/'
+            for name in args[2]:
+                self.invalidate_tree(base + name)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._entry_count = 0
+
+    def _pop(self, key):
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._entry_count -= len(item[0])
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_dirs
+                              or self._entry_count > self.max_entries):
+            key, (entries, _, _) = self._data.popitem(last=False)
+            self._entry_count -= len(entries)
+            logger.debug(f'[缓存] 淘汰目录列表: {key[0]}:{key[1]} ({len(entries)} 项)')
+
+
+_cache: Optional[ListingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_listing_cache() -> ListingCache:
+    """返回应用内共享的目录列表缓存。"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ListingCache()
+        return _cache
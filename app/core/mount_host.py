@@ -0,0 +1,85 @@
+"""
+单进程挂载宿主模块。
+
+默认每个挂载启动一个独立的 ``rclone mount`` 进程，各自持有 VFS 结构、
+后端连接池和内存。MountHost 改为在一个专用的 ``rclone rcd`` 进程中通过
+``mount/mount`` / ``mount/unmount`` 创建和移除挂载，挂载状态由
+``mount/listmounts`` 查询，不再需要扫描系统进程。
+
+挂载宿主与浏览用的共享 rcd 进程分开：两者的生命周期不同，宿主进程
+停止时其中的全部挂载随之卸载。
+"""
+
+from typing import Any, Dict, Optional
+
+from .rclone_rc import RCDaemon, RCError, RCTransportError
+from ..common.logger import get_logger
+from ..models.mount import Mount
+
+logger = get_logger('mount_host')
+
+
+class MountHost:
+    """在单个 rclone rcd 进程中承载全部挂载。
+
+    mount / unmount / list_mounts 失败时抛出 RCError 或 RCTransportError。
+    """
+
+    def __init__(self, rclone_path: str, config_path: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
+        self.rclone_path = rclone_path
+        self.config_path = config_path
+        self.cache_dir = cache_dir
+        # VFS 缓存目录是 rcd 进程的全局参数，所有挂载共用
+        extra_args = ['--cache-dir', cache_dir] if cache_dir else []
+        self.daemon = RCDaemon(rclone_path, config_path, extra_args=extra_args)
+
+    @staticmethod
+    def mount_point(mount: Mount) -> str:
+        return f'{mount.drive_letter}:'
+
+    @staticmethod
+    def mount_params(mount: Mount) -> Dict[str, Any]:
+        """mount/mount 的参数，与 MountWorker 的命令行选项对应。"""
+        return {
+            'fs': mount.remote_full_path,
+            'mountPoint': MountHost.mount_point(mount),
+            'vfsOpt': {
+                'CacheMode': mount.cache_mode,
+                'CacheMaxSize': mount.vfs_cache_max_size,
+                'ReadOnly': mount.read_only,
+            },
+        }
+
+    def start(self) -> bool:
+        return self.daemon.start()
+
+    def is_running(self) -> bool:
+        return self.daemon.is_running()
+
+    def mount(self, mount: Mount):
+        self.daemon.call('mount/mount', self.mount_params(mount))
+        logger.info(f'[挂载宿主] 已挂载 {mount.remote_full_path} -> {self.mount_point(mount)}')
+
+    def unmount(self, mount: Mount):
+        self.daemon.call('mount/unmount', {'mountPoint': self.mount_point(mount)})
+        logger.info(f'[挂载宿主] 已卸载 {self.mount_point(mount)}')
+
+    def list_mounts(self) -> Dict[str, str]:
+        """宿主中当前的挂载：挂载点 -> 远程路径。"""
+        result = self.daemon.call('mount/listmounts')
+        mounts = {}
+        for item in result.get('mountPoints') or []:
+            point = item.get('MountPoint')
+            if point:
+                mounts[point] = item.get('Fs', '')
+        return mounts
+
+    def stop(self):
+        """卸载宿主中的全部挂载并停止 rcd 进程。"""
+        if self.is_running():
+            try:
+                self.daemon.call('mount/unmountall')
+            except (RCError, RCTransportError) as e:
+                logger.warning(f'[挂载宿主] 卸载全部挂载失败: {e}')
+        self.daemon.stop()
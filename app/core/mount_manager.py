@@ -14,7 +14,10 @@ from PySide6.QtCore import QObject, Signal, QThread
 from ..common.config import APP_PATH, cfg, get_cache_dir
 from ..common.logger import get_logger
 from ..models.mount import Mount, MountStatus
+from .mount_host import MountHost
+from .process_inventory import get_process_inventory
 from .rclone import RClone
+from .rclone_rc import RCError, RCTransportError
 
 logger = get_logger('mount_manager')
 
@@ -156,6 +159,45 @@ class MountWorker(QThread):
                 self.process = None
 
 
+class HostMountWorker(QThread):
+    """通过单进程挂载宿主创建挂载，信号与 MountWorker 相同。
+
+    宿主在工作线程中启动（首次可能需要数秒）；无法启动时发出 hostUnavailable，
+    并在本线程中改用 MountWorker 启动独立的 rclone mount 进程。
+    """
+
+    started = Signal(str)
+    finished = Signal(str, bool, str)
+    hostUnavailable = Signal(str)
+
+    def __init__(self, rclone: RClone, host: MountHost, mount: Mount):
+        super().__init__()
+        self.rclone = rclone
+        self.host = host
+        self.mount = mount
+        self._fallback: Optional[MountWorker] = None
+
+    def run(self):
+        self.started.emit(self.mount.remote_name)
+        if not self.host.start():
+            logger.warning('挂载宿主不可用，改用独立的 rclone mount 进程')
+            self.hostUnavailable.emit(self.mount.remote_name)
+            self._fallback = MountWorker(self.rclone, self.mount)
+            self._fallback.finished.connect(self.finished)
+            self._fallback.run()
+            return
+        try:
+            self.host.mount(self.mount)
+            self.finished.emit(self.mount.remote_name, True, "Mounted successfully")
+        except (RCError, RCTransportError) as e:
+            self.finished.emit(self.mount.remote_name, False, str(e))
+
+    def stop(self):
+        # mount/mount 调用无法中断，卸载由 MountManager 通过宿主完成
+        if self._fallback is not None:
+            self._fallback.stop()
+
+
 class MountManager(QObject):
 
     mountStatusChanged = Signal(str, MountStatus)
@@ -169,6 +211,9 @@ class MountManager(QObject):
         self._lock = Lock()
         self._config_file = APP_PATH / "config" / "mounts.json"
         self._shutdown = False
+        # 单进程挂载宿主及其中的挂载（远程名称）
+        self._host: Optional[MountHost] = None
+        self._hosted: Set[str] = set()
 
     def load_mounts(self):
         if self._config_file.exists():
@@ -185,13 +230,52 @@ class MountManager(QObject):
             except (json.JSONDecodeError, KeyError) as e:
                 logger.error(f'加载挂载配置失败: {e}')
 
+    def _get_host(self) -> Optional[MountHost]:
+        """启用单进程挂载时返回挂载宿主（不在此启动，由 HostMountWorker 在后台启动）。"""
+        if cfg.mountHost.value is not True:
+            return None
+        stale = None
+        with self._lock:
+            host = self._host
+            # rclone 路径或配置变化后换用新的宿主；旧宿主中仍有挂载时继续沿用
+            if host is not None and not self._hosted and (host.rclone_path, host.config_path) != (
+                    self.rclone.rclone_path, self.rclone.config_path):
+                stale, host = host, None
+            if host is None:
+                host = MountHost(self.rclone.rclone_path, self.rclone.config_path, get_cache_dir())
+                self._host = host
+        if stale is not None:
+            stale.stop()
+        return host
+
+    def _hosted_mount_points(self) -> Optional[Set[str]]:
+        """宿主中的挂载点；宿主未运行时返回 None。"""
+        with self._lock:
+            host = self._host
+        if host is None or not host.is_running():
+            return None
+        try:
+            return set(host.list_mounts())
+        except (RCError, RCTransportError) as e:
+            logger.warning(f'查询挂载宿主状态失败: {e}')
+            return None
+
     def refresh_mount_status(self):
         with self._lock:
             mounts_copy = list(self.mounts.values())
+            hosted = set(self._hosted)
+        hosted_points = self._hosted_mount_points() if hosted else None
 
         for mount in mounts_copy:
             was_mounted = mount.status == MountStatus.MOUNTED
-            is_mounted = mount.check_drive_exists()
+            if mount.remote_name in hosted:
+                # 宿主中的挂载以 mount/listmounts 为准
+                is_mounted = hosted_points is not None and MountHost.mount_point(mount) in hosted_points
+                if not is_mounted and mount.status != MountStatus.MOUNTING:
+                    with self._lock:
+                        self._hosted.discard(mount.remote_name)
+            else:
+                is_mounted = mount.check_drive_exists()
 
             if is_mounted != was_mounted:
                 with self._lock:
@@ -293,7 +377,14 @@ class MountManager(QObject):
         mount.status = MountStatus.MOUNTING
         self.mountStatusChanged.emit(remote_name, MountStatus.MOUNTING)
 
-        worker = MountWorker(self.rclone, mount)
+        host = self._get_host()
+        if host is not None:
+            with self._lock:
+                self._hosted.add(remote_name)
+            worker = HostMountWorker(self.rclone, host, mount)
+            worker.hostUnavailable.connect(self._on_host_unavailable)
+        else:
+            worker = MountWorker(self.rclone, mount)
         worker.started.connect(self._on_mount_started)
         worker.finished.connect(self._on_mount_finished)
         with self._lock:
@@ -310,6 +401,24 @@ class MountManager(QObject):
 
         logger.info(f'卸载远程存储 {remote_name} ({mount.drive_letter}: 盘)')
 
+        with self._lock:
+            hosted = remote_name in self._hosted
+            host = self._host
+        if hosted and host is not None:
+            try:
+                host.unmount(mount)
+            except (RCError, RCTransportError) as e:
+                # 挂载仍在宿主中，保留记录以便重试
+                logger.warning(f'通过挂载宿主卸载失败: {e}')
+                self.mountError.emit(remote_name, str(e))
+                return False
+            with self._lock:
+                self.workers.pop(remote_name, None)
+                self._hosted.discard(remote_name)
+            mount.status = MountStatus.UNMOUNTED
+            self.mountStatusChanged.emit(remote_name, MountStatus.UNMOUNTED)
+            return True
+
         terminated = False
 
         with self._lock:
@@ -345,20 +454,40 @@ class MountManager(QObject):
 
         当应用重启后丢失了 worker 和 process_id 时使用此后备方法。
         策略：
-        1. 优先使用 PowerShell Get-CimInstance 精确匹配命令行中的盘符
-        2. 若 PowerShell 不可用，回退到 tasklist + taskkill 终止所有 rclone 进程
+        1. 优先从进程清单中按命令行精确匹配盘符
+        2. 进程清单不可用时，使用 PowerShell Get-CimInstance 匹配
+        3. 若 PowerShell 也不可用，回退到 tasklist + taskkill 终止所有 rclone 进程
         """
         if os.name != 'nt':
             return False
 
-        # 策略1：PowerShell 精确匹配（使用完整路径避免 PATH 问题）
+        inventory = get_process_inventory()
+        if inventory.available:
+            return self._kill_by_inventory(drive_letter)
+
+        # 策略2：PowerShell 精确匹配（使用完整路径避免 PATH 问题）
         killed = self._kill_by_powershell(drive_letter)
         if killed:
             return True
 
-        # 策略2：tasklist + taskkill 回退（终止所有 rclone 进程）
+        # 策略3：tasklist + taskkill 回退（终止所有 rclone 进程）
         return self._kill_by_tasklist(drive_letter)
 
+    def _kill_by_inventory(self, drive_letter: str) -> bool:
+        """从进程清单中查找挂载到指定盘符的 rclone 进程并终止。"""
+        inventory = get_process_inventory()
+        pids = [pid for drive, pid, _ in self._mount_processes_from_inventory(force=True)
+                if drive == drive_letter]
+        for pid in pids:
+            try:
+                self._terminate_process_gracefully(pid)
+                logger.debug(f'已终止 rclone 挂载进程 PID {pid} (盘符 {drive_letter}:)')
+            except Exception as e:
+                logger.warning(f'终止 rclone 进程 PID {pid} 失败: {e}')
+        if pids:
+            inventory.invalidate()
+        return bool(pids)
+
     def _kill_by_powershell(self, drive_letter: str) -> bool:
         """使用 PowerShell Get-CimInstance 精确查找并终止 rclone mount 进程。"""
         # 使用完整路径，避免 PATH 中找不到 powershell 的问题
@@ -415,6 +544,30 @@ class MountManager(QObject):
         return False
 
     def _query_rclone_mount_processes(self) -> List[tuple]:
+        """查询所有 rclone mount 进程。
+
+        优先使用缓存的进程清单，不可用时回退到 PowerShell 查询。
+
+        Returns:
+            [(drive_letter, pid, remote_name), ...] 的列表，失败时返回空列表。
+        """
+        if get_process_inventory().available:
+            return self._mount_processes_from_inventory()
+        return self._query_by_powershell()
+
+    def _mount_processes_from_inventory(self, force: bool = False) -> List[tuple]:
+        processes = []
+        for proc in get_process_inventory().processes(force):
+            if 'mount' not in proc.cmdline:
+                continue
+            parsed = _parse_rclone_mount_cmdline(proc.cmdline)
+            if parsed is None:
+                continue
+            drive_letter, remote_name = parsed
+            processes.append((drive_letter, proc.pid, remote_name))
+        return processes
+
+    def _query_by_powershell(self) -> List[tuple]:
         """通过 PowerShell 查询所有 rclone mount 进程。
 
         使用 Get-CimInstance Win32_Process 查询命令行中包含 mount 的 rclone 进程，
@@ -559,6 +712,11 @@ class MountManager(QObject):
             remote_names = list(self.mounts.keys())
         for remote_name in remote_names:
             self.unmount(remote_name)
+        with self._lock:
+            host, self._host = self._host, None
+            self._hosted.clear()
+        if host is not None:
+            host.stop()
 
     def auto_mount_all(self):
         with self._lock:
@@ -616,6 +774,9 @@ class MountManager(QObject):
             return False
 
     def _is_process_running(self, process_id: int) -> bool:
+        inventory = get_process_inventory()
+        if inventory.available:
+            return inventory.is_running(process_id)
         try:
             if os.name == 'nt':
                 result = subprocess.run(
@@ -640,6 +801,10 @@ class MountManager(QObject):
         except Exception as e:
             logger.error(f'处理挂载开始信号时出错: {e}')
 
+    def _on_host_unavailable(self, remote_name: str):
+        with self._lock:
+            self._hosted.discard(remote_name)
+
     def _on_mount_finished(self, remote_name: str, success: bool, message: str):
         try:
             with self._lock:
@@ -650,6 +815,8 @@ class MountManager(QObject):
                     mount.error_message = None
                     logger.info(f'挂载成功: {remote_name} -> {mount.drive_letter}: 盘')
                 else:
+                    with self._lock:
+                        self._hosted.discard(remote_name)
                     mount.status = MountStatus.ERROR
                     mount.error_message = message
                     self.mountError.emit(remote_name, message)
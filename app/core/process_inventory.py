@@ -0,0 +1,339 @@
+"""
+进程清单模块。
+
+MountManager 需要频繁地枚举 rclone 进程（发现系统挂载、按盘符终止挂载、
+检查 PID 是否存活）。原先每次都启动 PowerShell / tasklist，单次调用
+就要数百毫秒甚至超时。这里改为进程内的原生查询并缓存结果：
+
+- Linux：直接读取 ``/proc``
+- Windows：通过 ctypes 调用 Toolhelp32 快照和 NtQueryInformationProcess
+- 其他平台：安装了 psutil 时使用 psutil
+
+刷新是增量的：每次只取一份轻量的 (PID, 进程名, 标识) 快照，仅对新出现
+的 rclone 进程读取命令行，已知进程直接复用缓存。
+"""
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..common.logger import get_logger
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = get_logger('process_inventory')
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid: int
+    name: str
+    cmdline: str
+    # 用于识别 PID 复用：同一 PID 的标识变化说明已是另一个进程
+    token: str = ''
+
+
+class ProcessProvider:
+    """进程枚举后端的接口。"""
+
+    def snapshot(self) -> Dict[int, Tuple[str, str]]:
+        """返回 {pid: (进程名, 标识)}，应当足够轻量以便频繁调用。"""
+        raise NotImplementedError
+
+    def cmdline(self, pid: int) -> str:
+        raise NotImplementedError
+
+    def is_running(self, pid: int) -> bool:
+        raise NotImplementedError
+
+
+class ProcFsProvider(ProcessProvider):
+    """基于 Linux ``/proc`` 文件系统。"""
+
+    def __init__(self, root: str = '/proc'):
+        self.root = root
+
+    def _read_stat(self, pid: int) -> Optional[Tuple[str, str, str]]:
+        """返回 (进程名, 状态, 启动时间)。"""
+        try:
+            with open(os.path.join(self.root, str(pid), 'stat'), 'r',
+                      encoding='utf-8', errors='replace') as f:
+                stat = f.read()
+        except OSError:
+            return None
+        # 进程名可能包含空格和括号，以最后一个 ')' 为界
+        left, right = stat.find('('), stat.rfind(')')
+        if left < 0 or right < left:
+            return None
+        fields = stat[right + 2:].split()
+        if len(fields) < 20:
+            return None
+        return stat[left + 1:right], fields[0], fields[19]
+
+    def snapshot(self) -> Dict[int, Tuple[str, str]]:
+        result = {}
+        try:
+            entries = os.listdir(self.root)
+        except OSError as e:
+            logger.warning(f'[进程] 无法读取 {self.root}: {e}')
+            return result
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            stat = self._read_stat(pid)
+            if stat is not None:
+                result[pid] = (stat[0], stat[2])
+        return result
+
+    def cmdline(self, pid: int) -> str:
+        with open(os.path.join(self.root, str(pid), 'cmdline'), 'rb') as f:
+            raw = f.read()
+        return ' '.join(arg.decode('utf-8', 'replace') for arg in raw.split(b'\0') if arg)
+
+    def is_running(self, pid: int) -> bool:
+        stat = self._read_stat(pid)
+        # 僵尸进程已退出，只是尚未被父进程回收
+        return stat is not None and stat[1] != 'Z'
+
+
+class Win32Provider(ProcessProvider):
+    """通过 ctypes 调用 Win32 API，无需启动外部进程。"""
+
+    TH32CS_SNAPPROCESS = 0x00000002
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    PROCESS_COMMAND_LINE_INFORMATION = 60
+    STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ('dwSize', wintypes.DWORD),
+                ('cntUsage', wintypes.DWORD),
+                ('th32ProcessID', wintypes.DWORD),
+                ('th32DefaultHeapID', ctypes.c_size_t),
+                ('th32ModuleID', wintypes.DWORD),
+                ('cntThreads', wintypes.DWORD),
+                ('th32ParentProcessID', wintypes.DWORD),
+                ('pcPriClassBase', wintypes.LONG),
+                ('dwFlags', wintypes.DWORD),
+                ('szExeFile', wintypes.WCHAR * 260),
+            ]
+
+        class UNICODE_STRING(ctypes.Structure):
+            _fields_ = [
+                ('Length', wintypes.USHORT),
+                ('MaximumLength', wintypes.USHORT),
+                ('Buffer', ctypes.c_void_p),
+            ]
+
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._entry_type = PROCESSENTRY32W
+        self._unicode_string = UNICODE_STRING
+        self._kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._ntdll = ctypes.WinDLL('ntdll')
+
+        k32 = self._kernel32
+        k32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        k32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        k32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        k32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        k32.OpenProcess.restype = wintypes.HANDLE
+        k32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        k32.GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._ntdll.NtQueryInformationProcess.restype = ctypes.c_ulong
+        self._ntdll.NtQueryInformationProcess.argtypes = [
+            wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.ULONG,
+            ctypes.POINTER(wintypes.ULONG)]
+
+    def snapshot(self) -> Dict[int, Tuple[str, str]]:
+        ctypes = self._ctypes
+        k32 = self._kernel32
+        handle = k32.CreateToolhelp32Snapshot(self.TH32CS_SNAPPROCESS, 0)
+        if not handle or handle == self._wintypes.HANDLE(-1).value:
+            raise OSError(ctypes.get_last_error(), 'CreateToolhelp32Snapshot 失败')
+        result = {}
+        try:
+            entry = self._entry_type()
+            entry.dwSize = ctypes.sizeof(entry)
+            ok = k32.Process32FirstW(handle, ctypes.byref(entry))
+            while ok:
+                # Toolhelp 不提供创建时间，用父进程 PID 识别 PID 复用
+                result[entry.th32ProcessID] = (entry.szExeFile, str(entry.th32ParentProcessID))
+                ok = k32.Process32NextW(handle, ctypes.byref(entry))
+        finally:
+            k32.CloseHandle(handle)
+        return result
+
+    def cmdline(self, pid: int) -> str:
+        ctypes = self._ctypes
+        wintypes = self._wintypes
+        handle = self._kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            raise OSError(ctypes.get_last_error(), f'无法打开进程 {pid}')
+        try:
+            size = wintypes.ULONG(0)
+            query = self._ntdll.NtQueryInformationProcess
+            status = query(handle, self.PROCESS_COMMAND_LINE_INFORMATION, None, 0, ctypes.byref(size))
+            if status != self.STATUS_INFO_LENGTH_MISMATCH or not size.value:
+                raise OSError(status, f'无法读取进程 {pid} 的命令行')
+            buffer = ctypes.create_string_buffer(size.value)
+            status = query(handle, self.PROCESS_COMMAND_LINE_INFORMATION, buffer, size, ctypes.byref(size))
+            if status != 0:
+                raise OSError(status, f'无法读取进程 {pid} 的命令行')
+            text = self._unicode_string.from_buffer(buffer)
+            if not text.Buffer:
+                return ''
+            return ctypes.wstring_at(text.Buffer, text.Length // 2)
+        finally:
+            self._kernel32.CloseHandle(handle)
+
+    def is_running(self, pid: int) -> bool:
+        ctypes = self._ctypes
+        handle = self._kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            # 无权限打开说明进程存在（例如以管理员身份运行）
+            return ctypes.get_last_error() == self.ERROR_ACCESS_DENIED
+        try:
+            code = self._wintypes.DWORD()
+            if not self._kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return False
+            return code.value == self.STILL_ACTIVE
+        finally:
+            self._kernel32.CloseHandle(handle)
+
+
+class PsutilProvider(ProcessProvider):
+    """基于可选依赖 psutil，用于 Linux/Windows 以外的平台。"""
+
+    def snapshot(self) -> Dict[int, Tuple[str, str]]:
+        result = {}
+        for proc in psutil.process_iter(['name', 'create_time']):
+            info = proc.info
+            result[proc.pid] = (info.get('name') or '', str(info.get('create_time')))
+        return result
+
+    def cmdline(self, pid: int) -> str:
+        try:
+            return ' '.join(psutil.Process(pid).cmdline())
+        except psutil.Error as e:
+            raise OSError(str(e)) from e
+
+    def is_running(self, pid: int) -> bool:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+
+def default_provider() -> Optional[ProcessProvider]:
+    """选择当前平台可用的进程枚举后端，均不可用时返回 None。"""
+    if sys.platform.startswith('linux') and os.path.isdir('/proc'):
+        return ProcFsProvider()
+    if os.name == 'nt':
+        try:
+            return Win32Provider()
+        except (OSError, AttributeError) as e:
+            logger.warning(f'[进程] Win32 进程枚举不可用: {e}')
+    if PSUTIL_AVAILABLE:
+        return PsutilProvider()
+    return None
+
+
+class ProcessInventory:
+    """缓存的 rclone 进程清单。
+
+    processes() 在缓存超过 max_age 秒后才重新枚举；is_running() 直接查询
+    单个 PID，不经过缓存。provider 为 None 时 available 为 False，调用方
+    应回退到原有的外部命令方案。
+    """
+
+    def __init__(self, provider: Optional[ProcessProvider] = None,
+                 max_age: float = 2.0, name_prefix: str = 'rclone',
+                 clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self.max_age = max_age
+        self.name_prefix = name_prefix.lower()
+        self._clock = clock
+        self._procs: Dict[int, ProcessInfo] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self.provider is not None
+
+    def refresh(self, force: bool = False):
+        if self.provider is None:
+            return
+        with self._lock:
+            now = self._clock()
+            if (not force and self._refreshed_at is not None
+                    and now - self._refreshed_at < self.max_age):
+                return
+            try:
+                snapshot = self.provider.snapshot()
+            except OSError as e:
+                logger.warning(f'[进程] 枚举进程失败: {e}')
+                return
+            procs = {}
+            for pid, (name, token) in snapshot.items():
+                if not name.lower().startswith(self.name_prefix):
+                    continue
+                cached = self._procs.get(pid)
+                if cached is not None and cached.token == token:
+                    procs[pid] = cached
+                    continue
+                try:
+                    cmdline = self.provider.cmdline(pid)
+                except OSError as e:
+                    logger.debug(f'[进程] 无法读取 PID {pid} 的命令行: {e}')
+                    cmdline = ''
+                procs[pid] = ProcessInfo(pid, name, cmdline, token)
+            self._procs = procs
+            self._refreshed_at = now
+
+    def processes(self, force: bool = False) -> List[ProcessInfo]:
+        """返回名称以 name_prefix 开头的进程列表。"""
+        self.refresh(force)
+        with self._lock:
+            return list(self._procs.values())
+
+    def is_running(self, pid: int) -> bool:
+        if self.provider is None:
+            raise RuntimeError('进程清单不可用')
+        try:
+            return self.provider.is_running(pid)
+        except OSError:
+            return False
+
+    def invalidate(self):
+        with self._lock:
+            self._refreshed_at = None
+
+
+_inventory: Optional[ProcessInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_process_inventory() -> ProcessInventory:
+    """返回应用内共享的进程清单。"""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = ProcessInventory(default_provider())
+        return _inventory
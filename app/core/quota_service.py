@@ -0,0 +1,255 @@
+"""
+远程存储容量（about）缓存服务。
+
+``rclone about`` 在部分存储上需要数秒甚至更久。QuotaService 在线程池中
+并发查询所有远程存储的容量，把结果连同查询时间写入磁盘缓存；启动时
+先从缓存立即给出汇总，再在后台刷新，并按固定间隔定期重新查询。
+每个远程存储的结果单独送出，慢的存储不会拖住其他存储的显示。
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from ..common.config import APP_PATH
+from ..common.logger import get_logger
+
+logger = get_logger('quota')
+
+
+@dataclass
+class RemoteQuota:
+    remote: str
+    total: Optional[int] = None
+    used: Optional[int] = None
+    free: Optional[int] = None
+    fetched_at: float = 0.0
+    error: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RemoteQuota':
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+    @classmethod
+    def from_about(cls, remote: str, info: dict, fetched_at: float) -> 'RemoteQuota':
+        def _num(key):
+            value = info.get(key)
+            return int(value) if isinstance(value, (int, float)) else None
+
+        total, used, free = _num('total'), _num('used'), _num('free')
+        if free is None and total is not None and used is not None:
+            free = max(0, total - used)
+        return cls(remote=remote, total=total, used=used, free=free, fetched_at=fetched_at)
+
+
+@dataclass
+class QuotaSummary:
+    total: int = 0
+    used: int = 0
+    free: int = 0
+    # 有容量数据的远程存储数；不支持 about 或从未查询成功的不计入合计
+    counted: int = 0
+    failed: int = 0
+    oldest: Optional[float] = None
+
+
+def summarize(quotas: Iterable[RemoteQuota]) -> QuotaSummary:
+    summary = QuotaSummary()
+    for quota in quotas:
+        if not quota.ok:
+            # 失败的条目仍可能带有上次成功查询的数值
+            summary.failed += 1
+        if quota.total is None and quota.used is None:
+            continue
+        summary.counted += 1
+        summary.total += quota.total or 0
+        summary.used += quota.used or 0
+        summary.free += quota.free or 0
+        if summary.oldest is None or quota.fetched_at < summary.oldest:
+            summary.oldest = quota.fetched_at
+    return summary
+
+
+def format_bytes(size: Optional[float]) -> str:
+    if size is None:
+        return '-'
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024:
+            return f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} PB'
+
+
+class QuotaService(QObject):
+    """并发刷新并持久化各远程存储的容量信息。"""
+
+    quotaUpdated = Signal(str, object)
+    summaryChanged = Signal(object)
+
+    def __init__(self, rclone, cache_file: Optional[Path] = None,
+                 max_workers: int = 6, interval: int = 30 * 60, timeout: int = 60,
+                 clock: Callable[[], float] = time.time, parent=None):
+        super().__init__(parent)
+        self.rclone = rclone
+        self.max_workers = max_workers
+        self.interval = interval
+        self.timeout = timeout
+        self._clock = clock
+        self._cache_file = Path(cache_file) if cache_file else APP_PATH / 'config' / 'quota_cache.json'
+        self._quotas: Dict[str, RemoteQuota] = {}
+        self._pending: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._names_provider: Optional[Callable[[], List[str]]] = None
+        self._timer: Optional[QTimer] = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.load_cache()
+
+    def load_cache(self):
+        if not self._cache_file.exists():
+            return
+        try:
+            with open(self._cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            quotas = {q.remote: q for q in (RemoteQuota.from_dict(d) for d in data)}
+        except Exception as e:
+            logger.warning(f'[容量] 读取缓存失败: {e}')
+            return
+        with self._lock:
+            self._quotas = quotas
+        logger.debug(f'[容量] 已从缓存加载 {len(quotas)} 个远程存储')
+
+    def save_cache(self):
+        with self._lock:
+            data = [q.to_dict() for q in self._quotas.values()]
+        with self._save_lock:
+            try:
+                self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self._cache_file.with_suffix('.tmp')
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp, self._cache_file)
+            except Exception as e:
+                logger.error(f'[容量] 保存缓存失败: {e}')
+
+    def quota(self, name: str) -> Optional[RemoteQuota]:
+        with self._lock:
+            return self._quotas.get(name)
+
+    def summary(self, names: Optional[Iterable[str]] = None) -> QuotaSummary:
+        """汇总容量；指定 names 时只统计这些远程存储。"""
+        with self._lock:
+            if names is None:
+                quotas = list(self._quotas.values())
+            else:
+                quotas = [self._quotas[n] for n in names if n in self._quotas]
+        return summarize(quotas)
+
+    def is_refreshing(self) -> bool:
+        with self._lock:
+            return bool(self._pending)
+
+    def prune(self, names: Iterable[str]):
+        """丢弃已不存在的远程存储的缓存。"""
+        keep = set(names)
+        with self._lock:
+            removed = [n for n in self._quotas if n not in keep]
+            for name in removed:
+                del self._quotas[name]
+        if removed:
+            self.save_cache()
+            self.summaryChanged.emit(self.summary())
+
+    def refresh(self, names: Iterable[str], max_age: Optional[float] = None) -> int:
+        """提交后台查询，max_age 秒内查询过的跳过。返回提交的数量。"""
+        now = self._clock()
+        submitted = []
+        with self._lock:
+            for name in names:
+                if name in self._pending:
+                    continue
+                cached = self._quotas.get(name)
+                if max_age is not None and cached is not None and now - cached.fetched_at < max_age:
+                    continue
+                self._pending.add(name)
+                submitted.append(name)
+        if not submitted:
+            return 0
+        logger.info(f'[容量] 后台查询 {len(submitted)} 个远程存储')
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='quota')
+        for name in submitted:
+            self._executor.submit(self._fetch, name)
+        return len(submitted)
+
+    def _fetch(self, name: str):
+        try:
+            success, info = self.rclone.about(name, timeout=self.timeout)
+        except Exception as e:
+            success, info = False, str(e)
+        now = self._clock()
+        if success and isinstance(info, dict):
+            quota = RemoteQuota.from_about(name, info, now)
+        else:
+            with self._lock:
+                previous = self._quotas.get(name)
+            # 查询失败时保留上次成功的数值，只记录错误
+            quota = RemoteQuota(remote=name, fetched_at=now, error=str(info or '查询失败')[:300])
+            if previous is not None and (previous.total is not None or previous.used is not None):
+                quota.total, quota.used, quota.free = previous.total, previous.used, previous.free
+                quota.fetched_at = previous.fetched_at
+            logger.warning(f'[容量] {name} 查询失败: {quota.error}')
+        with self._lock:
+            self._quotas[name] = quota
+            self._pending.discard(name)
+            finished = not self._pending
+        self.quotaUpdated.emit(name, quota)
+        self.summaryChanged.emit(self.summary())
+        if finished:
+            self.save_cache()
+
+    def start(self, names_provider: Callable[[], List[str]]):
+        """开始定期刷新：立即刷新过期的条目，之后每 interval 秒刷新一次。"""
+        self._names_provider = names_provider
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.timeout.connect(self._on_timer)
+        self._timer.start(self.interval * 1000)
+        self._refresh_all(max_age=self.interval)
+
+    def _on_timer(self):
+        self._refresh_all()
+
+    def _refresh_all(self, max_age: Optional[float] = None):
+        if self._names_provider is None:
+            return
+        try:
+            names = list(self._names_provider())
+        except Exception as e:
+            logger.warning(f'[容量] 获取远程存储列表失败: {e}')
+            return
+        self.prune(names)
+        self.refresh(names, max_age=max_age)
+
+    def shutdown(self):
+        if self._timer is not None:
+            self._timer.stop()
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
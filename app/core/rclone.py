@@ -1,13 +1,18 @@
+import codecs
 import subprocess
 import json
 import os
 import re
+import tempfile
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
 from ..common.config import cfg, APP_PATH
 from ..common.logger import get_logger
+from .rclone_conf import RCloneConfFile, get_conf_file
+from .rclone_rc import RCError, RCTransportError, get_rc_daemon, release_rc_daemon
 
 logger = get_logger('rclone')
 
@@ -29,11 +34,212 @@ def _resolve_path(value: str) -> str:
     return str(APP_PATH / value)
 
 
+# 流式列表只保留界面和索引需要的字段，丢弃 MimeType / ID / Tier 等
+LSJSON_COMPACT_KEYS = ('Path', 'Name', 'Size', 'ModTime', 'IsDir', 'Hashes')
+
+
+class LsjsonStreamParser:
+    """增量解析 rclone lsjson 输出的 JSON 数组。
+
+    每次 feed 一段文本，返回其中已完整到达的条目；未完整的尾部留在缓冲区，
+    因此内存占用只与单个条目大小相关，而与目录条目总数无关。
+    """
+
+    MAX_BUFFER = 16 * 1024 * 1024
+
+    def __init__(self, keys: Optional[Tuple[str, ...]] = LSJSON_COMPACT_KEYS):
+        self._keys = keys
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._started = False
+        self.done = False
+
+    def _compact(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        if self._keys is None:
+            return entry
+        return {k: entry[k] for k in self._keys if k in entry}
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        if self.done:
+            return []
+        buf = self._buf + chunk
+        pos = 0
+        length = len(buf)
+        entries = []
+
+        while pos < length:
+            ch = buf[pos]
+            if ch in ' \t\r\n,':
+                pos += 1
+                continue
+            if not self._started:
+                if ch != '[':
+                    raise ValueError(f'lsjson 输出不是 JSON 数组: {buf[pos:pos + 40]!r}')
+                self._started = True
+                pos += 1
+                continue
+            if ch == ']':
+                self.done = True
+                pos = length
+                break
+            try:
+                obj, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # 条目尚未完整到达，等待下一段数据
+                break
+            entries.append(self._compact(obj))
+            pos = end
+
+        self._buf = buf[pos:]
+        if len(self._buf) > self.MAX_BUFFER:
+            raise ValueError('lsjson 条目过大或输出格式无效')
+        return entries
+
+
+class LsjsonStream:
+    """以批次形式迭代 rclone lsjson 的输出。
+
+    迭代结束后可通过 success / error / count 获取结果；调用 cancel()
+    或提前停止迭代都会终止 rclone 进程。
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, cmd: List[str], batch_size: int = 1000):
+        self.cmd = cmd
+        self.batch_size = max(1, batch_size)
+        self.success = False
+        self.error = ''
+        self.count = 0
+        self._cancelled = False
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+        self._terminate()
+
+    def _terminate(self):
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        except (ProcessLookupError, OSError):
+            pass
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        parser = LsjsonStreamParser()
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        batch: List[Dict[str, Any]] = []
+
+        with tempfile.TemporaryFile() as stderr_file:
+            try:
+                self._process = subprocess.Popen(
+                    self.cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file,
+                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+                )
+            except OSError as e:
+                self.error = f'系统错误: {e}'
+                logger.error(f'[RClone] 流式 lsjson 启动失败: {e}')
+                return
+
+            try:
+                stdout = self._process.stdout
+                while not self._cancelled:
+                    chunk = stdout.read1(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    batch.extend(parser.feed(decoder.decode(chunk)))
+                    while len(batch) >= self.batch_size:
+                        out, batch = batch[:self.batch_size], batch[self.batch_size:]
+                        self.count += len(out)
+                        yield out
+                if batch and not self._cancelled:
+                    self.count += len(batch)
+                    yield batch
+            except ValueError as e:
+                self.error = str(e)
+                self._terminate()
+            finally:
+                # 消费方提前退出迭代（break / close）时同样要结束进程
+                if self._cancelled or (self._process.poll() is None and not parser.done):
+                    self._terminate()
+
+            return_code = self._process.wait()
+            self._process.stdout.close()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', errors='replace')
+
+        if self._cancelled:
+            self.error = '操作已取消'
+        elif not self.error:
+            self.success = return_code == 0
+            if not self.success:
+                self.error = stderr.strip() or f'lsjson 失败 (返回码: {return_code})'
+        if self.success:
+            logger.info(f'[RClone] 流式 lsjson 完成, 条目数={self.count}')
+        else:
+            logger.error(f'[RClone] 流式 lsjson 失败: {self.error[:300]}')
+
+
+def _split_fs(remote_path: str) -> Optional[Tuple[str, str]]:
+    """将 remote:path 拆分为 RC 接口使用的 (fs, remote)，本地路径返回 None。"""
+    if ':' not in remote_path:
+        return None
+    name, _, path = remote_path.partition(':')
+    # 单字母视为 Windows 盘符（如 C:\data），不是远程存储
+    if len(name) < 2 or not re.match(r'^[a-zA-Z0-9_-]+$', name):
+        return None
+    return f'{name}:', path.strip('/')
+
+
+def _last_line(text: str) -> str:
+    lines = text.strip().splitlines()
+    return lines[-1] if lines else ''
+
+
+def _json_log_errors(stderr: str) -> Dict[str, str]:
+    """从 --use-json-log 输出中提取 {对象路径: 错误信息}。"""
+    errors = {}
+    for line in stderr.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and record.get('level') == 'error' and record.get('object'):
+            errors[record['object']] = record.get('msg', '')
+    return errors
+
+
 class RClone:
 
-    def __init__(self, rclone_path: Optional[str] = None, config_path: Optional[str] = None):
+    def __init__(self, rclone_path: Optional[str] = None, config_path: Optional[str] = None,
+                 rc=None):
         self.rclone_path = _resolve_path(rclone_path or cfg.rclonePath.value)
         self.config_path = _resolve_path(config_path or cfg.rcloneConfigPath.value) or None
+        # 使用按 (路径, 配置) 共享的 rcd 时，更换路径需要换用对应的 rcd
+        self._shared_rc = rc is None and cfg.rcdBackend.value is True
+        if self._shared_rc:
+            rc = get_rc_daemon(self.rclone_path, self.config_path)
+        self.rc = rc
+
+    def set_rclone_path(self, rclone_path: str):
+        """更换 rclone 可执行文件；RC 调用随之改用新程序启动的 rcd，旧的 rcd 被停止。"""
+        old_path = self.rclone_path
+        self.rclone_path = _resolve_path(rclone_path)
+        if self._shared_rc and self.rclone_path != old_path:
+            release_rc_daemon(old_path, self.config_path)
+            self.rc = get_rc_daemon(self.rclone_path, self.config_path)
 
     def _validate_remote_name(self, name: str) -> None:
         if not name:
@@ -73,7 +279,7 @@ class RClone:
 
         return cmd
 
-    def _run(self, *args, **kwargs) -> RCloneResult:
+    def _run(self, *args, run_timeout: int = 300, **kwargs) -> RCloneResult:
         cmd = self._build_command(*args, **kwargs)
 
         safe_cmd = []
@@ -90,7 +296,7 @@ class RClone:
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=300,
+                timeout=run_timeout,
                 creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
             )
             result = RCloneResult(
@@ -106,11 +312,11 @@ class RClone:
                            f'stderr={result.stderr[:300] if result.stderr else "N/A"}')
             return result
         except subprocess.TimeoutExpired:
-            logger.error('[RClone] 命令执行超时（300秒）')
+            logger.error(f'[RClone] 命令执行超时（{run_timeout}秒）')
             return RCloneResult(
                 success=False,
                 stdout='',
-                stderr='命令执行超时（300秒）',
+                stderr=f'命令执行超时（{run_timeout}秒）',
                 return_code=-1
             )
         except subprocess.SubprocessError as e:
@@ -139,13 +345,69 @@ class RClone:
                 return False, result.stderr or "无效的 JSON 响应"
         return result.success, result.stderr if not result.success else []
 
+    def _rc_run(self, method: str, params: Dict[str, Any],
+                timeout: Optional[float] = None) -> Optional[RCloneResult]:
+        """通过 rcd 执行 RC 方法，结果包装为 RCloneResult（stdout 为 JSON）。
+
+        未启用 rcd 或通信失败时返回 None，调用方应回退到命令行执行；
+        超过 timeout 秒未完成时返回失败结果。
+        """
+        if self.rc is None:
+            return None
+        try:
+            data = self.rc.call(method, params, timeout=timeout)
+        except RCTransportError as e:
+            logger.warning(f'[RClone] RC 调用 {method} 不可用，回退到命令行: {e}')
+            return None
+        except RCError as e:
+            logger.error(f'[RClone] RC 调用失败: {method}, error={e}')
+            return RCloneResult(success=False, stdout='', stderr=str(e), return_code=1)
+        logger.debug(f'[RClone] RC 调用成功: {method}')
+        return RCloneResult(success=True, stdout=json.dumps(data), stderr='', return_code=0)
+
+    def _rc_json(self, method: str, params: Dict[str, Any], key: Optional[str] = None,
+                 timeout: Optional[float] = None) -> Optional[Tuple[bool, Any]]:
+        result = self._rc_run(method, params, timeout=timeout)
+        if result is None:
+            return None
+        if not result.success:
+            return False, result.stderr
+        data = json.loads(result.stdout)
+        if key is not None:
+            data = (data.get(key) or []) if isinstance(data, dict) else []
+        return True, data
+
+    def _rc_path_op(self, method: str, remote_path: str) -> Optional[RCloneResult]:
+        split = _split_fs(remote_path)
+        if split is None:
+            return None
+        fs, remote = split
+        return self._rc_run(method, {'fs': fs, 'remote': remote})
+
     def version(self) -> str:
         result = self._run('version')
         if result.success:
             return result.stdout.split('\n')[0]
         return "未知"
 
+    def conf_file(self) -> Optional[RCloneConfFile]:
+        """可在进程内直接读取的配置文件；加密或找不到时需回退到 rclone 命令。"""
+        conf = get_conf_file(self.config_path, self.rclone_path)
+        if conf is None or conf.encrypted:
+            return None
+        return conf
+
+    def _native_config(self) -> Optional[Dict[str, Dict[str, str]]]:
+        conf = self.conf_file()
+        return conf.load() if conf is not None else None
+
     def listremotes(self) -> List[str]:
+        native = self._native_config()
+        if native is not None:
+            return list(native)
+        rc = self._rc_json('config/listremotes', {}, key='remotes')
+        if rc is not None:
+            return list(rc[1]) if rc[0] else []
         result = self._run('listremotes')
         if result.success:
             remotes = [r.rstrip(':') for r in result.stdout.strip().split('\n') if r]
@@ -153,10 +415,22 @@ class RClone:
         return []
 
     def config_dump(self) -> Dict[str, Dict[str, str]]:
+        native = self._native_config()
+        if native is not None:
+            return native
+        rc = self._rc_json('config/dump', {})
+        if rc is not None:
+            success, data = rc
+            return data if success and isinstance(data, dict) else {}
         success, data = self._run_json('config', 'dump')
         return data if success and isinstance(data, dict) else {}
 
     def config_get(self, remote: str) -> Dict[str, str]:
+        conf = self.conf_file()
+        if conf is not None:
+            section = conf.section(remote)
+            if section is not None:
+                return section
         all_config = self.config_dump()
         return all_config.get(remote, {})
 
@@ -189,26 +463,103 @@ class RClone:
         return self._run('config', 'delete', name)
 
     def lsjson(self, remote_path: str, recursive: bool = False) -> Tuple[bool, List[Dict]]:
+        split = _split_fs(remote_path)
+        if split is not None:
+            rc = self._rc_json('operations/list', {
+                'fs': split[0], 'remote': split[1], 'opt': {'recurse': recursive}
+            }, key='list')
+            if rc is not None:
+                return rc
         args = ['lsjson', remote_path]
         if recursive:
             args.append('--recursive')
         return self._run_json(*args)
 
+    def lsjson_stream(self, remote_path: str, recursive: bool = False,
+                      batch_size: int = 1000, excludes: Optional[Iterable[str]] = None,
+                      **options) -> LsjsonStream:
+        """返回逐批产出条目的 lsjson 流，适合超大目录（始终走命令行管道）。"""
+        args = ['lsjson', remote_path]
+        if recursive:
+            args.append('--recursive')
+        for pattern in excludes or []:
+            args.extend(['--exclude', pattern])
+        cmd = self._build_command(*args, **options)
+        logger.info(f'[RClone] 流式 lsjson: {remote_path}, recursive={recursive}')
+        return LsjsonStream(cmd, batch_size=batch_size)
+
     def ls(self, remote_path: str) -> List[Dict[str, Any]]:
         success, data = self.lsjson(remote_path)
         return data if success else []
 
     def mkdir(self, remote_path: str) -> RCloneResult:
-        return self._run('mkdir', remote_path)
+        return self._rc_path_op('operations/mkdir', remote_path) or self._run('mkdir', remote_path)
 
     def rmdir(self, remote_path: str) -> RCloneResult:
-        return self._run('rmdir', remote_path)
+        return self._rc_path_op('operations/rmdir', remote_path) or self._run('rmdir', remote_path)
 
     def purge(self, remote_path: str) -> RCloneResult:
-        return self._run('purge', remote_path)
+        return self._rc_path_op('operations/purge', remote_path) or self._run('purge', remote_path)
 
     def delete_file(self, remote_path: str) -> RCloneResult:
-        return self._run('deletefile', remote_path)
+        return self._rc_path_op('operations/deletefile', remote_path) or self._run('deletefile', remote_path)
+
+    def delete_batch(self, remote_dir: str, files: List[str], dirs: List[str],
+                     checkers: int = 16, run_timeout: int = 3600) -> Tuple[RCloneResult, Dict[str, str]]:
+        """批量删除 remote_dir 下的直接子项。
+
+        文件通过一次 ``rclone delete --files-from-raw`` 删除；目录逐个 purge
+        （rcd 可用时走 ``operations/purge``），由后端直接删除整棵子树。
+        单个条目失败不会中止其余条目。
+
+        Returns:
+            (整体结果, {失败的条目名: 错误信息})；无法归属到具体条目的错误
+            只体现在整体结果中。
+        """
+        failures: Dict[str, str] = {}
+        results: List[RCloneResult] = []
+        if files:
+            fd, path = tempfile.mkstemp(prefix='rclonegui-delete-', suffix='.txt')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(''.join(name + '\n' for name in files))
+                result = self._run('delete', remote_dir, files_from_raw=path, checkers=checkers,
+                                   use_json_log=True, run_timeout=run_timeout)
+            finally:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            results.append(result)
+            failures.update(self._batch_failures(result, files))
+
+        base = remote_dir if remote_dir.endswith((':', '/')) else remote_dir + '/'
+        for name in dirs:
+            result = self.purge(base + name)
+            results.append(result)
+            if not result.success:
+                failures[name] = _last_line(result.stderr) or '删除失败'
+
+        combined = RCloneResult(
+            success=all(r.success for r in results),
+            stdout='',
+            stderr='\n'.join(r.stderr for r in results if not r.success),
+            return_code=next((r.return_code for r in results if not r.success), 0)
+        )
+        return combined, failures
+
+    @staticmethod
+    def _batch_failures(result: RCloneResult, names: List[str]) -> Dict[str, str]:
+        """把 JSON 日志中的错误归到对应的顶层条目；无法归属的错误不计入任何条目。"""
+        if result.success:
+            return {}
+        wanted = set(names)
+        failures = {}
+        for obj, msg in _json_log_errors(result.stderr).items():
+            top = obj.split('/', 1)[0]
+            if top in wanted:
+                failures.setdefault(top, msg)
+        return failures
 
     def copy(self, source: str, dest: str, **options) -> RCloneResult:
         return self._run('copy', source, dest, **options)
@@ -219,11 +570,87 @@ class RClone:
     def sync(self, source: str, dest: str, **options) -> RCloneResult:
         return self._run('sync', source, dest, **options)
 
-    def check(self, remote: str) -> RCloneResult:
-        return self._run('lsd', f'{remote}:', max_depth=1)
-
-    def about(self, remote: str) -> Tuple[bool, Dict]:
-        return self._run_json('about', f'{remote}:', json=True)
+    def check(self, remote: str, timeout: Optional[int] = None) -> RCloneResult:
+        """列出远程存储根目录以检查连通性；timeout 为整体超时秒数。"""
+        result = self._rc_run('operations/list', {
+            'fs': f'{remote}:', 'remote': '', 'opt': {'dirsOnly': True}
+        }, timeout=timeout)
+        if result is not None:
+            return result
+        if timeout is None:
+            return self._run('lsd', f'{remote}:', max_depth=1)
+        return self._run('lsd', f'{remote}:', max_depth=1, run_timeout=timeout,
+                         contimeout=f'{timeout}s', low_level_retries=1, retries=1)
+
+    def about(self, remote: str, timeout: Optional[int] = None) -> Tuple[bool, Dict]:
+        rc = self._rc_json('operations/about', {'fs': f'{remote}:'}, timeout=timeout)
+        if rc:
+            return rc
+        if timeout is None:
+            return self._run_json('about', f'{remote}:', json=True)
+        return self._run_json('about', f'{remote}:', json=True, run_timeout=timeout,
+                              contimeout=f'{timeout}s', low_level_retries=1)
+
+    def check_combined(self, source: str, dest: str, output_path: str, one_way: bool = False,
+                       excludes: Iterable[str] = (), cancelled: Optional[Callable[[], bool]] = None,
+                       run_timeout: int = 6 * 3600) -> RCloneResult:
+        """运行 rclone check，把逐文件的比对结果（--combined 格式）写入 output_path。
+
+        存在差异时 rclone 也以非 0 返回码退出，调用方需要结合输出判断。
+        cancelled 返回 True 时终止进程。
+        """
+        args = ['check', source, dest, '--combined', output_path]
+        for pattern in excludes:
+            args.extend(['--exclude', pattern])
+        cmd = self._build_command(*args, one_way=one_way)
+        logger.info(f'[RClone] 比对: {source} → {dest}, one_way={one_way}')
+        deadline = time.monotonic() + run_timeout
+        with tempfile.TemporaryFile() as stderr_file:
+            try:
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=stderr_file,
+                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+                )
+            except OSError as e:
+                logger.error(f'[RClone] 比对启动失败: {e}')
+                return RCloneResult(success=False, stdout='', stderr=f'系统错误: {e}', return_code=-1)
+            while True:
+                try:
+                    return_code = process.wait(timeout=0.2)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                timed_out = time.monotonic() > deadline
+                if timed_out or (cancelled is not None and cancelled()):
+                    process.kill()
+                    process.wait()
+                    message = f'命令执行超时（{run_timeout}秒）' if timed_out else '操作已取消'
+                    return RCloneResult(success=False, stdout='', stderr=message, return_code=-1)
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', errors='replace')
+        return RCloneResult(success=return_code == 0, stdout='', stderr=stderr,
+                            return_code=return_code)
+
+    def hashsum(self, remote_path: str, algorithm: str = 'md5',
+                run_timeout: int = 3600) -> Tuple[bool, Any]:
+        """列出 remote_path 下全部文件的哈希。
+
+        Returns:
+            (True, {相对路径: 哈希}) 或 (False, 错误信息)；存储不提供哈希的文件不在结果中
+        """
+        result = self._run('hashsum', algorithm, remote_path, run_timeout=run_timeout)
+        if not result.success:
+            return False, result.stderr or f'返回码 {result.return_code}'
+        hashes = {}
+        for line in result.stdout.splitlines():
+            digest, sep, path = line.partition('  ')
+            digest = digest.strip()
+            if sep and digest and path:
+                hashes[path] = digest
+        return True, hashes
 
     def size(self, remote_path: str) -> Tuple[bool, Dict]:
-        return self._run_json('size', remote_path, json=True)
+        rc = self._rc_json('operations/size', {'fs': remote_path})
+        return rc or self._run_json('size', remote_path, json=True)
@@ -0,0 +1,184 @@
+"""
+rclone.conf 原生读取模块。
+
+``rclone config dump`` 每次都要启动一个进程，而远程存储列表在界面中
+被频繁读取。这里直接在进程内解析未加密的 INI 格式配置文件，并按文件
+的 mtime 和大小缓存结果；另外可选地挂上 QFileSystemWatcher，在文件
+被外部修改时立即失效。
+
+以下情况返回 None，由调用方回退到 rclone 命令：
+- 找不到配置文件（rclone 可能有其他查找规则）
+- 配置文件已加密（以 ``RCLONE_ENCRYPT_V0:`` 开头）
+- 通过 ``RCLONE_CONFIG_<NAME>_TYPE`` 环境变量定义了远程存储
+"""
+
+import copy
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..common.logger import get_logger
+
+logger = get_logger('rclone_conf')
+
+ENCRYPTED_MARKER = 'RCLONE_ENCRYPT_V0:'
+_ENV_REMOTE_RE = re.compile(r'^RCLONE_CONFIG_\w+_TYPE$')
+
+ConfigData = Dict[str, Dict[str, str]]
+
+
+def parse_rclone_conf(text: str) -> Optional[ConfigData]:
+    """解析 rclone.conf 文本，加密的配置返回 None。"""
+    sections: ConfigData = {}
+    current: Optional[Dict[str, str]] = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line.startswith(ENCRYPTED_MARKER):
+            return None
+        if line.startswith('[') and line.endswith(']'):
+            current = sections.setdefault(line[1:-1].strip(), {})
+            continue
+        key, sep, value = line.partition('=')
+        if not sep or current is None:
+            continue
+        current[key.strip()] = value.strip()
+    return sections
+
+
+def candidate_paths(rclone_path: Optional[str] = None) -> List[Path]:
+    """按 rclone 的查找顺序列出默认配置文件位置。"""
+    paths = []
+    env_path = os.environ.get('RCLONE_CONFIG')
+    if env_path:
+        return [Path(env_path)]
+    # 便携模式：与 rclone 可执行文件位于同一目录的 rclone.conf 优先
+    if rclone_path:
+        paths.append(Path(rclone_path).resolve().parent / 'rclone.conf')
+    home = Path.home()
+    if sys.platform == 'win32' and os.environ.get('APPDATA'):
+        paths.append(Path(os.environ['APPDATA']) / 'rclone' / 'rclone.conf')
+    xdg = os.environ.get('XDG_CONFIG_HOME')
+    paths.append((Path(xdg) if xdg else home / '.config') / 'rclone' / 'rclone.conf')
+    paths.append(home / '.rclone.conf')
+    return paths
+
+
+def resolve_config_path(config_path: Optional[str],
+                        rclone_path: Optional[str] = None) -> Optional[Path]:
+    """返回实际存在的配置文件路径，找不到时返回 None。"""
+    if config_path:
+        path = Path(config_path)
+        return path if path.is_file() else None
+    for path in candidate_paths(rclone_path):
+        if path.is_file():
+            return path
+    return None
+
+
+def _env_defines_remotes() -> bool:
+    return any(_ENV_REMOTE_RE.match(key) for key in os.environ)
+
+
+class RCloneConfFile:
+    """带缓存的单个配置文件读取器。
+
+    load() 每次只做一次 stat，mtime 与大小不变时直接返回缓存的副本。
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._data: Optional[ConfigData] = None
+        self._encrypted = False
+        self._watcher = None
+        self._lock = threading.Lock()
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load_locked(self) -> Optional[ConfigData]:
+        stamp = self.stamp()
+        if stamp is None:
+            return None
+        if stamp != self._stamp:
+            try:
+                text = self.path.read_text(encoding='utf-8-sig', errors='replace')
+            except OSError as e:
+                logger.warning(f'[配置] 读取 {self.path} 失败: {e}')
+                return None
+            data = parse_rclone_conf(text)
+            self._stamp = stamp
+            self._data = data
+            self._encrypted = data is None
+            if data is not None:
+                logger.debug(f'[配置] 已解析 {self.path}: {len(data)} 个远程存储')
+        return self._data
+
+    def load(self) -> Optional[ConfigData]:
+        """返回全部配置的副本；文件不存在或已加密时返回 None。"""
+        with self._lock:
+            data = self._load_locked()
+            return copy.deepcopy(data) if data is not None else None
+
+    def section(self, name: str) -> Optional[Dict[str, str]]:
+        """返回单个远程存储的配置副本；无法原生读取时返回 None。"""
+        with self._lock:
+            data = self._load_locked()
+            if data is None:
+                return None
+            return dict(data.get(name, {}))
+
+    @property
+    def encrypted(self) -> bool:
+        return self._encrypted
+
+    def invalidate(self):
+        with self._lock:
+            self._stamp = None
+            self._data = None
+
+    def watch(self, callback: Optional[Callable[[], None]] = None):
+        """监视文件变化：变化时立即失效缓存并调用 callback。"""
+        if self._watcher is not None:
+            return
+        from PySide6.QtCore import QFileSystemWatcher
+
+        self._watcher = QFileSystemWatcher([str(self.path)])
+
+        def on_changed(path: str):
+            self.invalidate()
+            # 编辑器保存时可能先删除再重建文件，需要重新加入监视
+            if path not in self._watcher.files() and os.path.exists(path):
+                self._watcher.addPath(path)
+            if callback is not None:
+                callback()
+
+        self._watcher.fileChanged.connect(on_changed)
+
+
+_files: Dict[Path, RCloneConfFile] = {}
+_files_lock = threading.Lock()
+
+
+def get_conf_file(config_path: Optional[str],
+                  rclone_path: Optional[str] = None) -> Optional[RCloneConfFile]:
+    """返回可原生读取的配置文件读取器，需要回退到 rclone 命令时返回 None。"""
+    if _env_defines_remotes():
+        return None
+    path = resolve_config_path(config_path, rclone_path)
+    if path is None:
+        return None
+    with _files_lock:
+        conf = _files.get(path)
+        if conf is None:
+            conf = _files[path] = RCloneConfFile(path)
+        return conf
@@ -0,0 +1,278 @@
+"""
+rclone rcd 后端模块。
+
+在应用会话内维护一个常驻的 ``rclone rcd`` 进程，通过其 HTTP RC API
+执行 lsjson / config dump / about / mkdir 等操作，避免每次调用都启动
+新的 rclone 进程、重新读取 rclone.conf 并重建后端连接。
+
+- RCClient: RC API 客户端，使用 keep-alive 连接池复用 HTTP 连接
+- RCDaemon: 负责启动、探活和停止 rclone rcd 进程，首次调用时惰性启动
+"""
+
+import base64
+import http.client
+import json
+import os
+import queue
+import secrets
+import socket
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..common.logger import get_logger
+
+logger = get_logger('rclone_rc')
+
+
+class RCError(Exception):
+    """RC 调用已送达 rcd，但命令本身执行失败（如远程路径不存在）。"""
+
+
+class RCTransportError(Exception):
+    """无法与 rcd 通信（进程未启动、连接被拒绝、响应无法解析等）。"""
+
+
+def _find_free_port(host: str = '127.0.0.1') -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+class RCClient:
+    """rclone RC HTTP API 客户端。
+
+    每个请求从连接池中取出一个 HTTPConnection，请求结束后归还，
+    从而在多个工作线程之间复用 keep-alive 连接。
+    """
+
+    def __init__(self, host: str, port: int, user: Optional[str] = None,
+                 password: Optional[str] = None, timeout: float = 300,
+                 pool_size: int = 4):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        self._headers = {'Content-Type': 'application/json'}
+        if user is not None:
+            token = base64.b64encode(f'{user}:{password or ""}'.encode()).decode()
+            self._headers['Authorization'] = f'Basic {token}'
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @staticmethod
+    def _set_timeout(conn: http.client.HTTPConnection, timeout: float):
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+
+    def _request(self, conn: http.client.HTTPConnection, method: str, body: bytes):
+        conn.request('POST', f'/{method}', body=body, headers=self._headers)
+        response = conn.getresponse()
+        return response.status, response.read()
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None,
+             timeout: Optional[float] = None) -> Any:
+        """调用 RC 方法并返回解码后的 JSON 响应。
+
+        timeout 为本次请求的超时秒数，默认使用客户端的 timeout。
+
+        Raises:
+            RCError: rcd 返回了错误状态码，或请求超时。
+            RCTransportError: 连接或协议层失败。
+        """
+        body = json.dumps(params or {}).encode('utf-8')
+
+        # 池中的 keep-alive 连接可能已被服务端关闭，失败后用新连接重试一次
+        for attempt in range(2):
+            conn = self._acquire()
+            if timeout is not None:
+                self._set_timeout(conn, timeout)
+            try:
+                status, data = self._request(conn, method, body)
+            except socket.timeout as e:
+                # 超时不重试：rcd 已收到请求，只是没有在期限内完成
+                conn.close()
+                raise RCError(f'RC 调用超时（{timeout or self.timeout}秒）') from e
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise RCTransportError(f'RC 连接失败: {e}') from e
+            if timeout is not None:
+                self._set_timeout(conn, self.timeout)
+            self._release(conn)
+            break
+
+        try:
+            payload = json.loads(data.decode('utf-8')) if data else {}
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise RCTransportError(f'无效的 RC 响应: {e}') from e
+
+        if status != 200:
+            message = payload.get('error') if isinstance(payload, dict) else None
+            raise RCError(message or f'RC 调用失败 (HTTP {status})')
+        return payload
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class RCDaemon:
+    """管理单个常驻 rclone rcd 进程，对外提供与 RCClient 相同的 call 接口。"""
+
+    START_TIMEOUT = 10.0
+
+    def __init__(self, rclone_path: str, config_path: Optional[str] = None,
+                 host: str = '127.0.0.1', extra_args: Optional[List[str]] = None):
+        self.rclone_path = rclone_path
+        self.config_path = config_path
+        self.host = host
+        # 追加到 rcd 命令行的全局参数（如 --cache-dir）
+        self.extra_args = list(extra_args or [])
+        self.client: Optional[RCClient] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._start_failed = False
+
+    def _build_command(self, port: int, user: str) -> List[str]:
+        cmd = [self.rclone_path]
+        if self.config_path:
+            cmd.extend(['--config', self.config_path])
+        cmd.extend([
+            'rcd',
+            '--rc-addr', f'{self.host}:{port}',
+            '--rc-user', user,
+        ])
+        cmd.extend(self.extra_args)
+        return cmd
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        with self._lock:
+            if self.is_running() and self.client is not None:
+                return True
+            if self._start_failed:
+                return False
+
+            port = _find_free_port(self.host)
+            user = 'rclonegui'
+            password = secrets.token_urlsafe(16)
+            cmd = self._build_command(port, user)
+            # 密码经环境变量传入，命令行在进程列表中对其他本地用户可见
+            env = dict(os.environ, RCLONE_RC_PASS=password)
+            logger.info(f'[RCD] 启动 rclone rcd: {self.host}:{port}')
+
+            try:
+                self._process = subprocess.Popen(
+                    cmd,
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+                )
+            except OSError as e:
+                logger.error(f'[RCD] 启动失败: {e}')
+                self._start_failed = True
+                return False
+
+            client = RCClient(self.host, port, user, password)
+            deadline = time.monotonic() + self.START_TIMEOUT
+            while time.monotonic() < deadline:
+                if self._process.poll() is not None:
+                    break
+                try:
+                    client.call('rc/noop')
+                    self.client = client
+                    logger.info(f'[RCD] rclone rcd 已就绪 (PID {self._process.pid})')
+                    return True
+                except (RCError, RCTransportError):
+                    time.sleep(0.1)
+
+            logger.error('[RCD] rclone rcd 未能在超时时间内就绪，回退到命令行模式')
+            self._start_failed = True
+            self._terminate()
+            return False
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None,
+             timeout: Optional[float] = None) -> Any:
+        if not self.start():
+            raise RCTransportError('rclone rcd 不可用')
+        try:
+            return self.client.call(method, params, timeout=timeout)
+        except RCTransportError:
+            if not self.is_running():
+                logger.warning('[RCD] rclone rcd 进程已退出')
+                self.client = None
+            raise
+
+    def _terminate(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait(timeout=2)
+        except (ProcessLookupError, OSError):
+            pass
+
+    def stop(self):
+        with self._lock:
+            if self._process is not None:
+                logger.info('[RCD] 停止 rclone rcd')
+            self._terminate()
+
+
+# 按 (rclone 路径, 配置文件) 区分：不同设置的 RClone 各用一个进程，互不影响进行中的调用
+_daemons: Dict[Tuple[str, Optional[str]], RCDaemon] = {}
+_daemon_lock = threading.Lock()
+
+
+def get_rc_daemon(rclone_path: str, config_path: Optional[str] = None) -> RCDaemon:
+    """返回应用会话内共享的 RCDaemon（惰性创建，首次调用时才启动进程）。"""
+    key = (rclone_path, config_path)
+    with _daemon_lock:
+        daemon = _daemons.get(key)
+        if daemon is None:
+            daemon = _daemons[key] = RCDaemon(rclone_path, config_path)
+        return daemon
+
+
+def release_rc_daemon(rclone_path: str, config_path: Optional[str] = None):
+    """停止并移除某个设置对应的共享 RCDaemon（如更换了 rclone 可执行文件之后）。"""
+    with _daemon_lock:
+        daemon = _daemons.pop((rclone_path, config_path), None)
+    if daemon is not None:
+        daemon.stop()
+
+
+def shutdown_rc_daemon():
+    with _daemon_lock:
+        daemons = list(_daemons.values())
+        _daemons.clear()
+    for daemon in daemons:
+        daemon.stop()
@@ -0,0 +1,161 @@
+"""
+rclone JSON 统计输出解码模块。
+
+配合 ``--use-json-log --stats-log-level NOTICE`` 使用：rclone 每个统计周期
+输出一行带 ``stats`` 字段的 JSON 日志，其中包含精确的字节数、文件数、
+检查数、错误数以及正在传输的文件列表。StatsDecoder 逐行解析这些日志，
+同时统计 "Attempt N/M failed" 形式的重试记录、服务端限流提示和最近一条
+错误信息。
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+_ATTEMPT_RE = re.compile(r'Attempt (\d+)/(\d+) failed')
+# 服务端限流的常见提示（HTTP 429 / 503、rate limit 等）
+_THROTTLE_RE = re.compile(
+    r'\b429\b|\b503\b|too many requests|rate ?limit|throttl|slow ?down', re.IGNORECASE)
+
+
+@dataclass
+class TransferStats:
+    bytes: int = 0
+    total_bytes: int = 0
+    transfers: int = 0
+    total_transfers: int = 0
+    checks: int = 0
+    total_checks: int = 0
+    errors: int = 0
+    deletes: int = 0
+    retries: int = 0
+    speed: float = 0.0
+    eta: Optional[int] = None
+    elapsed: float = 0.0
+    # 实际用于传输的时间（不含列目录等），旧版 rclone 不提供时为 0
+    transfer_time: float = 0.0
+    last_error: str = ''
+    transferring: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def percentage(self) -> int:
+        if self.total_bytes <= 0:
+            return 0
+        return min(100, int(self.bytes * 100 / self.total_bytes))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转为 taskStatsUpdate 使用的字典，保留原有 regex 解析时的键名。"""
+        stats = {
+            'percentage': self.percentage,
+            'bytes_transferred': self.bytes,
+            'bytes_total': self.total_bytes,
+            'files_transferred': self.transfers,
+            'files_total': self.total_transfers,
+            'checks': self.checks,
+            'checks_total': self.total_checks,
+            'errors': self.errors,
+            'deletes': self.deletes,
+            'retries': self.retries,
+            'speed': int(self.speed),
+            'elapsed': self.elapsed,
+            'transferring': self.transferring,
+        }
+        if self.eta is not None:
+            stats['eta'] = self.eta
+        if self.last_error:
+            stats['last_error'] = self.last_error
+        return stats
+
+
+def _int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class StatsDecoder:
+    """逐行解码 rclone JSON 日志。
+
+    feed() 对统计行返回新的 TransferStats 快照，对其他 JSON 日志行返回 None
+    （但会记录错误与重试信息）；非 JSON 行返回 None 且 is_json 为 False。
+    """
+
+    def __init__(self):
+        self.retries = 0
+        self.throttled = 0
+        self.errors: List[str] = []
+        self.last: Optional[TransferStats] = None
+
+    @staticmethod
+    def is_json(line: str) -> bool:
+        return line.startswith('{')
+
+    def feed(self, line: str) -> Optional[TransferStats]:
+        if not self.is_json(line):
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict):
+            return None
+
+        stats = record.get('stats')
+        if isinstance(stats, dict):
+            self.last = self._decode_stats(stats)
+            return self.last
+
+        msg = record.get('msg', '')
+        attempt = _ATTEMPT_RE.search(msg)
+        if attempt:
+            self.retries = max(self.retries, int(attempt.group(1)))
+        if _THROTTLE_RE.search(msg):
+            self.throttled += 1
+        if record.get('level') == 'error':
+            obj = record.get('object')
+            self.errors.append(f'{obj}: {msg}' if obj else msg)
+        return None
+
+    @property
+    def last_error(self) -> str:
+        return self.errors[-1] if self.errors else ''
+
+    def _decode_stats(self, stats: Dict[str, Any]) -> TransferStats:
+        eta = stats.get('eta')
+        transferring = [
+            {
+                'name': t.get('name', ''),
+                'bytes': _int(t.get('bytes')),
+                'size': _int(t.get('size')),
+                'percentage': _int(t.get('percentage')),
+                'speed': _float(t.get('speed')),
+            }
+            for t in stats.get('transferring') or []
+            if isinstance(t, dict)
+        ]
+        return TransferStats(
+            bytes=_int(stats.get('bytes')),
+            total_bytes=_int(stats.get('totalBytes')),
+            transfers=_int(stats.get('transfers')),
+            total_transfers=_int(stats.get('totalTransfers')),
+            checks=_int(stats.get('checks')),
+            total_checks=_int(stats.get('totalChecks')),
+            errors=_int(stats.get('errors')),
+            deletes=_int(stats.get('deletes')),
+            retries=self.retries,
+            speed=_float(stats.get('speed')),
+            eta=_int(eta) if eta is not None else None,
+            elapsed=_float(stats.get('elapsedTime')),
+            transfer_time=_float(stats.get('transferTime')),
+            last_error=stats.get('lastError') or self.last_error,
+            transferring=transferring,
+        )
@@ -0,0 +1,324 @@
+"""
+远程存储元数据索引模块。
+
+在大型远程存储上查找文件只能逐个目录调用 ``lsjson``。RemoteIndex 用
+``lsjson --recursive --fast-list`` 流式抓取整个远程存储（或其中一个子
+目录），把路径、大小、修改时间、哈希和目录标记写入每个远程存储独立的
+SQLite 数据库，并用 FTS5 trigram 索引文件名，使按名称搜索可以离线、
+在毫秒级完成。
+
+重新抓取是增量的：每次抓取分配一个新的代号，已有条目只在内容变化时
+更新，抓取成功结束后删除本次范围内未再出现的旧条目；抓取失败或取消时
+保留原有数据。
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..common.config import DEFAULT_CACHE_DIR
+from ..common.logger import get_logger
+
+logger = get_logger('remote_index')
+
+INDEX_DIR = DEFAULT_CACHE_DIR / 'index'
+
+
+def _trigram_supported() -> bool:
+    try:
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(name, tokenize='trigram')")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+FTS_TRIGRAM_AVAILABLE = _trigram_supported()
+
+# 在元数据中保存哈希的存储类型：列出哈希不需要读取文件内容。
+# local、sftp、crypt、多数 WebDAV 等需要现场计算，抓取时请求哈希等于读取全部数据
+STORED_HASH_BACKENDS = frozenset({
+    'azureblob', 'b2', 'box', 'drive', 'dropbox', 'googlecloudstorage', 'hidrive',
+    'jottacloud', 'koofr', 'mailru', 'mega', 'onedrive', 'opendrive', 'oracleobjectstorage',
+    'pcloud', 'pikpak', 'putio', 'qingstor', 's3', 'sharefile', 'swift', 'yandex',
+})
+
+
+def stores_hashes(backend_type: Optional[str]) -> bool:
+    """该类型的远程存储能否在列出时直接返回哈希。"""
+    return bool(backend_type) and backend_type.lower() in STORED_HASH_BACKENDS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    mtime TEXT NOT NULL DEFAULT '',
+    hashes TEXT NOT NULL DEFAULT '',
+    is_dir INTEGER NOT NULL DEFAULT 0,
+    gen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# 外部内容 FTS 表：只有文件名变化时才需要同步，大小或时间变化不触发重建
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(
+    name, content='entries', content_rowid='id', tokenize='trigram'
+);
+"""
+
+_FTS_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE OF name ON entries BEGIN
+    INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+END;
+"""
+
+_DROP_FTS_TRIGGERS = """
+DROP TRIGGER IF EXISTS entries_ai;
+DROP TRIGGER IF EXISTS entries_ad;
+DROP TRIGGER IF EXISTS entries_au;
+"""
+
+_UPSERT = """
+INSERT INTO entries (path, name, parent, size, mtime, hashes, is_dir, gen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    size = excluded.size, mtime = excluded.mtime, hashes = excluded.hashes,
+    is_dir = excluded.is_dir, gen = excluded.gen
+"""
+
+_SAFE_NAME_RE = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+def _join(base: str, path: str) -> str:
+    return f'{base}/{path}' if base else path
+
+
+def _like_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class RemoteIndex:
+    """单个远程存储的元数据索引。"""
+
+    def __init__(self, remote: str, db_path: Optional[Path] = None):
+        self.remote = remote
+        if db_path is None:
+            db_path = INDEX_DIR / f'{_SAFE_NAME_RE.sub("_", remote)}.sqlite'
+        self.db_path = Path(db_path)
+        if str(db_path) != ':memory:':
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._stream = None
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        if FTS_TRIGRAM_AVAILABLE:
+            self._conn.executescript(_FTS_SCHEMA)
+            if self._meta('fts_dirty'):
+                # 上次整体抓取中途退出，FTS 尚未重建
+                self._rebuild_fts()
+            self._conn.executescript(_FTS_TRIGGERS)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value):
+        self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    def _rebuild_fts(self):
+        self._conn.execute("INSERT INTO names(names) VALUES ('rebuild')")
+        self._conn.execute("DELETE FROM meta WHERE key = 'fts_dirty'")
+        self._conn.commit()
+
+    def _suspend_fts(self):
+        """整体抓取时逐行维护 trigram 索引很慢，改为结束后一次性重建。"""
+        with self._lock:
+            self._conn.executescript(_DROP_FTS_TRIGGERS)
+            self._set_meta('fts_dirty', 1)
+            self._conn.commit()
+
+    def _resume_fts(self):
+        with self._lock:
+            self._rebuild_fts()
+            self._conn.executescript(_FTS_TRIGGERS)
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def last_crawl(self) -> Optional[float]:
+        """最近一次成功抓取的时间戳；从未抓取过返回 None。"""
+        with self._lock:
+            value = self._meta('last_crawl')
+        return float(value) if value else None
+
+    def add_entries(self, entries: Iterable[Dict], base: str, gen: int) -> int:
+        """写入一批 lsjson 条目，Path 相对于 base。返回写入的条目数。"""
+        rows = []
+        for entry in entries:
+            path = _join(base, entry.get('Path') or entry.get('Name', ''))
+            if not path:
+                continue
+            parent, _, name = path.rpartition('/')
+            hashes = entry.get('Hashes')
+            rows.append((
+                path, name, parent, max(0, entry.get('Size', 0) or 0), entry.get('ModTime', ''),
+                json.dumps(hashes, sort_keys=True) if hashes else '',
+                1 if entry.get('IsDir') else 0, gen,
+            ))
+        with self._lock:
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.commit()
+        return len(rows)
+
+    def _next_gen(self) -> int:
+        with self._lock:
+            gen = int(self._meta('gen') or 0) + 1
+            self._set_meta('gen', gen)
+            self._conn.commit()
+        return gen
+
+    def _finish(self, base: str, gen: int) -> int:
+        """删除 base 范围内本次抓取未出现的条目，返回删除数量。"""
+        with self._lock:
+            if base:
+                # 子目录本身不在 lsjson 输出中，只清理其下的条目
+                prefix = base + '/'
+                cursor = self._conn.execute(
+                    'DELETE FROM entries WHERE gen < ? AND substr(path, 1, ?) = ?',
+                    (gen, len(prefix), prefix))
+            else:
+                cursor = self._conn.execute('DELETE FROM entries WHERE gen < ?', (gen,))
+                self._set_meta('last_crawl', time.time())
+            self._conn.commit()
+            return cursor.rowcount
+
+    def crawl(self, rclone, path: str = '', hashes: bool = False,
+              progress: Optional[Callable[[int], None]] = None) -> Tuple[bool, str]:
+        """抓取 path（默认整个远程存储）并更新索引。
+
+        hashes 只应对 stores_hashes() 为真的存储开启，否则 rclone 会读取并
+        计算每个文件的哈希。
+
+        Returns:
+            (是否成功, 错误信息)
+        """
+        base = path.strip('/')
+        gen = self._next_gen()
+        options = {'fast_list': True, 'no_mimetype': True}
+        if hashes:
+            options['hash'] = True
+        stream = rclone.lsjson_stream(f'{self.remote}:{base}', recursive=True, **options)
+        self._stream = stream
+        logger.info(f'[索引] 开始抓取 {self.remote}:{base}')
+        start = time.monotonic()
+        total = 0
+        bulk = FTS_TRIGRAM_AVAILABLE and not base
+        if bulk:
+            self._suspend_fts()
+        try:
+            for batch in stream:
+                total += self.add_entries(batch, base, gen)
+                if progress is not None:
+                    progress(total)
+            removed = self._finish(base, gen) if stream.success else 0
+        finally:
+            self._stream = None
+            if bulk:
+                self._resume_fts()
+        if not stream.success:
+            logger.warning(f'[索引] 抓取 {self.remote}:{base} 未完成，保留原有数据: {stream.error[:200]}')
+            return False, stream.error
+        logger.info(f'[索引] {self.remote}:{base} 抓取完成: {total} 项，移除 {removed} 项，'
+                    f'耗时 {time.monotonic() - start:.1f}s')
+        return True, ''
+
+    def cancel(self):
+        stream = self._stream
+        if stream is not None:
+            stream.cancel()
+
+    def search(self, query: str, limit: int = 500) -> List[Dict]:
+        """按名称子串搜索（不区分大小写），返回 lsjson 形式的条目，Path 为完整相对路径。"""
+        query = query.strip()
+        if not query:
+            return []
+        columns = 'e.path, e.name, e.size, e.mtime, e.is_dir'
+        with self._lock:
+            # trigram 至少需要 3 个字符，更短的查询退回 LIKE 扫描
+            if FTS_TRIGRAM_AVAILABLE and len(query) >= 3:
+                fts_query = '"' + query.replace('"', '""') + '"'
+                rows = self._conn.execute(
+                    f'SELECT {columns} FROM names JOIN entries e ON e.id = names.rowid '
+                    f'WHERE names MATCH ? LIMIT ?', (fts_query, limit)).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT {columns} FROM entries e WHERE e.name LIKE ? ESCAPE '\\' LIMIT ?",
+                    (f'%{_like_escape(query)}%', limit)).fetchall()
+        return [
+            {'Path': path, 'Name': name, 'Size': size, 'ModTime': mtime, 'IsDir': bool(is_dir)}
+            for path, name, size, mtime, is_dir in rows
+        ]
+
+    def list_dir(self, path: str = '') -> List[Dict]:
+        """从索引读取一个目录的直接子项，可用于离线浏览。"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT name, size, mtime, is_dir FROM entries WHERE parent = ?',
+                (path.strip('/'),)).fetchall()
+        return [{'Name': name, 'Size': size, 'ModTime': mtime, 'IsDir': bool(is_dir)}
+                for name, size, mtime, is_dir in rows]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self._conn.execute("DELETE FROM meta WHERE key = 'last_crawl'")
+            self._conn.commit()
+
+
+_indexes: Dict[str, RemoteIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_remote_index(remote: str) -> RemoteIndex:
+    """返回远程存储的共享索引实例。"""
+    with _indexes_lock:
+        index = _indexes.get(remote)
+        if index is None:
+            index = _indexes[remote] = RemoteIndex(remote)
+        return index
+
+
+def has_remote_index(remote: str) -> bool:
+    """是否已为该远程存储建立过索引文件（不会因此创建数据库）。"""
+    with _indexes_lock:
+        if remote in _indexes:
+            return True
+    return (INDEX_DIR / f'{_SAFE_NAME_RE.sub("_", remote)}.sqlite').exists()
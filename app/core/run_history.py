@@ -0,0 +1,210 @@
+"""
+同步运行历史模块。
+
+SyncTask 只保存最近一次运行的结果，每次运行都会覆盖。RunHistory 把每次
+运行的起止时间、耗时、传输字节数、文件数、检查数、错误数、平均 / 峰值
+吞吐、rclone 返回码和所用参数追加写入 SQLite，用于对比趋势、发现性能
+退化。保留策略按记录的天数和每个任务的条数清理旧记录。
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from ..common.logger import get_logger
+
+logger = get_logger('run_history')
+
+# 参数值属于本机路径或临时文件，记录时只保留参数名
+_PRIVATE_VALUE_FLAGS = ('--config', '--files-from')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    task_name TEXT NOT NULL DEFAULT '',
+    mode TEXT NOT NULL DEFAULT '',
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    duration REAL NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    files INTEGER NOT NULL DEFAULT 0,
+    checks INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    avg_speed REAL NOT NULL DEFAULT 0,
+    peak_speed REAL NOT NULL DEFAULT 0,
+    exit_code INTEGER,
+    success INTEGER NOT NULL,
+    dry_run INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    flags TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS runs_task ON runs(task_id, started_at);
+"""
+
+_COLUMNS = ('id', 'task_id', 'task_name', 'mode', 'started_at', 'finished_at', 'duration',
+            'bytes', 'files', 'checks', 'errors', 'avg_speed', 'peak_speed', 'exit_code',
+            'success', 'dry_run', 'message', 'flags')
+
+
+def recorded_flags(args: Iterable[str]) -> List[str]:
+    """整理要记录的 rclone 参数，去掉配置文件和临时文件等本机路径。"""
+    result: List[str] = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+            continue
+        result.append(arg)
+        if arg in _PRIVATE_VALUE_FLAGS:
+            skip = True
+    return result
+
+
+@dataclass
+class RunRecord:
+    """一次同步运行的结果。"""
+    task_id: str
+    started_at: datetime
+    finished_at: datetime
+    success: bool
+    task_name: str = ''
+    mode: str = ''
+    bytes: int = 0
+    files: int = 0
+    checks: int = 0
+    errors: int = 0
+    # 字节/秒
+    avg_speed: float = 0.0
+    peak_speed: float = 0.0
+    # rclone 返回码，未启动进程时为 None
+    exit_code: Optional[int] = None
+    dry_run: bool = False
+    message: str = ''
+    flags: List[str] = field(default_factory=list)
+    id: Optional[int] = None
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, (self.finished_at - self.started_at).total_seconds())
+
+    def _row(self) -> tuple:
+        return (self.task_id, self.task_name, self.mode, self.started_at.timestamp(),
+                self.finished_at.timestamp(), self.duration, int(self.bytes), int(self.files),
+                int(self.checks), int(self.errors), float(self.avg_speed), float(self.peak_speed),
+                self.exit_code, int(bool(self.success)), int(bool(self.dry_run)), self.message,
+                json.dumps(list(self.flags)))
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> 'RunRecord':
+        data = dict(zip(_COLUMNS, row))
+        try:
+            flags = json.loads(data['flags'])
+        except ValueError:
+            flags = []
+        return cls(
+            id=data['id'],
+            task_id=data['task_id'],
+            task_name=data['task_name'],
+            mode=data['mode'],
+            started_at=datetime.fromtimestamp(data['started_at']),
+            finished_at=datetime.fromtimestamp(data['finished_at']),
+            bytes=data['bytes'],
+            files=data['files'],
+            checks=data['checks'],
+            errors=data['errors'],
+            avg_speed=data['avg_speed'],
+            peak_speed=data['peak_speed'],
+            exit_code=data['exit_code'],
+            success=bool(data['success']),
+            dry_run=bool(data['dry_run']),
+            message=data['message'],
+            flags=flags if isinstance(flags, list) else [],
+        )
+
+
+class RunHistory:
+    """只追加的运行历史数据库。"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        if str(db_path) != ':memory:':
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add(self, record: RunRecord) -> int:
+        columns = _COLUMNS[1:]
+        with self._lock:
+            cursor = self._conn.execute(
+                f'INSERT INTO runs ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+                record._row())
+            self._conn.commit()
+        record.id = cursor.lastrowid
+        return record.id
+
+    def runs(self, task_id: str, limit: int = 100) -> List[RunRecord]:
+        """任务最近的运行记录，按开始时间从新到旧。"""
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {", ".join(_COLUMNS)} FROM runs WHERE task_id = ? '
+                'ORDER BY started_at DESC, id DESC LIMIT ?', (task_id, limit)).fetchall()
+        return [RunRecord._from_row(row) for row in rows]
+
+    def count(self, task_id: Optional[str] = None) -> int:
+        with self._lock:
+            if task_id is None:
+                return self._conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+            return self._conn.execute('SELECT COUNT(*) FROM runs WHERE task_id = ?',
+                                      (task_id,)).fetchone()[0]
+
+    def prune(self, max_age_days: int = 0, max_runs: int = 0,
+              task_id: Optional[str] = None, now: Optional[float] = None) -> int:
+        """按保留策略删除旧记录，返回删除的条数。
+
+        Args:
+            max_age_days: 删除早于该天数的记录，0 表示不限
+            max_runs: 每个任务最多保留的条数，0 表示不限
+            task_id: 只清理该任务；为 None 时清理全部任务
+        """
+        deleted = 0
+        with self._lock:
+            if max_age_days > 0:
+                cutoff = (now if now is not None else time.time()) - max_age_days * 86400
+                if task_id is None:
+                    cursor = self._conn.execute('DELETE FROM runs WHERE started_at < ?', (cutoff,))
+                else:
+                    cursor = self._conn.execute(
+                        'DELETE FROM runs WHERE task_id = ? AND started_at < ?', (task_id, cutoff))
+                deleted += cursor.rowcount
+            if max_runs > 0:
+                task_ids = [task_id] if task_id is not None else [
+                    row[0] for row in self._conn.execute('SELECT DISTINCT task_id FROM runs')]
+                for tid in task_ids:
+                    cursor = self._conn.execute(
+                        'DELETE FROM runs WHERE task_id = ? AND id NOT IN ('
+                        'SELECT id FROM runs WHERE task_id = ? '
+                        'ORDER BY started_at DESC, id DESC LIMIT ?)', (tid, tid, max_runs))
+                    deleted += cursor.rowcount
+            self._conn.commit()
+        if deleted:
+            logger.debug(f'已清理 {deleted} 条运行历史')
+        return deleted
+
+    def delete_task(self, task_id: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM runs WHERE task_id = ?', (task_id,))
+            self._conn.commit()
@@ -0,0 +1,113 @@
+"""
+同步任务运行队列。
+
+SyncManager 不再为每次 run_task 直接启动 SyncWorker，而是把任务放入
+RunQueue，由它根据全局并发上限和每个远程存储的并发上限决定哪些任务
+可以立即启动。等待中的任务按优先级（手动运行先于定时运行）和入队
+顺序排列；被远程存储上限挡住的任务不会阻塞其后使用其他存储的任务。
+"""
+
+import heapq
+import itertools
+from collections import Counter
+from enum import IntEnum
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+class RunPriority(IntEnum):
+    MANUAL = 0
+    SCHEDULED = 1
+
+
+def task_remotes(*paths: str) -> FrozenSet[str]:
+    """提取路径涉及的远程存储名称；本地路径（含 Windows 盘符）统一记为 'local'。"""
+    remotes = set()
+    for path in paths:
+        name, sep, _ = (path or '').partition(':')
+        if sep and len(name) > 1 and '/' not in name and '\\' not in name:
+            remotes.add(name)
+        else:
+            remotes.add('local')
+    return frozenset(remotes)
+
+
+class RunQueue:
+    """带优先级的任务队列，同时记录正在运行的任务占用的远程存储。"""
+
+    def __init__(self, max_concurrent: int = 3, per_remote: int = 2):
+        self.max_concurrent = max_concurrent
+        self.per_remote = per_remote
+        self._heap: List[Tuple[int, int, str]] = []
+        # task_id -> (优先级, 入队序号, 涉及的远程存储)；序号用于识别堆中的过期条目
+        self._queued: Dict[str, Tuple[int, int, FrozenSet[str]]] = {}
+        self._running: Dict[str, FrozenSet[str]] = {}
+        self._remote_load: Counter = Counter()
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._queued
+
+    @property
+    def running(self) -> Iterable[str]:
+        return self._running.keys()
+
+    def push(self, task_id: str, remotes: FrozenSet[str],
+             priority: RunPriority = RunPriority.MANUAL) -> bool:
+        """入队；已在队列中时只会提升优先级。返回是否新入队。"""
+        current = self._queued.get(task_id)
+        if current is not None and priority >= current[0]:
+            return False
+        seq = next(self._seq)
+        self._queued[task_id] = (int(priority), seq, remotes)
+        heapq.heappush(self._heap, (int(priority), seq, task_id))
+        return current is None
+
+    def remove(self, task_id: str) -> bool:
+        # 堆中的旧条目在弹出时按 _queued 惰性丢弃
+        return self._queued.pop(task_id, None) is not None
+
+    def position(self, task_id: str) -> Optional[int]:
+        """任务在等待队列中的位置（从 1 开始）。"""
+        if task_id not in self._queued:
+            return None
+        ordered = sorted(entry for entry in self._heap if self._is_live(entry))
+        return [tid for _, _, tid in ordered].index(task_id) + 1
+
+    def _is_live(self, entry: Tuple[int, int, str]) -> bool:
+        queued = self._queued.get(entry[2])
+        return queued is not None and queued[1] == entry[1]
+
+    def _fits(self, remotes: FrozenSet[str]) -> bool:
+        return all(self._remote_load[r] < self.per_remote for r in remotes)
+
+    def pop_runnable(self) -> List[str]:
+        """取出当前可以启动的任务并标记为运行中。"""
+        started = []
+        skipped = []
+        while self._heap and len(self._running) < self.max_concurrent:
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            task_id = entry[2]
+            remotes = self._queued[task_id][2]
+            if not self._fits(remotes):
+                skipped.append(entry)
+                continue
+            del self._queued[task_id]
+            self.mark_running(task_id, remotes)
+            started.append(task_id)
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return started
+
+    def mark_running(self, task_id: str, remotes: FrozenSet[str]):
+        self._running[task_id] = remotes
+        self._remote_load.update(remotes)
+
+    def finish(self, task_id: str):
+        remotes = self._running.pop(task_id, None)
+        if remotes:
+            self._remote_load.subtract(remotes)
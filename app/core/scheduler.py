@@ -1,8 +1,10 @@
+import heapq
+import itertools
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from threading import Lock
-from typing import Callable, Dict, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from PySide6.QtCore import QObject, Signal, QTimer
 import logging
 
@@ -17,34 +19,57 @@ logger = logging.getLogger(__name__)
 
 
 class SchedulerThread(QObject):
+    """单次触发的唤醒定时器。
+
+    每次由 SyncScheduler 按最近的到期时间重新布置；最长等待 MAX_WAIT_MS，
+    这样即使没有任务到期也会定期唤醒一次，用于检测系统时间跳变。
+    """
+
     tick = Signal()
 
+    MAX_WAIT_MS = 60000
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
         self._timer.timeout.connect(self._on_tick)
-        self._timer.setInterval(60000)
-        self._last_minute = -1
+        self._timer.setInterval(self.MAX_WAIT_MS)
+        self._running = False
 
     def _on_tick(self):
-        now = datetime.now()
-        current_minute = now.minute
-
-        if current_minute != self._last_minute:
-            self._last_minute = current_minute
+        if self._running:
             self.tick.emit()
 
+    def arm(self, deadline: Optional[datetime]):
+        """在 deadline 时唤醒；deadline 为空时只做周期性的时间跳变检查。"""
+        if not self._running:
+            return
+        delay = self.MAX_WAIT_MS
+        if deadline is not None:
+            remaining = (deadline - datetime.now()).total_seconds() * 1000
+            delay = max(0, min(self.MAX_WAIT_MS, int(remaining)))
+        self._timer.start(delay)
+
     def start(self):
         if not self._timer.isActive():
+            self._running = True
             self._timer.start()
-            self._last_minute = datetime.now().minute
             self.tick.emit()
 
     def stop(self):
+        self._running = False
         self._timer.stop()
 
 
 class SyncScheduler(QObject):
+    """按 Cron 表达式触发同步任务。
+
+    每个任务的下次运行时间预先算好并放入最小堆，定时器只为堆顶布置，
+    到期时弹出并为该任务计算下一次时间；只有任务触发、运行完成或
+    Cron 表达式变化时才重新计算，调度数千个任务时每次唤醒也只处理
+    真正到期的条目。被移除或更新的旧条目留在堆中，弹出时按序号丢弃。
+    """
 
     taskDue = Signal(str)
 
@@ -53,6 +78,10 @@ class SyncScheduler(QObject):
         self._scheduled_tasks: Dict[str, str] = {}
         self._last_run_times: Dict[str, datetime] = {}
         self._triggered_tasks: Set[str] = set()
+        self._heap: List[Tuple[datetime, int, str]] = []
+        # task_id -> (下次运行时间, 序号)；序号用于识别堆中的过期条目
+        self._next_runs: Dict[str, Tuple[datetime, int]] = {}
+        self._seq = itertools.count()
         self._scheduler_thread: Optional[SchedulerThread] = None
         self._check_callback: Optional[Callable[[str], None]] = None
         self._lock = Lock()
@@ -89,6 +118,8 @@ class SyncScheduler(QObject):
                 self._scheduled_tasks[task_id] = cron_expression
                 if last_run:
                     self._last_run_times[task_id] = last_run
+                self._reschedule(task_id, datetime.now())
+            self._arm()
             logger.info(f"已添加定时任务 {task_id}: {cron_expression}")
             return True
         except (ValueError, KeyError) as e:
@@ -103,6 +134,7 @@ class SyncScheduler(QObject):
                 del self._last_run_times[task_id]
             if task_id in self._triggered_tasks:
                 self._triggered_tasks.discard(task_id)
+            self._next_runs.pop(task_id, None)
         logger.info(f"已移除定时任务 {task_id}")
 
     def update_task(self, task_id: str, cron_expression: str):
@@ -114,9 +146,12 @@ class SyncScheduler(QObject):
 
     def update_last_run(self, task_id: str, run_time: Optional[datetime] = None):
         with self._lock:
-            if task_id in self._scheduled_tasks:
-                self._last_run_times[task_id] = run_time or datetime.now()
-                self._triggered_tasks.discard(task_id)
+            if task_id not in self._scheduled_tasks:
+                return
+            self._last_run_times[task_id] = run_time or datetime.now()
+            self._triggered_tasks.discard(task_id)
+            self._reschedule(task_id, datetime.now())
+        self._arm()
 
     def get_next_run(self, task_id: str) -> Optional[datetime]:
         if not CRONITER_AVAILABLE:
@@ -149,53 +184,98 @@ class SyncScheduler(QObject):
         with self._lock:
             return task_id in self._scheduled_tasks
 
+    def _compute_next(self, task_id: str, now: datetime) -> Optional[datetime]:
+        """计算任务的下次运行时间；从未运行过的任务立即到期。"""
+        cron_expression = self._scheduled_tasks[task_id]
+        last_run = self._last_run_times.get(task_id)
+        # 时间回拨后 last_run 可能晚于当前时间，此时从当前时间起算
+        base_time = min(last_run, now) if last_run else datetime.fromtimestamp(0)
+        try:
+            return croniter(cron_expression, base_time).get_next(datetime)
+        except (ValueError, KeyError) as e:
+            logger.error(f"无效的 Cron 表达式，任务 {task_id}: {e}")
+        except TypeError as e:
+            logger.error(f"类型错误，任务 {task_id}: {e}")
+        except Exception as e:
+            logger.error(f"计算任务 {task_id} 下次运行时间时发生未知错误: {e}", exc_info=True)
+        return None
+
+    def _push(self, task_id: str, next_run: datetime):
+        seq = next(self._seq)
+        self._next_runs[task_id] = (next_run, seq)
+        heapq.heappush(self._heap, (next_run, seq, task_id))
+
+    def _reschedule(self, task_id: str, now: datetime):
+        self._next_runs.pop(task_id, None)
+        next_run = self._compute_next(task_id, now)
+        if next_run is not None:
+            self._push(task_id, next_run)
+
+    def _rebuild(self, now: datetime):
+        self._heap.clear()
+        self._next_runs.clear()
+        for task_id in self._scheduled_tasks:
+            self._reschedule(task_id, now)
+
+    def _is_live(self, entry: Tuple[datetime, int, str]) -> bool:
+        current = self._next_runs.get(entry[2])
+        return current is not None and current[1] == entry[1]
+
+    def _peek(self) -> Optional[datetime]:
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        # 频繁更新的任务会在堆中留下大量过期条目，超过一定比例时压缩
+        if len(self._heap) > 2 * len(self._next_runs) + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _arm(self):
+        if self._scheduler_thread is None:
+            return
+        with self._lock:
+            deadline = self._peek()
+        self._scheduler_thread.arm(deadline)
+
     def _on_tick(self):
         if not CRONITER_AVAILABLE:
             return
 
         now = datetime.now()
+        due: List[Tuple[str, datetime]] = []
 
         with self._lock:
             if self._last_check_time and now < self._last_check_time:
                 logger.warning("检测到系统时间回拨，重置调度状态")
                 self._triggered_tasks.clear()
+                self._rebuild(now)
             self._last_check_time = now
 
-            tasks_copy = dict(self._scheduled_tasks)
-            triggered_copy = set(self._triggered_tasks)
-
-        for task_id, cron_expression in tasks_copy.items():
-            try:
-                with self._lock:
-                    last_run = self._last_run_times.get(task_id)
-
-                base_time = last_run or datetime.fromtimestamp(0)
-                itr = croniter(cron_expression, base_time)
-                next_run = itr.get_next(datetime)
-
-                if now >= next_run:
-                    with self._lock:
-                        if task_id in self._triggered_tasks:
-                            continue
-                        self._triggered_tasks.add(task_id)
-
-                    logger.info(f"任务 {task_id} 已到期，下次运行时间: {next_run}")
-                    with self._lock:
-                        self._last_run_times[task_id] = now
-                    self.taskDue.emit(task_id)
-
-                    if self._check_callback:
-                        try:
-                            self._check_callback(task_id)
-                        except Exception as e:
-                            logger.error(f"回调函数执行出错: {e}")
-
-            except (ValueError, KeyError) as e:
-                logger.error(f"无效的 Cron 表达式，任务 {task_id}: {e}")
-            except TypeError as e:
-                logger.error(f"类型错误，任务 {task_id}: {e}")
-            except Exception as e:
-                logger.error(f"检查任务 {task_id} 时发生未知错误: {e}", exc_info=True)
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if not self._is_live(entry):
+                    continue
+                next_run, _, task_id = entry
+                del self._next_runs[task_id]
+                if task_id not in self._triggered_tasks:
+                    self._triggered_tasks.add(task_id)
+                    self._last_run_times[task_id] = now
+                    due.append((task_id, next_run))
+            # 在循环结束后再放回，避免同一次唤醒中重复处理同一任务
+            for task_id, _ in due:
+                self._reschedule(task_id, now)
+
+        for task_id, next_run in due:
+            logger.info(f"任务 {task_id} 已到期，下次运行时间: {next_run}")
+            self.taskDue.emit(task_id)
+
+            if self._check_callback:
+                try:
+                    self._check_callback(task_id)
+                except Exception as e:
+                    logger.error(f"回调函数执行出错: {e}")
+
+        self._arm()
 
     def validate_cron(self, expression: str) -> bool:
         if not CRONITER_AVAILABLE:
@@ -236,6 +316,8 @@ class SyncScheduler(QObject):
             self._scheduled_tasks.clear()
             self._last_run_times.clear()
             self._triggered_tasks.clear()
+            self._heap.clear()
+            self._next_runs.clear()
             self._last_check_time = None
 
     def get_all_scheduled_tasks(self) -> Dict[str, str]:
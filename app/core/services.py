@@ -0,0 +1,130 @@
+"""
+应用级服务容器。
+
+各个界面和系统托盘原先各自创建 RClone、ConfigManager、MountManager，
+导致重复的 ``config dump`` 调用、重复的进程扫描，以及多份互不同步的
+挂载状态。Services 为整个应用持有每种管理器的唯一实例：界面从这里
+取得共享实例，并通过管理器自身的信号（如 mountStatusChanged）或
+signalBus 订阅变化，而不是各自重新查询。
+
+管理器按需创建，只用到远程存储配置的界面不会触发挂载或同步初始化。
+"""
+
+import threading
+from typing import Optional
+
+from .config_manager import ConfigManager
+from .health_check import HealthChecker
+from .mount_manager import MountManager
+from .quota_service import QuotaService
+from .rclone import RClone
+from .sync_manager import SyncManager
+from ..common.logger import get_logger
+
+logger = get_logger('services')
+
+
+class Services:
+    """持有 RClone 及各管理器的共享实例。
+
+    构造时传入的实例会被直接使用（便于测试注入），其余在首次访问时创建。
+    """
+
+    def __init__(self, rclone: Optional[RClone] = None,
+                 configManager: Optional[ConfigManager] = None,
+                 mountManager: Optional[MountManager] = None,
+                 syncManager: Optional[SyncManager] = None,
+                 healthChecker: Optional[HealthChecker] = None,
+                 quotaService: Optional[QuotaService] = None):
+        self._rclone = rclone
+        self._configManager = configManager
+        self._mountManager = mountManager
+        self._syncManager = syncManager
+        self._healthChecker = healthChecker
+        self._quotaService = quotaService
+        self._lock = threading.RLock()
+
+    @property
+    def rclone(self) -> RClone:
+        with self._lock:
+            if self._rclone is None:
+                self._rclone = RClone()
+            return self._rclone
+
+    @property
+    def configManager(self) -> ConfigManager:
+        with self._lock:
+            if self._configManager is None:
+                self._configManager = ConfigManager(self.rclone)
+            return self._configManager
+
+    @property
+    def mountManager(self) -> MountManager:
+        with self._lock:
+            if self._mountManager is None:
+                self._mountManager = MountManager(self.rclone)
+                self._mountManager.load_mounts()
+                logger.debug('[服务] 已创建共享 MountManager')
+            return self._mountManager
+
+    @property
+    def syncManager(self) -> SyncManager:
+        with self._lock:
+            if self._syncManager is None:
+                self._syncManager = SyncManager(self.rclone)
+                logger.debug('[服务] 已创建共享 SyncManager')
+            return self._syncManager
+
+    @property
+    def healthChecker(self) -> HealthChecker:
+        with self._lock:
+            if self._healthChecker is None:
+                self._healthChecker = HealthChecker(self.rclone)
+            return self._healthChecker
+
+    @property
+    def quotaService(self) -> QuotaService:
+        with self._lock:
+            if self._quotaService is None:
+                self._quotaService = QuotaService(self.rclone)
+            return self._quotaService
+
+    def shutdown(self):
+        """停止已创建的管理器；未创建的不会因此被初始化。"""
+        with self._lock:
+            sync_manager, mount_manager = self._syncManager, self._mountManager
+            background = [self._healthChecker, self._quotaService]
+        for service in background:
+            if service is not None:
+                service.shutdown()
+        if sync_manager is not None:
+            try:
+                sync_manager.shutdown()
+                logger.info('同步管理器已关闭')
+            except Exception as e:
+                logger.error(f'关闭同步管理器失败: {e}')
+        if mount_manager is not None:
+            try:
+                mount_manager.unmount_all()
+            except Exception as e:
+                logger.error(f'卸载挂载失败: {e}')
+
+
+_services: Optional[Services] = None
+_services_lock = threading.Lock()
+
+
+def get_services() -> Services:
+    """返回应用内共享的服务容器。"""
+    global _services
+    with _services_lock:
+        if _services is None:
+            _services = Services()
+        return _services
+
+
+def set_services(services: Optional[Services]):
+    """替换共享的服务容器；传入 None 时下次访问会重新创建。"""
+    global _services
+    with _services_lock:
+        _services = services
@@ -0,0 +1,202 @@
+"""
+分片并行同步的辅助模块。
+
+单个 rclone 进程同步上千万文件的目录树时，瓶颈在于一个进程内的列目录
+和比对。分片模式把源目录在指定深度的子目录拆成独立的工作单元，每个
+单元由一个 rclone 进程以该子目录为根执行同样的 sync / copy / move，多个
+进程并发运行（受全局进程上限约束），它们的统计合并为一个进度流。
+
+分片之外的部分由最后一次对账完成：用 ``--max-depth`` 处理分片深度以内
+的文件，SYNC 模式下再清除目标端在源端已不存在的目录。
+
+本模块只包含与 Qt 无关的部分：分片列表、排除规则改写、带宽拆分、
+统计合并和全局进程额度；执行逻辑见 sync_manager.ShardedSyncWorker。
+"""
+
+import fnmatch
+import re
+import threading
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from .rclone import RClone
+from .rclone_stats import TransferStats
+from ..common.config import cfg
+from ..common.logger import get_logger
+
+logger = get_logger('sharded_sync')
+
+_BWLIMIT_RE = re.compile(r'^(\d+(?:\.\d+)?)([KMGTP]?)$', re.IGNORECASE)
+
+
+def join_path(root: str, rel: str) -> str:
+    """拼接 rclone 路径（remote:path 或本地路径）与相对路径。"""
+    if not rel:
+        return root
+    if root.endswith((':', '/', '\\')):
+        return root + rel
+    return f'{root}/{rel}'
+
+
+def list_dirs(rclone: RClone, root: str, depth: int, excludes: Iterable[str] = (),
+              cancelled: Optional[Callable[[], bool]] = None) -> Tuple[Optional[Set[str]], str]:
+    """列出 root 下深度不超过 depth 的全部目录（相对路径）。
+
+    Returns:
+        (目录集合, 错误信息)；失败或取消时集合为 None
+    """
+    stream = rclone.lsjson_stream(root, recursive=True, dirs_only=True, max_depth=depth,
+                                  excludes=list(excludes), no_mimetype=True, no_modtime=True)
+    dirs: Set[str] = set()
+    for batch in stream:
+        if cancelled is not None and cancelled():
+            stream.cancel()
+            return None, '操作已取消'
+        for entry in batch:
+            path = entry.get('Path', '')
+            if path:
+                dirs.add(path)
+    if not stream.success:
+        return None, stream.error
+    return dirs, ''
+
+
+def shard_dirs(dirs: Iterable[str], depth: int) -> List[str]:
+    """取恰好位于 depth 层的目录作为分片。"""
+    return sorted(d for d in dirs if d.count('/') == depth - 1)
+
+
+def dirs_to_purge(source_dirs: Set[str], dest_dirs: Set[str]) -> List[str]:
+    """目标端有、源端没有的目录；父目录已在列表中的子目录不再重复列出。"""
+    missing = sorted(dest_dirs - source_dirs)
+    result: List[str] = []
+    for path in missing:
+        if not any(path.startswith(parent + '/') for parent in result):
+            result.append(path)
+    return result
+
+
+def _component_matches(pattern: str, name: str) -> bool:
+    if '{' in pattern:
+        # fnmatch 不支持 {a,b}，保守地视为匹配
+        return True
+    return fnmatch.fnmatchcase(name, pattern)
+
+
+def _rebase_anchored(components: List[str], shard_parts: List[str]) -> Optional[str]:
+    """把以源根目录为基准的锚定规则改写为以分片目录为基准；不可能匹配分片内文件时返回 None。"""
+    for index, part in enumerate(shard_parts):
+        if index >= len(components):
+            return None
+        comp = components[index]
+        if '**' in comp:
+            # ** 可以跨越分片前缀，剩余部分保持原样
+            return '/' + '/'.join(components[index:])
+        if not _component_matches(comp, part):
+            return None
+    rest = components[len(shard_parts):]
+    return '/' + '/'.join(rest) if rest else None
+
+
+def shard_excludes(patterns: Iterable[str], shard: str) -> List[str]:
+    """把任务的排除规则改写为以分片目录为根时的等价规则。
+
+    - 锚定规则（以 / 开头）按分片前缀改写，与分片无关的规则丢弃；
+    - 含 / 的非锚定规则可能从分片上层开始匹配，额外生成对应的锚定规则；
+    - 不含 / 的规则只匹配文件名，原样保留。
+    """
+    shard_parts = shard.split('/')
+    result: List[str] = []
+
+    def add(rule: Optional[str]):
+        if rule and rule not in result:
+            result.append(rule)
+
+    for pattern in patterns:
+        if pattern.startswith('/'):
+            add(_rebase_anchored(pattern[1:].split('/'), shard_parts))
+            continue
+        add(pattern)
+        if '/' in pattern.rstrip('/'):
+            components = pattern.split('/')
+            for start in range(len(shard_parts)):
+                add(_rebase_anchored(shard_parts[:start] + components, shard_parts))
+    return result
+
+
+def split_bwlimit(limit: str, processes: int) -> str:
+    """把简单的带宽限制平均分给并发进程；时间表等复杂格式原样返回。"""
+    match = _BWLIMIT_RE.match(limit.strip())
+    if not match or processes <= 1:
+        return limit
+    value = float(match.group(1)) / processes
+    unit = match.group(2) or 'B'
+    # 除不尽时换算到更小的单位，避免出现小数
+    units = 'BKMGTP'
+    index = units.index(unit.upper())
+    while index > 0 and value != int(value):
+        value *= 1024
+        index -= 1
+    return f'{max(1, int(value))}{units[index] if index else "B"}'
+
+
+def aggregate_stats(snapshots: Iterable[TransferStats], elapsed: float) -> TransferStats:
+    """合并多个 rclone 进程的统计快照。"""
+    total = TransferStats(elapsed=elapsed)
+    errors = []
+    for stats in snapshots:
+        total.bytes += stats.bytes
+        total.total_bytes += stats.total_bytes
+        total.transfers += stats.transfers
+        total.total_transfers += stats.total_transfers
+        total.checks += stats.checks
+        total.total_checks += stats.total_checks
+        total.errors += stats.errors
+        total.deletes += stats.deletes
+        total.retries += stats.retries
+        total.speed += stats.speed
+        total.transferring.extend(stats.transferring)
+        if stats.last_error:
+            errors.append(stats.last_error)
+    if errors:
+        total.last_error = errors[-1]
+    if total.speed > 0 and total.total_bytes > total.bytes:
+        total.eta = int((total.total_bytes - total.bytes) / total.speed)
+    return total
+
+
+class ProcessSlots:
+    """全部分片任务共享的 rclone 进程额度。上限每次申请时重新读取，设置修改后立即生效。"""
+
+    def __init__(self, limit: Optional[Callable[[], int]] = None):
+        self._limit = limit or (lambda: int(cfg.maxShardProcesses.value))
+        self._cond = threading.Condition()
+        self.in_use = 0
+
+    def acquire(self, cancelled: Optional[Callable[[], bool]] = None) -> bool:
+        """等待空闲额度；取消时返回 False。"""
+        with self._cond:
+            while self.in_use >= max(1, self._limit()):
+                if cancelled is not None and cancelled():
+                    return False
+                self._cond.wait(0.2)
+            if cancelled is not None and cancelled():
+                return False
+            self.in_use += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.in_use = max(0, self.in_use - 1)
+            self._cond.notify_all()
+
+
+_slots: Optional[ProcessSlots] = None
+_slots_lock = threading.Lock()
+
+
+def get_process_slots() -> ProcessSlots:
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = ProcessSlots()
+        return _slots
@@ -0,0 +1,112 @@
+"""
+存储空间分析模块（类似 ncdu）。
+
+流式读取 ``lsjson --recursive`` 的输出，把文件大小和数量累加到所在目录
+及其全部上级目录。树只为目录建立节点，各字段保存在按节点编号索引的
+array 中，子节点用 first_child / next_sibling 链接，因此内存只与目录数
+成正比，而与文件数无关；树在抓取过程中逐批增长。后台线程写入时持有
+``lock``，界面读取子节点列表时也应持有它；新节点的各字段总是先于它被
+链接到父节点之前追加，因此经由 children() 得到的编号一定可以安全索引。
+"""
+
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+ROOT = 0
+
+
+class DirTree:
+    """目录大小汇总树。节点 0 为分析的根目录。"""
+
+    def __init__(self):
+        self.names: List[str] = ['']
+        self.parents = array('l', [-1])
+        self.first_child = array('l', [-1])
+        self.next_sibling = array('l', [-1])
+        # 含全部子目录的合计
+        self.sizes = array('q', [0])
+        self.files = array('q', [0])
+        # 仅直接位于该目录下的文件
+        self.own_sizes = array('q', [0])
+        self.own_files = array('q', [0])
+        self._index: Dict[str, int] = {'': ROOT}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def total_size(self) -> int:
+        return self.sizes[ROOT]
+
+    @property
+    def total_files(self) -> int:
+        return self.files[ROOT]
+
+    def find(self, path: str) -> Optional[int]:
+        return self._index.get(path.strip('/'))
+
+    def _ensure_dir(self, path: str) -> int:
+        node = self._index.get(path)
+        if node is not None:
+            return node
+        parent_path, _, name = path.rpartition('/')
+        parent = self._ensure_dir(parent_path)
+        node = len(self.names)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.first_child.append(-1)
+        self.next_sibling.append(self.first_child[parent])
+        self.sizes.append(0)
+        self.files.append(0)
+        self.own_sizes.append(0)
+        self.own_files.append(0)
+        # 所有字段就绪后才链接到父节点，读取方不会看到未完成的节点
+        self.first_child[parent] = node
+        self._index[path] = node
+        return node
+
+    def add_entries(self, entries: Iterable[dict]):
+        """累加一批 lsjson 条目（Path 相对于分析根目录）。"""
+        with self.lock:
+            self._add_entries(entries)
+
+    def _add_entries(self, entries: Iterable[dict]):
+        parents, sizes, files = self.parents, self.sizes, self.files
+        for entry in entries:
+            path = entry.get('Path') or entry.get('Name', '')
+            if not path:
+                continue
+            if entry.get('IsDir'):
+                self._ensure_dir(path)
+                continue
+            node = self._ensure_dir(path.rpartition('/')[0])
+            # 部分存储返回 -1 表示大小未知
+            size = entry.get('Size', 0) or 0
+            if size < 0:
+                size = 0
+            self.own_sizes[node] += size
+            self.own_files[node] += 1
+            while node >= 0:
+                sizes[node] += size
+                files[node] += 1
+                node = parents[node]
+
+    def children(self, node: int) -> List[int]:
+        result = []
+        child = self.first_child[node]
+        while child >= 0:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def path(self, node: int) -> str:
+        parts = []
+        while node > ROOT:
+            parts.append(self.names[node])
+            node = self.parents[node]
+        return '/'.join(reversed(parts))
+
+    def largest(self, node: int = ROOT, limit: int = 10) -> List[int]:
+        return sorted(self.children(node), key=lambda c: self.sizes[c], reverse=True)[:limit]
@@ -2,21 +2,36 @@ import json
 import os
 import re
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from threading import Lock
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
 from PySide6.QtCore import QObject, Signal, QThread, QTimer
 
 from .rclone import RClone
+from .auto_tuner import AutoTuner, DEFAULT_TRANSFERS, RunSample
+from .fs_watcher import DirectoryWatcher, ChangeSet, MAX_FILES
+from .hash_cache import compare_hashes, get_hash_cache
+from .rclone_stats import StatsDecoder, TransferStats
+from .run_history import RunHistory, RunRecord, recorded_flags
+from .run_queue import RunPriority, RunQueue, task_remotes
 from .scheduler import SyncScheduler
-from ..common.config import APP_PATH
+from .sharded_sync import (ProcessSlots, aggregate_stats, dirs_to_purge, get_process_slots, join_path,
+                           list_dirs, shard_dirs, shard_excludes, split_bwlimit)
+from .sync_planner import SyncPlan
+from ..common.config import APP_PATH, cfg
 from ..common.logger import get_logger
 from ..common.signal_bus import signalBus
 from ..models.sync_task import SyncMode, SyncStatus, SyncTask
 
 logger = get_logger('sync_manager')
 
+# 哈希预筛选依次尝试的哈希类型，取目标端支持的第一个
+PRECHECK_HASHES = ('md5', 'sha1')
+
 
 class SyncWorker(QThread):
     started = Signal(str)
@@ -31,47 +46,72 @@ class SyncWorker(QThread):
     _SPEED_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(KiB|MiB|GiB)/s')
     _ETA_RE = re.compile(r'ETA\s*(\S+)')
 
-    def __init__(self, rclone: RClone, task: SyncTask):
+    def __init__(self, rclone: RClone, task: SyncTask, files: Optional[List[str]] = None,
+                 checksum: bool = False):
         super().__init__()
         self.rclone = rclone
         self.task = task
+        # 非空时只传输这些文件（相对于源路径）
+        self.files = files
+        # 文件列表按哈希判定差异时，传输也要按哈希比较，否则大小和修改时间相同的变化会被跳过
+        self.checksum = checksum
+        # 由目录监视触发的运行只覆盖部分文件，不能作为增量复制的起点
+        self.partial = bool(files)
         self._cancelled = False
         self._process = None
+        self._stats = StatsDecoder()
+        self.started_at: Optional[datetime] = None
+        self.full_pass = True
+        # 本次运行实际使用的 --transfers，供自动调优记录
+        self.transfers = task.transfers if task.transfers > 0 else DEFAULT_TRANSFERS
+        self._files_from: Optional[str] = None
+        # 运行历史记录的返回码、所用参数和峰值速度
+        self.return_code: Optional[int] = None
+        self.flags: List[str] = []
+        self.peak_speed = 0.0
 
     def run(self):
+        self.started_at = datetime.now()
         self.started.emit(self.task.id)
 
-        cmd = [self.rclone.rclone_path]
-
-        if self.rclone.config_path:
-            cmd.extend(['--config', self.rclone.config_path])
-
-        cmd.extend([
-            '--progress',
-            '--stats-one-line',
-            '--stats=1s',
-        ])
-
-        if self.task.bandwidth_limit:
-            cmd.extend(['--bwlimit', self.task.bandwidth_limit])
-        if self.task.dry_run:
-            cmd.append('--dry-run')
-        if self.task.delete_excluded:
-            cmd.append('--delete-excluded')
-
-        for pattern in self.task.exclude_patterns:
-            cmd.extend(['--exclude', pattern])
-
-        if self.task.mode == SyncMode.SYNC:
-            cmd.extend(['sync', self.task.source, self.task.destination])
-        elif self.task.mode == SyncMode.COPY:
-            cmd.extend(['copy', self.task.source, self.task.destination])
-        elif self.task.mode == SyncMode.MOVE:
-            cmd.extend(['move', self.task.source, self.task.destination])
-        else:
-            cmd.extend(['bisync', self.task.source, self.task.destination])
+        if not self.files and self.task.hash_precheck:
+            candidates = self._hash_precheck()
+            if self._cancelled:
+                self.finished.emit(self.task.id, False, "已取消")
+                return
+            if candidates is not None:
+                if not candidates:
+                    logger.info(f'哈希比对无差异，跳过传输: {self.task.name}')
+                    self.finished.emit(self.task.id, True, "无需传输")
+                    return
+                self.files = candidates
+                self.checksum = True
+
+        cmd = [self.rclone.rclone_path] + self._global_args() + self._window_args()
 
         try:
+            if self.files:
+                # 定向运行：只列出变化的文件，不遍历目标；SYNC 任务退化为 copy，删除留给完整运行
+                self._files_from = self._write_files_from(self.files)
+                cmd.extend(['--files-from', self._files_from])
+                if len(self.files) <= MAX_FILES:
+                    # 文件较多时逐个查询目标反而比列出目标目录慢
+                    cmd.append('--no-traverse')
+                if self.checksum:
+                    cmd.append('--checksum')
+                verb = 'move' if self.task.mode == SyncMode.MOVE else 'copy'
+                cmd.extend([verb, self.task.source, self.task.destination])
+                logger.info(f'定向{verb}: {self.task.name}, {len(self.files)} 个文件')
+            elif self.task.mode == SyncMode.SYNC:
+                cmd.extend(['sync', self.task.source, self.task.destination])
+            elif self.task.mode == SyncMode.COPY:
+                cmd.extend(['copy', self.task.source, self.task.destination])
+            elif self.task.mode == SyncMode.MOVE:
+                cmd.extend(['move', self.task.source, self.task.destination])
+            else:
+                cmd.extend(['bisync', self.task.source, self.task.destination])
+            self.flags = recorded_flags(cmd[1:-3])
+
             self._process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
@@ -94,6 +134,7 @@ class SyncWorker(QThread):
                 self._parse_progress(line.strip())
 
             return_code = self._process.wait()
+            self.return_code = return_code
             success = return_code == 0
 
             if self._cancelled:
@@ -102,17 +143,161 @@ class SyncWorker(QThread):
                 message = "完成"
             else:
                 message = f"失败 (返回码: {return_code})"
+                if self._stats.last_error:
+                    message += f": {self._stats.last_error}"
 
             self.finished.emit(self.task.id, success and not self._cancelled, message)
 
         except Exception as e:
             self.finished.emit(self.task.id, False, str(e))
+        finally:
+            if self._files_from:
+                try:
+                    os.remove(self._files_from)
+                except OSError:
+                    pass
+                self._files_from = None
+
+    def _global_args(self, excludes: Optional[List[str]] = None, bwlimit: Optional[str] = None,
+                     track_renames: Optional[bool] = None) -> List[str]:
+        """子命令和路径以外的公共参数。"""
+        args = []
+        if self.rclone.config_path:
+            args.extend(['--config', self.rclone.config_path])
+
+        # 统计信息以 JSON 日志输出，由 StatsDecoder 解析
+        args.extend([
+            '--use-json-log',
+            '--stats=1s',
+            '--stats-log-level', 'NOTICE',
+        ])
+
+        bwlimit = self.task.bandwidth_limit if bwlimit is None else bwlimit
+        if bwlimit:
+            args.extend(['--bwlimit', bwlimit])
+        if self.task.dry_run:
+            args.append('--dry-run')
+        if self.task.delete_excluded:
+            args.append('--delete-excluded')
+        if self.task.transfers > 0:
+            args.extend(['--transfers', str(self.task.transfers)])
+        if self.task.checkers > 0:
+            args.extend(['--checkers', str(self.task.checkers)])
+        if self.task.multi_thread_streams > 0:
+            args.extend(['--multi-thread-streams', str(self.task.multi_thread_streams)])
+
+        for pattern in self.task.exclude_patterns if excludes is None else excludes:
+            args.extend(['--exclude', pattern])
+
+        # --track-renames 只能用于完整的 sync
+        if track_renames is None:
+            track_renames = self.task.mode == SyncMode.SYNC and not self.files
+        args.extend(self.task.perf.to_args(track_renames=track_renames))
+        return args
+
+    def _window_args(self) -> List[str]:
+        """增量复制的 --max-age 参数，同时确定本次是否算作完整运行。"""
+        window = None if self.files else self.task.incremental_window(self.started_at)
+        self.full_pass = window is None and not self.partial
+        if window is None:
+            return []
+        # 增量复制：源端只列出时间窗内修改过的文件
+        args = ['--max-age', f'{int(window.total_seconds())}s']
+        if self.task.no_traverse:
+            args.append('--no-traverse')
+        logger.info(f'增量复制: {self.task.name}, --max-age {int(window.total_seconds())}s')
+        return args
+
+    def run_sample(self) -> Optional[RunSample]:
+        """本次运行的测量结果；没有统计输出时返回 None。"""
+        if self._stats.last is None:
+            return None
+        return RunSample.from_stats(self.transfers, self._stats.last, self._stats.throttled > 0)
+
+    def run_record(self, success: bool, message: str) -> RunRecord:
+        """整理本次运行的历史记录。"""
+        stats = self._stats.last or TransferStats()
+        finished_at = datetime.now()
+        started_at = self.started_at or finished_at
+        seconds = stats.transfer_time or stats.elapsed or (finished_at - started_at).total_seconds()
+        return RunRecord(
+            task_id=self.task.id,
+            task_name=self.task.name,
+            mode=self.task.mode.value,
+            started_at=started_at,
+            finished_at=finished_at,
+            success=success,
+            bytes=stats.bytes,
+            files=stats.transfers,
+            checks=stats.checks,
+            errors=stats.errors,
+            avg_speed=stats.bytes / seconds if seconds > 0 else 0.0,
+            peak_speed=max(self.peak_speed, stats.speed),
+            exit_code=self.return_code,
+            dry_run=self.task.dry_run,
+            message=message,
+            flags=list(self.flags),
+        )
+
+    def _hash_precheck(self) -> Optional[List[str]]:
+        """用本地哈希缓存与目标端哈希比对，返回需要传输的文件；无法比对时返回 None。"""
+        source, destination = self.task.source, self.task.destination
+        if (self.task.mode != SyncMode.COPY or task_remotes(source) != frozenset({'local'})
+                or not os.path.isdir(source)):
+            logger.debug(f'任务 {self.task.name} 不适用哈希预筛选')
+            return None
+        cache = get_hash_cache()
+        cancelled = lambda: self._cancelled
+        excludes = self.task.exclude_patterns
+        try:
+            for algorithm in PRECHECK_HASHES:
+                if task_remotes(destination) == frozenset({'local'}):
+                    ok, remote = True, cache.update(destination, algorithm, cancelled=cancelled,
+                                                    excludes=excludes)
+                else:
+                    ok, remote = self.rclone.hashsum(destination, algorithm)
+                if self._cancelled or remote is None:
+                    return None
+                if not ok:
+                    logger.debug(f'目标端不支持 {algorithm}: {str(remote)[:200]}')
+                    continue
+                local = cache.update(source, algorithm, cancelled=cancelled, excludes=excludes)
+                if local is None:
+                    # 取消，或有源文件无法读取：不完整的哈希会漏掉需要传输的文件
+                    return None
+                comparison = compare_hashes(local, remote)
+                logger.info(f'哈希预筛选 ({algorithm}): {self.task.name}, 相同 {comparison.same}，'
+                            f'不同 {len(comparison.changed)}，目标缺失 {len(comparison.missing)}')
+                return comparison.candidates
+        except Exception as e:
+            logger.warning(f'哈希预筛选失败，改为普通运行: {e}')
+            return None
+        logger.info(f'目标端不支持可比对的哈希，改为普通运行: {self.task.name}')
+        return None
+
+    @staticmethod
+    def _write_files_from(files: Iterable[str]) -> str:
+        fd, path = tempfile.mkstemp(prefix='rclonegui-files-', suffix='.txt')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for name in files:
+                f.write(name + '\n')
+        return path
 
     def _parse_progress(self, line: str):
 
         if not line:
             return
 
+        if StatsDecoder.is_json(line):
+            snapshot = self._stats.feed(line)
+            if snapshot is not None:
+                self.peak_speed = max(self.peak_speed, snapshot.speed)
+                self.progress.emit(self.task.id, snapshot.percentage, snapshot.transfers, snapshot.bytes)
+                self.stats_update.emit(self.task.id, snapshot.to_dict())
+            return
+
+        # 非 JSON 输出（旧版 rclone 或 --stats-one-line 文本）沿用正则解析
+
         stats = {}
         matched = False
 
@@ -152,6 +337,7 @@ class SyncWorker(QThread):
             unit = speed_match.group(2)
             units = {'KiB': 1024, 'MiB': 1024**2, 'GiB': 1024**3}
             stats['speed'] = int(speed * units.get(unit, 1))
+            self.peak_speed = max(self.peak_speed, stats['speed'])
 
         eta_match = self._ETA_RE.search(line)
         if eta_match:
@@ -182,6 +368,204 @@ class SyncWorker(QThread):
                 self._process = None
 
 
+class ShardedSyncWorker(SyncWorker):
+    """分片并行运行：按源目录的子目录拆成多个 rclone 进程并发执行，统计合并后统一上报。"""
+
+    _EMIT_INTERVAL = 0.5
+
+    def __init__(self, rclone: RClone, task: SyncTask, slots: Optional[ProcessSlots] = None):
+        super().__init__(rclone, task)
+        self.slots = slots or get_process_slots()
+        self._stats_lock = Lock()
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._shard_stats: Dict[str, TransferStats] = {}
+        self._running: Set[str] = set()
+        self._shards_done = 0
+        self._shards_total = 0
+        self._last_emit = 0.0
+        self._start = 0.0
+
+    def run_sample(self):
+        # 多进程运行的吞吐不能代表单进程的 --transfers 档位，不参与自动调优
+        return None
+
+    def run(self):
+        if self.task.hash_precheck or self.task.mode == SyncMode.BISYNC:
+            super().run()
+            return
+
+        self.started_at = datetime.now()
+        self._start = time.monotonic()
+        self.started.emit(self.task.id)
+        cancelled = lambda: self._cancelled
+        depth = max(1, self.task.shard_depth)
+
+        try:
+            source_dirs, error = list_dirs(self.rclone, self.task.source, depth,
+                                           self.task.exclude_patterns, cancelled)
+            if self._cancelled:
+                self.finished.emit(self.task.id, False, "已取消")
+                return
+            if source_dirs is None:
+                self.finished.emit(self.task.id, False, f"列出源目录失败: {error.strip()[:200]}")
+                return
+            shards = shard_dirs(source_dirs, depth)
+            if len(shards) < 2:
+                logger.info(f'源目录不足以分片，改为普通运行: {self.task.name}')
+                super().run()
+                return
+
+            processes = max(1, min(self.task.shards, len(shards)))
+            bwlimit = split_bwlimit(self.task.bandwidth_limit, processes)
+            window_args = self._window_args()
+            verb = self.task.mode.value
+            self.flags = recorded_flags(self._global_args(bwlimit=bwlimit) + window_args)
+            self._shards_total = len(shards) + 1
+            logger.info(f'分片{verb}: {self.task.name}, {len(shards)} 个分片 (深度 {depth})，'
+                        f'{processes} 个并发进程')
+
+            failures = []
+            with ThreadPoolExecutor(max_workers=processes, thread_name_prefix='shard') as pool:
+                futures = [pool.submit(self._run_shard, shard, verb, bwlimit, window_args)
+                           for shard in shards]
+                for future in futures:
+                    error = future.result()
+                    if error:
+                        failures.append(error)
+
+            if not self._cancelled:
+                # 分片之间的文件和删除由最后的对账处理
+                error = self._reconcile(verb, depth, source_dirs, bwlimit, window_args)
+                if error:
+                    failures.append(error)
+            self._emit_stats(force=True)
+
+            if self._cancelled:
+                self.finished.emit(self.task.id, False, "已取消")
+            elif failures:
+                self.finished.emit(self.task.id, False,
+                                   f"失败: {len(failures)} 个分片出错，{failures[0]}")
+            else:
+                logger.info(f'分片运行完成: {self.task.name}, 耗时 {time.monotonic() - self._start:.1f}s')
+                self.finished.emit(self.task.id, True, "完成")
+        except Exception as e:
+            self.finished.emit(self.task.id, False, str(e))
+
+    def _run_shard(self, shard: str, verb: str, bwlimit: str, window_args: List[str]) -> str:
+        if not self.slots.acquire(lambda: self._cancelled):
+            return ''
+        try:
+            cmd = [self.rclone.rclone_path]
+            cmd.extend(self._global_args(excludes=shard_excludes(self.task.exclude_patterns, shard),
+                                         bwlimit=bwlimit))
+            cmd.extend(window_args)
+            cmd.extend([verb, join_path(self.task.source, shard),
+                        join_path(self.task.destination, shard)])
+            return_code, last_error = self._run_process(shard, cmd)
+        finally:
+            self.slots.release()
+        with self._stats_lock:
+            self._shards_done += 1
+        if return_code != 0 and not self._cancelled:
+            return f'{shard}: {last_error or f"返回码 {return_code}"}'
+        return ''
+
+    def _reconcile(self, verb: str, depth: int, source_dirs: Set[str], bwlimit: str,
+                   window_args: List[str]) -> str:
+        """处理分片深度以内的文件，SYNC 模式下删除源端已不存在的目录。"""
+        cmd = [self.rclone.rclone_path] + self._global_args(bwlimit=bwlimit) + window_args
+        cmd.extend(['--max-depth', str(depth), verb, self.task.source, self.task.destination])
+        return_code, last_error = self._run_process('', cmd)
+        with self._stats_lock:
+            self._shards_done += 1
+        if self._cancelled:
+            return ''
+        if return_code != 0:
+            return f'根目录: {last_error or f"返回码 {return_code}"}'
+        if self.task.mode != SyncMode.SYNC:
+            return ''
+
+        dest_dirs, error = list_dirs(self.rclone, self.task.destination, depth,
+                                     self.task.exclude_patterns, lambda: self._cancelled)
+        if dest_dirs is None:
+            return '' if self._cancelled else f'列出目标目录失败: {error.strip()[:200]}'
+        for rel in dirs_to_purge(source_dirs, dest_dirs):
+            path = join_path(self.task.destination, rel)
+            if self.task.dry_run:
+                logger.info(f'[预览] 将删除目标目录: {path}')
+                continue
+            logger.info(f'删除源端已不存在的目录: {path}')
+            result = self.rclone.purge(path)
+            if not result.success:
+                return f'{rel}: {result.stderr.strip()[:200]}'
+        return ''
+
+    def _run_process(self, key: str, cmd: List[str]):
+        """运行一个 rclone 进程并把统计合并到总进度，返回 (返回码, 最近错误)。"""
+        decoder = StatsDecoder()
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            universal_newlines=True,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        with self._stats_lock:
+            self._processes[key] = process
+            self._running.add(key)
+        try:
+            if self._cancelled:
+                process.terminate()
+            for line in iter(process.stderr.readline, ''):
+                snapshot = decoder.feed(line.strip())
+                if snapshot is not None:
+                    with self._stats_lock:
+                        self._shard_stats[key] = snapshot
+                    self._emit_stats()
+            return_code = process.wait()
+        finally:
+            with self._stats_lock:
+                self._processes.pop(key, None)
+                self._running.discard(key)
+        with self._stats_lock:
+            # 记录最严重的返回码
+            self.return_code = max(self.return_code or 0, return_code)
+        return return_code, decoder.last_error
+
+    def _emit_stats(self, force: bool = False):
+        now = time.monotonic()
+        with self._stats_lock:
+            if not force and now - self._last_emit < self._EMIT_INTERVAL:
+                return
+            self._last_emit = now
+            snapshots = list(self._shard_stats.values())
+            running = sum(self._shard_stats[k].percentage / 100
+                          for k in self._running if k in self._shard_stats)
+            done, total = self._shards_done, max(1, self._shards_total)
+        stats = aggregate_stats(snapshots, now - self._start)
+        self._stats.last = stats
+        self.peak_speed = max(self.peak_speed, stats.speed)
+        # 各分片的总字节数在开始运行后才知道，进度按分片计算
+        percentage = min(100, int((done + running) * 100 / total))
+        self.progress.emit(self.task.id, percentage, stats.transfers, stats.bytes)
+        data = stats.to_dict()
+        data.update(percentage=percentage, shards_done=done, shards_total=total)
+        self.stats_update.emit(self.task.id, data)
+
+    def cancel(self):
+        self._cancelled = True
+        with self._stats_lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            try:
+                process.terminate()
+            except (ProcessLookupError, PermissionError, OSError) as e:
+                logger.debug(f"Failed to terminate process: {e}")
+        super().cancel()
+
+
 class SyncManager(QObject):
 
     taskStatusChanged = Signal(str, SyncStatus)
@@ -197,6 +581,14 @@ class SyncManager(QObject):
         self.workers: Dict[str, SyncWorker] = {}
         self._config_file = APP_PATH / "config" / "sync_tasks.json"
         self._lock = Lock()
+        self.runQueue = RunQueue()
+        self.tuner = AutoTuner()
+        self.history = RunHistory(APP_PATH / "config" / "run_history.sqlite")
+        self._watchers: Dict[str, DirectoryWatcher] = {}
+        # 目录监视发现、尚未运行的变化：文件集合，或 None 表示需要完整运行
+        self._pending_files: Dict[str, Optional[Set[str]]] = {}
+        # 按预览计划运行的任务：计划由 rclone check 按哈希判定差异，传输时也需按哈希比较
+        self._checksum_runs: Set[str] = set()
 
         self.scheduler = SyncScheduler(self)
         self.scheduler.taskDue.connect(self._on_scheduled_task_due)
@@ -228,6 +620,8 @@ class SyncManager(QObject):
             self.tasks[task.id] = task
         self.save_tasks()
         logger.info(f'添加同步任务: {name} ({mode.value})')
+        if task.watch:
+            self.update_watch(task.id)
         return task
 
     def remove_task(self, task_id: str):
@@ -241,11 +635,18 @@ class SyncManager(QObject):
                 worker.cancel()
             with self._lock:
                 del self.tasks[task_id]
+                self._pending_files.pop(task_id, None)
+                self._checksum_runs.discard(task_id)
+            self.update_watch(task_id)
+            self.runQueue.remove(task_id)
+            self.runQueue.finish(task_id)
             self.scheduler.remove_task(task_id)
+            self.history.delete_task(task_id)
             self.save_tasks()
             logger.info(f'删除同步任务: {task_name}')
 
-    def run_task(self, task_id: str) -> bool:
+    def run_task(self, task_id: str, priority: RunPriority = RunPriority.MANUAL) -> bool:
+        """将任务加入运行队列，并发额度允许时立即启动。"""
         with self._lock:
             task = self.tasks.get(task_id)
         if not task:
@@ -256,32 +657,110 @@ class SyncManager(QObject):
             logger.debug(f'任务 {task.name} 已在运行中')
             return False
 
+        # 完整运行会覆盖尚未处理的源目录变化
+        with self._lock:
+            self._pending_files.pop(task_id, None)
+            self._checksum_runs.discard(task_id)
+        return self._enqueue(task, priority)
+
+    def run_plan(self, plan: SyncPlan) -> bool:
+        """按预览计划运行：计划可复用时只传输其中的文件，否则完整运行。"""
+        with self._lock:
+            task = self.tasks.get(plan.task_id)
+        if not task:
+            logger.warning(f'按计划运行失败: 任务 {plan.task_id} 不存在')
+            return False
+        if task.status == SyncStatus.RUNNING:
+            logger.debug(f'任务 {task.name} 已在运行中')
+            return False
+        files = plan.files_for_run()
+        if files is None:
+            logger.info(f'计划不能按文件列表执行，完整运行: {task.name}')
+            return self.run_task(task.id)
+        if not files:
+            logger.info(f'计划中没有需要传输的文件: {task.name}')
+            return False
+        logger.info(f'按计划运行: {task.name}, {len(files)} 个文件')
+        with self._lock:
+            self._pending_files[task.id] = set(files)
+            self._checksum_runs.add(task.id)
+        return self._enqueue(task, RunPriority.MANUAL)
+
+    def _enqueue(self, task: SyncTask, priority: RunPriority) -> bool:
+        task_id = task.id
+        if task_id in self.runQueue:
+            # 已在排队：手动运行可以把定时触发的任务提到前面
+            self.runQueue.push(task_id, task_remotes(task.source, task.destination), priority)
+            logger.debug(f'任务 {task.name} 已在队列中')
+            return False
+
+        self.runQueue.push(task_id, task_remotes(task.source, task.destination), priority)
+        task.status = SyncStatus.QUEUED
+        self.taskStatusChanged.emit(task_id, SyncStatus.QUEUED)
+        self._dispatch()
+        if task.status == SyncStatus.QUEUED:
+            logger.info(f'同步任务排队中: {task.name} (队列位置 {self.runQueue.position(task_id)})')
+        return True
+
+    def _dispatch(self):
+        """按当前并发设置启动队列中可以运行的任务。"""
+        self.runQueue.max_concurrent = max(1, int(cfg.maxConcurrentTasks.value))
+        self.runQueue.per_remote = max(1, int(cfg.perRemoteTasks.value))
+        for task_id in self.runQueue.pop_runnable():
+            with self._lock:
+                task = self.tasks.get(task_id)
+            if task is None:
+                self.runQueue.finish(task_id)
+                continue
+            self._start_worker(task)
+
+    def _start_worker(self, task: SyncTask):
+        task_id = task.id
         logger.info(f'开始同步任务: {task.name} ({task.mode.value})')
         task.status = SyncStatus.RUNNING
         self.taskStatusChanged.emit(task_id, SyncStatus.RUNNING)
 
-        worker = SyncWorker(self.rclone, task)
+        with self._lock:
+            files = self._pending_files.pop(task_id, None)
+            checksum = task_id in self._checksum_runs
+            self._checksum_runs.discard(task_id)
+        self.tuner.prepare(task)
+        if not files and task.shards > 1 and task.mode != SyncMode.BISYNC:
+            worker = ShardedSyncWorker(self.rclone, task)
+        elif files and checksum:
+            worker = SyncWorker(self.rclone, task, sorted(files), checksum=True)
+        else:
+            worker = SyncWorker(self.rclone, task, sorted(files) if files else None)
         worker.started.connect(self._on_task_started)
         worker.progress.connect(self._on_task_progress)
         worker.stats_update.connect(self._on_task_stats_update)
-        worker.finished.connect(self._on_task_finished)
+        worker.finished.connect(
+            lambda tid, success, message, w=worker: self._on_worker_finished(w, tid, success, message))
         with self._lock:
             self.workers[task_id] = worker
         worker.start()
 
-        return True
-
     def cancel_task(self, task_id: str):
+        self.runQueue.remove(task_id)
         with self._lock:
             worker = self.workers.pop(task_id, None)
+            self._pending_files.pop(task_id, None)
+            self._checksum_runs.discard(task_id)
         if worker:
             worker.cancel()
+            # worker 已移出 workers，完成信号到达时不会再记录，这里记录取消的运行
+            self._record_history(worker, False, '已取消')
+        self.runQueue.finish(task_id)
 
         with self._lock:
             task = self.tasks.get(task_id)
         if task:
             task.status = SyncStatus.IDLE
             self.taskStatusChanged.emit(task_id, SyncStatus.IDLE)
+            if task.scheduled:
+                # 取消的运行不会经过 _on_task_finished，否则调度器一直认为它已触发而不再运行
+                self.scheduler.update_last_run(task_id, task.last_run)
+        self._dispatch()
 
     def _on_task_started(self, task_id: str):
         if task_id in self.tasks:
@@ -299,17 +778,34 @@ class SyncManager(QObject):
     def _on_task_stats_update(self, task_id: str, stats: dict):
         self.taskStatsUpdate.emit(task_id, stats)
 
+    def _on_worker_finished(self, worker: SyncWorker, task_id: str, success: bool, message: str):
+        with self._lock:
+            current = self.workers.get(task_id) is worker
+        if not current:
+            # 已取消的运行较晚退出：历史和队列额度已在 cancel_task 中处理，不能影响新的运行
+            logger.debug(f'忽略已取消运行的完成信号: {task_id}')
+            return
+        self._on_task_finished(task_id, success, message)
+
     def _on_task_finished(self, task_id: str, success: bool, message: str):
         try:
             with self._lock:
                 task = self.tasks.get(task_id)
 
+            with self._lock:
+                worker = self.workers.get(task_id)
+
             if task:
                 task.last_run = datetime.now()
 
                 if success:
                     task.status = SyncStatus.COMPLETED
                     task.error_message = None
+                    # 以本次开始时间为下次增量的起点；预览运行不算
+                    if worker is not None and worker.started_at and not worker.partial and not task.dry_run:
+                        task.last_success = worker.started_at
+                        if worker.full_pass:
+                            task.last_full_run = worker.started_at
                     logger.info(f'同步任务完成: {task.name} - {message}')
                 else:
                     task.status = SyncStatus.ERROR
@@ -317,6 +813,13 @@ class SyncManager(QObject):
                     self.taskError.emit(task_id, message)
                     logger.error(f'同步任务失败: {task.name} - {message}')
 
+                if worker is not None and task.auto_tune and not task.dry_run:
+                    sample = worker.run_sample()
+                    if sample is not None:
+                        self.tuner.record(task, sample)
+                if worker is not None:
+                    self._record_history(worker, success, message)
+
                 self.taskStatusChanged.emit(task_id, task.status)
                 self.taskCompleted.emit(task_id, success, message)
                 self.save_tasks()
@@ -326,19 +829,91 @@ class SyncManager(QObject):
 
             with self._lock:
                 self.workers.pop(task_id, None)
+                rerun = task is not None and task_id in self._pending_files
+            self.runQueue.finish(task_id)
+            if rerun:
+                # 运行期间源目录又有变化
+                self._enqueue(task, RunPriority.SCHEDULED)
+            self._dispatch()
         except Exception as e:
             logger.error(f'处理任务完成信号时出错: {e}')
 
+    def _record_history(self, worker: SyncWorker, success: bool, message: str):
+        try:
+            record = worker.run_record(success, message)
+            self.history.add(record)
+            self.history.prune(int(cfg.historyRetentionDays.value), int(cfg.historyMaxRuns.value),
+                               task_id=record.task_id)
+        except Exception as e:
+            logger.warning(f'记录运行历史失败: {e}')
+
     def _on_scheduled_task_due(self, task_id: str):
         try:
             with self._lock:
                 task = self.tasks.get(task_id)
             if task:
                 signalBus.scheduledTaskDue.emit(task_id, task.name)
-                self.run_task(task_id)
+                self.run_task(task_id, RunPriority.SCHEDULED)
         except Exception as e:
             logger.error(f'处理定时任务到期时出错: {e}')
 
+    def update_watch(self, task_id: str):
+        """按任务的 watch 设置启动、重启或停止源目录监视。"""
+        with self._lock:
+            task = self.tasks.get(task_id)
+            watcher = self._watchers.pop(task_id, None)
+        if watcher is not None:
+            watcher.stop()
+            watcher.deleteLater()
+        if task is None or not task.watch:
+            return
+        if task_remotes(task.source) != frozenset({'local'}):
+            logger.warning(f'任务 {task.name} 的源不是本地路径，无法监视')
+            return
+        watcher = DirectoryWatcher(task_id, task.source, parent=self)
+        watcher.changesReady.connect(self._on_watch_changes)
+        if watcher.start():
+            with self._lock:
+                self._watchers[task_id] = watcher
+        else:
+            watcher.deleteLater()
+
+    def is_watching(self, task_id: str) -> bool:
+        with self._lock:
+            return task_id in self._watchers
+
+    def _on_watch_changes(self, task_id: str, changes: ChangeSet):
+        try:
+            with self._lock:
+                task = self.tasks.get(task_id)
+            if task is None:
+                return
+            # 溢出、需要同步删除或无法按文件运行的模式改为完整运行
+            full = (changes.overflow or task.mode == SyncMode.BISYNC
+                    or (changes.deleted and task.mode == SyncMode.SYNC))
+            if not full and not changes.paths:
+                return
+
+            with self._lock:
+                if task_id in self.runQueue and task_id not in self._pending_files:
+                    # 已排队的完整运行会包含这些变化
+                    return
+                pending = self._pending_files.get(task_id, set())
+                if full or pending is None or len(pending) + len(changes.paths) > MAX_FILES:
+                    self._pending_files[task_id] = None
+                else:
+                    self._pending_files[task_id] = pending | changes.paths
+                pending = self._pending_files[task_id]
+
+            if task.status == SyncStatus.RUNNING:
+                logger.debug(f'任务 {task.name} 运行中，结束后再处理源目录变化')
+                return
+            logger.info(f'源目录变化: {task.name}, '
+                        f'{"完整运行" if pending is None else f"{len(pending)} 个文件"}')
+            self._enqueue(task, RunPriority.SCHEDULED)
+        except Exception as e:
+            logger.error(f'处理源目录变化时出错: {e}')
+
     def enable_schedule(self, task_id: str, cron_expression: str) -> bool:
         if task_id not in self.tasks:
             return False
@@ -388,11 +963,19 @@ class SyncManager(QObject):
 
     def shutdown(self):
         with self._lock:
+            queued = [t for t in self.tasks if t in self.runQueue]
             task_ids = list(self.workers.keys())
+        for task_id in queued:
+            self.runQueue.remove(task_id)
         for task_id in task_ids:
             self.cancel_task(task_id)
 
         self.scheduler.stop()
+        with self._lock:
+            watchers = list(self._watchers.values())
+            self._watchers.clear()
+        for watcher in watchers:
+            watcher.stop()
 
     def _initialize_schedules(self):
         scheduled_count = 0
@@ -405,6 +988,12 @@ class SyncManager(QObject):
         if scheduled_count > 0:
             logger.info(f'已初始化 {scheduled_count} 个定时任务')
 
+    def _initialize_watches(self):
+        with self._lock:
+            task_ids = [task.id for task in self.tasks.values() if task.watch]
+        for task_id in task_ids:
+            self.update_watch(task_id)
+
     def load_tasks(self) -> bool:
         if not self._config_file.exists():
             logger.info(f'同步任务文件不存在: {self._config_file}')
@@ -425,6 +1014,7 @@ class SyncManager(QObject):
 
             logger.info(f'已加载 {len(self.tasks)} 个同步任务')
             self._initialize_schedules()
+            self._initialize_watches()
             return True
         except json.JSONDecodeError as e:
             logger.error(f'加载同步任务失败（JSON解析错误）: {e}')
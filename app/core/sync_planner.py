@@ -0,0 +1,199 @@
+"""
+同步预览（计划）模块。
+
+在真正运行大型 SYNC / MOVE 任务之前，用 ``rclone check --combined``
+比对源和目标，把逐文件结果归类为新增 / 更新 / 删除 / 相同，并通过一次
+流式 lsjson 补上各类别的字节数，得到一份 SyncPlan。
+
+界面展示计划后，用户可以直接按计划运行：计划可复用时（没有需要删除的
+文件，且比对没有出错）只把计划中的文件通过 ``--files-from`` 交给
+rclone，省去再次遍历比对；否则退回完整运行。
+"""
+
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from .rclone import RClone
+from ..common.logger import get_logger
+from ..models.sync_task import SyncMode, SyncTask
+
+logger = get_logger('sync_planner')
+
+# rclone check --combined 的行首标记
+_NEW = '+'
+_DELETED = '-'
+_CHANGED = '*'
+_IDENTICAL = '='
+_ERROR = '!'
+
+# rclone 目录不存在的返回码
+_EXIT_DIR_NOT_FOUND = 3
+
+
+@dataclass
+class SyncPlan:
+    """一次预览的结果。路径均相对于任务的源 / 目标路径。"""
+    task_id: str
+    mode: SyncMode
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    identical: int = 0
+    # 仅 MOVE 需要：相同的文件在移动时也会从源端删除
+    identical_files: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    new_bytes: int = 0
+    changed_bytes: int = 0
+    deleted_bytes: int = 0
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def transfer_count(self) -> int:
+        return len(self.new) + len(self.changed)
+
+    @property
+    def transfer_bytes(self) -> int:
+        return self.new_bytes + self.changed_bytes
+
+    @property
+    def is_empty(self) -> bool:
+        """没有任何需要执行的操作。"""
+        if self.mode == SyncMode.MOVE and self.identical_files:
+            return False
+        return not (self.new or self.changed or self.deleted or self.errors)
+
+    def files_for_run(self) -> Optional[List[str]]:
+        """按计划运行时交给 --files-from 的文件；计划不能复用、需要完整运行时返回 None。"""
+        if self.errors or self.mode == SyncMode.BISYNC:
+            return None
+        if self.mode == SyncMode.SYNC and self.deleted:
+            # 按文件列表运行无法删除目标端多余的文件
+            return None
+        files = self.new + self.changed
+        if self.mode == SyncMode.MOVE:
+            files = files + self.identical_files
+        return sorted(files)
+
+
+def parse_combined(lines: Iterable[str], plan: SyncPlan):
+    """把 rclone check --combined 的输出累加到 plan。"""
+    keep_identical = plan.mode == SyncMode.MOVE
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if len(line) < 3 or line[1] != ' ':
+            continue
+        marker, path = line[0], line[2:]
+        if marker == _NEW:
+            plan.new.append(path)
+        elif marker == _CHANGED:
+            plan.changed.append(path)
+        elif marker == _DELETED:
+            plan.deleted.append(path)
+        elif marker == _IDENTICAL:
+            plan.identical += 1
+            if keep_identical:
+                plan.identical_files.append(path)
+        elif marker == _ERROR:
+            plan.errors.append(path)
+
+
+def _sum_sizes(rclone: RClone, remote_path: str, groups: List[Tuple[Set[str], str]],
+               plan: SyncPlan, cancelled: Optional[Callable[[], bool]]) -> Tuple[bool, str]:
+    """流式列出 remote_path，把各组路径的大小累加到 plan 的对应字段。"""
+    stream = rclone.lsjson_stream(remote_path, recursive=True, files_only=True,
+                                  fast_list=True, no_mimetype=True)
+    for batch in stream:
+        if cancelled is not None and cancelled():
+            stream.cancel()
+            break
+        for entry in batch:
+            path = entry.get('Path', '')
+            size = max(0, entry.get('Size', 0) or 0)
+            for paths, attr in groups:
+                if path in paths:
+                    setattr(plan, attr, getattr(plan, attr) + size)
+    return stream.success, stream.error
+
+
+def build_plan(rclone: RClone, task: SyncTask,
+               cancelled: Optional[Callable[[], bool]] = None) -> Tuple[Optional[SyncPlan], str]:
+    """比对任务的源和目标，生成 SyncPlan（阻塞调用，应在后台线程中执行）。
+
+    Returns:
+        (计划, 错误信息)；失败或取消时计划为 None
+    """
+    if task.mode == SyncMode.BISYNC:
+        return None, '双向同步不支持预览'
+    plan = SyncPlan(task_id=task.id, mode=task.mode)
+    # COPY / MOVE 不会处理目标端多余的文件
+    one_way = task.mode != SyncMode.SYNC
+    start = time.monotonic()
+
+    fd, combined_path = tempfile.mkstemp(prefix='rclonegui-plan-', suffix='.txt')
+    os.close(fd)
+    try:
+        result = rclone.check_combined(task.source, task.destination, combined_path,
+                                       one_way=one_way, excludes=task.exclude_patterns,
+                                       cancelled=cancelled)
+        with open(combined_path, encoding='utf-8', errors='replace') as f:
+            parse_combined(f, plan)
+    finally:
+        try:
+            os.remove(combined_path)
+        except OSError:
+            pass
+
+    if cancelled is not None and cancelled():
+        return None, '操作已取消'
+    missing_dest = result.return_code == _EXIT_DIR_NOT_FOUND and not (
+        plan.new or plan.changed or plan.identical)
+    # 有差异时 rclone check 同样返回非 0，只要写出了比对结果就视为完成
+    compared = result.success or 'differences found' in result.stderr or (
+        plan.new or plan.changed or plan.deleted or plan.identical)
+    if not compared and not missing_dest:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else \
+            f'比对失败 (返回码: {result.return_code})'
+        logger.warning(f'[预览] {task.name} 比对失败: {error[:300]}')
+        return None, error
+
+    if missing_dest:
+        # 目标目录尚不存在：源端的全部文件都是新增
+        plan.errors = []
+        stream = rclone.lsjson_stream(task.source, recursive=True, files_only=True,
+                                      fast_list=True, no_mimetype=True)
+        for batch in stream:
+            if cancelled is not None and cancelled():
+                stream.cancel()
+                break
+            for entry in batch:
+                plan.new.append(entry.get('Path', ''))
+                plan.new_bytes += max(0, entry.get('Size', 0) or 0)
+        if not stream.success and not stream.cancelled:
+            # 不存在的是源目录
+            return None, stream.error
+        ok, error = True, ''
+    else:
+        groups = []
+        if plan.new:
+            groups.append((set(plan.new), 'new_bytes'))
+        if plan.changed:
+            groups.append((set(plan.changed), 'changed_bytes'))
+        ok, error = True, ''
+        if groups:
+            ok, error = _sum_sizes(rclone, task.source, groups, plan, cancelled)
+        if ok and plan.deleted:
+            ok, error = _sum_sizes(rclone, task.destination,
+                                   [(set(plan.deleted), 'deleted_bytes')], plan, cancelled)
+    if cancelled is not None and cancelled():
+        return None, '操作已取消'
+    if not ok:
+        # 大小只是估计，列表失败不影响计划本身
+        logger.warning(f'[预览] {task.name} 统计大小失败: {error[:200]}')
+
+    logger.info(f'[预览] {task.name}: 新增 {len(plan.new)}，更新 {len(plan.changed)}，'
+                f'删除 {len(plan.deleted)}，相同 {plan.identical}，错误 {len(plan.errors)}，'
+                f'耗时 {time.monotonic() - start:.1f}s')
+    return plan, ''
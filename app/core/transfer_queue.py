@@ -0,0 +1,357 @@
+"""
+文件浏览器的并行传输队列。
+
+上传/下载请求先拆成 TransferItem，再按 (源父目录, 目标目录) 分组：
+同组的多个文件合并为一次 ``rclone copy <父目录> <目标> --files-from``，
+目录仍然各自单独复制。多个分组作业按配置的并发数同时运行，
+通过 ``--use-json-log`` 输出解析每个文件的进度和结果，失败的文件
+会重新分组后重试。
+"""
+
+import json
+import ntpath
+import os
+import subprocess
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from .rclone import RClone
+from ..common.config import cfg
+from ..common.logger import get_logger
+
+logger = get_logger('transfer_queue')
+
+
+class TransferState(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class TransferItem:
+    source: str
+    dest: str
+    is_dir: bool = False
+    size: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    state: TransferState = TransferState.PENDING
+    bytes_done: int = 0
+    attempts: int = 0
+    error: str = ''
+
+    @property
+    def name(self) -> str:
+        return split_parent(self.source)[1]
+
+    @property
+    def progress(self) -> int:
+        if self.state == TransferState.DONE:
+            return 100
+        if self.size <= 0:
+            return 0
+        return min(100, int(self.bytes_done * 100 / self.size))
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (TransferState.DONE, TransferState.FAILED, TransferState.CANCELLED)
+
+
+def split_parent(path: str) -> Tuple[str, str]:
+    """拆分为 (父目录, 名称)，同时支持 ``remote:a/b`` 和本地路径。"""
+    name, sep, rest = path.partition(':')
+    is_remote = sep and len(name) > 1 and '/' not in name and '\\' not in name
+    if is_remote:
+        rest = rest.rstrip('/')
+        parent, _, base = rest.rpartition('/')
+        return f'{name}:{parent}', base
+    module = ntpath if '\\' in path else os.path
+    return module.dirname(path), module.basename(path)
+
+
+@dataclass
+class TransferJob:
+    """一次 rclone 调用：目录单独复制，文件按父目录合并为 --files-from。"""
+    source: str
+    dest: str
+    items: List[TransferItem]
+    is_dir: bool = False
+
+
+def group_items(items: List[TransferItem]) -> List[TransferJob]:
+    jobs: List[TransferJob] = []
+    groups: Dict[Tuple[str, str], TransferJob] = {}
+    for item in items:
+        if item.is_dir:
+            jobs.append(TransferJob(item.source, item.dest, [item], is_dir=True))
+            continue
+        parent = split_parent(item.source)[0]
+        job = groups.get((parent, item.dest))
+        if job is None:
+            job = groups[(parent, item.dest)] = TransferJob(parent, item.dest, [])
+            jobs.append(job)
+        job.items.append(item)
+    return jobs
+
+
+class TransferJobWorker(QThread):
+    itemProgress = Signal(str, int)
+    itemFinished = Signal(str, bool, str)
+    finished = Signal(bool)
+
+    def __init__(self, rclone: RClone, job: TransferJob, transfers: Optional[int] = None):
+        super().__init__()
+        self.rclone = rclone
+        self.job = job
+        # None 时使用 rclone 默认的 --transfers
+        self.transfers = transfers
+        self._cancelled = False
+        self._process = None
+
+    def build_command(self, files_from: Optional[str]) -> List[str]:
+        # 重试交给队列处理，rclone 自身只尝试一次
+        options = dict(
+            use_json_log=True,
+            log_level='INFO',
+            stats='1s',
+            stats_log_level='NOTICE',
+            transfers=self.transfers,
+            retries=1,
+        )
+        if files_from:
+            options['files_from_raw'] = files_from
+            options['no_traverse'] = True
+        return self.rclone._build_command('copy', self.job.source, self.job.dest, **options)
+
+    def run(self):
+        files_from = None
+        if not self.job.is_dir:
+            fd, files_from = tempfile.mkstemp(prefix='rclonegui-files-', suffix='.txt')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for item in self.job.items:
+                    f.write(item.name + '\n')
+
+        by_name = {item.name: item for item in self.job.items}
+        pending = set(by_name)
+        last_error = ''
+        try:
+            self._process = subprocess.Popen(
+                self.build_command(files_from),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+            for line in self._process.stderr:
+                if self._cancelled:
+                    self._process.terminate()
+                    break
+                error = self._handle_log_line(line, by_name, pending)
+                if error:
+                    last_error = error
+            return_code = self._process.wait()
+        except OSError as e:
+            return_code = -1
+            last_error = str(e)
+        finally:
+            if files_from:
+                try:
+                    os.remove(files_from)
+                except OSError:
+                    pass
+
+        if self._cancelled:
+            self.finished.emit(False)
+            return
+
+        success = return_code == 0
+        message = '' if success else (last_error or f'返回码: {return_code}')
+        for name in list(pending):
+            self.itemFinished.emit(by_name[name].id, success, message)
+        self.finished.emit(success)
+
+    def _handle_log_line(self, line: str, by_name: Dict[str, TransferItem], pending: set) -> str:
+        """解析一行 JSON 日志，返回其中的错误信息（如有）。"""
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return ''
+        if not isinstance(record, dict):
+            return ''
+
+        stats = record.get('stats')
+        if isinstance(stats, dict):
+            if self.job.is_dir:
+                self.itemProgress.emit(self.job.items[0].id, int(stats.get('bytes', 0)))
+            for entry in stats.get('transferring') or []:
+                item = by_name.get(entry.get('name'))
+                if item is not None:
+                    self.itemProgress.emit(item.id, int(entry.get('bytes', 0)))
+            return ''
+
+        name = record.get('object', '')
+        msg = record.get('msg', '')
+        level = record.get('level', '')
+        item = by_name.get(name)
+        if level == 'error':
+            if item is not None and name in pending:
+                pending.discard(name)
+                self.itemFinished.emit(item.id, False, msg)
+            return msg
+        if item is not None and name in pending and msg.startswith('Copied'):
+            pending.discard(name)
+            self.itemFinished.emit(item.id, True, '')
+        return ''
+
+    def cancel(self):
+        self._cancelled = True
+        if self._process is not None and self._process.poll() is None:
+            try:
+                self._process.terminate()
+            except OSError:
+                pass
+
+
+class TransferQueue(QObject):
+    """管理等待中和运行中的传输作业。
+
+    Signals:
+        itemAdded(TransferItem), itemChanged(TransferItem)
+        jobFinished(str): 作业完成后发出其目标路径
+        allFinished(int, int): 队列清空时发出 (成功数, 失败数)
+    """
+
+    itemAdded = Signal(object)
+    itemChanged = Signal(object)
+    jobFinished = Signal(str)
+    allFinished = Signal(int, int)
+
+    def __init__(self, rclone: RClone, cache=None, max_concurrent: Optional[int] = None,
+                 max_retries: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.rclone = rclone
+        self.cache = cache
+        self._max_concurrent = max_concurrent
+        self._max_retries = max_retries
+        self.items: Dict[str, TransferItem] = {}
+        self._pending_jobs: List[TransferJob] = []
+        self._workers: List[TransferJobWorker] = []
+        self._retry_items: List[TransferItem] = []
+
+    @property
+    def max_concurrent(self) -> int:
+        if self._max_concurrent is not None:
+            return self._max_concurrent
+        return max(1, int(cfg.transferConcurrency.value))
+
+    @property
+    def max_retries(self) -> int:
+        if self._max_retries is not None:
+            return self._max_retries
+        return max(0, int(cfg.transferRetries.value))
+
+    def enqueue(self, items: List[TransferItem]):
+        for item in items:
+            self.items[item.id] = item
+            self.itemAdded.emit(item)
+        jobs = group_items(items)
+        logger.info(f'[传输] 加入 {len(items)} 个项目，合并为 {len(jobs)} 个作业')
+        self._pending_jobs.extend(jobs)
+        self._pump()
+
+    def is_active(self) -> bool:
+        return bool(self._workers or self._pending_jobs)
+
+    def _pump(self):
+        while self._pending_jobs and len(self._workers) < self.max_concurrent:
+            job = self._pending_jobs.pop(0)
+            # 作业并发数只限制同时运行的 rclone 进程，不套用到每个进程的 --transfers
+            worker = TransferJobWorker(self.rclone, job)
+            worker.itemProgress.connect(self._on_item_progress)
+            worker.itemFinished.connect(self._on_item_finished)
+            worker.finished.connect(lambda ok, w=worker: self._on_job_finished(w))
+            for item in job.items:
+                item.state = TransferState.RUNNING
+                item.attempts += 1
+                self.itemChanged.emit(item)
+            self._workers.append(worker)
+            worker.start()
+
+    def _on_item_progress(self, item_id: str, bytes_done: int):
+        item = self.items.get(item_id)
+        if item is not None and not item.finished:
+            item.bytes_done = bytes_done
+            self.itemChanged.emit(item)
+
+    def _on_item_finished(self, item_id: str, success: bool, error: str):
+        item = self.items.get(item_id)
+        if item is None or item.finished:
+            return
+        if success:
+            item.state = TransferState.DONE
+            item.bytes_done = item.size
+            item.error = ''
+        elif item.attempts <= self.max_retries:
+            logger.warning(f'[传输] {item.name} 失败，准备重试 ({item.attempts}/{self.max_retries}): {error}')
+            item.state = TransferState.PENDING
+            item.error = error
+            self._retry_items.append(item)
+        else:
+            logger.error(f'[传输] {item.name} 失败: {error}')
+            item.state = TransferState.FAILED
+            item.error = error
+        self.itemChanged.emit(item)
+
+    def _on_job_finished(self, worker: TransferJobWorker):
+        if worker in self._workers:
+            self._workers.remove(worker)
+        job = worker.job
+        for item in job.items:
+            # 被取消或未收到结果的条目（等待重试的条目状态已回到 PENDING）
+            if item.state == TransferState.RUNNING:
+                item.state = TransferState.CANCELLED if worker._cancelled else TransferState.FAILED
+                self.itemChanged.emit(item)
+        worker.deleteLater()
+
+        if self.cache is not None:
+            self.cache.invalidate_for_operation(('copy', job.source, job.dest))
+        self.jobFinished.emit(job.dest)
+
+        if self._retry_items:
+            retry, self._retry_items = self._retry_items, []
+            self._pending_jobs.extend(group_items(retry))
+        self._pump()
+
+        if not self.is_active():
+            states = [item.state for item in self.items.values()]
+            self.allFinished.emit(states.count(TransferState.DONE), states.count(TransferState.FAILED))
+
+    def cancel_all(self):
+        for job in self._pending_jobs:
+            for item in job.items:
+                item.state = TransferState.CANCELLED
+                self.itemChanged.emit(item)
+        self._pending_jobs.clear()
+        self._retry_items.clear()
+        for worker in list(self._workers):
+            worker.cancel()
+
+    def clear_finished(self) -> List[str]:
+        removed = [item_id for item_id, item in self.items.items() if item.finished]
+        for item_id in removed:
+            del self.items[item_id]
+        return removed
+
+    def shutdown(self):
+        self.cancel_all()
+        for worker in list(self._workers):
+            worker.wait(3000)
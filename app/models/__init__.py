@@ -1,3 +1,4 @@
 from .remote import Remote
 from .mount import Mount
 from .sync_task import SyncTask
+from .perf_profile import PerfProfile
@@ -0,0 +1,102 @@
+"""
+同步任务的 rclone 性能参数配置。
+
+PerfProfile 汇总影响同步速度的 rclone 参数（--fast-list、--buffer-size、
+--multi-thread-cutoff、--s3-upload-concurrency 以及 --size-only / --update /
+--track-renames 比对方式），在构造时校验取值，并可以从内置的命名预设创建。
+"""
+
+import re
+from dataclasses import dataclass, fields, replace
+from typing import Dict, List, Tuple
+
+# rclone 的 SizeSuffix 格式，如 16M、1.5Gi、256k、1024
+_SIZE_RE = re.compile(r'^\d+(?:\.\d+)?(?:[KMGTP]i?)?B?$', re.IGNORECASE)
+
+MAX_S3_UPLOAD_CONCURRENCY = 64
+
+
+@dataclass
+class PerfProfile:
+
+    # 创建时使用的预设名称，手动修改过的配置为空
+    preset: str = ""
+    fast_list: bool = False
+    buffer_size: str = ""
+    multi_thread_cutoff: str = ""
+    s3_upload_concurrency: int = 0
+    size_only: bool = False
+    update: bool = False
+    track_renames: bool = False
+
+    def __post_init__(self):
+        for name in ('buffer_size', 'multi_thread_cutoff'):
+            value = getattr(self, name)
+            if not isinstance(value, str):
+                raise ValueError(f"{name} 必须是字符串: {value!r}")
+            value = value.strip()
+            if value and not _SIZE_RE.match(value):
+                raise ValueError(f"无效的大小: {value}。格式如 16M、256k、1G")
+            object.__setattr__(self, name, value)
+
+        if isinstance(self.s3_upload_concurrency, bool) or not isinstance(self.s3_upload_concurrency, int):
+            raise ValueError(f"s3_upload_concurrency 必须是整数: {self.s3_upload_concurrency!r}")
+        if not (0 <= self.s3_upload_concurrency <= MAX_S3_UPLOAD_CONCURRENCY):
+            raise ValueError(f"s3_upload_concurrency 必须在 0-{MAX_S3_UPLOAD_CONCURRENCY} 之间，"
+                             f"当前值: {self.s3_upload_concurrency}")
+
+        for name in ('fast_list', 'size_only', 'update', 'track_renames'):
+            if not isinstance(getattr(self, name), bool):
+                raise ValueError(f"{name} 必须是布尔值: {getattr(self, name)!r}")
+
+    @property
+    def is_default(self) -> bool:
+        return self.to_args() == []
+
+    def to_args(self, track_renames: bool = True) -> List[str]:
+        """转为 rclone 参数。--track-renames 只对完整的 sync 有效，由调用方决定是否允许。"""
+        args = []
+        if self.fast_list:
+            args.append('--fast-list')
+        if self.buffer_size:
+            args.extend(['--buffer-size', self.buffer_size])
+        if self.multi_thread_cutoff:
+            args.extend(['--multi-thread-cutoff', self.multi_thread_cutoff])
+        if self.s3_upload_concurrency > 0:
+            args.extend(['--s3-upload-concurrency', str(self.s3_upload_concurrency)])
+        if self.size_only:
+            args.append('--size-only')
+        if self.update:
+            args.append('--update')
+        if self.track_renames and track_renames:
+            args.append('--track-renames')
+        return args
+
+    def to_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PerfProfile':
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in known})
+
+
+# 内置预设：名称 -> (显示名称, 配置)
+PRESETS: Dict[str, Tuple[str, PerfProfile]] = {
+    # 列目录和逐文件检查是瓶颈：一次性递归列出，减小每个传输的缓冲区
+    'small_files': ('大量小文件', PerfProfile(
+        fast_list=True, buffer_size='1M')),
+    # 单文件传输是瓶颈：大缓冲区，较早启用多线程分块，S3 分片并行上传
+    'huge_files': ('少量大文件', PerfProfile(
+        buffer_size='64M', multi_thread_cutoff='64M', s3_upload_concurrency=8)),
+    # 往返延迟是瓶颈：减少列目录请求，加大缓冲和分片并发来填满链路
+    'high_latency': ('高延迟链路', PerfProfile(
+        fast_list=True, buffer_size='32M', multi_thread_cutoff='128M', s3_upload_concurrency=8)),
+}
+
+
+def preset_profile(name: str) -> PerfProfile:
+    """返回预设配置的副本。"""
+    if name not in PRESETS:
+        raise ValueError(f"未知的性能预设: {name}")
+    return replace(PRESETS[name][1], preset=name)
@@ -1,10 +1,12 @@
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
 import logging
 
+from .perf_profile import PerfProfile
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,7 @@ class SyncMode(Enum):
 
 class SyncStatus(Enum):
     IDLE = "idle"
+    QUEUED = "queued"
     RUNNING = "running"
     PAUSED = "paused"
     COMPLETED = "completed"
@@ -38,11 +41,37 @@ class SyncTask:
     dry_run: bool = False
     bandwidth_limit: str = ""
     exclude_patterns: List[str] = field(default_factory=list)
+    # rclone 性能参数（--fast-list、--buffer-size 等）
+    perf: PerfProfile = field(default_factory=PerfProfile)
 
     scheduled: bool = False
     cron_expression: str = ""
+    # 监视本地源目录，变化后只传输变化的文件
+    watch: bool = False
+    # 运行前用本地哈希缓存与目标端哈希比对，只传输不同的文件（本地源，仅 COPY 模式）
+    hash_precheck: bool = False
+
+    # 增量复制：只列出并传输上次成功运行以来修改过的文件（仅 COPY 模式）
+    incremental: bool = False
+    incremental_overlap: int = 3600
+    no_traverse: bool = False
+    # 每隔多少小时做一次完整比对，0 表示从不
+    full_check_interval: int = 24
+
+    # 并发设置，0 表示使用 rclone 默认值；开启自动调优时由运行结果调整，关闭后固定使用
+    auto_tune: bool = False
+    transfers: int = 0
+    checkers: int = 0
+    multi_thread_streams: int = 0
+    # 分片并行：按源目录第 shard_depth 层的子目录拆分，同时运行的 rclone 进程数，0 或 1 表示不分片
+    shards: int = 0
+    shard_depth: int = 1
+    # 自动调优的测量历史（auto_tuner.TuningState.to_dict()）
+    tuning: Dict[str, Any] = field(default_factory=dict)
 
     last_run: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    last_full_run: Optional[datetime] = None
     files_transferred: int = 0
     bytes_transferred: int = 0
     error_message: Optional[str] = None
@@ -50,6 +79,12 @@ class SyncTask:
     def __post_init__(self):
         if not isinstance(self.exclude_patterns, list):
             object.__setattr__(self, 'exclude_patterns', [])
+        if isinstance(self.perf, dict):
+            object.__setattr__(self, 'perf', PerfProfile.from_dict(self.perf))
+        elif not isinstance(self.perf, PerfProfile):
+            object.__setattr__(self, 'perf', PerfProfile())
+        if not isinstance(self.tuning, dict):
+            object.__setattr__(self, 'tuning', {})
 
         if not self.id or not isinstance(self.id, str):
             object.__setattr__(self, 'id', str(uuid.uuid4())[:8])
@@ -70,6 +105,22 @@ class SyncTask:
             raise ValueError(f"进度必须在 0-100 之间，当前值: {value}")
         self._progress = value
 
+    def incremental_window(self, now: Optional[datetime] = None) -> Optional[timedelta]:
+        """本次运行应使用的 --max-age 时间窗；需要完整比对时返回 None。
+
+        时间窗从上次成功运行的开始时间算起，再加上 incremental_overlap 秒的
+        安全余量，以覆盖时钟偏差和运行期间写入的文件。
+        """
+        if not self.incremental or self.mode != SyncMode.COPY or self.last_success is None:
+            return None
+        now = now or datetime.now()
+        if self.full_check_interval > 0 and (
+                self.last_full_run is None
+                or now - self.last_full_run >= timedelta(hours=self.full_check_interval)):
+            return None
+        window = now - self.last_success + timedelta(seconds=max(0, self.incremental_overlap))
+        return max(window, timedelta(seconds=1))
+
     def to_dict(self) -> dict:
         result = {
             'id': self.id,
@@ -83,12 +134,31 @@ class SyncTask:
             'dry_run': self.dry_run,
             'bandwidth_limit': self.bandwidth_limit,
             'exclude_patterns': list(self.exclude_patterns),
+            'perf': self.perf.to_dict(),
             'scheduled': self.scheduled,
-            'cron_expression': self.cron_expression
+            'cron_expression': self.cron_expression,
+            'watch': self.watch,
+            'hash_precheck': self.hash_precheck,
+            'incremental': self.incremental,
+            'incremental_overlap': self.incremental_overlap,
+            'no_traverse': self.no_traverse,
+            'full_check_interval': self.full_check_interval,
+            'auto_tune': self.auto_tune,
+            'transfers': self.transfers,
+            'checkers': self.checkers,
+            'multi_thread_streams': self.multi_thread_streams,
+            'shards': self.shards,
+            'shard_depth': self.shard_depth
         }
+        if self.tuning:
+            result['tuning'] = self.tuning
 
         if self.last_run:
             result['last_run'] = self.last_run.isoformat()
+        if self.last_success:
+            result['last_success'] = self.last_success.isoformat()
+        if self.last_full_run:
+            result['last_full_run'] = self.last_full_run.isoformat()
         if self.files_transferred is not None:
             result['files_transferred'] = self.files_transferred
         if self.bytes_transferred is not None:
@@ -109,6 +179,9 @@ class SyncTask:
             status = SyncStatus(data.get('status', 'idle'))
         except ValueError as e:
             raise ValueError(f"Invalid sync status: {data.get('status')}") from e
+        # 排队状态只存在于本次会话的运行队列中
+        if status == SyncStatus.QUEUED:
+            status = SyncStatus.IDLE
 
         task = cls(
             id=data.get('id', str(uuid.uuid4())[:8]),
@@ -122,17 +195,37 @@ class SyncTask:
             bandwidth_limit=data.get('bandwidth_limit', ''),
             exclude_patterns=list(data.get('exclude_patterns', [])),
             scheduled=data.get('scheduled', False),
-            cron_expression=data.get('cron_expression', '')
+            cron_expression=data.get('cron_expression', ''),
+            watch=data.get('watch', False),
+            hash_precheck=data.get('hash_precheck', False),
+            incremental=data.get('incremental', False),
+            incremental_overlap=data.get('incremental_overlap', 3600),
+            no_traverse=data.get('no_traverse', False),
+            full_check_interval=data.get('full_check_interval', 24),
+            auto_tune=data.get('auto_tune', False),
+            transfers=data.get('transfers', 0),
+            checkers=data.get('checkers', 0),
+            multi_thread_streams=data.get('multi_thread_streams', 0),
+            shards=data.get('shards', 0),
+            shard_depth=data.get('shard_depth', 1),
+            tuning=dict(data.get('tuning') or {})
         )
 
+        if data.get('perf'):
+            try:
+                task.perf = PerfProfile.from_dict(data['perf'])
+            except (ValueError, TypeError) as e:
+                logger.warning(f"忽略无效的性能配置: {data['perf']}, 错误: {e}")
+
         if 'progress' in data:
             task.progress = data['progress']
 
-        if 'last_run' in data and data['last_run']:
-            try:
-                task.last_run = datetime.fromisoformat(data['last_run'])
-            except (ValueError, TypeError) as e:
-                logger.warning(f"无法解析 last_run 日期: {data['last_run']}, 错误: {e}")
+        for key in ('last_run', 'last_success', 'last_full_run'):
+            if data.get(key):
+                try:
+                    setattr(task, key, datetime.fromisoformat(data[key]))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"无法解析 {key} 日期: {data[key]}, 错误: {e}")
         if 'files_transferred' in data:
             task.files_transferred = data['files_transferred']
         if 'bytes_transferred' in data:
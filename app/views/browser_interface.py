@@ -1,19 +1,25 @@
 from PySide6.QtCore import Qt, QModelIndex, QSize, QThread, QTimer, Signal
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
-    QHeaderView, QAbstractItemView, QFileDialog
+    QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QAbstractItemView, QFileDialog
 )
+import os
 import urllib.parse
 
 from qfluentwidgets import (
     ScrollArea, FluentIcon as FIF, IconWidget,
     TitleLabel, BodyLabel, CaptionLabel, PrimaryPushButton,
     PushButton, TransparentPushButton, ComboBox, LineEdit,
-    InfoBar, InfoBarPosition, MessageBox, TreeWidget, ToolButton
+    InfoBar, InfoBarPosition, MessageBox, TreeView, ToolButton, SearchLineEdit
 )
 
 from ..core.rclone import RClone
-from ..core.config_manager import ConfigManager
+from ..core.services import get_services
+from ..core.listing_cache import ListingCache, get_listing_cache, listing_fingerprint, ttl_for_type
+from ..core.remote_index import RemoteIndex, get_remote_index, has_remote_index, stores_hashes
+from ..core.transfer_queue import TransferItem, TransferQueue
+from .file_list_model import FileListModel
+from .storage_analyzer import StorageAnalyzerWindow
+from .transfer_panel import TransferPanel
 from ..common.signal_bus import signalBus
 from ..common.logger import get_logger
 
@@ -22,18 +28,27 @@ logger = get_logger('browser')
 
 class FileListWorker(QThread):
     finished = Signal(bool, list, str)
+    batchReady = Signal(list)
 
-    def __init__(self, rclone: RClone, remote_path: str):
+    def __init__(self, rclone: RClone, remote_path: str, batch_size: int = 0):
         super().__init__()
         self.rclone = rclone
         self.remote_path = remote_path
+        self.batch_size = batch_size
         self._cancelled = False
+        self._stream = None
+        # 成功时在后台线程算好的列表指纹，供缓存和重新验证比较使用
+        self.fingerprint = None
 
     def run(self):
         if self._cancelled:
             self.finished.emit(False, [], "操作已取消")
             return
 
+        if self.batch_size > 0:
+            self._run_streaming()
+            return
+
         success, files = self.rclone.lsjson(self.remote_path)
 
         if self._cancelled:
@@ -41,12 +56,34 @@ class FileListWorker(QThread):
             return
 
         if success:
+            self.fingerprint = listing_fingerprint(files)
             self.finished.emit(True, files, "")
         else:
             self.finished.emit(False, [], str(files) if isinstance(files, str) else "无法加载文件列表")
 
+    def _run_streaming(self):
+        """边读取边解析 lsjson 输出，每凑满一批就通过 batchReady 推送给界面。"""
+        self._stream = self.rclone.lsjson_stream(self.remote_path, batch_size=self.batch_size)
+        files = []
+        for batch in self._stream:
+            if self._cancelled:
+                self._stream.cancel()
+                break
+            files.extend(batch)
+            self.batchReady.emit(batch)
+
+        if self._cancelled:
+            self.finished.emit(False, [], "操作已取消")
+        elif self._stream.success:
+            self.fingerprint = listing_fingerprint(files)
+            self.finished.emit(True, files, "")
+        else:
+            self.finished.emit(False, [], self._stream.error or "无法加载文件列表")
+
     def cancel(self):
         self._cancelled = True
+        if self._stream is not None:
+            self._stream.cancel()
         if not self.isFinished():
             self.wait(1000)
 
@@ -55,10 +92,12 @@ class FileOperationWorker(QThread):
     progress = Signal(str)
     finished = Signal(bool, str)
 
-    def __init__(self, rclone: RClone, operations: list):
+    def __init__(self, rclone: RClone, operations: list, cache: ListingCache = None):
         super().__init__()
         self.rclone = rclone
         self.operations = operations
+        self.cache = cache
+        self.failures = {}
         self._cancelled = False
 
     def run(self):
@@ -79,33 +118,84 @@ class FileOperationWorker(QThread):
                 result = self.rclone.purge(*args)
             elif operation == 'delete_file':
                 result = self.rclone.delete_file(*args)
+            elif operation == 'bulk_delete':
+                result, failures = self.rclone.delete_batch(*args)
+                if failures:
+                    self.failures.update(failures)
+                    result.stderr = self._format_failures(failures)
             else:
                 self.finished.emit(False, f"未知操作: {operation}")
                 return
 
+            # 失败的操作也可能已部分修改目标目录，同样需要失效
+            if self.cache is not None:
+                self.cache.invalidate_for_operation(op)
+
             if not result.success:
                 self.finished.emit(False, result.stderr)
                 return
 
         self.finished.emit(True, "操作完成")
 
+    @staticmethod
+    def _format_failures(failures: dict, limit: int = 5) -> str:
+        lines = [f'{name}: {error}' for name, error in list(failures.items())[:limit]]
+        if len(failures) > limit:
+            lines.append(f'... 另有 {len(failures) - limit} 项')
+        return f'{len(failures)} 个项目删除失败\n' + '\n'.join(lines)
+
     def cancel(self):
         self._cancelled = True
         if not self.isFinished():
             self.wait(1000)
 
 
+class IndexCrawlWorker(QThread):
+    progress = Signal(int)
+    finished = Signal(bool, str)
+
+    def __init__(self, rclone: RClone, index: RemoteIndex, hashes: bool = False):
+        super().__init__()
+        self.rclone = rclone
+        self.index = index
+        self.hashes = hashes
+
+    def run(self):
+        success, error = self.index.crawl(self.rclone, hashes=self.hashes,
+                                          progress=self.progress.emit)
+        self.finished.emit(success, error)
+
+    def cancel(self):
+        self.index.cancel()
+        if not self.isFinished():
+            self.wait(1000)
+
+
 class BrowserInterface(QWidget):
 
+    LIST_BATCH_SIZE = 1000
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName('browserInterface')
 
-        self.rclone = RClone()
-        self.configManager = ConfigManager(self.rclone)
+        services = get_services()
+        self.rclone = services.rclone
+        self.configManager = services.configManager
         self.currentRemote = ''
         self.currentPath = ''
         self._current_worker = None
+        self._streamed_count = 0
+        self.listingCache = get_listing_cache()
+        # 当前显示的列表的指纹，重新验证后据此判断是否需要重新渲染
+        self._shown_fingerprint = None
+        self._revalidating = False
+        self._searching = False
+        self._index_worker = None
+        self._analyzer = None
+        self.transferQueue = TransferQueue(self.rclone, self.listingCache, parent=self)
+        self.transferQueue.jobFinished.connect(self._on_transfer_job_finished)
+        self.transferQueue.allFinished.connect(self._on_transfers_finished)
 
         self.initUI()
         self.loadRemotes()
@@ -127,7 +217,8 @@ class BrowserInterface(QWidget):
             self.currentRemote = ''
             self.currentPath = ''
             self.pathEdit.setText('/')
-            self.fileTree.clear()
+            self.fileModel.clear()
+            self.statusLabel.clear()
         self.loadRemotes()
 
     def initUI(self):
@@ -154,7 +245,7 @@ class BrowserInterface(QWidget):
 
         self.refreshBtn = ToolButton(FIF.SYNC, self)
         self.refreshBtn.setFixedSize(32, 32)
-        self.refreshBtn.clicked.connect(self.refresh)
+        self.refreshBtn.clicked.connect(self.forceRefresh)
 
         self.homeBtn = ToolButton(FIF.HOME, self)
         self.homeBtn.setFixedSize(32, 32)
@@ -166,6 +257,14 @@ class BrowserInterface(QWidget):
         toolbarLayout.addWidget(self.pathEdit, 1)
         toolbarLayout.addWidget(self.refreshBtn)
 
+        self.searchEdit = SearchLineEdit(self)
+        self.searchEdit.setPlaceholderText('搜索文件名（需先建立索引）')
+        self.searchEdit.setFixedWidth(240)
+        self.searchEdit.searchSignal.connect(self.searchIndex)
+        self.searchEdit.clearSignal.connect(self.exitSearch)
+        self.searchEdit.returnPressed.connect(lambda: self.searchIndex(self.searchEdit.text()))
+        toolbarLayout.addWidget(self.searchEdit)
+
         self.mainLayout.addLayout(toolbarLayout)
 
         actionLayout = QHBoxLayout()
@@ -182,36 +281,58 @@ class BrowserInterface(QWidget):
         self.deleteBtn = PushButton(FIF.DELETE, '删除', self)
         self.deleteBtn.clicked.connect(self.deleteSelected)
 
+        self.indexBtn = PushButton(FIF.SEARCH, '建立索引', self)
+        self.indexBtn.clicked.connect(self.buildIndex)
+
+        self.analyzeBtn = PushButton(FIF.PIE_SINGLE, '空间分析', self)
+        self.analyzeBtn.clicked.connect(self.analyzeUsage)
+
         actionLayout.addWidget(self.uploadBtn)
         actionLayout.addWidget(self.downloadBtn)
         actionLayout.addWidget(self.newFolderBtn)
         actionLayout.addWidget(self.deleteBtn)
         actionLayout.addStretch()
+        actionLayout.addWidget(self.analyzeBtn)
+        actionLayout.addWidget(self.indexBtn)
 
         self.mainLayout.addLayout(actionLayout)
 
-        self.fileTree = TreeWidget(self)
-        self.fileTree.setHeaderLabels(['名称', '大小', '修改时间'])
+        # 虚拟化列表：视图只请求可见行，条目以列式结构保存在模型中
+        self.fileModel = FileListModel(self.formatSize, self)
+        self.fileTree = TreeView(self)
+        self.fileTree.setModel(self.fileModel)
+        self.fileTree.setRootIsDecorated(False)
+        self.fileTree.setUniformRowHeights(True)
         self.fileTree.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.fileTree.itemDoubleClicked.connect(self.onItemDoubleClicked)
+        self.fileTree.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.fileTree.setSortingEnabled(True)
+        self.fileTree.sortByColumn(0, Qt.AscendingOrder)
+        self.fileTree.doubleClicked.connect(self.onItemDoubleClicked)
 
         header = self.fileTree.header()
         header.setSectionResizeMode(0, QHeaderView.Stretch)
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        header.setSectionResizeMode(2, QHeaderView.Fixed)
+        header.resizeSection(1, 100)
+        header.resizeSection(2, 160)
 
         self.mainLayout.addWidget(self.fileTree, 1)
 
-        self._loading_item = None
+        self.statusLabel = CaptionLabel('', self)
+        self.mainLayout.addWidget(self.statusLabel)
+
+        self.transferPanel = TransferPanel(self.transferQueue, self)
+        self.mainLayout.addWidget(self.transferPanel)
 
     def loadRemotes(self):
         self.remoteCombo.blockSignals(True)
         self.remoteCombo.clear()
-        self.configManager.refresh()
+        # 共享的 ConfigManager 由远程存储界面在增删改时维护，这里直接读取缓存
         remotes = self.configManager.list_remotes()
 
         for remote in remotes:
             self.remoteCombo.addItem(remote.name)
+            self.listingCache.set_ttl(remote.name, ttl_for_type(remote.type))
         self.remoteCombo.blockSignals(False)
 
         if remotes:
@@ -267,22 +388,54 @@ class BrowserInterface(QWidget):
     def refresh(self):
         if not self.currentRemote:
             return
+        self._searching = False
 
         self._cancel_current_worker()
 
-        self.fileTree.clear()
+        self.fileModel.clear()
         remote_path = self._build_remote_path(self.currentRemote, self.currentPath)
+        self._streamed_count = 0
+
+        cached = self.listingCache.get(remote_path)
+        if cached is not None:
+            # 先用缓存立即渲染；过期时再在后台重新验证
+            self._shown_fingerprint = cached.fingerprint
+            self._show_entries(cached.entries)
+            if cached.fresh:
+                return
+            logger.debug(f'目录缓存已过期，后台重新验证: {remote_path}')
+            self._revalidating = True
+            self._current_worker = FileListWorker(self.rclone, remote_path)
+        else:
+            self._revalidating = False
+            self._shown_fingerprint = None
+            self._set_loading_state(True)
+            self.statusLabel.setText('加载中...')
 
-        self._set_loading_state(True)
-        self._loading_item = QTreeWidgetItem()
-        self._loading_item.setText(0, "加载中...")
-        self._loading_item.setIcon(0, FIF.SYNC.icon())
-        self.fileTree.addTopLevelItem(self._loading_item)
-
-        self._current_worker = FileListWorker(self.rclone, remote_path)
-        self._current_worker.finished.connect(self._on_refresh_finished)
-        self._current_worker.finished.connect(self._clear_worker_ref)
-        self._current_worker.start()
+            self._current_worker = FileListWorker(self.rclone, remote_path, batch_size=self.LIST_BATCH_SIZE)
+            self._current_worker.batchReady.connect(self._on_refresh_batch)
+
+        worker = self._current_worker
+        worker.finished.connect(
+            lambda success, files, error, path=remote_path, w=worker:
+            self._store_listing(path, success, files, w.fingerprint)
+        )
+        worker.finished.connect(
+            lambda success, files, error, w=worker:
+            self._on_refresh_finished(success, files, error, w.fingerprint)
+        )
+        worker.finished.connect(self._clear_worker_ref)
+        worker.start()
+
+    def forceRefresh(self):
+        """刷新按钮：丢弃当前目录的缓存后重新加载"""
+        if self.currentRemote:
+            self.listingCache.invalidate(self._build_remote_path(self.currentRemote, self.currentPath))
+        self.refresh()
+
+    def _store_listing(self, remote_path: str, success: bool, files: list, fingerprint=None):
+        if success:
+            self.listingCache.put(remote_path, files, fingerprint)
 
     def _clear_worker_ref(self, *args):
         """finished 信号回调：清空 worker 引用并安排销毁"""
@@ -312,35 +465,56 @@ class BrowserInterface(QWidget):
 
         return f'{remote_name}:{safe_path}'
 
-    def _on_refresh_finished(self, success: bool, files: list, error_message: str):
+    def _on_refresh_batch(self, files: list):
+        if self._streamed_count == 0:
+            self.fileModel.clear()
+        self._streamed_count += len(files)
+        self.fileModel.append(files)
+        self.statusLabel.setText(f'加载中... 已读取 {self._streamed_count} 项')
+
+    def _on_refresh_finished(self, success: bool, files: list, error_message: str,
+                             fingerprint=None):
         self._set_loading_state(False)
-        self.fileTree.clear()
+        streamed = self._streamed_count
+        self._streamed_count = 0
+        revalidating, self._revalidating = self._revalidating, False
+
+        if revalidating:
+            if not success:
+                logger.warning(f'后台刷新目录失败，继续显示缓存: remote={self.currentRemote}, '
+                               f'path={self.currentPath}, error={error_message}')
+            else:
+                fingerprint = fingerprint or listing_fingerprint(files)
+                if fingerprint != self._shown_fingerprint:
+                    self._shown_fingerprint = fingerprint
+                    self._show_entries(files)
+            return
 
         if not success:
+            self.fileModel.clear()
+            self.statusLabel.clear()
             logger.error(f'文件列表加载失败: remote={self.currentRemote}, path={self.currentPath}, error={error_message}')
             InfoBar.error('错误', error_message,
                          parent=self, position=InfoBarPosition.TOP)
             return
 
         logger.debug(f'文件列表加载成功: remote={self.currentRemote}, path={self.currentPath}, count={len(files)}')
-        for file in files:
-            item = QTreeWidgetItem()
-            item.setText(0, file.get('Name', ''))
-            item.setData(0, Qt.UserRole, file)
-
-            if file.get('IsDir'):
-                item.setIcon(0, FIF.FOLDER.icon())
-                item.setText(1, '-')
-            else:
-                item.setIcon(0, FIF.DOCUMENT.icon())
-                size = file.get('Size', 0)
-                item.setText(1, self.formatSize(size))
+        self._shown_fingerprint = fingerprint
+        # 流式加载时条目已随批次添加完毕，只需按当前列排序
+        if streamed and streamed == len(files):
+            header = self.fileTree.header()
+            self.fileModel.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+            self.statusLabel.setText(f'共 {len(files)} 项')
+            return
+        self._show_entries(files)
 
-            mod_time = file.get('ModTime', '')
-            if mod_time:
-                item.setText(2, mod_time[:19].replace('T', ' '))
+    def _show_entries(self, files: list):
+        self.fileModel.setEntries(files)
+        self.statusLabel.setText(f'共 {len(files)} 项')
 
-            self.fileTree.addTopLevelItem(item)
+    def _selected_entries(self) -> list:
+        rows = sorted(index.row() for index in self.fileTree.selectionModel().selectedRows())
+        return [self.fileModel.entry(row) for row in rows]
 
     def formatSize(self, size: int) -> str:
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -349,9 +523,20 @@ class BrowserInterface(QWidget):
             size /= 1024
         return f'{size:.1f} PB'
 
-    def onItemDoubleClicked(self, item: QTreeWidgetItem, column: int):
-        file_data = item.data(0, Qt.UserRole)
-        if file_data and file_data.get('IsDir'):
+    def onItemDoubleClicked(self, index: QModelIndex):
+        if not index.isValid():
+            return
+        file_data = self.fileModel.entry(index.row())
+        if self._searching:
+            # 搜索结果的名称是完整相对路径：目录直接进入，文件进入其所在目录
+            path = file_data.get('Name', '')
+            if not file_data.get('IsDir'):
+                path = path.rpartition('/')[0]
+            self.currentPath = path
+            self.pathEdit.setText('/' + path)
+            self.refresh()
+            return
+        if file_data.get('IsDir'):
             name = file_data.get('Name', '')
             if self.currentPath:
                 self.currentPath = f'{self.currentPath}/{name}'
@@ -360,6 +545,76 @@ class BrowserInterface(QWidget):
             self.pathEdit.setText('/' + self.currentPath)
             self.refresh()
 
+    def analyzeUsage(self):
+        if not self.currentRemote:
+            return
+        remote_path = self._build_remote_path(self.currentRemote, self.currentPath)
+        logger.info(f'用户分析空间占用: {remote_path}')
+        if self._analyzer is not None:
+            self._analyzer.close()
+        self._analyzer = StorageAnalyzerWindow(self.rclone, remote_path, self)
+        self._analyzer.setAttribute(Qt.WA_DeleteOnClose)
+        self._analyzer.destroyed.connect(lambda *_: setattr(self, '_analyzer', None))
+        self._analyzer.show()
+        self._analyzer.start()
+
+    def buildIndex(self):
+        if not self.currentRemote or self._index_worker is not None:
+            return
+        remote = self.currentRemote
+        logger.info(f'用户为 {remote} 建立索引')
+        info = self.configManager.get_remote(remote)
+        self._index_worker = IndexCrawlWorker(self.rclone, get_remote_index(remote),
+                                              hashes=stores_hashes(info.type if info else None))
+        self._index_worker.progress.connect(
+            lambda count: self.indexBtn.setText(f'索引中 {count}'))
+        self._index_worker.finished.connect(
+            lambda success, error, name=remote: self._on_index_finished(name, success, error))
+        self.indexBtn.setEnabled(False)
+        self.indexBtn.setText('索引中...')
+        self._index_worker.start()
+
+    def _on_index_finished(self, remote: str, success: bool, error: str):
+        worker, self._index_worker = self._index_worker, None
+        if worker is not None:
+            worker.deleteLater()
+        self.indexBtn.setEnabled(True)
+        self.indexBtn.setText('建立索引')
+        if success:
+            count = get_remote_index(remote).count()
+            InfoBar.success('索引完成', f'{remote}: 共 {count} 项',
+                            parent=self, position=InfoBarPosition.TOP)
+        else:
+            InfoBar.error('索引失败', error, parent=self, position=InfoBarPosition.TOP)
+
+    def searchIndex(self, text: str):
+        text = text.strip()
+        if not text:
+            self.exitSearch()
+            return
+        if not self.currentRemote:
+            return
+        if not has_remote_index(self.currentRemote):
+            InfoBar.warning('提示', f'{self.currentRemote} 尚未建立索引，请先点击"建立索引"',
+                            parent=self, position=InfoBarPosition.TOP)
+            return
+        self._cancel_current_worker()
+        self._set_loading_state(False)
+        results = get_remote_index(self.currentRemote).search(text)
+        logger.debug(f'索引搜索: remote={self.currentRemote}, query={text}, 结果={len(results)}')
+        # 名称显示完整相对路径，当前目录视为根目录，下载和删除按完整路径处理
+        entries = [dict(entry, Name=entry['Path']) for entry in results]
+        self._searching = True
+        self.currentPath = ''
+        self.pathEdit.setText(f'搜索: {text}')
+        self.fileModel.setEntries(entries)
+        self.statusLabel.setText(f'找到 {len(entries)} 项（来自索引）')
+
+    def exitSearch(self):
+        if self._searching:
+            self.pathEdit.setText('/')
+            self.refresh()
+
     def uploadFile(self):
         files, _ = QFileDialog.getOpenFileNames(self, '选择文件')
         if not files:
@@ -367,12 +622,18 @@ class BrowserInterface(QWidget):
 
         logger.info(f'用户上传 {len(files)} 个文件到 {self.currentRemote}:{self.currentPath}')
         remote_path = self._build_remote_path(self.currentRemote, self.currentPath)
-        operations = [('copy', file, remote_path) for file in files]
+        items = [TransferItem(file, remote_path, size=self._local_size(file)) for file in files]
+        self.transferQueue.enqueue(items)
 
-        self._execute_operations(operations, f'已上传 {len(files)} 个文件', '上传失败')
+    @staticmethod
+    def _local_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
 
     def downloadFile(self):
-        items = self.fileTree.selectedItems()
+        items = self._selected_entries()
         if not items:
             InfoBar.warning('提示', '请选择要下载的文件',
                            parent=self, position=InfoBarPosition.TOP)
@@ -383,23 +644,38 @@ class BrowserInterface(QWidget):
             return
 
         logger.info(f'用户下载 {len(items)} 个文件到 {folder}')
-        operations = []
-        for item in items:
-            file_data = item.data(0, Qt.UserRole)
-            if file_data:
-                name = file_data.get('Name', '')
-                item_path = f"{self.currentPath}/{name}" if self.currentPath else name
-                remote_path = self._build_remote_path(self.currentRemote, item_path)
-                operations.append(('copy', remote_path, folder))
+        transfers = []
+        for file_data in items:
+            name = file_data.get('Name', '')
+            item_path = f"{self.currentPath}/{name}" if self.currentPath else name
+            remote_path = self._build_remote_path(self.currentRemote, item_path)
+            transfers.append(TransferItem(
+                remote_path, folder,
+                is_dir=bool(file_data.get('IsDir')),
+                size=max(0, file_data.get('Size', 0) or 0)
+            ))
+
+        self.transferQueue.enqueue(transfers)
+
+    def _on_transfer_job_finished(self, dest: str):
+        # 传输队列已失效目标目录的缓存，正在浏览该目录时重新加载
+        if self.currentRemote and dest == self._build_remote_path(self.currentRemote, self.currentPath):
+            self.refresh()
 
-        self._execute_operations(operations, f'已下载 {len(items)} 个文件', '下载失败')
+    def _on_transfers_finished(self, done: int, failed: int):
+        if failed:
+            InfoBar.warning('传输完成', f'{done} 个成功，{failed} 个失败',
+                            parent=self, position=InfoBarPosition.TOP)
+        else:
+            InfoBar.success('传输完成', f'{done} 个项目已完成',
+                            parent=self, position=InfoBarPosition.TOP)
 
     def _execute_operations(self, operations: list, success_msg: str, error_prefix: str):
         self._set_loading_state(True)
 
         self._cancel_current_worker()
 
-        self._current_worker = FileOperationWorker(self.rclone, operations)
+        self._current_worker = FileOperationWorker(self.rclone, operations, self.listingCache)
         self._current_worker.finished.connect(
             lambda success, msg: self._on_operation_finished(success, msg, success_msg, error_prefix)
         )
@@ -465,28 +741,23 @@ class BrowserInterface(QWidget):
                 )
 
     def deleteSelected(self):
-        items = self.fileTree.selectedItems()
+        items = self._selected_entries()
         if not items:
             InfoBar.warning('提示', '请选择要删除的文件',
                            parent=self, position=InfoBarPosition.TOP)
             return
 
-        names = [item.data(0, Qt.UserRole).get('Name', '') for item in items]
+        names = [file_data.get('Name', '') for file_data in items]
         box = MessageBox('确认删除', f'确定要删除 {len(items)} 个项目吗？\n{", ".join(names[:3])}...', self.window())
 
         if box.exec():
             logger.info(f'用户确认删除 {len(items)} 个项目: {names[:3]}')
-            operations = []
-            for item in items:
-                file_data = item.data(0, Qt.UserRole)
-                if file_data:
-                    name = file_data.get('Name', '')
-                    item_path = f"{self.currentPath}/{name}" if self.currentPath else name
-                    remote_path = self._build_remote_path(self.currentRemote, item_path)
-
-                    if file_data.get('IsDir'):
-                        operations.append(('purge', remote_path))
-                    else:
-                        operations.append(('delete_file', remote_path))
-
-            self._execute_operations(operations, f'已删除 {len(items)} 个项目', '删除失败')
+            files = [f.get('Name', '') for f in items if not f.get('IsDir')]
+            dirs = [f.get('Name', '') for f in items if f.get('IsDir')]
+            remote_dir = self._build_remote_path(self.currentRemote, self.currentPath)
+
+            # 所有选中项位于同一目录，合并为一次批量删除
+            self._execute_operations(
+                [('bulk_delete', remote_dir, files, dirs)],
+                f'已删除 {len(items)} 个项目', '删除失败'
+            )
@@ -0,0 +1,164 @@
+"""
+文件浏览器的虚拟化列表模型。
+
+目录条目以列式结构保存（名称列表、大小 array、修改时间列表、目录标记
+bytearray），不再为每个条目创建 QTreeWidgetItem 和完整的 rclone 字典。
+视图只向模型请求可见行的数据；行通过 canFetchMore/fetchMore 分段加入，
+排序使用追加条目时预先计算好的排序键。
+"""
+
+from array import array
+from typing import Callable, List
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from qfluentwidgets import FluentIcon as FIF
+
+
+class FileEntryStore:
+    """紧凑的目录条目存储。"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.names: List[str] = []
+        self.name_keys: List[str] = []
+        self.sizes = array('q')
+        self.mtimes: List[str] = []
+        self.is_dir = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def extend(self, entries: List[dict]):
+        names, name_keys, mtimes = self.names, self.name_keys, self.mtimes
+        sizes, is_dir = self.sizes, self.is_dir
+        for entry in entries:
+            name = entry.get('Name', '')
+            key = name.casefold()
+            names.append(name)
+            # 大多数文件名本身就是小写，直接复用同一个字符串对象
+            name_keys.append(name if key == name else key)
+            sizes.append(entry.get('Size', 0) or 0)
+            mod_time = entry.get('ModTime', '')
+            mtimes.append(mod_time[:19].replace('T', ' ') if mod_time else '')
+            is_dir.append(1 if entry.get('IsDir') else 0)
+
+    def entry(self, i: int) -> dict:
+        return {
+            'Name': self.names[i],
+            'Size': self.sizes[i],
+            'ModTime': self.mtimes[i],
+            'IsDir': bool(self.is_dir[i]),
+        }
+
+
+class FileListModel(QAbstractTableModel):
+    """基于 FileEntryStore 的三列（名称、大小、修改时间）表格模型。"""
+
+    HEADERS = ('名称', '大小', '修改时间')
+    FETCH_SIZE = 2000
+
+    def __init__(self, format_size: Callable[[int], str], parent=None):
+        super().__init__(parent)
+        self._format_size = format_size
+        self._store = FileEntryStore()
+        self._order = array('l')
+        self._loaded = 0
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._folder_icon = FIF.FOLDER.icon()
+        self._file_icon = FIF.DOCUMENT.icon()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def totalCount(self) -> int:
+        return len(self._store)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._order)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._load_rows(self._loaded + self.FETCH_SIZE)
+
+    def _load_rows(self, target: int):
+        target = min(target, len(self._order))
+        if target <= self._loaded:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, target - 1)
+        self._loaded = target
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = self._order[index.row()]
+        column = index.column()
+        store = self._store
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return store.names[i]
+            if column == 1:
+                return '-' if store.is_dir[i] else self._format_size(store.sizes[i])
+            return store.mtimes[i]
+        if role == Qt.DecorationRole and column == 0:
+            return self._folder_icon if store.is_dir[i] else self._file_icon
+        if role == Qt.UserRole:
+            return store.entry(i)
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def entry(self, row: int) -> dict:
+        return self._store.entry(self._order[row])
+
+    def clear(self):
+        self.beginResetModel()
+        self._store.clear()
+        self._order = array('l')
+        self._loaded = 0
+        self.endResetModel()
+
+    def append(self, entries: List[dict]):
+        """追加条目；只有首屏范围内的行会立即插入，其余等待 fetchMore。"""
+        if not entries:
+            return
+        start = len(self._store)
+        self._store.extend(entries)
+        self._order.extend(range(start, len(self._store)))
+        if self._loaded < self.FETCH_SIZE:
+            self._load_rows(self.FETCH_SIZE)
+
+    def setEntries(self, entries: List[dict]):
+        self.clear()
+        self.append(entries)
+        if self._sort_column >= 0:
+            self.sort(self._sort_column, self._sort_order)
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        store = self._store
+        if column < 0 or not len(store):
+            return
+
+        keys = (store.name_keys, store.sizes, store.mtimes)[column]
+        rows = list(range(len(store)))
+        rows.sort(key=keys.__getitem__, reverse=order == Qt.DescendingOrder)
+        # 稳定排序：目录始终排在文件前面
+        rows.sort(key=store.is_dir.__getitem__, reverse=True)
+
+        self.beginResetModel()
+        self._order = array('l', rows)
+        self.endResetModel()
@@ -1,3 +1,5 @@
+import time
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
 
@@ -11,9 +13,8 @@ from qfluentwidgets import (
 
 from ..common.signal_bus import signalBus
 from ..common.logger import get_logger
-from ..core.rclone import RClone
-from ..core.config_manager import ConfigManager
-from ..core.mount_manager import MountManager
+from ..core.quota_service import QuotaSummary, format_bytes
+from ..core.services import get_services
 
 logger = get_logger('home')
 
@@ -82,12 +83,26 @@ class HomeInterface(ScrollArea):
         self.setObjectName('homeInterface')
         self.setWidgetResizable(True)
 
-        self.rclone = RClone()
-        self.configManager = ConfigManager(self.rclone)
-        self.mountManager = MountManager(self.rclone)
+        services = get_services()
+        self.rclone = services.rclone
+        self.configManager = services.configManager
+        self.mountManager = services.mountManager
+        self.quotaService = services.quotaService
 
         self.initUI()
+        self.connectSignals()
         self.loadData()
+        # 先显示磁盘缓存中的容量，再在后台刷新过期的条目
+        self.updateQuota(self.quotaService.summary())
+        self.quotaService.start(self._remoteNames)
+
+    def connectSignals(self):
+        # 共享的管理器状态变化时只更新对应的统计，不重新加载挂载配置
+        self.mountManager.mountStatusChanged.connect(self.updateMountCount)
+        signalBus.remoteAdded.connect(self.updateRemoteCount)
+        signalBus.remoteRemoved.connect(self.updateRemoteCount)
+        self.quotaService.summaryChanged.connect(self.updateQuota)
+        signalBus.remoteAdded.connect(self.refreshQuota)
 
     def initUI(self):
         self.scrollWidget = QWidget()
@@ -110,10 +125,12 @@ class HomeInterface(ScrollArea):
         self.remoteCard = StatCard(FIF.CLOUD, '远程存储', '0', self)
         self.mountCard = StatCard(FIF.TILES, '已挂载', '0', self)
         self.syncCard = StatCard(FIF.SYNC, '同步任务', '0', self)
+        self.quotaCard = StatCard(FIF.PIE_SINGLE, '存储容量', '-', self)
 
         statsLayout.addWidget(self.remoteCard)
         statsLayout.addWidget(self.mountCard)
         statsLayout.addWidget(self.syncCard)
+        statsLayout.addWidget(self.quotaCard)
 
         self.mainLayout.addLayout(statsLayout)
 
@@ -143,12 +160,8 @@ class HomeInterface(ScrollArea):
 
     def loadData(self):
         try:
-            remotes = self.configManager.list_remotes()
-            self.remoteCard.setValue(str(len(remotes)))
-
-            self.mountManager.load_mounts()
-            mounted = sum(1 for m in self.mountManager.mounts.values() if m.is_mounted)
-            self.mountCard.setValue(str(mounted))
+            self.updateRemoteCount()
+            self.updateMountCount()
         except Exception as e:
             logger.warning(f"加载仪表盘数据失败: {e}")
             InfoBar.warning(
@@ -158,6 +171,42 @@ class HomeInterface(ScrollArea):
                 position=InfoBarPosition.TOP
             )
 
+    def updateRemoteCount(self, *_):
+        remotes = self.configManager.list_remotes()
+        self.remoteCard.setValue(str(len(remotes)))
+
+    def updateMountCount(self, *_):
+        mounted = sum(1 for m in self.mountManager.mounts.values() if m.is_mounted)
+        self.mountCard.setValue(str(mounted))
+
+    def _remoteNames(self) -> list:
+        return [r.name for r in self.configManager.list_remotes()]
+
+    def refreshQuota(self, *_):
+        try:
+            self.quotaService.refresh(self._remoteNames())
+        except Exception as e:
+            logger.warning(f"刷新存储容量失败: {e}")
+
+    def updateQuota(self, summary: QuotaSummary):
+        if not summary.counted:
+            self.quotaCard.setValue('-')
+            self.quotaCard.setToolTip('')
+            return
+        if summary.total:
+            self.quotaCard.setValue(f'{format_bytes(summary.used)} / {format_bytes(summary.total)}')
+        else:
+            self.quotaCard.setValue(format_bytes(summary.used))
+        tip = [f'已用: {format_bytes(summary.used)}',
+               f'可用: {format_bytes(summary.free)}',
+               f'总计: {format_bytes(summary.total)}',
+               f'统计 {summary.counted} 个远程存储']
+        if summary.failed:
+            tip.append(f'{summary.failed} 个查询失败')
+        if summary.oldest:
+            tip.append('最早数据: ' + time.strftime('%Y-%m-%d %H:%M', time.localtime(summary.oldest)))
+        self.quotaCard.setToolTip('\n'.join(tip))
+
     def mountAll(self):
         self.mountManager.auto_mount_all()
         self.loadData()
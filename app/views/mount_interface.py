@@ -13,9 +13,8 @@ from qfluentwidgets import (
 
 from ..common.signal_bus import signalBus
 from ..common.logger import get_logger
-from ..core.rclone import RClone
-from ..core.config_manager import ConfigManager
 from ..core.mount_manager import MountManager
+from ..core.services import get_services
 from ..models.mount import Mount, MountStatus
 
 logger = get_logger('mount')
@@ -272,10 +271,10 @@ class MountInterface(ScrollArea):
         self.setObjectName('mountInterface')
         self.setWidgetResizable(True)
 
-        self.rclone = RClone()
-        self.configManager = ConfigManager(self.rclone)
-        self.mountManager = MountManager(self.rclone)
-        self.mountManager.load_mounts()
+        services = get_services()
+        self.rclone = services.rclone
+        self.configManager = services.configManager
+        self.mountManager = services.mountManager
 
         self.mountCards: dict = {}
         self._unmount_worker = None
@@ -11,13 +11,13 @@ from qfluentwidgets import (
     TitleLabel, BodyLabel, StrongBodyLabel, CaptionLabel, PrimaryPushButton,
     PushButton, TransparentPushButton, SimpleCardWidget,
     MessageBox, LineEdit, PasswordLineEdit, ComboBox,
-    Dialog, FluentIcon, InfoBar, InfoBarPosition
+    Dialog, FluentIcon, InfoBar, InfoBarPosition, InfoBadge, InfoLevel
 )
 
 from ..common.signal_bus import signalBus
 from ..common.logger import get_logger
-from ..core.rclone import RClone
-from ..core.config_manager import ConfigManager
+from ..core.health_check import HealthResult
+from ..core.services import get_services
 from ..providers import get_all_providers, get_provider
 from ..models.remote import Remote
 
@@ -70,7 +70,14 @@ class RemoteCard(SimpleCardWidget):
         self.typeLabel = CaptionLabel(f'{remote.type}', self)
         if remote.host:
             self.typeLabel.setText(f'{remote.type} - {remote.host}')
-        infoLayout.addWidget(self.nameLabel)
+        self.statusBadge = InfoBadge(self, level=InfoLevel.INFOAMTION)
+        self.statusBadge.hide()
+        nameLayout = QHBoxLayout()
+        nameLayout.setSpacing(8)
+        nameLayout.addWidget(self.nameLabel)
+        nameLayout.addWidget(self.statusBadge)
+        nameLayout.addStretch()
+        infoLayout.addLayout(nameLayout)
         infoLayout.addWidget(self.typeLabel)
 
         btnLayout = QHBoxLayout()
@@ -97,6 +104,20 @@ class RemoteCard(SimpleCardWidget):
         layout.addLayout(infoLayout, 1)
         layout.addLayout(btnLayout)
 
+    def setChecking(self):
+        self.statusBadge.setLevel(InfoLevel.INFOAMTION)
+        self.statusBadge.setText('检查中')
+        self.statusBadge.setToolTip('')
+        self.statusBadge.adjustSize()
+        self.statusBadge.show()
+
+    def setHealth(self, result: HealthResult):
+        self.statusBadge.setLevel(InfoLevel.SUCCESS if result.ok else InfoLevel.ERROR)
+        self.statusBadge.setText(result.summary)
+        self.statusBadge.setToolTip(result.message)
+        self.statusBadge.adjustSize()
+        self.statusBadge.show()
+
 
 class AddRemoteDialog(Dialog):
 
@@ -534,8 +555,15 @@ class RemoteInterface(ScrollArea):
         self.setObjectName('remoteInterface')
         self.setWidgetResizable(True)
 
-        self.rclone = RClone()
-        self.configManager = ConfigManager(self.rclone)
+        services = get_services()
+        self.rclone = services.rclone
+        self.configManager = services.configManager
+        self.healthChecker = services.healthChecker
+        self._cards: dict[str, RemoteCard] = {}
+        # 用户点击"测试"发起的探测，结果返回时需要弹出提示
+        self._manual_tests: set[str] = set()
+        self.healthChecker.checkStarted.connect(self.onHealthCheckStarted)
+        self.healthChecker.resultReady.connect(self.onHealthResult)
         logger.info('[远程存储] RemoteInterface 初始化')
 
         self.initUI()
@@ -556,9 +584,12 @@ class RemoteInterface(ScrollArea):
         self.addBtn.clicked.connect(self.showAddDialog)
         self.refreshBtn = PushButton(FIF.SYNC, '刷新', self)
         self.refreshBtn.clicked.connect(self.loadRemotes)
+        self.checkAllBtn = PushButton(FIF.SPEED_HIGH, '全部检查', self)
+        self.checkAllBtn.clicked.connect(self.checkAllRemotes)
 
         headerLayout.addWidget(self.titleLabel)
         headerLayout.addStretch()
+        headerLayout.addWidget(self.checkAllBtn)
         headerLayout.addWidget(self.refreshBtn)
         headerLayout.addWidget(self.addBtn)
 
@@ -576,6 +607,7 @@ class RemoteInterface(ScrollArea):
         logger.info('[远程存储] 开始加载远程存储列表')
 
         count = self.listLayout.count()
+        self._cards.clear()
         while self.listLayout.count():
             item = self.listLayout.takeAt(0)
             if item.widget():
@@ -598,6 +630,8 @@ class RemoteInterface(ScrollArea):
             card.editClicked.connect(self.showEditDialog)
             card.deleteClicked.connect(self.deleteRemote)
             card.testClicked.connect(self.testRemote)
+            self._applyHealth(card, remote.name)
+            self._cards[remote.name] = card
             self.listLayout.addWidget(card)
             logger.debug(f'[远程存储] 已添加卡片: {remote.name} ({remote.type})')
 
@@ -650,6 +684,7 @@ class RemoteInterface(ScrollArea):
                 logger.info(f'[远程存储] 远程存储更新成功: {name}')
                 InfoBar.success('成功', f'已更新远程存储: {name}',
                                parent=self, position=InfoBarPosition.TOP)
+                self.healthChecker.invalidate(name)
                 self.loadRemotes()
                 signalBus.remoteUpdated.emit(name)
             else:
@@ -670,6 +705,7 @@ class RemoteInterface(ScrollArea):
                 logger.info(f'[远程存储] 远程存储删除成功: {name}')
                 InfoBar.success('成功', f'已删除远程存储: {name}',
                                parent=self, position=InfoBarPosition.TOP)
+                self.healthChecker.invalidate(name)
                 self.loadRemotes()
                 signalBus.remoteRemoved.emit(name)
             else:
@@ -681,12 +717,39 @@ class RemoteInterface(ScrollArea):
 
     def testRemote(self, name: str):
         logger.info(f'[远程存储] 用户测试远程存储连接: {name}')
-        success, message = self.configManager.test_remote(name)
-        if success:
-            logger.info(f'[远程存储] 远程存储连接测试成功: {name}, message={message}')
-            InfoBar.success('连接成功', message,
+        self._manual_tests.add(name)
+        self.healthChecker.check(name, force=True)
+
+    def checkAllRemotes(self):
+        names = list(self._cards)
+        logger.info(f'[远程存储] 用户检查全部远程存储: {len(names)} 个')
+        self.healthChecker.check_all(names, force=True)
+
+    def _applyHealth(self, card: RemoteCard, name: str):
+        if self.healthChecker.is_checking(name):
+            card.setChecking()
+            return
+        result = self.healthChecker.result(name)
+        if result is not None:
+            card.setHealth(result)
+
+    def onHealthCheckStarted(self, name: str):
+        card = self._cards.get(name)
+        if card is not None:
+            card.setChecking()
+
+    def onHealthResult(self, name: str, result: HealthResult):
+        card = self._cards.get(name)
+        if card is not None:
+            card.setHealth(result)
+        if name not in self._manual_tests:
+            return
+        self._manual_tests.discard(name)
+        if result.ok:
+            logger.info(f'[远程存储] 远程存储连接测试成功: {name}, 耗时={result.latency:.2f}s')
+            InfoBar.success('连接成功', f'{name}: {result.summary}',
                            parent=self, position=InfoBarPosition.TOP)
         else:
-            logger.warning(f'[远程存储] 远程存储连接测试失败: {name}, message={message}')
-            InfoBar.error('连接失败', message,
+            logger.warning(f'[远程存储] 远程存储连接测试失败: {name}, message={result.message}')
+            InfoBar.error('连接失败', result.message or result.summary,
                          parent=self, position=InfoBarPosition.TOP)
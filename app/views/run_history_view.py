@@ -0,0 +1,192 @@
+from typing import Callable, List, Sequence
+
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QTableWidgetItem
+
+from qfluentwidgets import CaptionLabel, ComboBox, Dialog, TableWidget, isDarkTheme, themeColor
+
+from ..core.quota_service import format_bytes
+from ..core.run_history import RunRecord
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f'{seconds}s'
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f'{minutes}m{seconds:02d}s'
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}h{minutes:02d}m'
+
+
+def _format_speed(value: float) -> str:
+    return f'{format_bytes(int(value))}/s'
+
+
+# 趋势图可选的指标：名称 -> (取值函数, 格式化函数)
+METRICS = {
+    '平均吞吐': (lambda r: r.avg_speed, _format_speed),
+    '峰值吞吐': (lambda r: r.peak_speed, _format_speed),
+    '耗时': (lambda r: r.duration, format_duration),
+    '传输量': (lambda r: float(r.bytes), lambda v: format_bytes(int(v))),
+    '文件数': (lambda r: float(r.files), lambda v: str(int(v))),
+    '错误数': (lambda r: float(r.errors), lambda v: str(int(v))),
+}
+
+
+class TrendChart(QWidget):
+    """按运行顺序绘制某项指标的折线，失败的运行用红点标出。"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values: List[float] = []
+        self.failed: List[bool] = []
+        self.formatter: Callable[[float], str] = str
+        self.setMinimumHeight(160)
+
+    def setData(self, values: Sequence[float], failed: Sequence[bool],
+                formatter: Callable[[float], str] = str):
+        self.values = list(values)
+        self.failed = list(failed)
+        self.formatter = formatter
+        self.update()
+
+    def points(self, rect: QRectF) -> List[QPointF]:
+        if not self.values:
+            return []
+        top = max(self.values) or 1.0
+        step = rect.width() / max(1, len(self.values) - 1)
+        return [QPointF(rect.left() + i * step if len(self.values) > 1 else rect.center().x(),
+                        rect.bottom() - value / top * rect.height())
+                for i, value in enumerate(self.values)]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        textColor = QColor(255, 255, 255, 150) if isDarkTheme() else QColor(0, 0, 0, 150)
+        gridColor = QColor(textColor)
+        gridColor.setAlpha(40)
+
+        rect = QRectF(self.rect()).adjusted(8, 22, -8, -8)
+        painter.setPen(QPen(gridColor, 1))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+        painter.drawLine(rect.topLeft(), rect.topRight())
+
+        painter.setPen(textColor)
+        if not self.values:
+            painter.drawText(self.rect(), Qt.AlignCenter, '暂无运行记录')
+            painter.end()
+            return
+        painter.drawText(QRectF(rect.left(), 0, rect.width(), 20), Qt.AlignLeft | Qt.AlignVCenter,
+                         f'最高 {self.formatter(max(self.values))}')
+        painter.drawText(QRectF(rect.left(), 0, rect.width(), 20), Qt.AlignRight | Qt.AlignVCenter,
+                         f'最近 {self.formatter(self.values[-1])}')
+
+        points = self.points(rect)
+        path = QPainterPath(points[0])
+        for point in points[1:]:
+            path.lineTo(point)
+        painter.setPen(QPen(themeColor(), 2))
+        painter.drawPath(path)
+
+        painter.setPen(Qt.NoPen)
+        for point, failed in zip(points, self.failed):
+            painter.setBrush(QColor(232, 17, 35) if failed else themeColor())
+            painter.drawEllipse(point, 3.5, 3.5)
+        painter.end()
+
+
+class RunHistoryDialog(Dialog):
+    """同步任务的运行历史：趋势图和逐次运行的明细表。"""
+
+    COLUMNS = ['开始时间', '结果', '耗时', '传输量', '文件', '检查', '错误', '平均吞吐', '峰值吞吐', '返回码']
+
+    def __init__(self, title: str, records: List[RunRecord], parent=None):
+        super().__init__(f'运行历史 - {title}', '', parent)
+        # 记录按从新到旧传入，趋势图从旧到新绘制
+        self.records = records
+        self.setFixedSize(760, 560)
+
+        if hasattr(self, 'contentLabel'):
+            self.contentLabel.hide()
+            self.contentLabel.setFixedHeight(0)
+        self.vBoxLayout.setStretchFactor(self.textLayout, 0)
+        button_index = self.vBoxLayout.indexOf(self.buttonGroup)
+
+        self.view = QWidget(self)
+        layout = QVBoxLayout(self.view)
+        layout.setContentsMargins(24, 0, 24, 0)
+        layout.setSpacing(8)
+
+        headerLayout = QHBoxLayout()
+        self.summaryLabel = CaptionLabel(self._summary(), self.view)
+        self.metricCombo = ComboBox(self.view)
+        for name in METRICS:
+            self.metricCombo.addItem(name)
+        self.metricCombo.currentTextChanged.connect(self.setMetric)
+        headerLayout.addWidget(self.summaryLabel)
+        headerLayout.addStretch()
+        headerLayout.addWidget(self.metricCombo)
+        layout.addLayout(headerLayout)
+
+        self.chart = TrendChart(self.view)
+        layout.addWidget(self.chart)
+
+        self.table = TableWidget(self.view)
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(TableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        layout.addWidget(self.table, 1)
+
+        self.vBoxLayout.insertWidget(button_index, self.view, 1)
+        self.yesButton.hide()
+        self.cancelButton.setText('关闭')
+
+        self._fillTable()
+        self.setMetric(self.metricCombo.currentText())
+
+    def _summary(self) -> str:
+        if not self.records:
+            return '暂无运行记录'
+        failed = sum(1 for r in self.records if not r.success)
+        text = f'最近 {len(self.records)} 次运行'
+        if failed:
+            text += f'，{failed} 次失败'
+        return text
+
+    def setMetric(self, name: str):
+        if name not in METRICS:
+            return
+        value, formatter = METRICS[name]
+        records = list(reversed(self.records))
+        self.chart.setData([value(r) for r in records], [not r.success for r in records], formatter)
+
+    def _fillTable(self):
+        self.table.setRowCount(len(self.records))
+        for row, record in enumerate(self.records):
+            result = '成功' if record.success else '失败'
+            if record.dry_run:
+                result += ' (预览)'
+            cells = [
+                record.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+                result,
+                format_duration(record.duration),
+                format_bytes(record.bytes),
+                str(record.files),
+                str(record.checks),
+                str(record.errors),
+                _format_speed(record.avg_speed),
+                _format_speed(record.peak_speed),
+                '' if record.exit_code is None else str(record.exit_code),
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if column == 1:
+                    item.setToolTip(record.message)
+                elif column == 0:
+                    item.setToolTip(' '.join(record.flags))
+                self.table.setItem(row, column, item)
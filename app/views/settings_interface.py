@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
 from qfluentwidgets import (
     ScrollArea, FluentIcon as FIF, SettingCardGroup,
     SwitchSettingCard, ComboBoxSettingCard, PushSettingCard,
-    PrimaryPushSettingCard, HyperlinkCard, OptionsSettingCard,
+    PrimaryPushSettingCard, HyperlinkCard, OptionsSettingCard, RangeSettingCard,
     TitleLabel, setTheme, Theme, isDarkTheme, qconfig
 )
 
@@ -16,7 +16,7 @@ from ..common.config import cfg, get_system_theme, CacheDirMode, get_cache_dir,
 from ..common.signal_bus import signalBus
 from ..common.auto_start import set_auto_start, is_auto_start_enabled
 from ..common.logger import get_logger
-from ..core.rclone import RClone
+from ..core.services import get_services
 from qfluentwidgets import InfoBar, InfoBarPosition
 
 logger = get_logger('settings')
@@ -29,7 +29,7 @@ class SettingsInterface(ScrollArea):
         self.setObjectName('settingsInterface')
         self.setWidgetResizable(True)
 
-        self.rclone = RClone()
+        self.rclone = get_services().rclone
         self.initUI()
         self.syncAutoStartState()
 
@@ -65,8 +65,20 @@ class SettingsInterface(ScrollArea):
         )
         self.rclonePathCard.clicked.connect(self.selectRclonePath)
 
+        self.rcdBackendCard = SwitchSettingCard(
+            FIF.SPEED_HIGH,
+            '常驻 rcd 后端',
+            '通过常驻的 rclone rcd 进程执行浏览和查询操作，重启应用后生效',
+            cfg.rcdBackend,
+            self.rcloneGroup
+        )
+        self.rcdBackendCard.checkedChanged.connect(
+            lambda checked: logger.info(f'用户更改 rcd 后端设置: {checked}')
+        )
+
         self.rcloneGroup.addSettingCard(self.rcloneVersionCard)
         self.rcloneGroup.addSettingCard(self.rclonePathCard)
+        self.rcloneGroup.addSettingCard(self.rcdBackendCard)
 
         self.appGroup = SettingCardGroup('应用设置', self)
 
@@ -129,6 +141,17 @@ class SettingsInterface(ScrollArea):
             lambda checked: logger.info(f'用户更改自动挂载设置: {checked}')
         )
 
+        self.mountHostCard = SwitchSettingCard(
+            FIF.APPLICATION,
+            '单进程挂载',
+            '所有挂载共用一个 rclone rcd 进程，减少内存占用，挂载和卸载更快；对之后的挂载生效',
+            cfg.mountHost,
+            self.mountGroup
+        )
+        self.mountHostCard.checkedChanged.connect(
+            lambda checked: logger.info(f'用户更改单进程挂载设置: {checked}')
+        )
+
         self.cacheDirModeCard = ComboBoxSettingCard(
             cfg.cacheDirMode,
             FIF.FOLDER,
@@ -150,9 +173,79 @@ class SettingsInterface(ScrollArea):
         self.cacheDirCustomCard.setVisible(cfg.cacheDirMode.value == CacheDirMode.CUSTOM)
 
         self.mountGroup.addSettingCard(self.autoMountCard)
+        self.mountGroup.addSettingCard(self.mountHostCard)
         self.mountGroup.addSettingCard(self.cacheDirModeCard)
         self.mountGroup.addSettingCard(self.cacheDirCustomCard)
 
+        self.transferGroup = SettingCardGroup('传输设置', self)
+
+        self.transferConcurrencyCard = RangeSettingCard(
+            cfg.transferConcurrency,
+            FIF.SPEED_HIGH,
+            '并发传输数',
+            '文件浏览器上传/下载时同时运行的传输作业数',
+            self.transferGroup
+        )
+
+        self.transferRetriesCard = RangeSettingCard(
+            cfg.transferRetries,
+            FIF.SYNC,
+            '失败重试次数',
+            '单个文件传输失败后自动重试的次数',
+            self.transferGroup
+        )
+
+        self.transferGroup.addSettingCard(self.transferConcurrencyCard)
+        self.transferGroup.addSettingCard(self.transferRetriesCard)
+
+        self.syncGroup = SettingCardGroup('同步设置', self)
+
+        self.maxConcurrentTasksCard = RangeSettingCard(
+            cfg.maxConcurrentTasks,
+            FIF.SYNC,
+            '最大并发任务数',
+            '同时运行的同步任务上限，超出的任务进入队列等待',
+            self.syncGroup
+        )
+
+        self.perRemoteTasksCard = RangeSettingCard(
+            cfg.perRemoteTasks,
+            FIF.CLOUD,
+            '单个存储并发任务数',
+            '涉及同一远程存储（或本地磁盘）的同步任务同时运行的上限',
+            self.syncGroup
+        )
+
+        self.maxShardProcessesCard = RangeSettingCard(
+            cfg.maxShardProcesses,
+            FIF.SPEED_HIGH,
+            '分片同步进程上限',
+            '所有分片并行同步任务同时运行的 rclone 进程总数上限',
+            self.syncGroup
+        )
+
+        self.historyRetentionDaysCard = RangeSettingCard(
+            cfg.historyRetentionDays,
+            FIF.HISTORY,
+            '运行历史保留天数',
+            '超过该天数的同步运行记录会被删除，0 表示不按天数清理',
+            self.syncGroup
+        )
+
+        self.historyMaxRunsCard = RangeSettingCard(
+            cfg.historyMaxRuns,
+            FIF.HISTORY,
+            '每个任务保留的运行记录',
+            '每个同步任务最多保留的运行历史条数',
+            self.syncGroup
+        )
+
+        self.syncGroup.addSettingCard(self.maxConcurrentTasksCard)
+        self.syncGroup.addSettingCard(self.perRemoteTasksCard)
+        self.syncGroup.addSettingCard(self.maxShardProcessesCard)
+        self.syncGroup.addSettingCard(self.historyRetentionDaysCard)
+        self.syncGroup.addSettingCard(self.historyMaxRunsCard)
+
         self.aboutGroup = SettingCardGroup('关于', self)
 
         self.appDirCard = PushSettingCard(
@@ -179,6 +272,8 @@ class SettingsInterface(ScrollArea):
         self.mainLayout.addWidget(self.rcloneGroup)
         self.mainLayout.addWidget(self.appGroup)
         self.mainLayout.addWidget(self.mountGroup)
+        self.mainLayout.addWidget(self.transferGroup)
+        self.mainLayout.addWidget(self.syncGroup)
         self.mainLayout.addWidget(self.aboutGroup)
         self.mainLayout.addStretch()
 
@@ -191,7 +286,7 @@ class SettingsInterface(ScrollArea):
             logger.info(f'用户更改 RClone 路径: {path}')
             cfg.rclonePath.value = path
             self.rclonePathCard.setContent(path)
-            self.rclone.rclone_path = path
+            self.rclone.set_rclone_path(path)
             self.rcloneVersionCard.setContent(self.rclone.version())
             logger.info(f'RClone 版本已更新: {self.rclone.version()}')
 
@@ -0,0 +1,263 @@
+"""
+存储空间分析窗口。
+
+后台流式读取 ``remote:path`` 的递归列表并累加到 DirTree，界面按固定间隔
+刷新当前目录的子目录列表；双击子目录进入下一层，可按名称、大小、占比
+或文件数排序。
+"""
+
+from typing import List
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QThread, QTimer, Signal
+from PySide6.QtWidgets import QAbstractItemView, QHBoxLayout, QHeaderView, QVBoxLayout, QWidget
+
+from qfluentwidgets import (
+    FluentIcon as FIF, CaptionLabel, StrongBodyLabel, ToolButton, TreeView, PushButton
+)
+
+from ..core.quota_service import format_bytes
+from ..core.rclone import RClone
+from ..core.storage_analyzer import ROOT, DirTree
+from ..common.logger import get_logger
+
+logger = get_logger('analyzer')
+
+# 行列表中代表"当前目录下的文件"的占位编号
+FILES_ROW = -1
+
+
+class AnalyzeWorker(QThread):
+    progress = Signal(int)
+    finished = Signal(bool, str)
+
+    def __init__(self, rclone: RClone, remote_path: str, tree: DirTree, batch_size: int = 5000):
+        super().__init__()
+        self.rclone = rclone
+        self.remote_path = remote_path
+        self.tree = tree
+        self.batch_size = batch_size
+        self._stream = None
+
+    def run(self):
+        self._stream = self.rclone.lsjson_stream(self.remote_path, recursive=True,
+                                                 batch_size=self.batch_size,
+                                                 fast_list=True, no_mimetype=True)
+        for batch in self._stream:
+            self.tree.add_entries(batch)
+            self.progress.emit(self._stream.count)
+        self.finished.emit(self._stream.success, self._stream.error)
+
+    def cancel(self):
+        if self._stream is not None:
+            self._stream.cancel()
+        if not self.isFinished():
+            self.wait(3000)
+
+
+class DirUsageModel(QAbstractTableModel):
+    """DirTree 中一个目录的直接子目录列表。"""
+
+    HEADERS = ('名称', '大小', '占比', '文件数')
+
+    def __init__(self, tree: DirTree, parent=None):
+        super().__init__(parent)
+        self.tree = tree
+        self.node = ROOT
+        self._rows: List[int] = []
+        self._sort_column = 1
+        self._sort_order = Qt.DescendingOrder
+        self._folder_icon = FIF.FOLDER.icon()
+        self._file_icon = FIF.DOCUMENT.icon()
+
+    def setNode(self, node: int):
+        self.node = node
+        self.reload()
+
+    def reload(self):
+        """重新读取当前目录的子项（抓取过程中定期调用）。"""
+        self.beginResetModel()
+        with self.tree.lock:
+            rows = self.tree.children(self.node)
+            if self.tree.own_files[self.node]:
+                rows.append(FILES_ROW)
+            self._rows = rows
+            self._sort_rows()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def nodeAt(self, row: int) -> int:
+        return self._rows[row]
+
+    def _size(self, row_node: int) -> int:
+        if row_node == FILES_ROW:
+            return self.tree.own_sizes[self.node]
+        return self.tree.sizes[row_node]
+
+    def _files(self, row_node: int) -> int:
+        if row_node == FILES_ROW:
+            return self.tree.own_files[self.node]
+        return self.tree.files[row_node]
+
+    def _name(self, row_node: int) -> str:
+        if row_node == FILES_ROW:
+            return f'<{self.tree.own_files[self.node]} 个文件>'
+        return self.tree.names[row_node]
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row_node = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self._name(row_node)
+            if column == 1:
+                return format_bytes(self._size(row_node))
+            if column == 2:
+                total = self.tree.sizes[self.node]
+                return f'{self._size(row_node) * 100 / total:.1f}%' if total else '-'
+            return str(self._files(row_node))
+        if role == Qt.DecorationRole and column == 0:
+            return self._file_icon if row_node == FILES_ROW else self._folder_icon
+        if role == Qt.TextAlignmentRole and column > 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.beginResetModel()
+        with self.tree.lock:
+            self._sort_rows()
+        self.endResetModel()
+
+    def _sort_rows(self):
+        if self._sort_column == 0:
+            key = lambda n: self._name(n).casefold()
+        elif self._sort_column == 3:
+            key = self._files
+        else:
+            # 大小和占比按同一数值排序
+            key = self._size
+        self._rows.sort(key=key, reverse=self._sort_order == Qt.DescendingOrder)
+
+
+class StorageAnalyzerWindow(QWidget):
+    """对一个 remote:path 做空间占用分析的独立窗口。"""
+
+    REFRESH_INTERVAL = 500
+
+    def __init__(self, rclone: RClone, remote_path: str, parent=None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.Window)
+        self.setWindowTitle(f'空间分析 - {remote_path}')
+        self.resize(760, 560)
+        self.rclone = rclone
+        self.remote_path = remote_path
+        self.tree = DirTree()
+        self._worker = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 16, 20, 16)
+        layout.setSpacing(10)
+
+        headerLayout = QHBoxLayout()
+        self.upBtn = ToolButton(FIF.UP, self)
+        self.upBtn.clicked.connect(self.goUp)
+        self.upBtn.setEnabled(False)
+        self.pathLabel = StrongBodyLabel(remote_path, self)
+        self.stopBtn = PushButton(FIF.CLOSE, '停止', self)
+        self.stopBtn.clicked.connect(self.stop)
+        headerLayout.addWidget(self.upBtn)
+        headerLayout.addWidget(self.pathLabel, 1)
+        headerLayout.addWidget(self.stopBtn)
+        layout.addLayout(headerLayout)
+
+        self.model = DirUsageModel(self.tree, self)
+        self.view = TreeView(self)
+        self.view.setModel(self.model)
+        self.view.setRootIsDecorated(False)
+        self.view.setUniformRowHeights(True)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(1, Qt.DescendingOrder)
+        self.view.doubleClicked.connect(self.onDoubleClicked)
+        header = self.view.header()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in (1, 2, 3):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        layout.addWidget(self.view, 1)
+
+        self.statusLabel = CaptionLabel('', self)
+        layout.addWidget(self.statusLabel)
+
+        # 抓取期间按固定间隔刷新，而不是每批都重建模型
+        self._refreshTimer = QTimer(self)
+        self._refreshTimer.setInterval(self.REFRESH_INTERVAL)
+        self._refreshTimer.timeout.connect(self.model.reload)
+
+    def start(self):
+        logger.info(f'[空间分析] 开始分析 {self.remote_path}')
+        self._worker = AnalyzeWorker(self.rclone, self.remote_path, self.tree)
+        self._worker.progress.connect(self._on_progress)
+        self._worker.finished.connect(self._on_finished)
+        self._refreshTimer.start()
+        self.statusLabel.setText('正在读取...')
+        self._worker.start()
+
+    def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def _on_progress(self, count: int):
+        self.statusLabel.setText(f'正在读取... 已扫描 {count} 项，'
+                                 f'{len(self.tree)} 个目录，{format_bytes(self.tree.total_size)}')
+
+    def _on_finished(self, success: bool, error: str):
+        self._refreshTimer.stop()
+        self.model.reload()
+        self.stopBtn.setEnabled(False)
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.deleteLater()
+        summary = (f'{self.tree.total_files} 个文件，{len(self.tree)} 个目录，'
+                   f'共 {format_bytes(self.tree.total_size)}')
+        if success:
+            self.statusLabel.setText(f'分析完成: {summary}')
+        else:
+            logger.warning(f'[空间分析] {self.remote_path} 未完成: {error[:200]}')
+            self.statusLabel.setText(f'分析未完成（{error}）: {summary}')
+
+    def _show_node(self, node: int):
+        self.model.setNode(node)
+        path = self.tree.path(node)
+        if path:
+            base = self.remote_path.rstrip('/')
+            path = f'{base}{"" if base.endswith(":") else "/"}{path}'
+        self.pathLabel.setText(path or self.remote_path)
+        self.upBtn.setEnabled(node != ROOT)
+
+    def onDoubleClicked(self, index: QModelIndex):
+        if not index.isValid():
+            return
+        node = self.model.nodeAt(index.row())
+        if node != FILES_ROW:
+            self._show_node(node)
+
+    def goUp(self):
+        if self.model.node != ROOT:
+            self._show_node(self.tree.parents[self.model.node])
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
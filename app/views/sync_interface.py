@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QThread
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFileDialog
 )
@@ -16,23 +16,48 @@ from qfluentwidgets import (
     TitleLabel, BodyLabel, StrongBodyLabel, CaptionLabel, PrimaryPushButton,
     PushButton, TransparentPushButton, SimpleCardWidget,
     MessageBox, ComboBox, Dialog, LineEdit, ProgressBar,
-    InfoBar, InfoBarPosition, SwitchButton, isDarkTheme
+    InfoBar, InfoBarPosition, SwitchButton, SpinBox, isDarkTheme
 )
 
 from ..common.signal_bus import signalBus
 from ..common.logger import get_logger
-from ..core.rclone import RClone
-from ..core.config_manager import ConfigManager
-from ..core.sync_manager import SyncManager
+from ..core.quota_service import format_bytes
+from ..core.services import get_services
+from ..core.sync_planner import SyncPlan, build_plan
+from .run_history_view import RunHistoryDialog
+from ..models.perf_profile import MAX_S3_UPLOAD_CONCURRENCY, PRESETS, PerfProfile, preset_profile
 from ..models.sync_task import SyncTask, SyncMode, SyncStatus
 
 logger = get_logger('sync')
 
 
+class PlanWorker(QThread):
+    finished = Signal(str, object, str)
+
+    def __init__(self, rclone, task: SyncTask):
+        super().__init__()
+        self.rclone = rclone
+        self.task = task
+        self._cancelled = False
+
+    def run(self):
+        try:
+            plan, error = build_plan(self.rclone, self.task, cancelled=lambda: self._cancelled)
+        except Exception as e:
+            logger.error(f'生成同步预览出错: {e}', exc_info=True)
+            plan, error = None, str(e)
+        self.finished.emit(self.task.id, plan, error)
+
+    def cancel(self):
+        self._cancelled = True
+
+
 class SyncTaskCard(SimpleCardWidget):
 
     runClicked = Signal(str)
     stopClicked = Signal(str)
+    planClicked = Signal(str)
+    historyClicked = Signal(str)
     editClicked = Signal(str)
     deleteClicked = Signal(str)
 
@@ -52,13 +77,16 @@ class SyncTaskCard(SimpleCardWidget):
         self.nameLabel = StrongBodyLabel(task.name or f'任务 {task.id}', self)
 
         mode_text = {'sync': '同步', 'copy': '复制', 'move': '移动', 'bisync': '双向同步'}
-        self.infoLabel = CaptionLabel(
-            f'{mode_text.get(task.mode.value, task.mode.value)}: {task.source} → {task.destination}',
-            self
-        )
+        info = f'{mode_text.get(task.mode.value, task.mode.value)}: {task.source} → {task.destination}'
+        if task.transfers > 0:
+            info += f'  ·  并发 {task.transfers}/{task.checkers or "默认"}'
+            if task.auto_tune:
+                info += ' (自动)'
+        self.infoLabel = CaptionLabel(info, self)
 
         status_text = {
             SyncStatus.IDLE: '空闲',
+            SyncStatus.QUEUED: '排队中',
             SyncStatus.RUNNING: '运行中',
             SyncStatus.PAUSED: '已暂停',
             SyncStatus.COMPLETED: '已完成',
@@ -82,6 +110,15 @@ class SyncTaskCard(SimpleCardWidget):
         self.actionBtn.setFixedWidth(70)
         self._updateButton()
 
+        self.planBtn = TransparentPushButton('预览', self)
+        self.planBtn.setFixedWidth(60)
+        self.planBtn.setVisible(task.mode != SyncMode.BISYNC)
+        self.planBtn.clicked.connect(lambda: self.planClicked.emit(task.id))
+
+        self.historyBtn = TransparentPushButton('历史', self)
+        self.historyBtn.setFixedWidth(60)
+        self.historyBtn.clicked.connect(lambda: self.historyClicked.emit(task.id))
+
         self.editBtn = TransparentPushButton('编辑', self)
         self.editBtn.setFixedWidth(60)
         self.editBtn.clicked.connect(lambda: self.editClicked.emit(task.id))
@@ -92,6 +129,8 @@ class SyncTaskCard(SimpleCardWidget):
 
         btnLayout.addWidget(self.progressBar)
         btnLayout.addWidget(self.actionBtn)
+        btnLayout.addWidget(self.planBtn)
+        btnLayout.addWidget(self.historyBtn)
         btnLayout.addWidget(self.editBtn)
         btnLayout.addWidget(self.deleteBtn)
 
@@ -104,10 +143,15 @@ class SyncTaskCard(SimpleCardWidget):
         self.progressBar.setValue(progress)
         self.progressBar.setVisible(True)
 
+    def setPlanning(self, planning: bool):
+        self.planBtn.setEnabled(not planning)
+        self.planBtn.setText('预览中' if planning else '预览')
+
     def updateStatus(self, status: SyncStatus):
         self.task.status = status
         status_text = {
             SyncStatus.IDLE: '空闲',
+            SyncStatus.QUEUED: '排队中',
             SyncStatus.RUNNING: '运行中',
             SyncStatus.PAUSED: '已暂停',
             SyncStatus.COMPLETED: '已完成',
@@ -126,7 +170,7 @@ class SyncTaskCard(SimpleCardWidget):
         except (TypeError, RuntimeError):
             pass
 
-        if self.task.status == SyncStatus.RUNNING:
+        if self.task.status in (SyncStatus.RUNNING, SyncStatus.QUEUED):
             self.actionBtn.setText('停止')
             self._current_action_handler = lambda: self.stopClicked.emit(self.task.id)
         else:
@@ -145,7 +189,8 @@ class AddSyncDialog(Dialog):
         title = '编辑同步任务' if task else '添加同步任务'
         super().__init__(title, '', parent)
 
-        self.setFixedSize(500, 520)
+        self.setFixedSize(500, 680)
+        self._loadingPerf = False
         self.initUI()
 
         if task:
@@ -163,9 +208,16 @@ class AddSyncDialog(Dialog):
         # 找到按钮组位置，在其前面插入自定义布局
         button_index = self.vBoxLayout.indexOf(self.buttonGroup)
 
-        layout = QVBoxLayout()
+        # 选项较多，放在可滚动的区域中
+        self.scrollArea = ScrollArea(self)
+        self.scrollArea.setWidgetResizable(True)
+        self.scrollArea.enableTransparentBackground()
+        self.scrollWidget = QWidget()
+        self.scrollWidget.setStyleSheet('QWidget{background: transparent}')
+        layout = QVBoxLayout(self.scrollWidget)
         layout.setSpacing(12)
         layout.setContentsMargins(24, 0, 24, 0)
+        self.scrollArea.setWidget(self.scrollWidget)
 
         layout.addWidget(QLabel('任务名称:'))
         self.nameEdit = LineEdit(self)
@@ -257,6 +309,14 @@ class AddSyncDialog(Dialog):
         self.cronStatusLabel = CaptionLabel('', self)
         layout.addWidget(self.cronStatusLabel)
 
+        watchLayout = QHBoxLayout()
+        watchLayout.addWidget(QLabel('监视源目录变化 (仅本地源):'))
+        self.watchSwitch = SwitchButton(self)
+        self.watchSwitch.setChecked(False)
+        watchLayout.addStretch()
+        watchLayout.addWidget(self.watchSwitch)
+        layout.addLayout(watchLayout)
+
         layout.addSpacing(10)
         layout.addWidget(QLabel('高级选项:'))
 
@@ -290,16 +350,137 @@ class AddSyncDialog(Dialog):
         deleteExcludedLayout.addWidget(self.deleteExcludedSwitch)
         layout.addLayout(deleteExcludedLayout)
 
-        self.vBoxLayout.insertLayout(button_index, layout)
+        incrementalLayout = QHBoxLayout()
+        incrementalLayout.addWidget(QLabel('增量复制 (仅复制模式):'))
+        self.incrementalSwitch = SwitchButton(self)
+        self.incrementalSwitch.setChecked(False)
+        self.incrementalSwitch.checkedChanged.connect(self.onIncrementalToggled)
+        incrementalLayout.addStretch()
+        incrementalLayout.addWidget(self.incrementalSwitch)
+        layout.addLayout(incrementalLayout)
+
+        incrementalOptions = QHBoxLayout()
+        incrementalOptions.addWidget(QLabel('完整比对间隔 (小时, 0 为从不):'))
+        self.fullCheckSpin = SpinBox(self)
+        self.fullCheckSpin.setRange(0, 24 * 30)
+        self.fullCheckSpin.setValue(24)
+        incrementalOptions.addWidget(self.fullCheckSpin)
+        incrementalOptions.addStretch()
+        incrementalOptions.addWidget(QLabel('不遍历目标:'))
+        self.noTraverseSwitch = SwitchButton(self)
+        self.noTraverseSwitch.setChecked(False)
+        incrementalOptions.addWidget(self.noTraverseSwitch)
+        layout.addLayout(incrementalOptions)
+        self.onIncrementalToggled(False)
+
+        hashLayout = QHBoxLayout()
+        hashLayout.addWidget(QLabel('哈希预筛选 (本地源, 仅复制模式):'))
+        self.hashPrecheckSwitch = SwitchButton(self)
+        self.hashPrecheckSwitch.setChecked(False)
+        hashLayout.addStretch()
+        hashLayout.addWidget(self.hashPrecheckSwitch)
+        layout.addLayout(hashLayout)
+
+        tuneLayout = QHBoxLayout()
+        tuneLayout.addWidget(QLabel('自动调优并发 (关闭后固定使用下列数值):'))
+        self.autoTuneSwitch = SwitchButton(self)
+        self.autoTuneSwitch.setChecked(False)
+        self.autoTuneSwitch.checkedChanged.connect(self.onAutoTuneToggled)
+        tuneLayout.addStretch()
+        tuneLayout.addWidget(self.autoTuneSwitch)
+        layout.addLayout(tuneLayout)
+
+        concurrencyLayout = QHBoxLayout()
+        concurrencyLayout.addWidget(QLabel('传输数:'))
+        self.transfersSpin = SpinBox(self)
+        self.transfersSpin.setRange(0, 64)
+        concurrencyLayout.addWidget(self.transfersSpin)
+        concurrencyLayout.addWidget(QLabel('检查数:'))
+        self.checkersSpin = SpinBox(self)
+        self.checkersSpin.setRange(0, 128)
+        concurrencyLayout.addWidget(self.checkersSpin)
+        concurrencyLayout.addWidget(QLabel('分块线程:'))
+        self.streamsSpin = SpinBox(self)
+        self.streamsSpin.setRange(0, 32)
+        concurrencyLayout.addWidget(self.streamsSpin)
+        layout.addLayout(concurrencyLayout)
+        layout.addWidget(CaptionLabel('0 表示使用 rclone 默认值', self))
+
+        shardLayout = QHBoxLayout()
+        shardLayout.addWidget(QLabel('分片并行进程 (0 为关闭):'))
+        self.shardsSpin = SpinBox(self)
+        self.shardsSpin.setRange(0, 32)
+        shardLayout.addWidget(self.shardsSpin)
+        shardLayout.addWidget(QLabel('分片目录深度:'))
+        self.shardDepthSpin = SpinBox(self)
+        self.shardDepthSpin.setRange(1, 4)
+        self.shardDepthSpin.setValue(1)
+        shardLayout.addWidget(self.shardDepthSpin)
+        layout.addLayout(shardLayout)
+        layout.addWidget(CaptionLabel('按源目录的子目录拆分为多个 rclone 进程同时运行，适合文件数极多的目录树', self))
 
-        # 在自定义内容和按钮栏之间插入弹性空间
-        new_button_index = self.vBoxLayout.indexOf(self.buttonGroup)
-        self.vBoxLayout.insertStretch(new_button_index, 1)
+        layout.addSpacing(10)
+        perfHeader = QHBoxLayout()
+        perfHeader.addWidget(QLabel('性能配置:'))
+        self.perfPresetCombo = ComboBox(self)
+        self.perfPresetCombo.addItem('自定义', userData='')
+        for name, (label, _) in PRESETS.items():
+            self.perfPresetCombo.addItem(label, userData=name)
+        self.perfPresetCombo.currentIndexChanged.connect(self.onPerfPresetChanged)
+        perfHeader.addStretch()
+        perfHeader.addWidget(self.perfPresetCombo)
+        layout.addLayout(perfHeader)
+
+        perfSizeLayout = QHBoxLayout()
+        perfSizeLayout.addWidget(QLabel('缓冲区:'))
+        self.bufferSizeEdit = LineEdit(self)
+        self.bufferSizeEdit.setPlaceholderText('16M')
+        perfSizeLayout.addWidget(self.bufferSizeEdit, 1)
+        perfSizeLayout.addWidget(QLabel('多线程阈值:'))
+        self.multiThreadCutoffEdit = LineEdit(self)
+        self.multiThreadCutoffEdit.setPlaceholderText('256M')
+        perfSizeLayout.addWidget(self.multiThreadCutoffEdit, 1)
+        layout.addLayout(perfSizeLayout)
+
+        s3Layout = QHBoxLayout()
+        s3Layout.addWidget(QLabel('S3 分片上传并发 (0 为默认):'))
+        self.s3ConcurrencySpin = SpinBox(self)
+        self.s3ConcurrencySpin.setRange(0, MAX_S3_UPLOAD_CONCURRENCY)
+        s3Layout.addStretch()
+        s3Layout.addWidget(self.s3ConcurrencySpin)
+        layout.addLayout(s3Layout)
+
+        self.fastListSwitch = self._addSwitchRow(layout, '一次性递归列目录 (--fast-list):')
+        self.sizeOnlySwitch = self._addSwitchRow(layout, '只比较大小 (--size-only):')
+        self.updateSwitch = self._addSwitchRow(layout, '跳过目标端较新的文件 (--update):')
+        self.trackRenamesSwitch = self._addSwitchRow(layout, '识别重命名 (--track-renames, 仅同步模式):')
+
+        self.perfStatusLabel = CaptionLabel('', self)
+        layout.addWidget(self.perfStatusLabel)
+
+        for edit in (self.bufferSizeEdit, self.multiThreadCutoffEdit):
+            edit.textEdited.connect(self.onPerfEdited)
+        self.s3ConcurrencySpin.valueChanged.connect(self.onPerfEdited)
+        for switch in (self.fastListSwitch, self.sizeOnlySwitch, self.updateSwitch,
+                       self.trackRenamesSwitch):
+            switch.checkedChanged.connect(self.onPerfEdited)
+
+        self.vBoxLayout.insertWidget(button_index, self.scrollArea, 1)
 
         # 按钮文本汉化
         self.yesButton.setText('确认')
         self.cancelButton.setText('取消')
 
+    def _addSwitchRow(self, layout: QVBoxLayout, text: str) -> SwitchButton:
+        row = QHBoxLayout()
+        row.addWidget(QLabel(text))
+        switch = SwitchButton(self)
+        switch.setChecked(False)
+        row.addStretch()
+        row.addWidget(switch)
+        layout.addLayout(row)
+        return switch
+
     def browseLocal(self, edit: LineEdit):
         folder = QFileDialog.getExistingDirectory(self, '选择文件夹')
         if folder:
@@ -319,6 +500,75 @@ class AddSyncDialog(Dialog):
             self.nextRunLabel.setText('下次运行: -')
             self.cronStatusLabel.setText('')
 
+    def onIncrementalToggled(self, enabled: bool):
+        self.fullCheckSpin.setEnabled(enabled)
+        self.noTraverseSwitch.setEnabled(enabled)
+
+    def onAutoTuneToggled(self, enabled: bool):
+        # 自动调优时数值由运行结果决定，只用于查看
+        self.transfersSpin.setEnabled(not enabled)
+        self.checkersSpin.setEnabled(not enabled)
+        self.streamsSpin.setEnabled(not enabled)
+
+    def onPerfPresetChanged(self, index: int):
+        name = self.perfPresetCombo.currentData()
+        if name:
+            self.setPerfProfile(preset_profile(name))
+
+    def onPerfEdited(self, *args):
+        if self._loadingPerf:
+            return
+        # 手动修改后不再属于预设
+        self.perfPresetCombo.blockSignals(True)
+        self.perfPresetCombo.setCurrentIndex(0)
+        self.perfPresetCombo.blockSignals(False)
+        self.perfStatusLabel.setText('')
+
+    def setPerfProfile(self, profile: PerfProfile):
+        self._loadingPerf = True
+        try:
+            self.bufferSizeEdit.setText(profile.buffer_size)
+            self.multiThreadCutoffEdit.setText(profile.multi_thread_cutoff)
+            self.s3ConcurrencySpin.setValue(profile.s3_upload_concurrency)
+            self.fastListSwitch.setChecked(profile.fast_list)
+            self.sizeOnlySwitch.setChecked(profile.size_only)
+            self.updateSwitch.setChecked(profile.update)
+            self.trackRenamesSwitch.setChecked(profile.track_renames)
+            self.perfPresetCombo.blockSignals(True)
+            index = self.perfPresetCombo.findData(profile.preset) if profile.preset else 0
+            self.perfPresetCombo.setCurrentIndex(max(0, index))
+            self.perfPresetCombo.blockSignals(False)
+        finally:
+            self._loadingPerf = False
+
+    def perfProfile(self) -> PerfProfile:
+        """按编辑器内容构造性能配置；取值无效时抛出 ValueError。"""
+        return PerfProfile(
+            preset=self.perfPresetCombo.currentData() or '',
+            fast_list=self.fastListSwitch.isChecked(),
+            buffer_size=self.bufferSizeEdit.text().strip(),
+            multi_thread_cutoff=self.multiThreadCutoffEdit.text().strip(),
+            s3_upload_concurrency=self.s3ConcurrencySpin.value(),
+            size_only=self.sizeOnlySwitch.isChecked(),
+            update=self.updateSwitch.isChecked(),
+            track_renames=self.trackRenamesSwitch.isChecked()
+        )
+
+    def validate(self) -> bool:
+        try:
+            self.perfProfile()
+        except ValueError as e:
+            self.perfStatusLabel.setText(f'✗ {e}')
+            self.perfStatusLabel.setStyleSheet(f'color: {"#ff6b6b" if isDarkTheme() else "red"};')
+            return False
+        return True
+
+    def accept(self):
+        if not self.validate():
+            self.scrollArea.ensureWidgetVisible(self.perfStatusLabel)
+            return
+        super().accept()
+
     def onPresetChanged(self, index: int):
         preset = self.schedulePresetCombo.currentData()
         if preset:
@@ -370,10 +620,24 @@ class AddSyncDialog(Dialog):
             if not preset_found:
                 self.schedulePresetCombo.setCurrentIndex(0)
 
+        self.watchSwitch.setChecked(task.watch)
         self.bwLimitEdit.setText(task.bandwidth_limit)
         self.excludeEdit.setPlainText('\n'.join(task.exclude_patterns))
         self.dryRunSwitch.setChecked(task.dry_run)
         self.deleteExcludedSwitch.setChecked(task.delete_excluded)
+        self.incrementalSwitch.setChecked(task.incremental)
+        self.onIncrementalToggled(task.incremental)
+        self.fullCheckSpin.setValue(task.full_check_interval)
+        self.noTraverseSwitch.setChecked(task.no_traverse)
+        self.hashPrecheckSwitch.setChecked(task.hash_precheck)
+        self.autoTuneSwitch.setChecked(task.auto_tune)
+        self.onAutoTuneToggled(task.auto_tune)
+        self.transfersSpin.setValue(task.transfers)
+        self.checkersSpin.setValue(task.checkers)
+        self.streamsSpin.setValue(task.multi_thread_streams)
+        self.shardsSpin.setValue(task.shards)
+        self.shardDepthSpin.setValue(task.shard_depth)
+        self.setPerfProfile(task.perf)
 
     def getData(self) -> dict:
         exclude_text = self.excludeEdit.toPlainText().strip()
@@ -386,13 +650,62 @@ class AddSyncDialog(Dialog):
             'mode': self.modeCombo.currentData() or SyncMode.SYNC,
             'scheduled': self.scheduleSwitch.isChecked(),
             'cron_expression': self.cronEdit.text().strip() if self.scheduleSwitch.isChecked() else '',
+            'watch': self.watchSwitch.isChecked(),
             'bandwidth_limit': self.bwLimitEdit.text().strip(),
             'exclude_patterns': exclude_patterns,
             'dry_run': self.dryRunSwitch.isChecked(),
-            'delete_excluded': self.deleteExcludedSwitch.isChecked()
+            'delete_excluded': self.deleteExcludedSwitch.isChecked(),
+            'incremental': self.incrementalSwitch.isChecked(),
+            'full_check_interval': self.fullCheckSpin.value(),
+            'no_traverse': self.noTraverseSwitch.isChecked(),
+            'hash_precheck': self.hashPrecheckSwitch.isChecked(),
+            'auto_tune': self.autoTuneSwitch.isChecked(),
+            'transfers': self.transfersSpin.value(),
+            'checkers': self.checkersSpin.value(),
+            'multi_thread_streams': self.streamsSpin.value(),
+            'shards': self.shardsSpin.value(),
+            'shard_depth': self.shardDepthSpin.value(),
+            'perf': self.perfProfile()
         }
 
 
+def _plan_text(plan: SyncPlan, limit: int = 5) -> str:
+    lines = [
+        f'新增: {len(plan.new)} 个文件，{format_bytes(plan.new_bytes)}',
+        f'更新: {len(plan.changed)} 个文件，{format_bytes(plan.changed_bytes)}',
+    ]
+    if plan.mode == SyncMode.SYNC:
+        lines.append(f'删除: {len(plan.deleted)} 个文件，{format_bytes(plan.deleted_bytes)}')
+    lines.append(f'相同: {plan.identical} 个文件')
+    if plan.errors:
+        lines.append(f'比对出错: {len(plan.errors)} 个文件')
+    lines.append(f'合计传输 {plan.transfer_count} 个文件，{format_bytes(plan.transfer_bytes)}')
+
+    for title, paths in (('新增', plan.new), ('更新', plan.changed), ('删除', plan.deleted),
+                         ('出错', plan.errors)):
+        if paths:
+            more = f' 等 {len(paths)} 项' if len(paths) > limit else ''
+            lines.append(f'\n{title}: {", ".join(paths[:limit])}{more}')
+
+    if plan.is_empty:
+        lines.append('\n源和目标一致，无需运行。')
+    elif plan.files_for_run() is None:
+        lines.append('\n存在需要删除的文件或比对出错，将完整运行任务。')
+    else:
+        lines.append('\n将只处理计划中列出的文件。')
+    return '\n'.join(lines)
+
+
+class SyncPlanDialog(Dialog):
+
+    def __init__(self, task: SyncTask, plan: SyncPlan, parent=None):
+        super().__init__(f'同步预览 - {task.name}', _plan_text(plan), parent)
+        self.plan = plan
+        self.yesButton.setText('按计划运行')
+        self.yesButton.setEnabled(not plan.is_empty)
+        self.cancelButton.setText('关闭')
+
+
 class SyncInterface(ScrollArea):
 
     def __init__(self, parent=None):
@@ -400,11 +713,13 @@ class SyncInterface(ScrollArea):
         self.setObjectName('syncInterface')
         self.setWidgetResizable(True)
 
-        self.rclone = RClone()
-        self.configManager = ConfigManager(self.rclone)
-        self.syncManager = SyncManager(self.rclone)
+        services = get_services()
+        self.rclone = services.rclone
+        self.configManager = services.configManager
+        self.syncManager = services.syncManager
 
         self.taskCards: dict = {}
+        self._planWorkers: dict = {}
 
         self.initUI()
         self.connectSignals()
@@ -460,6 +775,9 @@ class SyncInterface(ScrollArea):
             card = SyncTaskCard(task, self)
             card.runClicked.connect(self.runTask)
             card.stopClicked.connect(self.stopTask)
+            card.planClicked.connect(self.planTask)
+            card.setPlanning(task.id in self._planWorkers)
+            card.historyClicked.connect(self.showHistory)
             card.editClicked.connect(self.showEditDialog)
             card.deleteClicked.connect(self.deleteTask)
             self.listLayout.addWidget(card)
@@ -520,8 +838,21 @@ class SyncInterface(ScrollArea):
             task.exclude_patterns = data.get('exclude_patterns', [])
             task.dry_run = data.get('dry_run', False)
             task.delete_excluded = data.get('delete_excluded', False)
+            task.incremental = data.get('incremental', False)
+            task.full_check_interval = data.get('full_check_interval', 24)
+            task.no_traverse = data.get('no_traverse', False)
+            task.watch = data.get('watch', False)
+            task.hash_precheck = data.get('hash_precheck', False)
+            task.auto_tune = data.get('auto_tune', False)
+            task.transfers = data.get('transfers', 0)
+            task.checkers = data.get('checkers', 0)
+            task.multi_thread_streams = data.get('multi_thread_streams', 0)
+            task.shards = data.get('shards', 0)
+            task.shard_depth = data.get('shard_depth', 1)
+            task.perf = data.get('perf') or PerfProfile()
 
             self.syncManager.save_tasks()
+            self.syncManager.update_watch(task_id)
             self.loadTasks()
 
     def deleteTask(self, task_id: str):
@@ -539,6 +870,48 @@ class SyncInterface(ScrollArea):
         logger.info(f'用户启动同步任务: {task_id}')
         self.syncManager.run_task(task_id)
 
+    def planTask(self, task_id: str):
+        task = self.syncManager.tasks.get(task_id)
+        if task is None or task_id in self._planWorkers:
+            return
+        logger.info(f'用户预览同步任务: {task.name}')
+        worker = PlanWorker(self.rclone, task)
+        worker.finished.connect(self.onPlanFinished)
+        self._planWorkers[task_id] = worker
+        if task_id in self.taskCards:
+            self.taskCards[task_id].setPlanning(True)
+        worker.start()
+
+    def onPlanFinished(self, task_id: str, plan, error: str):
+        worker = self._planWorkers.pop(task_id, None)
+        if worker is not None:
+            worker.wait(1000)
+            worker.deleteLater()
+        if task_id in self.taskCards:
+            self.taskCards[task_id].setPlanning(False)
+        task = self.syncManager.tasks.get(task_id)
+        if task is None:
+            return
+        if plan is None:
+            InfoBar.error('预览失败', error, parent=self, position=InfoBarPosition.TOP)
+            return
+        dialog = SyncPlanDialog(task, plan, self.window())
+        if dialog.exec():
+            logger.info(f'用户按计划运行同步任务: {task.name}')
+            self.syncManager.run_plan(plan)
+
+    def showHistory(self, task_id: str):
+        task = self.syncManager.tasks.get(task_id)
+        if task is None:
+            return
+        try:
+            records = self.syncManager.history.runs(task_id)
+        except Exception as e:
+            logger.error(f'读取运行历史失败: {e}')
+            InfoBar.error('读取运行历史失败', str(e), parent=self, position=InfoBarPosition.TOP)
+            return
+        RunHistoryDialog(task.name, records, self.window()).exec()
+
     def stopTask(self, task_id: str):
         logger.info(f'用户停止同步任务: {task_id}')
         self.syncManager.cancel_task(task_id)
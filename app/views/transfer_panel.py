@@ -0,0 +1,102 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QTableWidgetItem
+
+from qfluentwidgets import (
+    FluentIcon as FIF, StrongBodyLabel, CaptionLabel, TransparentPushButton, TableWidget
+)
+
+from ..core.transfer_queue import TransferItem, TransferQueue, TransferState
+
+
+STATE_TEXT = {
+    TransferState.PENDING: '等待中',
+    TransferState.RUNNING: '传输中',
+    TransferState.DONE: '已完成',
+    TransferState.FAILED: '失败',
+    TransferState.CANCELLED: '已取消',
+}
+
+
+class TransferPanel(QWidget):
+    """文件浏览器底部的传输列表，逐项显示状态和进度。"""
+
+    def __init__(self, queue: TransferQueue, parent=None):
+        super().__init__(parent)
+        self.queue = queue
+        self._rows = {}
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        headerLayout = QHBoxLayout()
+        self.titleLabel = StrongBodyLabel('传输', self)
+        self.summaryLabel = CaptionLabel('', self)
+        self.cancelBtn = TransparentPushButton(FIF.CLOSE, '取消全部', self)
+        self.cancelBtn.clicked.connect(self.queue.cancel_all)
+        self.clearBtn = TransparentPushButton(FIF.DELETE, '清除已完成', self)
+        self.clearBtn.clicked.connect(self.clearFinished)
+        headerLayout.addWidget(self.titleLabel)
+        headerLayout.addWidget(self.summaryLabel)
+        headerLayout.addStretch()
+        headerLayout.addWidget(self.cancelBtn)
+        headerLayout.addWidget(self.clearBtn)
+        layout.addLayout(headerLayout)
+
+        self.table = TableWidget(self)
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(['名称', '目标', '状态', '进度'])
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(TableWidget.NoEditTriggers)
+        self.table.setMaximumHeight(180)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+
+        self.queue.itemAdded.connect(self.addItem)
+        self.queue.itemChanged.connect(self.updateItem)
+        self.setVisible(False)
+
+    def addItem(self, item: TransferItem):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        for column in range(4):
+            self.table.setItem(row, column, QTableWidgetItem())
+        self.table.item(row, 0).setText(item.name)
+        self.table.item(row, 0).setToolTip(item.source)
+        self.table.item(row, 1).setText(item.dest)
+        self._rows[item.id] = row
+        self.updateItem(item)
+        self.setVisible(True)
+
+    def updateItem(self, item: TransferItem):
+        row = self._rows.get(item.id)
+        if row is None:
+            return
+        state = self.table.item(row, 2)
+        state.setText(STATE_TEXT[item.state])
+        state.setToolTip(item.error)
+        self.table.item(row, 3).setText(f'{item.progress}%')
+        self._update_summary()
+
+    def _update_summary(self):
+        items = self.queue.items.values()
+        done = sum(1 for item in items if item.state == TransferState.DONE)
+        failed = sum(1 for item in items if item.state == TransferState.FAILED)
+        text = f'{done}/{len(self.queue.items)} 已完成'
+        if failed:
+            text += f'，{failed} 个失败'
+        self.summaryLabel.setText(text)
+
+    def clearFinished(self):
+        removed = set(self.queue.clear_finished())
+        for item_id in sorted((i for i in removed if i in self._rows),
+                              key=self._rows.get, reverse=True):
+            self.table.removeRow(self._rows.pop(item_id))
+        # 删除行后重建剩余条目的行号
+        self._rows = {item_id: row for row, item_id in enumerate(
+            sorted(self._rows, key=self._rows.get))}
+        self._update_summary()
+        self.setVisible(bool(self._rows))
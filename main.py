@@ -1,6 +1,7 @@
 import sys
 import os
 import signal
+import multiprocessing
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
@@ -14,9 +15,8 @@ from app.common.config import cfg, get_system_theme
 from app.common.signal_bus import signalBus
 from app.common.logger import app_logger
 from app.core.bootstrap import bootstrap, is_rclone_available
-from app.core.rclone import RClone
-from app.core.mount_manager import MountManager
-from app.core.sync_manager import SyncManager
+from app.core.rclone_rc import shutdown_rc_daemon
+from app.core.services import get_services
 
 
 g_app = None
@@ -43,8 +43,7 @@ class SystemTray(QSystemTrayIcon):
     def __init__(self, window: MainWindow, parent=None):
         super().__init__(parent)
         self.window = window
-        self.mountManager = MountManager()
-        self.mountManager.load_mounts()
+        self.mountManager = get_services().mountManager
 
         self.setIcon(FIF.CLOUD.icon())
         self.setToolTip('RClone GUI')
@@ -104,18 +103,12 @@ class SystemTray(QSystemTrayIcon):
     def _cleanup_and_exit(self):
         global g_app, g_window
 
-        try:
-            if g_window and hasattr(g_window, 'syncInterface') and g_window.syncInterface:
-                if hasattr(g_window.syncInterface, 'syncManager') and g_window.syncInterface.syncManager:
-                    g_window.syncInterface.syncManager.shutdown()
-                    app_logger.info('同步管理器已关闭')
-        except Exception as e:
-            app_logger.error(f'关闭同步管理器失败: {e}')
+        get_services().shutdown()
 
         try:
-            self.mountManager.unmount_all()
+            shutdown_rc_daemon()
         except Exception as e:
-            app_logger.error(f'卸载挂载失败: {e}')
+            app_logger.error(f'停止 rclone rcd 失败: {e}')
 
         self._kill_rclone_processes()
 
@@ -332,4 +325,5 @@ def main():
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
@@ -31,3 +31,24 @@ def temp_config_dir(tmp_path):
     config_dir = tmp_path / "config"
     config_dir.mkdir()
     return config_dir
+
+@pytest.fixture(autouse=True)
+def reset_services():
+    # 每个测试结束后丢弃共享的服务容器，避免注入的 mock 泄漏到其他测试
+    yield
+    from app.core.services import set_services
+    set_services(None)
+
+@pytest.fixture(autouse=True)
+def no_process_inventory(mocker):
+    # 默认禁用进程清单，MountManager 走可 mock 的外部命令路径，避免真实系统进程干扰测试
+    from app.core.process_inventory import ProcessInventory
+    inventory = ProcessInventory(provider=None)
+    mocker.patch('app.core.mount_manager.get_process_inventory', return_value=inventory)
+    return inventory
+
+@pytest.fixture(autouse=True)
+def isolated_quota_cache(tmp_path, mocker):
+    # 容量缓存写到临时目录，避免测试读到或覆盖真实的 quota_cache.json
+    mocker.patch('app.core.quota_service.APP_PATH', tmp_path)
+    return tmp_path / 'config' / 'quota_cache.json'
@@ -23,10 +23,10 @@ def _mock_deps(mocker):
     mock_rclone = MagicMock()
     mock_rclone.config_dump.return_value = {}
     mock_rclone.listremotes.return_value = []
-    mocker.patch('app.views.remote_interface.RClone', return_value=mock_rclone)
     mock_cm = MagicMock()
     mock_cm.list_remotes.return_value = []
-    mocker.patch('app.views.remote_interface.ConfigManager', return_value=mock_cm)
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone, configManager=mock_cm))
 
 
 class TestAutoNamingDialog:
@@ -0,0 +1,231 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.auto_tuner import (AutoTuner, LevelStats, RunSample, TuningState, checkers_for,
+                                 ladder_index)
+from app.core.rclone_stats import StatsDecoder, TransferStats
+from app.models.sync_task import SyncMode, SyncTask
+
+MiB = 1024 * 1024
+
+
+def _task(**kwargs):
+    options = {'auto_tune': True}
+    options.update(kwargs)
+    return SyncTask(id='t1', name='Backup', source='/data', destination='gd:backup',
+                    mode=SyncMode.COPY, **options)
+
+
+def _sample(transfers, mib_per_s, seconds=60.0, **kwargs):
+    return RunSample(transfers=transfers, bytes=int(mib_per_s * MiB * seconds), files=0,
+                     seconds=seconds, **kwargs)
+
+
+def _simulate(tuner, task, speed_of, runs=20):
+    """按给定的 transfers -> MiB/s 曲线反复运行，返回每次使用的 transfers。"""
+    tuner.prepare(task)
+    used = []
+    for _ in range(runs):
+        used.append(task.transfers)
+        speed, throttled = speed_of(task.transfers)
+        tuner.record(task, _sample(task.transfers, speed, throttled=throttled))
+    return used
+
+
+class TestHelpers:
+
+    def test_ladder_index_picks_nearest(self):
+        assert ladder_index(4) == 3
+        assert ladder_index(5) == 3
+        assert ladder_index(100) == 11
+        assert ladder_index(0) == 0
+
+    def test_checkers_follow_transfers(self):
+        assert checkers_for(1) == 4
+        assert checkers_for(16) == 32
+        assert checkers_for(64) == 64
+
+    def test_small_runs_are_not_usable(self):
+        assert not RunSample(4, bytes=MiB, files=1, seconds=30).usable
+        assert not RunSample(4, bytes=100 * MiB, files=1, seconds=1).usable
+        assert RunSample(4, bytes=100 * MiB, files=1, seconds=30).usable
+        assert RunSample(4, bytes=0, files=0, seconds=1, throttled=True).usable
+
+    def test_sample_from_stats_prefers_transfer_time(self):
+        stats = TransferStats(bytes=50 * MiB, transfers=10, errors=1, retries=1,
+                              elapsed=40.0, transfer_time=25.0)
+
+        sample = RunSample.from_stats(8, stats, throttled=True)
+
+        assert sample.seconds == 25.0
+        assert sample.error_rate == pytest.approx(2 / 11)
+        assert sample.throttled
+
+    def test_state_roundtrip(self):
+        state = TuningState(remotes='gd,local', runs=3,
+                            levels={4: LevelStats(runs=2, throughput=10.0, last_run=3)})
+
+        restored = TuningState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        assert restored.levels[4].throughput == 10.0
+        assert restored.runs == 3
+
+
+class TestAutoTuner:
+
+    def test_climbs_one_step_at_a_time_to_fast_remote(self):
+        task = _task()
+
+        used = _simulate(AutoTuner(), task, lambda t: (min(t, 32) * 5.0, False))
+
+        steps = [abs(ladder_index(b) - ladder_index(a)) for a, b in zip(used, used[1:])]
+        assert max(steps) <= 1
+        assert used[0] == 4
+        # 48 路没有更快，回到能达到同样吞吐的最少连接数
+        assert used[-5:] == [32] * 5
+        assert task.checkers == 64
+
+    def test_backs_off_on_throttling(self):
+        task = _task()
+
+        used = _simulate(AutoTuner(), task, lambda t: (t * 5.0, t > 4))
+
+        assert used[-5:] == [4] * 5
+        assert task.multi_thread_streams == 1
+
+    def test_descends_for_slow_remote(self):
+        task = _task()
+        # SFTP 类远程：2 路最快，更多并发反而变慢
+        speeds = {1: 8.0, 2: 12.0, 3: 10.0, 4: 9.0, 6: 7.0}
+
+        used = _simulate(AutoTuner(explore_every=100), task, lambda t: (speeds.get(t, 5.0), False))
+
+        assert used[-5:] == [2] * 5
+        assert task.multi_thread_streams == 0
+
+    def test_periodic_reexploration(self):
+        task = _task()
+
+        used = _simulate(AutoTuner(explore_every=4), task,
+                         lambda t: ({3: 9.0, 4: 12.0, 6: 10.0}.get(t, 1.0), False), runs=30)
+
+        assert used.count(4) > 15
+        assert set(used[10:]) - {4} != set()
+
+    def test_errors_mark_level_unstable(self):
+        tuner = AutoTuner()
+        state = TuningState()
+        state.runs = 1
+        state.levels[8] = LevelStats()
+        state.levels[8].add(RunSample(8, bytes=100 * MiB, files=10, seconds=10, errors=3), 1)
+
+        assert tuner.next_transfers(state, 8) == 6
+
+    def test_disabled_or_unusable_runs_change_nothing(self):
+        tuner = AutoTuner()
+        pinned = _task(auto_tune=False, transfers=2)
+
+        assert not tuner.record(pinned, _sample(2, 50.0))
+        assert pinned.transfers == 2 and pinned.tuning == {}
+
+        task = _task(transfers=4)
+        assert not tuner.record(task, RunSample(4, bytes=10, files=1, seconds=0.5))
+        assert task.tuning == {}
+
+    def test_remote_change_resets_history(self):
+        tuner = AutoTuner()
+        task = _task()
+        tuner.prepare(task)
+        tuner.record(task, _sample(4, 10.0))
+        assert task.tuning['remotes'] == 'gd,local'
+
+        task.destination = 's3:bucket'
+        tuner.record(task, _sample(6, 10.0))
+
+        assert task.tuning['remotes'] == 'local,s3'
+        assert list(task.tuning['levels']) == ['6']
+
+
+class TestStatsDecoderThrottle:
+
+    def test_counts_throttle_messages(self):
+        decoder = StatsDecoder()
+        decoder.feed(json.dumps({'level': 'notice', 'msg': 'pacer: low level retry 1/10 (error 429 Too Many Requests)'}))
+        decoder.feed(json.dumps({'level': 'info', 'msg': 'Copied (new)'}))
+        snapshot = decoder.feed(json.dumps({'stats': {'bytes': 5, 'transferTime': 2.5}}))
+
+        assert decoder.throttled == 1
+        assert snapshot.transfer_time == 2.5
+
+
+class TestSyncIntegration:
+
+    @pytest.fixture
+    def manager(self, tmp_path, mocker):
+        from app.core.sync_manager import SyncManager
+        mocker.patch('app.core.sync_manager.APP_PATH', tmp_path)
+        self.worker_cls = mocker.patch('app.core.sync_manager.SyncWorker')
+        mgr = SyncManager(MagicMock())
+        yield mgr
+        mgr.shutdown()
+
+    def test_finished_run_updates_task(self, manager):
+        task = _task()
+        manager.tasks[task.id] = task
+        manager.run_task(task.id)
+        assert task.transfers == 4
+        worker = manager.workers[task.id]
+        worker.partial = False
+        worker.run_sample.return_value = _sample(4, 20.0)
+
+        manager._on_task_finished(task.id, True, '完成')
+
+        assert task.transfers == 6
+        assert task.checkers == 12
+        assert task.tuning['levels']['4']['runs'] == 1
+
+    def test_dry_run_not_recorded(self, manager):
+        task = _task(dry_run=True)
+        manager.tasks[task.id] = task
+        manager.run_task(task.id)
+        worker = manager.workers[task.id]
+        worker.partial = False
+
+        manager._on_task_finished(task.id, True, '完成')
+
+        worker.run_sample.assert_not_called()
+
+    def test_worker_passes_concurrency_flags(self, mocker):
+        from app.core.sync_manager import SyncWorker
+        rclone = MagicMock()
+        rclone.rclone_path = 'rclone'
+        rclone.config_path = None
+        process = MagicMock()
+        process.stderr.readline.return_value = ''
+        process.wait.return_value = 0
+        popen = mocker.patch('subprocess.Popen', return_value=process)
+        worker = SyncWorker(rclone, _task(transfers=8, checkers=16, multi_thread_streams=1))
+
+        worker.run()
+
+        cmd = popen.call_args[0][0]
+        assert cmd[cmd.index('--transfers') + 1] == '8'
+        assert cmd[cmd.index('--checkers') + 1] == '16'
+        assert cmd[cmd.index('--multi-thread-streams') + 1] == '1'
+        assert worker.run_sample() is None
+
+    def test_default_task_has_no_flags(self, mocker):
+        from app.core.sync_manager import SyncWorker
+        rclone = MagicMock()
+        rclone.rclone_path = 'rclone'
+        rclone.config_path = None
+        process = MagicMock()
+        process.stderr.readline.return_value = ''
+        process.wait.return_value = 0
+        popen = mocker.patch('subprocess.Popen', return_value=process)
+
+        SyncWorker(rclone, _task(auto_tune=False)).run()
+
+        assert '--transfers' not in popen.call_args[0][0]
@@ -7,8 +7,8 @@ from dataclasses import dataclass
 
 os.environ["QT_QPA_PLATFORM"] = "offscreen"
 
-from PySide6.QtWidgets import QApplication, QTreeWidgetItem
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt, QItemSelectionModel
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -35,12 +35,24 @@ def _make_browser_mocks(mocker):
     mock_cm = MagicMock()
     mock_cm.list_remotes.return_value = []
 
-    mocker.patch('app.views.browser_interface.RClone', return_value=mock_rclone)
-    mocker.patch('app.views.browser_interface.ConfigManager', return_value=mock_cm)
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone, configManager=mock_cm))
 
     return mock_rclone, mock_cm
 
 
+def _cell(browser, row, column=0):
+    return browser.fileModel.index(row, column).data()
+
+
+def _select_entries(browser, entries):
+    browser.fileModel.setEntries(entries)
+    selection = browser.fileTree.selectionModel()
+    for row in range(browser.fileModel.rowCount()):
+        selection.select(browser.fileModel.index(row, 0),
+                         QItemSelectionModel.Select | QItemSelectionModel.Rows)
+
+
 def _make_settings_mocks(mocker):
     from app.common.config import CacheDirMode
     from qfluentwidgets import qconfig
@@ -66,6 +78,21 @@ def _make_settings_mocks(mocker):
     mock_cfg.minimizeToTray = MagicMock()
     mock_cfg.closeToTray = MagicMock()
     mock_cfg.autoMount = MagicMock()
+    mock_cfg.mountHost = MagicMock()
+    mock_cfg.transferConcurrency.range = (1, 16)
+    mock_cfg.transferConcurrency.value = 4
+    mock_cfg.transferRetries.range = (0, 10)
+    mock_cfg.transferRetries.value = 2
+    mock_cfg.maxConcurrentTasks.range = (1, 32)
+    mock_cfg.maxConcurrentTasks.value = 3
+    mock_cfg.perRemoteTasks.range = (1, 16)
+    mock_cfg.perRemoteTasks.value = 2
+    mock_cfg.maxShardProcesses.range = (1, 64)
+    mock_cfg.maxShardProcesses.value = 8
+    mock_cfg.historyRetentionDays.range = (0, 365)
+    mock_cfg.historyRetentionDays.value = 90
+    mock_cfg.historyMaxRuns.range = (20, 2000)
+    mock_cfg.historyMaxRuns.value = 500
 
     original_qconfig_get = qconfig.get
 
@@ -74,7 +101,8 @@ def _make_settings_mocks(mocker):
             return CacheDirMode.DEFAULT
         return original_qconfig_get(item)
 
-    mocker.patch('app.views.settings_interface.RClone', return_value=mock_rclone)
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone))
     mocker.patch('app.views.settings_interface.is_auto_start_enabled', return_value=False)
     mocker.patch('app.views.settings_interface.set_auto_start', return_value=True)
     mocker.patch('app.views.settings_interface.cfg', mock_cfg)
@@ -221,6 +249,45 @@ class TestFileListWorker:
         assert "取消" in results[0][2]
 
 
+    def test_run_streaming_emits_batches(self, mocker):
+        _make_browser_mocks(mocker)
+        from app.views.browser_interface import FileListWorker
+        mock_rc = MagicMock()
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([[{"Name": "a"}], [{"Name": "b"}]])
+        stream.success = True
+        mock_rc.lsjson_stream.return_value = stream
+
+        worker = FileListWorker(mock_rc, "remote:path", batch_size=1)
+        batches = []
+        results = []
+        worker.batchReady.connect(batches.append)
+        worker.finished.connect(lambda s, f, e: results.append((s, f, e)))
+        worker.run()
+
+        mock_rc.lsjson_stream.assert_called_once_with("remote:path", batch_size=1)
+        mock_rc.lsjson.assert_not_called()
+        assert batches == [[{"Name": "a"}], [{"Name": "b"}]]
+        assert results[0] == (True, [{"Name": "a"}, {"Name": "b"}], "")
+
+    def test_run_streaming_failure(self, mocker):
+        _make_browser_mocks(mocker)
+        from app.views.browser_interface import FileListWorker
+        mock_rc = MagicMock()
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([])
+        stream.success = False
+        stream.error = "permission denied"
+        mock_rc.lsjson_stream.return_value = stream
+
+        worker = FileListWorker(mock_rc, "remote:path", batch_size=100)
+        results = []
+        worker.finished.connect(lambda s, f, e: results.append((s, f, e)))
+        worker.run()
+
+        assert results[0] == (False, [], "permission denied")
+
+
 class TestFileOperationWorker:
 
     def test_init_stores_attributes(self, mocker):
@@ -296,6 +363,40 @@ class TestFileOperationWorker:
         mock_rc.delete_file.assert_called_once_with('remote:file.txt')
         assert results[0][0] is True
 
+    def test_run_invalidates_cache_for_each_operation(self, mocker):
+        _make_browser_mocks(mocker)
+        from app.views.browser_interface import FileOperationWorker
+        mock_rc = MagicMock()
+        mock_rc.mkdir.return_value = FakeRCloneResult(success=True)
+        mock_rc.delete_file.return_value = FakeRCloneResult(success=False, stderr="denied")
+        cache = MagicMock()
+        ops = [('mkdir', 'remote:a/new'), ('delete_file', 'remote:a/b.txt')]
+
+        worker = FileOperationWorker(mock_rc, ops, cache)
+        worker.run()
+
+        assert cache.invalidate_for_operation.call_args_list == [call(ops[0]), call(ops[1])]
+
+    def test_run_bulk_delete_reports_item_failures(self, mocker):
+        _make_browser_mocks(mocker)
+        from app.views.browser_interface import FileOperationWorker
+        mock_rc = MagicMock()
+        mock_rc.delete_batch.return_value = (
+            FakeRCloneResult(success=False, return_code=1),
+            {'b.txt': 'permission denied'},
+        )
+        op = ('bulk_delete', 'remote:dir', ['a.txt', 'b.txt'], [])
+        worker = FileOperationWorker(mock_rc, [op])
+        results = []
+        worker.finished.connect(lambda s, m: results.append((s, m)))
+        worker.run()
+
+        mock_rc.delete_batch.assert_called_once_with('remote:dir', ['a.txt', 'b.txt'], [])
+        assert worker.failures == {'b.txt': 'permission denied'}
+        assert results[0][0] is False
+        assert '1 个项目删除失败' in results[0][1]
+        assert 'b.txt: permission denied' in results[0][1]
+
     def test_run_unknown_operation(self, mocker):
         _make_browser_mocks(mocker)
         from app.views.browser_interface import FileOperationWorker
@@ -372,7 +473,9 @@ class TestBrowserInterface:
         mock_rclone, mock_cm = _make_browser_mocks(mocker)
         mocker.patch('app.views.browser_interface.FileListWorker')
         from app.views.browser_interface import BrowserInterface
+        from app.core.listing_cache import ListingCache
         widget = BrowserInterface()
+        widget.listingCache = ListingCache()
         widget._mock_rclone = mock_rclone
         widget._mock_cm = mock_cm
         yield widget
@@ -454,26 +557,112 @@ class TestBrowserInterface:
         ]
         browser._on_refresh_finished(True, files, "")
 
-        assert browser.fileTree.topLevelItemCount() == 2
-        item0 = browser.fileTree.topLevelItem(0)
-        assert item0.text(0) == "photo.jpg"
-        assert "KB" in item0.text(1)
-        assert "2024-01-15 10:30:00" in item0.text(2)
-        item1 = browser.fileTree.topLevelItem(1)
-        assert item1.text(0) == "docs"
-        assert item1.text(1) == "-"
+        assert browser.fileModel.rowCount() == 2
+        # 目录排在文件前面
+        assert _cell(browser, 0) == "docs"
+        assert _cell(browser, 0, 1) == "-"
+        assert _cell(browser, 1) == "photo.jpg"
+        assert "KB" in _cell(browser, 1, 1)
+        assert "2024-01-15 10:30:00" in _cell(browser, 1, 2)
+        mock_infobar.error.assert_not_called()
+
+    def test_on_refresh_batch_appends_incrementally(self, browser, mocker):
+        mocker.patch('app.views.browser_interface.InfoBar')
+        first = [{"Name": "a.txt", "IsDir": False, "Size": 1}]
+        second = [{"Name": "b", "IsDir": True}]
+        browser._on_refresh_batch(first)
+        assert browser.fileModel.rowCount() == 1
+        browser._on_refresh_batch(second)
+        assert browser.fileModel.rowCount() == 2
+
+        browser._on_refresh_finished(True, first + second, "")
+        assert browser.fileModel.rowCount() == 2
+        assert _cell(browser, 0) == "b"
+
+    def test_refresh_uses_fresh_cache_without_worker(self, browser, mocker):
+        mock_worker_cls = mocker.patch('app.views.browser_interface.FileListWorker')
+        browser.currentRemote = "myremote"
+        browser.currentPath = "docs"
+        browser.listingCache.put("myremote:docs", [{"Name": "a.txt", "IsDir": False, "Size": 1}])
+
+        browser.refresh()
+
+        mock_worker_cls.assert_not_called()
+        assert browser.fileModel.rowCount() == 1
+        assert _cell(browser, 0) == "a.txt"
+
+    def test_refresh_stale_cache_revalidates_in_background(self, browser, mocker):
+        mock_worker_cls = mocker.patch('app.views.browser_interface.FileListWorker')
+        browser.currentRemote = "myremote"
+        browser.currentPath = ""
+        browser.listingCache.set_ttl("myremote", 0)
+        cached = [{"Name": "old.txt", "IsDir": False, "Size": 1}]
+        browser.listingCache.put("myremote:", cached)
+
+        browser.refresh()
+
+        mock_worker_cls.assert_called_once_with(browser.rclone, "myremote:")
+        assert _cell(browser, 0) == "old.txt"
+        assert browser.fileTree.isEnabled()
+
+        fresh = [{"Name": "new.txt", "IsDir": False, "Size": 2}]
+        browser._on_refresh_finished(True, fresh, "")
+        assert browser.fileModel.rowCount() == 1
+        assert _cell(browser, 0) == "new.txt"
+
+    def test_unchanged_revalidation_does_not_rerender(self, browser, mocker):
+        mocker.patch('app.views.browser_interface.FileListWorker')
+        browser.currentRemote = "myremote"
+        browser.listingCache.set_ttl("myremote", 0)
+        cached = [{"Name": "a.txt", "IsDir": False, "Size": 1}]
+        browser.listingCache.put("myremote:", cached)
+        browser.refresh()
+        set_entries = mocker.spy(browser.fileModel, 'setEntries')
+
+        browser._on_refresh_finished(True, [dict(cached[0])], "")
+
+        set_entries.assert_not_called()
+        assert browser.fileModel.rowCount() == 1
+
+    def test_revalidation_failure_keeps_cached_items(self, browser, mocker):
+        mocker.patch('app.views.browser_interface.FileListWorker')
+        mock_infobar = mocker.patch('app.views.browser_interface.InfoBar')
+        browser.currentRemote = "myremote"
+        browser.listingCache.set_ttl("myremote", 0)
+        browser.listingCache.put("myremote:", [{"Name": "a", "IsDir": True}])
+
+        browser.refresh()
+        browser._on_refresh_finished(False, [], "timeout")
+
         mock_infobar.error.assert_not_called()
+        assert browser.fileModel.rowCount() == 1
+
+    def test_force_refresh_drops_current_entry(self, browser, mocker):
+        mock_worker_cls = mocker.patch('app.views.browser_interface.FileListWorker')
+        browser.currentRemote = "myremote"
+        browser.listingCache.put("myremote:", [])
+
+        browser.forceRefresh()
+
+        assert browser.listingCache.get("myremote:") is None
+        mock_worker_cls.assert_called_once()
+
+    def test_store_listing_only_caches_success(self, browser):
+        browser._store_listing("myremote:a", False, [])
+        assert browser.listingCache.get("myremote:a") is None
+        browser._store_listing("myremote:a", True, [{"Name": "x"}])
+        assert browser.listingCache.get("myremote:a").entries == [{"Name": "x"}]
 
     def test_on_refresh_finished_success_empty(self, browser, mocker):
         mocker.patch('app.views.browser_interface.InfoBar')
         browser._on_refresh_finished(True, [], "")
-        assert browser.fileTree.topLevelItemCount() == 0
+        assert browser.fileModel.rowCount() == 0
 
     def test_on_refresh_finished_failure(self, browser, mocker):
         mock_infobar = mocker.patch('app.views.browser_interface.InfoBar')
         browser._on_refresh_finished(False, [], "Network error")
         mock_infobar.error.assert_called_once()
-        assert browser.fileTree.topLevelItemCount() == 0
+        assert browser.fileModel.rowCount() == 0
 
     def test_set_loading_state_true(self, browser):
         browser._set_loading_state(True)
@@ -565,11 +754,9 @@ class TestBrowserInterface:
         browser.currentRemote = "myremote"
         browser.currentPath = ""
 
-        item = QTreeWidgetItem()
-        item.setText(0, "subdir")
-        item.setData(0, Qt.UserRole, {"Name": "subdir", "IsDir": True})
+        browser.fileModel.setEntries([{"Name": "subdir", "IsDir": True}])
 
-        browser.onItemDoubleClicked(item, 0)
+        browser.onItemDoubleClicked(browser.fileModel.index(0, 0))
         assert browser.currentPath == "subdir"
         assert browser.pathEdit.text() == "/subdir"
 
@@ -578,10 +765,9 @@ class TestBrowserInterface:
         browser.currentRemote = "myremote"
         browser.currentPath = "parent"
 
-        item = QTreeWidgetItem()
-        item.setData(0, Qt.UserRole, {"Name": "child", "IsDir": True})
+        browser.fileModel.setEntries([{"Name": "child", "IsDir": True}])
 
-        browser.onItemDoubleClicked(item, 0)
+        browser.onItemDoubleClicked(browser.fileModel.index(0, 0))
         assert browser.currentPath == "parent/child"
 
     def test_on_item_double_clicked_file(self, browser, mocker):
@@ -589,10 +775,9 @@ class TestBrowserInterface:
         browser.currentRemote = "myremote"
         browser.currentPath = ""
 
-        item = QTreeWidgetItem()
-        item.setData(0, Qt.UserRole, {"Name": "file.txt", "IsDir": False})
+        browser.fileModel.setEntries([{"Name": "file.txt", "IsDir": False}])
 
-        browser.onItemDoubleClicked(item, 0)
+        browser.onItemDoubleClicked(browser.fileModel.index(0, 0))
         assert browser.currentPath == ""
 
     def test_upload_file_with_selection(self, browser, mocker):
@@ -601,18 +786,17 @@ class TestBrowserInterface:
             'app.views.browser_interface.QFileDialog.getOpenFileNames',
             return_value=(['/tmp/a.txt', '/tmp/b.txt'], '')
         )
-        mock_exec = mocker.patch.object(browser, '_execute_operations')
+        mock_enqueue = mocker.patch.object(browser.transferQueue, 'enqueue')
         browser.currentRemote = "myremote"
         browser.currentPath = "uploads"
 
         browser.uploadFile()
 
-        mock_exec.assert_called_once()
-        ops = mock_exec.call_args[0][0]
-        assert len(ops) == 2
-        assert ops[0][0] == 'copy'
-        assert ops[0][1] == '/tmp/a.txt'
-        assert ops[0][2] == 'myremote:uploads'
+        mock_enqueue.assert_called_once()
+        items = mock_enqueue.call_args[0][0]
+        assert len(items) == 2
+        assert items[0].source == '/tmp/a.txt'
+        assert items[0].dest == 'myremote:uploads'
 
     def test_upload_file_cancelled(self, browser, mocker):
         mocker.patch('app.views.browser_interface.FileListWorker')
@@ -620,9 +804,9 @@ class TestBrowserInterface:
             'app.views.browser_interface.QFileDialog.getOpenFileNames',
             return_value=([], '')
         )
-        mock_exec = mocker.patch.object(browser, '_execute_operations')
+        mock_enqueue = mocker.patch.object(browser.transferQueue, 'enqueue')
         browser.uploadFile()
-        mock_exec.assert_not_called()
+        mock_enqueue.assert_not_called()
 
     def test_download_file_with_selection(self, browser, mocker):
         mocker.patch('app.views.browser_interface.FileListWorker')
@@ -630,21 +814,45 @@ class TestBrowserInterface:
             'app.views.browser_interface.QFileDialog.getExistingDirectory',
             return_value='/home/user/downloads'
         )
-        mock_exec = mocker.patch.object(browser, '_execute_operations')
+        mock_enqueue = mocker.patch.object(browser.transferQueue, 'enqueue')
         browser.currentRemote = "myremote"
         browser.currentPath = "docs"
 
-        item = QTreeWidgetItem()
-        item.setData(0, Qt.UserRole, {"Name": "report.pdf", "IsDir": False})
-        browser.fileTree.addTopLevelItem(item)
-        item.setSelected(True)
+        _select_entries(browser, [{"Name": "report.pdf", "IsDir": False, "Size": 42}])
 
         browser.downloadFile()
 
-        mock_exec.assert_called_once()
-        ops = mock_exec.call_args[0][0]
-        assert len(ops) == 1
-        assert ops[0] == ('copy', 'myremote:docs/report.pdf', '/home/user/downloads')
+        mock_enqueue.assert_called_once()
+        items = mock_enqueue.call_args[0][0]
+        assert len(items) == 1
+        assert (items[0].source, items[0].dest) == ('myremote:docs/report.pdf', '/home/user/downloads')
+        assert items[0].size == 42
+        assert items[0].is_dir is False
+
+    def test_transfer_job_finished_refreshes_current_dir(self, browser, mocker):
+        mock_refresh = mocker.patch.object(browser, 'refresh')
+        browser.currentRemote = "myremote"
+        browser.currentPath = "docs"
+        browser._on_transfer_job_finished('/home/user/downloads')
+        mock_refresh.assert_not_called()
+        browser._on_transfer_job_finished('myremote:docs')
+        mock_refresh.assert_called_once()
+
+    def test_transfer_panel_tracks_items(self, browser):
+        from app.core.transfer_queue import TransferItem, TransferState
+        panel = browser.transferPanel
+        item = TransferItem('/tmp/a.txt', 'myremote:', size=10)
+        browser.transferQueue.items[item.id] = item
+        panel.addItem(item)
+        assert panel.table.rowCount() == 1
+        assert panel.table.item(0, 2).text() == '等待中'
+
+        item.state = TransferState.DONE
+        panel.updateItem(item)
+        assert panel.table.item(0, 3).text() == '100%'
+
+        panel.clearFinished()
+        assert panel.table.rowCount() == 0
 
     def test_download_file_no_selection(self, browser, mocker):
         mocker.patch('app.views.browser_interface.FileListWorker')
@@ -658,15 +866,12 @@ class TestBrowserInterface:
             'app.views.browser_interface.QFileDialog.getExistingDirectory',
             return_value=''
         )
-        mock_exec = mocker.patch.object(browser, '_execute_operations')
+        mock_enqueue = mocker.patch.object(browser.transferQueue, 'enqueue')
 
-        item = QTreeWidgetItem()
-        item.setData(0, Qt.UserRole, {"Name": "file.txt", "IsDir": False})
-        browser.fileTree.addTopLevelItem(item)
-        item.setSelected(True)
+        _select_entries(browser, [{"Name": "file.txt", "IsDir": False}])
 
         browser.downloadFile()
-        mock_exec.assert_not_called()
+        mock_enqueue.assert_not_called()
 
     def test_create_folder_success(self, browser, mocker):
         mocker.patch('app.views.browser_interface.FileListWorker')
@@ -738,24 +943,16 @@ class TestBrowserInterface:
         mock_dialog.exec.return_value = True
         mock_msgbox_cls.return_value = mock_dialog
 
-        file_item = QTreeWidgetItem()
-        file_item.setData(0, Qt.UserRole, {"Name": "file.txt", "IsDir": False})
-        browser.fileTree.addTopLevelItem(file_item)
-        file_item.setSelected(True)
-
-        dir_item = QTreeWidgetItem()
-        dir_item.setData(0, Qt.UserRole, {"Name": "subdir", "IsDir": True})
-        browser.fileTree.addTopLevelItem(dir_item)
-        dir_item.setSelected(True)
+        _select_entries(browser, [
+            {"Name": "file.txt", "IsDir": False},
+            {"Name": "subdir", "IsDir": True},
+        ])
 
         browser.deleteSelected()
 
         mock_exec.assert_called_once()
         ops = mock_exec.call_args[0][0]
-        assert len(ops) == 2
-        op_types = {op[0] for op in ops}
-        assert 'delete_file' in op_types
-        assert 'purge' in op_types
+        assert ops == [('bulk_delete', 'myremote:data', ['file.txt'], ['subdir'])]
 
     def test_delete_selected_no_selection(self, browser, mocker):
         mocker.patch('app.views.browser_interface.FileListWorker')
@@ -772,10 +969,7 @@ class TestBrowserInterface:
         mock_dialog.exec.return_value = False
         mock_msgbox_cls.return_value = mock_dialog
 
-        item = QTreeWidgetItem()
-        item.setData(0, Qt.UserRole, {"Name": "file.txt", "IsDir": False})
-        browser.fileTree.addTopLevelItem(item)
-        item.setSelected(True)
+        _select_entries(browser, [{"Name": "file.txt", "IsDir": False}])
 
         browser.deleteSelected()
         mock_exec.assert_not_called()
@@ -853,7 +1047,7 @@ class TestSettingsInterface:
         settings.selectRclonePath()
 
         assert settings._mock_cfg.rclonePath.value == '/opt/rclone/rclone'
-        assert settings._mock_rclone.rclone_path == '/opt/rclone/rclone'
+        settings._mock_rclone.set_rclone_path.assert_called_once_with('/opt/rclone/rclone')
         assert settings.rclonePathCard.contentLabel.text() == '/opt/rclone/rclone'
 
     def test_select_rclone_path_cancelled(self, settings, mocker):
@@ -1006,7 +1200,9 @@ class TestBrowserInterfaceSignals:
         mock_rclone, mock_cm = _make_browser_mocks(mocker)
         mocker.patch('app.views.browser_interface.FileListWorker')
         from app.views.browser_interface import BrowserInterface
+        from app.core.listing_cache import ListingCache
         widget = BrowserInterface()
+        widget.listingCache = ListingCache()
         widget._mock_rclone = mock_rclone
         widget._mock_cm = mock_cm
         yield widget
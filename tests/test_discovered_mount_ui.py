@@ -135,23 +135,17 @@ def _mock_view_deps(mocker):
     mock_rclone.config_path = "/tmp/rclone.conf"
     mock_rclone.config_dump.return_value = {}
     mock_rclone.listremotes.return_value = []
-    for mod in [
-        "app.views.mount_interface.RClone",
-    ]:
-        mocker.patch(mod, return_value=mock_rclone)
 
     mock_cm = MagicMock()
     mock_cm.list_remotes.return_value = []
-    for mod in [
-        "app.views.mount_interface.ConfigManager",
-    ]:
-        mocker.patch(mod, return_value=mock_cm)
 
     mock_mm = MagicMock()
     mock_mm.mounts = {}
     mock_mm.load_mounts.return_value = None
     mock_mm.refresh_mount_status.return_value = None
-    mocker.patch("app.views.mount_interface.MountManager", return_value=mock_mm)
+
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone, configManager=mock_cm, mountManager=mock_mm))
 
     return {
         "rclone": mock_rclone,
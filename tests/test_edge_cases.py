@@ -357,6 +357,7 @@ class TestSchedulerNoDuplicateTrigger:
 
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', return_value=mock_itr):
+                scheduler._rebuild(datetime.now())
                 scheduler._on_tick()
                 scheduler._on_tick()
                 scheduler._on_tick()
@@ -371,6 +372,7 @@ class TestSchedulerNoDuplicateTrigger:
 
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', return_value=mock_itr):
+                scheduler._rebuild(datetime.now())
                 scheduler._on_tick()
 
         assert 'task-a' in scheduler._triggered_tasks
@@ -402,6 +404,7 @@ class TestSchedulerNoDuplicateTrigger:
 
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', return_value=mock_itr):
+                scheduler._rebuild(datetime.now())
                 scheduler._on_tick()
 
         assert 'task-x' in triggered
@@ -0,0 +1,100 @@
+import os
+import sys
+
+import pytest
+
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from app.views.file_list_model import FileEntryStore, FileListModel
+
+
+@pytest.fixture(scope="module", autouse=True)
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def model():
+    return FileListModel(lambda size: f'{size} B')
+
+
+def _names(model):
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+
+ENTRIES = [
+    {'Name': 'b.txt', 'Size': 30, 'ModTime': '2024-03-01T00:00:00Z', 'IsDir': False},
+    {'Name': 'A.txt', 'Size': 10, 'ModTime': '2024-01-01T00:00:00Z', 'IsDir': False},
+    {'Name': 'zdir', 'Size': -1, 'ModTime': '2024-02-01T00:00:00Z', 'IsDir': True},
+    {'Name': 'c.txt', 'Size': 20, 'ModTime': '2024-02-15T00:00:00Z', 'IsDir': False},
+]
+
+
+class TestFileEntryStore:
+
+    def test_extend_and_entry(self):
+        store = FileEntryStore()
+        store.extend(ENTRIES)
+        assert len(store) == 4
+        assert store.entry(2) == {'Name': 'zdir', 'Size': -1, 'ModTime': '2024-02-01 00:00:00', 'IsDir': True}
+
+    def test_lowercase_name_key_is_shared(self):
+        store = FileEntryStore()
+        store.extend([{'Name': 'lower.txt'}, {'Name': 'Mixed.txt'}])
+        assert store.name_keys[0] is store.names[0]
+        assert store.name_keys[1] == 'mixed.txt'
+
+
+class TestFileListModel:
+
+    def test_display_roles(self, model):
+        model.append(ENTRIES)
+        assert model.index(0, 0).data() == 'b.txt'
+        assert model.index(0, 1).data() == '30 B'
+        assert model.index(0, 2).data() == '2024-03-01 00:00:00'
+        assert model.index(2, 1).data() == '-'
+        assert model.index(2, 0).data(Qt.UserRole)['IsDir'] is True
+
+    def test_rows_are_fetched_incrementally(self, model, mocker):
+        mocker.patch.object(FileListModel, 'FETCH_SIZE', 100)
+        model.append([{'Name': f'f{i}'} for i in range(250)])
+        assert model.totalCount() == 250
+        assert model.rowCount() == 100
+        assert model.canFetchMore()
+        model.fetchMore()
+        model.fetchMore()
+        assert model.rowCount() == 250
+        assert not model.canFetchMore()
+
+    def test_sort_by_name_puts_directories_first(self, model):
+        model.append(ENTRIES)
+        model.sort(0, Qt.AscendingOrder)
+        assert _names(model) == ['zdir', 'A.txt', 'b.txt', 'c.txt']
+
+    def test_sort_by_size_descending(self, model):
+        model.append(ENTRIES)
+        model.sort(1, Qt.DescendingOrder)
+        assert _names(model) == ['zdir', 'b.txt', 'c.txt', 'A.txt']
+
+    def test_sort_by_mtime(self, model):
+        model.append(ENTRIES)
+        model.sort(2, Qt.AscendingOrder)
+        assert _names(model) == ['zdir', 'A.txt', 'c.txt', 'b.txt']
+
+    def test_set_entries_keeps_sort(self, model):
+        model.sort(1, Qt.AscendingOrder)
+        model.setEntries(ENTRIES)
+        assert _names(model) == ['zdir', 'A.txt', 'c.txt', 'b.txt']
+        assert model.entry(1)['Name'] == 'A.txt'
+
+    def test_clear(self, model):
+        model.append(ENTRIES)
+        model.clear()
+        assert model.rowCount() == 0
+        assert model.totalCount() == 0
@@ -0,0 +1,222 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.fs_watcher import ChangeSet, DirectoryWatcher, scan_tree
+
+
+def _write(path, text='x'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def _event(kind, src, dest=None, is_directory=False):
+    return SimpleNamespace(event_type=kind, src_path=str(src), dest_path=str(dest or ''),
+                           is_directory=is_directory)
+
+
+@pytest.fixture
+def make_watcher(qtbot, tmp_path):
+    watchers = []
+
+    def make(**kwargs):
+        options = {'debounce': 0.05, 'poll_interval': 0.05, 'native': False}
+        options.update(kwargs)
+        watcher = DirectoryWatcher('task-1', str(tmp_path), **options)
+        watchers.append(watcher)
+        return watcher
+
+    yield make
+    for watcher in watchers:
+        watcher.stop()
+
+
+class TestScanTree:
+
+    def test_relative_paths_with_forward_slashes(self, tmp_path):
+        _write(tmp_path / 'a.txt')
+        _write(tmp_path / 'sub' / 'deep' / 'b.txt', 'hello')
+
+        snapshot = scan_tree(str(tmp_path))
+
+        assert set(snapshot) == {'a.txt', 'sub/deep/b.txt'}
+        assert snapshot['sub/deep/b.txt'][1] == 5
+
+    def test_missing_root(self, tmp_path):
+        assert scan_tree(str(tmp_path / 'missing')) == {}
+
+    def test_changeset_truthiness(self):
+        assert not ChangeSet()
+        assert ChangeSet(deleted=True)
+        assert ChangeSet(paths={'a'})
+
+
+class TestPollingWatcher:
+
+    def test_reports_new_and_modified_files(self, qtbot, tmp_path, make_watcher):
+        _write(tmp_path / 'keep.txt')
+        watcher = make_watcher()
+        assert watcher.start()
+        assert watcher.backend == 'polling'
+        assert watcher.wait_ready(3)
+
+        with qtbot.waitSignal(watcher.changesReady, timeout=3000) as blocker:
+            _write(tmp_path / 'docs' / 'new.txt')
+
+        key, changes = blocker.args
+        assert key == 'task-1'
+        assert changes.paths == {'docs/new.txt'}
+        assert not changes.deleted
+
+    def test_reports_deletion(self, qtbot, tmp_path, make_watcher):
+        _write(tmp_path / 'gone.txt')
+        watcher = make_watcher()
+        watcher.start()
+        assert watcher.wait_ready(3)
+
+        with qtbot.waitSignal(watcher.changesReady, timeout=3000) as blocker:
+            os.remove(tmp_path / 'gone.txt')
+
+        assert blocker.args[1].deleted
+        assert blocker.args[1].paths == set()
+
+    def test_missing_directory_does_not_start(self, tmp_path):
+        watcher = DirectoryWatcher('t', str(tmp_path / 'missing'), native=False)
+
+        assert not watcher.start()
+        assert watcher.backend is None
+
+
+class TestChangeAccumulation:
+
+    def test_events_are_debounced_into_one_changeset(self, qtbot, make_watcher):
+        watcher = make_watcher()
+        received = []
+        watcher.changesReady.connect(lambda key, changes: received.append(changes))
+
+        for name in ('a.txt', 'b.txt', 'a.txt'):
+            watcher._record(name)
+        qtbot.waitUntil(lambda: bool(received), timeout=3000)
+        qtbot.wait(100)
+
+        assert len(received) == 1
+        assert received[0].paths == {'a.txt', 'b.txt'}
+
+    def test_too_many_files_overflows(self, qtbot, make_watcher):
+        watcher = make_watcher(max_files=2)
+
+        with qtbot.waitSignal(watcher.changesReady, timeout=3000) as blocker:
+            for name in ('a', 'b', 'c'):
+                watcher._record(name)
+
+        assert blocker.args[1].overflow
+        assert blocker.args[1].paths == set()
+
+    def test_native_events(self, qtbot, tmp_path, make_watcher):
+        _write(tmp_path / 'moved' / 'one.txt')
+        _write(tmp_path / 'moved' / 'two' / 'three.txt')
+        watcher = make_watcher()
+
+        with qtbot.waitSignal(watcher.changesReady, timeout=3000) as blocker:
+            watcher._on_native_event(_event('modified', tmp_path, is_directory=True))
+            watcher._on_native_event(_event('closed', tmp_path / 'edited.txt'))
+            watcher._on_native_event(_event('moved', tmp_path / 'old', tmp_path / 'moved',
+                                            is_directory=True))
+            watcher._on_native_event(_event('created', tmp_path.parent / 'outside.txt'))
+
+        changes = blocker.args[1]
+        assert changes.paths == {'edited.txt', 'moved/one.txt', 'moved/two/three.txt'}
+        assert changes.deleted
+
+
+class TestSyncManagerWatch:
+
+    @pytest.fixture
+    def manager(self, tmp_path, mocker):
+        from app.core.sync_manager import SyncManager
+        mocker.patch('app.core.sync_manager.APP_PATH', tmp_path)
+        self.worker_cls = mocker.patch('app.core.sync_manager.SyncWorker')
+        mgr = SyncManager(MagicMock())
+        yield mgr
+        mgr.shutdown()
+
+    def _task(self, manager, mode):
+        from app.models.sync_task import SyncTask
+        task = SyncTask(id='task-1', name='Watched', source='/data', destination='gd:backup',
+                        mode=mode, watch=True)
+        manager.tasks[task.id] = task
+        return task
+
+    def test_changes_start_targeted_run(self, manager):
+        from app.models.sync_task import SyncMode, SyncStatus
+        task = self._task(manager, SyncMode.COPY)
+
+        manager._on_watch_changes('task-1', ChangeSet(paths={'b.txt', 'a.txt'}))
+
+        self.worker_cls.assert_called_once_with(manager.rclone, task, ['a.txt', 'b.txt'])
+        assert task.status == SyncStatus.RUNNING
+
+    def test_deletion_in_sync_mode_runs_full(self, manager):
+        from app.models.sync_task import SyncMode
+        task = self._task(manager, SyncMode.SYNC)
+
+        manager._on_watch_changes('task-1', ChangeSet(paths={'a.txt'}, deleted=True))
+
+        self.worker_cls.assert_called_once_with(manager.rclone, task, None)
+
+    def test_deletion_only_ignored_for_copy(self, manager):
+        from app.models.sync_task import SyncMode
+        self._task(manager, SyncMode.COPY)
+
+        manager._on_watch_changes('task-1', ChangeSet(deleted=True))
+
+        self.worker_cls.assert_not_called()
+
+    def test_changes_while_running_rerun_after_finish(self, manager):
+        from app.models.sync_task import SyncMode, SyncStatus
+        task = self._task(manager, SyncMode.COPY)
+        task.status = SyncStatus.RUNNING
+        manager.runQueue.push('task-1', frozenset({'local'}))
+        manager.runQueue.pop_runnable()
+
+        manager._on_watch_changes('task-1', ChangeSet(paths={'a.txt'}))
+        manager._on_watch_changes('task-1', ChangeSet(paths={'b.txt'}))
+        self.worker_cls.assert_not_called()
+
+        manager._on_task_finished('task-1', True, '完成')
+
+        self.worker_cls.assert_called_once_with(manager.rclone, task, ['a.txt', 'b.txt'])
+
+    def test_manual_run_replaces_pending_files(self, manager):
+        from app.models.sync_task import SyncMode, SyncStatus
+        task = self._task(manager, SyncMode.COPY)
+        task.status = SyncStatus.RUNNING
+        manager._on_watch_changes('task-1', ChangeSet(paths={'a.txt'}))
+        task.status = SyncStatus.IDLE
+
+        manager.run_task('task-1')
+
+        self.worker_cls.assert_called_once_with(manager.rclone, task, None)
+
+    def test_update_watch_starts_and_stops(self, manager, tmp_path):
+        from app.models.sync_task import SyncMode
+        task = self._task(manager, SyncMode.COPY)
+        task.source = str(tmp_path)
+
+        manager.update_watch('task-1')
+        assert manager.is_watching('task-1')
+
+        task.watch = False
+        manager.update_watch('task-1')
+        assert not manager.is_watching('task-1')
+
+    def test_remote_source_not_watched(self, manager):
+        from app.models.sync_task import SyncMode
+        task = self._task(manager, SyncMode.COPY)
+        task.source = 'gd:photos'
+
+        manager.update_watch('task-1')
+
+        assert not manager.is_watching('task-1')
@@ -0,0 +1,246 @@
+import hashlib
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.hash_cache import HashCache, compare_hashes, exclude_matcher, hash_file
+
+
+def _write(path, data=b'x'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def _md5(data):
+    return hashlib.md5(data).hexdigest()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    hc = HashCache(tmp_path / 'hashes.sqlite', workers=1)
+    yield hc
+    hc.close()
+
+
+@pytest.fixture
+def source(tmp_path):
+    root = tmp_path / 'src'
+    _write(root / 'a.txt', b'alpha')
+    _write(root / 'sub' / 'b.txt', b'beta')
+    return root
+
+
+class TestHashCache:
+
+    def test_update_hashes_tree(self, cache, source):
+        result = cache.update(str(source))
+
+        assert result == {'a.txt': _md5(b'alpha'), 'sub/b.txt': _md5(b'beta')}
+        assert cache.count() == 2
+        assert cache.lookup(str(source / 'a.txt')) == _md5(b'alpha')
+
+    def test_unchanged_files_are_not_reread(self, cache, source, mocker):
+        cache.update(str(source))
+        spy = mocker.patch('app.core.hash_cache.hash_file', side_effect=hash_file)
+
+        cache.update(str(source))
+
+        spy.assert_not_called()
+
+    def test_changed_file_is_rehashed(self, cache, source, mocker):
+        cache.update(str(source))
+        _write(source / 'a.txt', b'alpha-2')
+        spy = mocker.patch('app.core.hash_cache.hash_file', side_effect=hash_file)
+
+        result = cache.update(str(source))
+
+        assert result['a.txt'] == _md5(b'alpha-2')
+        spy.assert_called_once_with(str(source / 'a.txt'), 'md5')
+
+    def test_deleted_files_pruned(self, cache, source):
+        cache.update(str(source))
+        os.remove(source / 'sub' / 'b.txt')
+
+        assert cache.update(str(source)) == {'a.txt': _md5(b'alpha')}
+        assert cache.count() == 1
+
+    def test_other_algorithm_cached_separately(self, cache, source):
+        cache.update(str(source))
+
+        result = cache.update(str(source), 'sha1')
+
+        assert result['a.txt'] == hashlib.sha1(b'alpha').hexdigest()
+        assert cache.count() == 4
+        with pytest.raises(ValueError):
+            cache.update(str(source), 'quickxor')
+
+    def test_process_pool_pipeline(self, tmp_path):
+        root = tmp_path / 'many'
+        for i in range(20):
+            _write(root / f'{i:02d}.bin', bytes([i]) * 100)
+        hc = HashCache(tmp_path / 'pool.sqlite', workers=2)
+
+        result = hc.update(str(root))
+
+        assert len(result) == 20
+        assert result['07.bin'] == _md5(bytes([7]) * 100)
+        hc.close()
+
+    def test_cancel_returns_none_and_keeps_progress(self, cache, source):
+        assert cache.update(str(source), cancelled=lambda: True) is None
+        assert cache.count() == 1
+
+    def test_unreadable_file_returns_none(self, cache, source, mocker):
+        mocker.patch('app.core.hash_cache.hash_file',
+                     side_effect=lambda path, algorithm: None if path.endswith('b.txt')
+                     else hash_file(path, algorithm))
+
+        assert cache.update(str(source)) is None
+        assert cache.lookup(str(source / 'a.txt')) == _md5(b'alpha')
+
+    def test_excludes_skip_files_and_subtrees(self, cache, source, mocker):
+        _write(source / 'sub' / 'c.tmp', b'tmp')
+        _write(source / 'node_modules' / 'pkg' / 'x.js', b'js')
+        spy = mocker.patch('app.core.hash_cache.hash_file', side_effect=hash_file)
+
+        result = cache.update(str(source), excludes=['*.tmp', 'node_modules/**'])
+
+        assert result == {'a.txt': _md5(b'alpha'), 'sub/b.txt': _md5(b'beta')}
+        assert spy.call_count == 2
+
+    def test_exclude_matcher(self):
+        excluded = exclude_matcher(['*.{log,tmp}', '/build/', 'cache/**', 'a?c.txt'])
+
+        assert excluded('x.log', False) and excluded('deep/dir/y.tmp', False)
+        assert excluded('build', True) and not excluded('src/build', True)
+        assert not excluded('build', False)
+        assert excluded('cache', True) and excluded('src/cache/z.bin', False)
+        assert excluded('abc.txt', False) and not excluded('a/c.txt', False)
+        assert not excluded('x.txt', False)
+
+    def test_compare_hashes(self):
+        comparison = compare_hashes({'a': 'AA', 'b': 'bb', 'c': 'cc'},
+                                    {'a': 'aa', 'b': 'xx', 'z': 'zz'})
+
+        assert comparison.same == 1
+        assert comparison.changed == ['b']
+        assert comparison.missing == ['c']
+        assert comparison.extra == ['z']
+        assert comparison.candidates == ['b', 'c']
+
+
+class TestRCloneHashsum:
+
+    def test_parses_output(self, mocker):
+        from app.core.rclone import RClone, RCloneResult
+        rclone = RClone(rclone_path='rclone')
+        mocker.patch.object(rclone, '_run', return_value=RCloneResult(
+            success=True, stdout='abc  a.txt\n                                  nohash.txt\ndef  dir/b c.txt\n',
+            stderr='', return_code=0))
+
+        ok, hashes = rclone.hashsum('gd:backup')
+
+        assert ok
+        assert hashes == {'a.txt': 'abc', 'dir/b c.txt': 'def'}
+
+    def test_failure(self, mocker):
+        from app.core.rclone import RClone, RCloneResult
+        rclone = RClone(rclone_path='rclone')
+        mocker.patch.object(rclone, '_run', return_value=RCloneResult(
+            success=False, stdout='', stderr='hash type not supported', return_code=1))
+
+        assert rclone.hashsum('gd:backup', 'md5') == (False, 'hash type not supported')
+
+
+class TestSyncPrecheck:
+
+    @pytest.fixture
+    def worker(self, cache, source, mocker):
+        from app.core.sync_manager import SyncWorker
+        from app.models.sync_task import SyncMode, SyncTask
+        mocker.patch('app.core.sync_manager.get_hash_cache', return_value=cache)
+        rclone = MagicMock()
+        rclone.rclone_path = 'rclone'
+        rclone.config_path = None
+        task = SyncTask(id='t', name='Backup', source=str(source), destination='gd:backup',
+                        mode=SyncMode.COPY, hash_precheck=True)
+        return SyncWorker(rclone, task)
+
+    def _popen(self, mocker, listed):
+        def popen(cmd, **kwargs):
+            with open(cmd[cmd.index('--files-from') + 1], encoding='utf-8') as f:
+                listed.extend(f.read().splitlines())
+            process = MagicMock()
+            process.stderr.readline.return_value = ''
+            process.wait.return_value = 0
+            return process
+        return mocker.patch('subprocess.Popen', side_effect=popen)
+
+    def test_only_differing_files_transferred(self, worker, mocker):
+        worker.rclone.hashsum.return_value = (True, {'a.txt': _md5(b'alpha'), 'sub/b.txt': 'old'})
+        listed = []
+        self._popen(mocker, listed)
+        finished = []
+        worker.finished.connect(lambda *args: finished.append(args))
+
+        worker.run()
+
+        assert listed == ['sub/b.txt']
+        assert finished == [('t', True, '完成')]
+        assert not worker.partial
+
+    def test_precheck_run_compares_by_checksum(self, worker, mocker):
+        worker.rclone.hashsum.return_value = (True, {'a.txt': _md5(b'alpha'), 'sub/b.txt': 'old'})
+        popen = self._popen(mocker, [])
+
+        worker.run()
+
+        assert '--checksum' in popen.call_args[0][0]
+
+    def test_no_differences_skips_rclone(self, worker, mocker):
+        worker.rclone.hashsum.return_value = (True, {'a.txt': _md5(b'alpha'),
+                                                     'sub/b.txt': _md5(b'beta')})
+        popen = mocker.patch('subprocess.Popen')
+        finished = []
+        worker.finished.connect(lambda *args: finished.append(args))
+
+        worker.run()
+
+        popen.assert_not_called()
+        assert finished == [('t', True, '无需传输')]
+
+    def test_excluded_files_are_not_candidates(self, worker, mocker):
+        worker.task.exclude_patterns = ['sub/**']
+        worker.rclone.hashsum.return_value = (True, {})
+        listed = []
+        self._popen(mocker, listed)
+
+        worker.run()
+
+        assert listed == ['a.txt']
+
+    def test_unreadable_source_file_falls_back_to_full_run(self, worker, mocker):
+        worker.rclone.hashsum.return_value = (True, {'a.txt': _md5(b'alpha')})
+        mocker.patch('app.core.hash_cache.hash_file', return_value=None)
+        process = MagicMock()
+        process.stderr.readline.return_value = ''
+        process.wait.return_value = 0
+        popen = mocker.patch('subprocess.Popen', return_value=process)
+
+        worker.run()
+
+        assert '--files-from' not in popen.call_args[0][0]
+
+    def test_falls_back_to_sha1_then_full_run(self, worker, mocker):
+        worker.rclone.hashsum.return_value = (False, 'hash type not supported')
+        process = MagicMock()
+        process.stderr.readline.return_value = ''
+        process.wait.return_value = 0
+        popen = mocker.patch('subprocess.Popen', return_value=process)
+
+        worker.run()
+
+        assert [c.args[1] for c in worker.rclone.hashsum.call_args_list] == ['md5', 'sha1']
+        assert '--files-from' not in popen.call_args[0][0]
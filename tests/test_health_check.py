@@ -0,0 +1,193 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.health_check import ErrorClass, HealthChecker, HealthResult, classify_error
+from app.core.rclone import RCloneResult
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowRClone:
+    """check() 阻塞一段时间，并记录最大并发数。"""
+
+    def __init__(self, delay=0.0, failures=None):
+        self.delay = delay
+        self.failures = failures or {}
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def check(self, remote, timeout=None):
+        with self._lock:
+            self.calls.append(remote)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if remote in self.failures:
+            return RCloneResult(False, '', self.failures[remote], 1)
+        return RCloneResult(True, '', '', 0)
+
+
+class TestClassifyError:
+
+    @pytest.mark.parametrize('message, expected', [
+        ('Failed to create file system: couldn\'t fetch token: invalid_grant', ErrorClass.AUTH),
+        ('HTTP error 401 Unauthorized', ErrorClass.AUTH),
+        ('dial tcp: lookup example.com: no such host', ErrorClass.NETWORK),
+        ('dial tcp 10.0.0.1:443: i/o timeout', ErrorClass.TIMEOUT),
+        ('命令执行超时（20秒）', ErrorClass.TIMEOUT),
+        ('directory not found', ErrorClass.NOT_FOUND),
+        ('didn\'t find section in config file', ErrorClass.CONFIG),
+        ('something odd', ErrorClass.UNKNOWN),
+        ('', ErrorClass.UNKNOWN),
+    ])
+    def test_classify(self, message, expected):
+        assert classify_error(message) == expected
+
+
+class TestHealthChecker:
+
+    def test_probe_records_latency_and_error(self):
+        clock = Clock()
+        rclone = MagicMock()
+
+        def check(remote, timeout=None):
+            clock.now += 0.25
+            return RCloneResult(False, '', 'HTTP error 403 Forbidden', 1)
+
+        rclone.check.side_effect = check
+        checker = HealthChecker(rclone, timeout=7, clock=clock)
+
+        result = checker.probe('gd')
+
+        assert result.ok is False
+        assert result.latency == pytest.approx(0.25)
+        assert result.error_class == ErrorClass.AUTH
+        assert result.checked_at == clock.now
+        rclone.check.assert_called_once_with('gd', timeout=7)
+
+    def test_probe_exception_is_failure(self):
+        rclone = MagicMock()
+        rclone.check.side_effect = OSError('rclone not found')
+        checker = HealthChecker(rclone)
+
+        result = checker.probe('gd')
+
+        assert result.ok is False
+        assert 'rclone not found' in result.message
+
+    def test_check_all_runs_concurrently(self, qtbot):
+        rclone = SlowRClone(delay=0.2)
+        checker = HealthChecker(rclone, max_workers=8)
+        names = [f'remote{i}' for i in range(40)]
+
+        start = time.monotonic()
+        with qtbot.waitSignal(checker.allFinished, timeout=10000):
+            assert checker.check_all(names) == 40
+        elapsed = time.monotonic() - start
+
+        assert sorted(rclone.calls) == sorted(names)
+        assert rclone.peak <= 8
+        assert elapsed < 40 * 0.2 / 2
+        assert all(checker.result(n).ok for n in names)
+        checker.shutdown()
+
+    def test_results_cached_for_ttl(self, qtbot):
+        clock = Clock()
+        rclone = SlowRClone()
+        checker = HealthChecker(rclone, ttl=60, clock=clock)
+
+        with qtbot.waitSignal(checker.allFinished, timeout=3000):
+            checker.check('gd')
+        assert checker.check('gd') is False
+        assert checker.is_fresh('gd')
+
+        clock.now += 61
+        assert not checker.is_fresh('gd')
+        with qtbot.waitSignal(checker.allFinished, timeout=3000):
+            assert checker.check('gd') is True
+        assert rclone.calls == ['gd', 'gd']
+        checker.shutdown()
+
+    def test_force_bypasses_cache(self, qtbot):
+        rclone = SlowRClone()
+        checker = HealthChecker(rclone)
+        with qtbot.waitSignal(checker.allFinished, timeout=3000):
+            checker.check('gd')
+
+        with qtbot.waitSignal(checker.allFinished, timeout=3000):
+            assert checker.check('gd', force=True) is True
+
+        assert rclone.calls == ['gd', 'gd']
+        checker.shutdown()
+
+    def test_pending_not_submitted_twice(self, qtbot):
+        rclone = SlowRClone(delay=0.2)
+        checker = HealthChecker(rclone)
+
+        with qtbot.waitSignal(checker.allFinished, timeout=3000):
+            assert checker.check('gd') is True
+            assert checker.is_checking('gd')
+            assert checker.check('gd', force=True) is False
+
+        assert rclone.calls == ['gd']
+        checker.shutdown()
+
+    def test_result_signal_carries_result(self, qtbot):
+        rclone = SlowRClone(failures={'bad': 'dial tcp: no such host'})
+        checker = HealthChecker(rclone)
+
+        with qtbot.waitSignal(checker.resultReady, timeout=3000) as blocker:
+            checker.check('bad')
+
+        name, result = blocker.args
+        assert name == 'bad'
+        assert result.error_class == ErrorClass.NETWORK
+        checker.shutdown()
+
+    def test_invalidate(self, qtbot):
+        checker = HealthChecker(SlowRClone())
+        with qtbot.waitSignal(checker.allFinished, timeout=3000):
+            checker.check_all(['a', 'b'])
+
+        checker.invalidate('a')
+        assert checker.result('a') is None
+        assert checker.result('b') is not None
+
+        checker.invalidate()
+        assert checker.result('b') is None
+        checker.shutdown()
+
+
+class TestRemoteCardBadge:
+
+    def test_badge_states(self, qtbot):
+        from app.models.remote import Remote
+        from app.views.remote_interface import RemoteCard
+        card = RemoteCard(Remote(name='gd', type='drive'))
+        qtbot.addWidget(card)
+        assert card.statusBadge.isHidden()
+
+        card.setChecking()
+        assert card.statusBadge.text() == '检查中'
+
+        card.setHealth(HealthResult(remote='gd', ok=True, latency=0.123))
+        assert card.statusBadge.text() == '123 ms'
+
+        card.setHealth(HealthResult(remote='gd', ok=False, latency=1.0,
+                                    error_class=ErrorClass.AUTH, message='401'))
+        assert card.statusBadge.text() == '认证失败'
+        assert card.statusBadge.toolTip() == '401'
@@ -0,0 +1,162 @@
+import pytest
+
+from app.core.listing_cache import ListingCache, get_listing_cache, listing_fingerprint, ttl_for_type
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ListingCache(max_dirs=3, max_entries=10, default_ttl=30, clock=clock)
+
+
+def _entries(n):
+    return [{'Name': f'f{i}', 'IsDir': False} for i in range(n)]
+
+
+class TestListingCache:
+
+    def test_miss_returns_none(self, cache):
+        assert cache.get('rem:docs') is None
+
+    def test_put_then_get_is_fresh(self, cache):
+        cache.put('rem:docs', _entries(2))
+        hit = cache.get('rem:docs')
+        assert hit.fresh is True
+        assert len(hit.entries) == 2
+
+    def test_keys_are_normalized(self, cache):
+        cache.put('rem:/docs/', _entries(1))
+        assert cache.get('rem:docs') is not None
+
+    def test_expired_entry_is_stale_not_dropped(self, cache, clock):
+        cache.put('rem:docs', _entries(1))
+        clock.now += 31
+        hit = cache.get('rem:docs')
+        assert hit is not None
+        assert hit.fresh is False
+
+    def test_per_remote_ttl(self, cache, clock):
+        cache.set_ttl('slow', 300)
+        cache.put('slow:a', _entries(1))
+        cache.put('fast:a', _entries(1))
+        clock.now += 60
+        assert cache.get('slow:a').fresh is True
+        assert cache.get('fast:a').fresh is False
+
+    def test_local_paths_are_not_cached(self, cache):
+        cache.put('/home/user', _entries(1))
+        cache.put('C:\\data', _entries(1))
+        assert len(cache) == 0
+
+    def test_lru_evicts_least_recently_used_dir(self, cache):
+        cache.put('rem:a', _entries(1))
+        cache.put('rem:b', _entries(1))
+        cache.put('rem:c', _entries(1))
+        cache.get('rem:a')
+        cache.put('rem:d', _entries(1))
+        assert cache.get('rem:b') is None
+        assert cache.get('rem:a') is not None
+
+    def test_entry_count_bound(self, cache):
+        cache.put('rem:a', _entries(6))
+        cache.put('rem:b', _entries(6))
+        assert cache.get('rem:a') is None
+        assert cache.get('rem:b') is not None
+
+    def test_oversized_listing_is_skipped(self, cache):
+        cache.put('rem:huge', _entries(11))
+        assert cache.get('rem:huge') is None
+
+    def test_invalidate_tree(self, cache):
+        cache.max_dirs = 10
+        for path in ('rem:a', 'rem:a/b', 'rem:a/b/c', 'rem:ab', 'other:a'):
+            cache.put(path, [])
+        cache.invalidate_tree('rem:a')
+        assert cache.get('rem:a') is None
+        assert cache.get('rem:a/b/c') is None
+        assert cache.get('rem:ab') is not None
+        assert cache.get('other:a') is not None
+
+
+class TestInvalidateForOperation:
+
+    @pytest.fixture
+    def filled(self, clock):
+        cache = ListingCache(clock=clock)
+        for path in ('rem:', 'rem:docs', 'rem:docs/sub', 'rem:docs/sub/deep', 'rem:other'):
+            cache.put(path, [])
+        return cache
+
+    def test_upload_invalidates_destination_only(self, filled):
+        filled.invalidate_for_operation(('copy', '/tmp/a.txt', 'rem:docs'))
+        assert filled.get('rem:docs') is None
+        assert filled.get('rem:') is not None
+        assert filled.get('rem:docs/sub') is not None
+
+    def test_download_invalidates_nothing(self, filled):
+        filled.invalidate_for_operation(('copy', 'rem:docs/a.txt', '/tmp/out'))
+        assert len(filled) == 5
+
+    def test_mkdir_invalidates_parent(self, filled):
+        filled.invalidate_for_operation(('mkdir', 'rem:docs/new'))
+        assert filled.get('rem:docs') is None
+        assert filled.get('rem:') is not None
+
+    def test_delete_file_at_root_invalidates_root(self, filled):
+        filled.invalidate_for_operation(('delete_file', 'rem:a.txt'))
+        assert filled.get('rem:') is None
+        assert filled.get('rem:docs') is not None
+
+    def test_purge_invalidates_parent_and_subtree(self, filled):
+        filled.invalidate_for_operation(('purge', 'rem:docs/sub'))
+        assert filled.get('rem:docs') is None
+        assert filled.get('rem:docs/sub') is None
+        assert filled.get('rem:docs/sub/deep') is None
+        assert filled.get('rem:') is not None
+        assert filled.get('rem:other') is not None
+
+    def test_bulk_delete_invalidates_dir_and_deleted_subtrees(self, filled):
+        filled.invalidate_for_operation(('bulk_delete', 'rem:docs', ['a.txt'], ['sub']))
+        assert filled.get('rem:docs') is None
+        assert filled.get('rem:docs/sub/deep') is None
+        assert filled.get('rem:') is not None
+        assert filled.get('rem:other') is not None
+
+
+def test_ttl_for_type_defaults():
+    assert ttl_for_type('s3') > ttl_for_type('sftp')
+    assert ttl_for_type('unknown-backend') == ttl_for_type('webdav')
+
+
+def test_fingerprint_ignores_order_and_tracks_changes():
+    a = {'Name': 'a', 'Size': 1, 'ModTime': 't1', 'IsDir': False}
+    b = {'Name': 'b', 'Size': 2, 'ModTime': 't1', 'IsDir': False}
+
+    assert listing_fingerprint([a, b]) == listing_fingerprint([b, a])
+    assert listing_fingerprint([a, b]) != listing_fingerprint([a, dict(b, Size=3)])
+    assert listing_fingerprint([a])[0] == 1
+
+
+def test_put_stores_given_fingerprint():
+    cache = ListingCache()
+    cache.put('gd:docs', [{'Name': 'a'}], fingerprint=(1, 42))
+
+    assert cache.get('gd:docs').fingerprint == (1, 42)
+    cache.put('gd:docs', [{'Name': 'a'}])
+    assert cache.get('gd:docs').fingerprint == listing_fingerprint([{'Name': 'a'}])
+
+
+def test_get_listing_cache_is_shared():
+    assert get_listing_cache() is get_listing_cache()
@@ -539,6 +539,65 @@ class TestSyncTask:
         task = SyncTask.from_dict(data)
         assert task.last_run is None
 
+    def test_sync_task_incremental_window(self):
+        from datetime import datetime, timedelta
+        from app.models.sync_task import SyncTask, SyncMode
+
+        now = datetime(2024, 1, 2, 12, 0, 0)
+        task = SyncTask(name='Test', mode=SyncMode.COPY, incremental=True,
+                        incremental_overlap=600, full_check_interval=24)
+        assert task.incremental_window(now) is None
+
+        task.last_success = now - timedelta(hours=1)
+        task.last_full_run = now - timedelta(hours=2)
+        assert task.incremental_window(now) == timedelta(hours=1, minutes=10)
+
+        task.last_full_run = now - timedelta(hours=24)
+        assert task.incremental_window(now) is None
+
+        task.full_check_interval = 0
+        assert task.incremental_window(now) == timedelta(hours=1, minutes=10)
+
+        task.mode = SyncMode.SYNC
+        assert task.incremental_window(now) is None
+
+    def test_sync_task_incremental_roundtrip(self):
+        from app.models.sync_task import SyncTask, SyncMode
+
+        task = SyncTask(name='Test', mode=SyncMode.COPY, incremental=True,
+                        no_traverse=True, full_check_interval=6)
+        task.last_success = datetime(2024, 1, 1, 12, 0, 0)
+        task.last_full_run = datetime(2024, 1, 1, 6, 0, 0)
+
+        restored = SyncTask.from_dict(task.to_dict())
+
+        assert restored.incremental and restored.no_traverse
+        assert restored.full_check_interval == 6
+        assert restored.last_success == task.last_success
+        assert restored.last_full_run == task.last_full_run
+
+    def test_sync_task_perf_profile_roundtrip(self):
+        from app.models.perf_profile import preset_profile
+        from app.models.sync_task import SyncTask
+
+        task = SyncTask(name='Test', perf=preset_profile('high_latency'))
+
+        restored = SyncTask.from_dict(task.to_dict())
+
+        assert restored.perf == task.perf
+        assert restored.perf.preset == 'high_latency'
+
+    def test_sync_task_invalid_perf_profile_ignored(self):
+        from app.models.sync_task import SyncTask
+
+        data = SyncTask(id='t', name='Test').to_dict()
+        data['perf'] = {'buffer_size': 'huge'}
+
+        task = SyncTask.from_dict(data)
+
+        assert task.name == 'Test'
+        assert task.perf.is_default
+
     def test_sync_task_eq(self):
         from app.models.sync_task import SyncTask
 
@@ -555,3 +614,57 @@ class TestSyncTask:
 
         task = SyncTask(id='test-id', name='Test')
         assert hash(task) == hash('test-id')
+
+
+class TestPerfProfile:
+
+    def test_defaults_produce_no_args(self):
+        from app.models.perf_profile import PerfProfile
+
+        assert PerfProfile().is_default
+        assert PerfProfile().to_args() == []
+
+    def test_to_args(self):
+        from app.models.perf_profile import PerfProfile
+
+        profile = PerfProfile(fast_list=True, buffer_size=' 32M ', multi_thread_cutoff='1.5Gi',
+                              s3_upload_concurrency=8, size_only=True, update=True,
+                              track_renames=True)
+
+        assert profile.buffer_size == '32M'
+        assert profile.to_args() == [
+            '--fast-list', '--buffer-size', '32M', '--multi-thread-cutoff', '1.5Gi',
+            '--s3-upload-concurrency', '8', '--size-only', '--update', '--track-renames']
+        assert '--track-renames' not in profile.to_args(track_renames=False)
+
+    @pytest.mark.parametrize('kwargs', [
+        {'buffer_size': '16 MB'},
+        {'multi_thread_cutoff': 'big'},
+        {'s3_upload_concurrency': -1},
+        {'s3_upload_concurrency': 1000},
+        {'s3_upload_concurrency': '4'},
+        {'fast_list': 'yes'},
+    ])
+    def test_validation(self, kwargs):
+        from app.models.perf_profile import PerfProfile
+
+        with pytest.raises(ValueError):
+            PerfProfile(**kwargs)
+
+    def test_presets(self):
+        from app.models.perf_profile import PRESETS, preset_profile
+
+        for name in PRESETS:
+            profile = preset_profile(name)
+            assert profile.preset == name
+            assert not profile.is_default
+        assert PRESETS['small_files'][1].preset == ''
+        with pytest.raises(ValueError):
+            preset_profile('missing')
+
+    def test_from_dict_ignores_unknown_keys(self):
+        from app.models.perf_profile import PerfProfile
+
+        profile = PerfProfile.from_dict({'fast_list': True, 'legacy': 1})
+
+        assert profile == PerfProfile(fast_list=True)
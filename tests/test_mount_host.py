@@ -0,0 +1,209 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.mount_host import MountHost
+from app.core.rclone_rc import RCDaemon, RCError
+from app.models.mount import Mount, MountStatus
+
+
+class FakeHostDaemon:
+    """模拟 rcd 的 mount/* 方法。"""
+
+    def __init__(self, started=True):
+        self.started = started
+        self.running = False
+        self.mounts = {}
+        self.calls = []
+        self.stopped = False
+
+    def start(self):
+        self.running = self.started
+        return self.started
+
+    def is_running(self):
+        return self.running
+
+    def stop(self):
+        self.running = False
+        self.stopped = True
+
+    def call(self, method, params=None):
+        self.calls.append((method, params))
+        if method == 'mount/mount':
+            if params['mountPoint'] in self.mounts:
+                raise RCError('mount point already in use')
+            self.mounts[params['mountPoint']] = params['fs']
+            return {}
+        if method == 'mount/unmount':
+            if self.mounts.pop(params['mountPoint'], None) is None:
+                raise RCError('mount not found')
+            return {}
+        if method == 'mount/unmountall':
+            self.mounts.clear()
+            return {}
+        if method == 'mount/listmounts':
+            return {'mountPoints': [{'Fs': fs, 'MountPoint': point, 'MountedOn': ''}
+                                    for point, fs in self.mounts.items()]}
+        raise RCError(f'unknown method {method}')
+
+
+def _mount(name='gd', letter='X', **kwargs):
+    return Mount(remote_name=name, remote_path='docs', drive_letter=letter, **kwargs)
+
+
+@pytest.fixture
+def daemon(mocker):
+    fake = FakeHostDaemon()
+    mocker.patch('app.core.mount_host.RCDaemon', return_value=fake)
+    return fake
+
+
+class TestMountHost:
+
+    def test_mount_params(self):
+        params = MountHost.mount_params(_mount(cache_mode='full', vfs_cache_max_size='20G',
+                                               read_only=True))
+
+        assert params == {
+            'fs': 'gd:docs',
+            'mountPoint': 'X:',
+            'vfsOpt': {'CacheMode': 'full', 'CacheMaxSize': '20G', 'ReadOnly': True},
+        }
+
+    def test_mount_list_unmount(self, daemon):
+        host = MountHost('rclone.exe')
+        host.start()
+
+        host.mount(_mount())
+        host.mount(_mount('s3', 'Y'))
+        assert host.list_mounts() == {'X:': 'gd:docs', 'Y:': 's3:docs'}
+
+        host.unmount(_mount())
+        assert host.list_mounts() == {'Y:': 's3:docs'}
+
+    def test_stop_unmounts_everything(self, daemon):
+        host = MountHost('rclone.exe')
+        host.start()
+        host.mount(_mount())
+
+        host.stop()
+
+        assert daemon.mounts == {}
+        assert daemon.stopped
+
+    def test_cache_dir_passed_to_rcd(self):
+        host = MountHost('rclone.exe', '/c/rclone.conf', cache_dir='/cache')
+        cmd = host.daemon._build_command(5572, 'u')
+
+        assert cmd[cmd.index('--cache-dir') + 1] == '/cache'
+        assert cmd.index('rcd') < cmd.index('--cache-dir')
+
+    def test_daemon_without_extra_args(self):
+        assert '--cache-dir' not in RCDaemon('rclone.exe')._build_command(5572, 'u')
+
+
+class TestManagerWithHost:
+
+    @pytest.fixture
+    def manager(self, tmp_path, mocker, daemon):
+        from app.core.mount_manager import HostMountWorker, MountManager
+        mocker.patch('app.core.mount_manager.APP_PATH', tmp_path)
+        mock_cfg = mocker.patch('app.core.mount_manager.cfg')
+        mock_cfg.mountHost.value = True
+        mocker.patch('app.core.mount_manager.get_cache_dir', return_value='/cache')
+        # 在当前线程直接运行挂载
+        mocker.patch.object(HostMountWorker, 'start', lambda worker: worker.run())
+        self.mount_worker = mocker.patch('app.core.mount_manager.MountWorker')
+        rclone = MagicMock()
+        rclone.rclone_path = 'rclone.exe'
+        rclone.config_path = None
+        manager = MountManager(rclone)
+        manager._config_file = tmp_path / 'config' / 'mounts.json'
+        mocker.patch.object(manager, 'discover_system_mounts', return_value=[])
+        manager.mounts['gd'] = _mount()
+        return manager
+
+    def test_mount_goes_through_host(self, manager, daemon):
+        assert manager.mount('gd')
+
+        assert daemon.mounts == {'X:': 'gd:docs'}
+        assert manager.mounts['gd'].status == MountStatus.MOUNTED
+        assert manager.mounts['gd'].process_id is None
+        self.mount_worker.assert_not_called()
+
+    def test_unmount_uses_host(self, manager, daemon, mocker):
+        kill = mocker.patch.object(manager, '_kill_rclone_mount_by_drive')
+        manager.mount('gd')
+
+        manager.unmount('gd')
+
+        assert daemon.mounts == {}
+        assert manager.mounts['gd'].status == MountStatus.UNMOUNTED
+        kill.assert_not_called()
+
+    def test_failed_unmount_keeps_mount_tracked(self, manager, daemon):
+        manager.mount('gd')
+        daemon.mounts.clear()
+        errors = []
+        manager.mountError.connect(lambda name, message: errors.append(message))
+
+        assert manager.unmount('gd') is False
+
+        assert manager.mounts['gd'].status == MountStatus.MOUNTED
+        assert 'gd' in manager._hosted
+        assert 'mount not found' in errors[0]
+
+    def test_status_comes_from_listmounts(self, manager, daemon):
+        manager.mount('gd')
+        # 挂载在宿主外部被移除
+        daemon.mounts.clear()
+
+        manager.refresh_mount_status()
+
+        assert manager.mounts['gd'].status == MountStatus.UNMOUNTED
+        assert ('mount/listmounts', None) in daemon.calls
+
+    def test_mount_failure_reported(self, manager, daemon):
+        daemon.mounts['X:'] = 'other:'
+        errors = []
+        manager.mountError.connect(lambda name, message: errors.append(message))
+
+        manager.mount('gd')
+
+        assert manager.mounts['gd'].status == MountStatus.ERROR
+        assert 'already in use' in errors[0]
+
+    def test_unmount_all_stops_host(self, manager, daemon):
+        manager.mount('gd')
+
+        manager.unmount_all()
+
+        assert daemon.stopped
+        assert daemon.mounts == {}
+
+    def test_falls_back_when_host_unavailable(self, manager, daemon):
+        daemon.started = False
+
+        manager.mount('gd')
+
+        self.mount_worker.assert_called_once_with(manager.rclone, manager.mounts['gd'])
+        self.mount_worker.return_value.run.assert_called_once()
+        assert 'gd' not in manager._hosted
+
+    def test_host_started_in_worker_thread(self, manager, daemon, mocker):
+        from app.core.mount_manager import HostMountWorker
+        mocker.patch.object(HostMountWorker, 'start')
+
+        manager.mount('gd')
+
+        assert not daemon.running
+        assert manager.mounts['gd'].status == MountStatus.MOUNTING
+
+    def test_disabled_uses_process_per_mount(self, manager, daemon, mocker):
+        mocker.patch('app.core.mount_manager.cfg').mountHost.value = False
+
+        manager.mount('gd')
+
+        self.mount_worker.assert_called_once()
+        assert daemon.calls == []
@@ -26,6 +26,8 @@ class TestQueryRcloneMountProcesses:
         mgr = MountManager.__new__(MountManager)
         mgr._lock = Lock()
         mgr.mounts = {}
+        mgr._host = None
+        mgr._hosted = set()
         mgr.workers = {}
         mgr._config_file = tmp_path / "mounts.json"
         mgr._shutdown = False
@@ -135,6 +137,8 @@ class TestDiscoverSystemMounts:
         mgr = MountManager.__new__(MountManager)
         mgr._lock = Lock()
         mgr.mounts = {}
+        mgr._host = None
+        mgr._hosted = set()
         mgr.workers = {}
         mgr._config_file = tmp_path / "mounts.json"
         mgr._shutdown = False
@@ -196,6 +200,8 @@ class TestRefreshMountStatusDiscovery:
         mgr = MountManager.__new__(MountManager)
         mgr._lock = Lock()
         mgr.mounts = {}
+        mgr._host = None
+        mgr._hosted = set()
         mgr.workers = {}
         mgr._config_file = tmp_path / "mounts.json"
         mgr._shutdown = False
@@ -252,6 +258,8 @@ class TestSaveMountsDiscoveredFilter:
         mgr = MountManager.__new__(MountManager)
         mgr._lock = Lock()
         mgr.mounts = {}
+        mgr._host = None
+        mgr._hosted = set()
         mgr.workers = {}
         mgr._config_file = tmp_path / "mounts.json"
         mgr._shutdown = False
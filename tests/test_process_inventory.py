@@ -0,0 +1,227 @@
+import os
+import sys
+from threading import Lock
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.process_inventory import ProcFsProvider, ProcessInventory, ProcessProvider
+
+
+class FakeProvider(ProcessProvider):
+
+    def __init__(self, procs):
+        self.procs = procs
+        self.cmdline_calls = []
+        self.alive = set()
+
+    def snapshot(self):
+        return {pid: (name, token) for pid, (name, token, _) in self.procs.items()}
+
+    def cmdline(self, pid):
+        self.cmdline_calls.append(pid)
+        cmdline = self.procs[pid][2]
+        if cmdline is None:
+            raise OSError('access denied')
+        return cmdline
+
+    def is_running(self, pid):
+        return pid in self.alive
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write_proc(root, pid, name, state='S', start='100', cmdline=b''):
+    proc = root / str(pid)
+    proc.mkdir()
+    fields = [state] + ['0'] * 18 + [start, '0']
+    (proc / 'stat').write_text(f'{pid} ({name}) ' + ' '.join(fields))
+    (proc / 'cmdline').write_bytes(cmdline)
+
+
+class TestProcessInventory:
+
+    def test_filters_by_name_prefix(self):
+        provider = FakeProvider({
+            1: ('rclone.exe', 'a', 'rclone mount a: X:'),
+            2: ('explorer.exe', 'b', 'explorer'),
+        })
+        inventory = ProcessInventory(provider)
+
+        procs = inventory.processes()
+
+        assert [p.pid for p in procs] == [1]
+        assert procs[0].cmdline == 'rclone mount a: X:'
+        assert provider.cmdline_calls == [1]
+
+    def test_cached_until_max_age(self):
+        clock = Clock()
+        provider = FakeProvider({1: ('rclone', 'a', 'rclone mount a: X:')})
+        inventory = ProcessInventory(provider, max_age=2.0, clock=clock)
+        inventory.processes()
+
+        provider.procs[2] = ('rclone', 'b', 'rclone mount b: Y:')
+        assert len(inventory.processes()) == 1
+
+        clock.now = 3.0
+        assert len(inventory.processes()) == 2
+
+    def test_incremental_refresh_reads_only_new_cmdlines(self):
+        provider = FakeProvider({1: ('rclone', 'a', 'rclone mount a: X:')})
+        inventory = ProcessInventory(provider)
+        inventory.processes()
+
+        provider.procs[2] = ('rclone', 'b', 'rclone mount b: Y:')
+        inventory.processes(force=True)
+
+        assert provider.cmdline_calls == [1, 2]
+
+    def test_pid_reuse_rereads_cmdline(self):
+        provider = FakeProvider({1: ('rclone', 'a', 'rclone mount a: X:')})
+        inventory = ProcessInventory(provider)
+        inventory.processes()
+
+        provider.procs[1] = ('rclone', 'b', 'rclone mount b: Y:')
+        procs = inventory.processes(force=True)
+
+        assert procs[0].cmdline == 'rclone mount b: Y:'
+
+    def test_exited_processes_dropped(self):
+        provider = FakeProvider({1: ('rclone', 'a', 'x')})
+        inventory = ProcessInventory(provider)
+        inventory.processes()
+
+        del provider.procs[1]
+
+        assert inventory.processes(force=True) == []
+
+    def test_unreadable_cmdline_kept_empty(self):
+        provider = FakeProvider({1: ('rclone', 'a', None)})
+        inventory = ProcessInventory(provider)
+
+        assert inventory.processes()[0].cmdline == ''
+
+    def test_snapshot_error_keeps_previous(self):
+        provider = FakeProvider({1: ('rclone', 'a', 'x')})
+        inventory = ProcessInventory(provider)
+        inventory.processes()
+
+        provider.snapshot = MagicMock(side_effect=OSError('boom'))
+
+        assert len(inventory.processes(force=True)) == 1
+
+    def test_is_running_uses_provider(self):
+        provider = FakeProvider({})
+        provider.alive.add(42)
+        inventory = ProcessInventory(provider)
+
+        assert inventory.is_running(42) is True
+        assert inventory.is_running(43) is False
+
+    def test_unavailable(self):
+        inventory = ProcessInventory(None)
+
+        assert inventory.available is False
+        assert inventory.processes() == []
+        with pytest.raises(RuntimeError):
+            inventory.is_running(1)
+
+
+class TestProcFsProvider:
+
+    def test_snapshot_and_cmdline(self, tmp_path):
+        _write_proc(tmp_path, 10, 'rclone', cmdline=b'rclone\0mount\0gd:docs\0Z:\0')
+        _write_proc(tmp_path, 11, 'bash (login)')
+        (tmp_path / 'self').mkdir()
+        provider = ProcFsProvider(str(tmp_path))
+
+        snapshot = provider.snapshot()
+
+        assert snapshot == {10: ('rclone', '100'), 11: ('bash (login)', '100')}
+        assert provider.cmdline(10) == 'rclone mount gd:docs Z:'
+
+    def test_is_running_ignores_zombies(self, tmp_path):
+        _write_proc(tmp_path, 10, 'rclone')
+        _write_proc(tmp_path, 11, 'rclone', state='Z')
+        provider = ProcFsProvider(str(tmp_path))
+
+        assert provider.is_running(10) is True
+        assert provider.is_running(11) is False
+        assert provider.is_running(12) is False
+
+    @pytest.mark.skipif(not sys.platform.startswith('linux'), reason='需要 /proc')
+    def test_real_proc_contains_current_process(self):
+        provider = ProcFsProvider()
+
+        assert os.getpid() in provider.snapshot()
+        assert provider.is_running(os.getpid())
+        assert 'python' in provider.cmdline(os.getpid()).lower()
+
+
+class TestMountManagerInventory:
+
+    @pytest.fixture
+    def inventory(self, mocker):
+        provider = FakeProvider({
+            100: ('rclone.exe', 'a', 'rclone.exe mount myremote: X: --vfs-cache-mode full'),
+            200: ('rclone.exe', 'b', 'rclone.exe mount gdrive:docs Z:'),
+            300: ('rclone.exe', 'c', 'rclone.exe copy a: b:'),
+        })
+        inventory = ProcessInventory(provider)
+        mocker.patch('app.core.mount_manager.get_process_inventory', return_value=inventory)
+        return inventory
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        from app.core.mount_manager import MountManager
+        mgr = MountManager.__new__(MountManager)
+        mgr._lock = Lock()
+        mgr.mounts = {}
+        mgr.workers = {}
+        mgr._config_file = tmp_path / "mounts.json"
+        mgr._shutdown = False
+        mgr.rclone = MagicMock()
+        return mgr
+
+    def test_query_uses_inventory_without_subprocess(self, manager, inventory, mocker):
+        run = mocker.patch('subprocess.run')
+
+        processes = manager._query_rclone_mount_processes()
+
+        assert sorted(processes) == [('X', 100, 'myremote'), ('Z', 200, 'gdrive')]
+        run.assert_not_called()
+
+    def test_kill_by_drive_terminates_matching_pid(self, manager, inventory, mocker):
+        mocker.patch('os.name', 'nt')
+        term = mocker.patch.object(manager, '_terminate_process_gracefully')
+        ps = mocker.patch.object(manager, '_kill_by_powershell')
+
+        assert manager._kill_rclone_mount_by_drive('Z') is True
+
+        term.assert_called_once_with(200)
+        ps.assert_not_called()
+
+    def test_kill_by_drive_no_match(self, manager, inventory, mocker):
+        mocker.patch('os.name', 'nt')
+        term = mocker.patch.object(manager, '_terminate_process_gracefully')
+        tasklist = mocker.patch.object(manager, '_kill_by_tasklist')
+
+        assert manager._kill_rclone_mount_by_drive('Q') is False
+
+        term.assert_not_called()
+        tasklist.assert_not_called()
+
+    def test_is_process_running_uses_inventory(self, manager, inventory, mocker):
+        inventory.provider.alive.add(100)
+        run = mocker.patch('subprocess.run')
+
+        assert manager._is_process_running(100) is True
+        assert manager._is_process_running(999) is False
+        run.assert_not_called()
@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.quota_service import QuotaService, RemoteQuota, format_bytes, summarize
+
+
+class FakeRClone:
+
+    def __init__(self, infos, delays=None):
+        self.infos = infos
+        self.delays = delays or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def about(self, remote, timeout=None):
+        with self._lock:
+            self.calls.append(remote)
+        time.sleep(self.delays.get(remote, 0))
+        info = self.infos[remote]
+        if isinstance(info, str):
+            return False, info
+        return True, info
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / 'quota.json'
+
+
+def _wait_idle(qtbot, service):
+    qtbot.waitUntil(lambda: not service.is_refreshing(), timeout=5000)
+
+
+class TestSummarize:
+
+    def test_aggregates_and_skips_unknown(self):
+        summary = summarize([
+            RemoteQuota('a', total=100, used=40, free=60, fetched_at=5),
+            RemoteQuota('b', total=200, used=50, free=150, fetched_at=3),
+            RemoteQuota('c'),
+            RemoteQuota('d', error='not supported'),
+        ])
+
+        assert (summary.total, summary.used, summary.free) == (300, 90, 210)
+        assert summary.counted == 2
+        assert summary.failed == 1
+        assert summary.oldest == 3
+
+    def test_from_about_derives_free(self):
+        quota = RemoteQuota.from_about('a', {'total': 100, 'used': 30}, 1.0)
+
+        assert quota.free == 70
+
+    def test_format_bytes(self):
+        assert format_bytes(None) == '-'
+        assert format_bytes(1536) == '1.5 KB'
+
+
+class TestQuotaService:
+
+    def test_refresh_fetches_and_persists(self, qtbot, cache_file):
+        rclone = FakeRClone({'a': {'total': 100, 'used': 40, 'free': 60},
+                             'b': {'used': 10}})
+        service = QuotaService(rclone, cache_file=cache_file)
+
+        assert service.refresh(['a', 'b']) == 2
+        _wait_idle(qtbot, service)
+        qtbot.waitUntil(cache_file.exists, timeout=3000)
+
+        summary = service.summary()
+        assert (summary.total, summary.used, summary.counted) == (100, 50, 2)
+        saved = {d['remote']: d for d in json.loads(cache_file.read_text(encoding='utf-8'))}
+        assert saved['a']['free'] == 60
+        service.shutdown()
+
+    def test_cache_available_immediately_at_startup(self, cache_file):
+        cache_file.write_text(json.dumps([
+            {'remote': 'a', 'total': 100, 'used': 25, 'free': 75, 'fetched_at': 1.0}
+        ]), encoding='utf-8')
+        rclone = FakeRClone({})
+
+        service = QuotaService(rclone, cache_file=cache_file)
+
+        assert service.summary().used == 25
+        assert service.quota('a').fetched_at == 1.0
+        assert rclone.calls == []
+
+    def test_corrupt_cache_ignored(self, cache_file):
+        cache_file.write_text('{not json', encoding='utf-8')
+
+        service = QuotaService(FakeRClone({}), cache_file=cache_file)
+
+        assert service.summary().counted == 0
+
+    def test_slow_remote_does_not_block_others(self, qtbot, cache_file):
+        rclone = FakeRClone({'fast': {'total': 10, 'used': 1}, 'slow': {'total': 20, 'used': 2}},
+                            delays={'slow': 0.5})
+        service = QuotaService(rclone, cache_file=cache_file)
+        updated = []
+        service.quotaUpdated.connect(lambda name, _: updated.append(name))
+
+        service.refresh(['slow', 'fast'])
+        qtbot.waitUntil(lambda: 'fast' in updated, timeout=3000)
+
+        assert 'slow' not in updated
+        assert service.is_refreshing()
+        _wait_idle(qtbot, service)
+        service.shutdown()
+
+    def test_failure_keeps_previous_values(self, qtbot, cache_file):
+        rclone = FakeRClone({'a': {'total': 100, 'used': 40}})
+        service = QuotaService(rclone, cache_file=cache_file)
+        service.refresh(['a'])
+        _wait_idle(qtbot, service)
+
+        rclone.infos['a'] = 'couldn\'t connect'
+        service.refresh(['a'])
+        _wait_idle(qtbot, service)
+
+        quota = service.quota('a')
+        assert quota.error == 'couldn\'t connect'
+        assert quota.used == 40
+        summary = service.summary()
+        assert summary.used == 40 and summary.failed == 1
+        service.shutdown()
+
+    def test_max_age_skips_fresh_entries(self, qtbot, cache_file):
+        clock = Clock()
+        rclone = FakeRClone({'a': {'total': 1, 'used': 1}})
+        service = QuotaService(rclone, cache_file=cache_file, clock=clock)
+        service.refresh(['a'])
+        _wait_idle(qtbot, service)
+
+        assert service.refresh(['a'], max_age=60) == 0
+        clock.now += 61
+        assert service.refresh(['a'], max_age=60) == 1
+        _wait_idle(qtbot, service)
+        service.shutdown()
+
+    def test_start_prunes_removed_remotes(self, qtbot, cache_file):
+        cache_file.write_text(json.dumps([
+            {'remote': 'gone', 'total': 1, 'used': 1, 'fetched_at': 1.0}
+        ]), encoding='utf-8')
+        rclone = FakeRClone({'a': {'total': 5, 'used': 2}})
+        service = QuotaService(rclone, cache_file=cache_file)
+
+        service.start(lambda: ['a'])
+        _wait_idle(qtbot, service)
+
+        assert service.quota('gone') is None
+        assert service.summary().total == 5
+        service.shutdown()
+
+    def test_start_survives_provider_error(self, cache_file):
+        service = QuotaService(FakeRClone({}), cache_file=cache_file)
+
+        service.start(MagicMock(side_effect=RuntimeError('boom')))
+
+        assert not service.is_refreshing()
+        service.shutdown()
+
+
+class TestHomeQuotaCard:
+
+    def test_home_shows_cached_summary(self, qtbot, cache_file):
+        cache_file.write_text(json.dumps([
+            {'remote': 'gd', 'total': 2048, 'used': 1024, 'free': 1024, 'fetched_at': time.time()}
+        ]), encoding='utf-8')
+        rclone = MagicMock()
+        rclone.version.return_value = 'rclone v1.0.0'
+        cm = MagicMock()
+        cm.list_remotes.return_value = [MagicMock()]
+        cm.list_remotes.return_value[0].name = 'gd'
+        mm = MagicMock()
+        mm.mounts = {}
+        from app.core.services import Services, set_services
+        service = QuotaService(rclone, cache_file=cache_file)
+        set_services(Services(rclone=rclone, configManager=cm, mountManager=mm,
+                              quotaService=service))
+
+        from app.views.home_interface import HomeInterface
+        home = HomeInterface()
+        qtbot.addWidget(home)
+
+        assert home.quotaCard.valueLabel.text() == '1.0 KB / 2.0 KB'
+        rclone.about.assert_not_called()
+        service.shutdown()
@@ -384,6 +384,62 @@ class TestRClone:
 
         assert result.success is True
 
+    def test_delete_batch_files_in_one_process_dirs_purged(self, mocker, rclone):
+        seen = []
+
+        def fake_run(cmd, **kwargs):
+            if '--files-from-raw' in cmd:
+                with open(cmd[cmd.index('--files-from-raw') + 1], encoding='utf-8') as f:
+                    seen.append(f.read())
+            return MagicMock(returncode=0, stdout='', stderr='')
+
+        mock_run = mocker.patch('subprocess.run', side_effect=fake_run)
+        result, failures = rclone.delete_batch('remote:dir', ['a.txt', 'b.txt'],
+                                               ['sub[1]', 'other'], checkers=8)
+
+        assert result.success is True
+        assert failures == {}
+        first, *purges = (c[0][0] for c in mock_run.call_args_list)
+        assert first[:3] == ['rclone.exe', 'delete', 'remote:dir']
+        assert first[first.index('--checkers') + 1] == '8'
+        assert [cmd[1:3] for cmd in purges] == [['purge', 'remote:dir/sub[1]'],
+                                                 ['purge', 'remote:dir/other']]
+        assert seen == ['a.txt\nb.txt\n']
+
+    def test_delete_batch_purges_at_remote_root(self, mocker, rclone):
+        from app.core.rclone import RCloneResult
+        purge = mocker.patch.object(rclone, 'purge',
+                                    return_value=RCloneResult(True, '', '', 0))
+
+        rclone.delete_batch('remote:', [], ['sub'])
+
+        purge.assert_called_once_with('remote:sub')
+
+    def test_delete_batch_reports_per_item_failures(self, mocker, rclone):
+        from app.core.rclone import RCloneResult
+        stderr = '\n'.join([
+            '{"level":"error","msg":"permission denied","object":"b.txt"}',
+            '{"level":"info","msg":"Deleted","object":"a.txt"}',
+        ])
+        mocker.patch('subprocess.run', return_value=MagicMock(returncode=1, stdout='', stderr=stderr))
+        mocker.patch.object(rclone, 'purge',
+                            return_value=RCloneResult(False, '', 'error: directory not found', 3))
+
+        result, failures = rclone.delete_batch('remote:dir', ['a.txt', 'b.txt'], ['sub'])
+
+        assert result.success is False
+        assert failures == {'b.txt': 'permission denied', 'sub': 'error: directory not found'}
+
+    def test_delete_batch_unattributed_failure_reported_once(self, mocker, rclone):
+        mocker.patch('subprocess.run',
+                     return_value=MagicMock(returncode=1, stdout='', stderr='connection refused'))
+
+        result, failures = rclone.delete_batch('remote:dir', ['a.txt', 'b.txt'], [])
+
+        assert failures == {}
+        assert result.success is False
+        assert result.stderr == 'connection refused'
+
     @patch('subprocess.run')
     def test_copy(self, mock_run, rclone):
         mock_run.return_value = MagicMock(returncode=0, stdout='', stderr='')
@@ -508,3 +564,91 @@ class TestRClone:
     def test_config_delete_invalid_name(self, rclone):
         with pytest.raises(ValueError, match='非法'):
             rclone.config_delete('invalid name!')
+
+
+class TestLsjsonStreamParser:
+
+    def test_parses_entries_split_across_chunks(self):
+        from app.core.rclone import LsjsonStreamParser
+        parser = LsjsonStreamParser()
+        text = '[\n{"Name":"a.txt","Size":1,"IsDir":false},\n{"Name":"b","Size":-1,"IsDir":true}\n]\n'
+
+        entries = []
+        for i in range(0, len(text), 7):
+            entries.extend(parser.feed(text[i:i + 7]))
+
+        assert [e['Name'] for e in entries] == ['a.txt', 'b']
+        assert parser.done is True
+
+    def test_drops_non_compact_fields(self):
+        from app.core.rclone import LsjsonStreamParser
+        parser = LsjsonStreamParser()
+        entries = parser.feed('[{"Name":"a","Size":1,"MimeType":"text/plain","ID":"x"}]')
+        assert entries == [{'Name': 'a', 'Size': 1}]
+
+    def test_empty_array(self):
+        from app.core.rclone import LsjsonStreamParser
+        parser = LsjsonStreamParser()
+        assert parser.feed('[]\n') == []
+        assert parser.done is True
+
+    def test_invalid_output_raises(self):
+        from app.core.rclone import LsjsonStreamParser
+        with pytest.raises(ValueError):
+            LsjsonStreamParser().feed('error: not json')
+
+
+class TestLsjsonStream:
+
+    @staticmethod
+    def _python_cmd(script):
+        import sys
+        return [sys.executable, '-c', script]
+
+    def test_yields_batches(self):
+        from app.core.rclone import LsjsonStream
+        script = (
+            "import json\n"
+            "print('[')\n"
+            "print(',\\n'.join(json.dumps({'Name': f'f{i}', 'Size': i, 'IsDir': False}) for i in range(25)))\n"
+            "print(']')\n"
+        )
+        stream = LsjsonStream(self._python_cmd(script), batch_size=10)
+        batches = list(stream)
+
+        assert [len(b) for b in batches] == [10, 10, 5]
+        assert batches[2][-1]['Name'] == 'f24'
+        assert stream.success is True
+        assert stream.count == 25
+
+    def test_failure_reports_stderr(self):
+        from app.core.rclone import LsjsonStream
+        script = "import sys\nsys.stderr.write('directory not found')\nsys.exit(3)\n"
+        stream = LsjsonStream(self._python_cmd(script))
+        assert list(stream) == []
+        assert stream.success is False
+        assert 'directory not found' in stream.error
+
+    def test_cancel_stops_process(self):
+        from app.core.rclone import LsjsonStream
+        script = (
+            "import json, sys, time\n"
+            "sys.stdout.write('[')\n"
+            "for i in range(100000):\n"
+            "    sys.stdout.write(json.dumps({'Name': str(i)}) + ',\\n')\n"
+            "    sys.stdout.flush()\n"
+            "    time.sleep(0.001)\n"
+        )
+        stream = LsjsonStream(self._python_cmd(script), batch_size=5)
+        for batch in stream:
+            stream.cancel()
+        assert stream.success is False
+        assert stream.cancelled is True
+        assert stream._process.poll() is not None
+
+    def test_missing_executable(self):
+        from app.core.rclone import LsjsonStream
+        stream = LsjsonStream(['/nonexistent/rclone'])
+        assert list(stream) == []
+        assert stream.success is False
+        assert '系统错误' in stream.error
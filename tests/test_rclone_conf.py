@@ -0,0 +1,194 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.rclone_conf import (
+    RCloneConfFile, candidate_paths, get_conf_file, parse_rclone_conf, resolve_config_path
+)
+
+
+SAMPLE = """\
+# rclone config
+[gdrive]
+type = drive
+scope = drive
+token = {"access_token":"abc","expiry":"2024-01-01T00:00:00Z"}
+
+; legacy comment
+[s3-backup]
+type = s3
+provider = AWS
+endpoint = https://s3.example.com/path?a=b
+"""
+
+
+def _bump(path: Path, text: str):
+    path.write_text(text, encoding='utf-8')
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestParse:
+
+    def test_sections_and_values(self):
+        data = parse_rclone_conf(SAMPLE)
+
+        assert list(data) == ['gdrive', 's3-backup']
+        assert data['gdrive']['type'] == 'drive'
+        assert data['gdrive']['token'] == '{"access_token":"abc","expiry":"2024-01-01T00:00:00Z"}'
+        assert data['s3-backup']['endpoint'] == 'https://s3.example.com/path?a=b'
+
+    def test_empty_value_and_orphan_keys(self):
+        data = parse_rclone_conf('orphan = 1\n[a]\ntype = local\npass =\n')
+
+        assert data == {'a': {'type': 'local', 'pass': ''}}
+
+    def test_encrypted_returns_none(self):
+        assert parse_rclone_conf('# Encrypted rclone configuration File\n\nRCLONE_ENCRYPT_V0:\nabcdef') is None
+
+
+class TestRCloneConfFile:
+
+    def test_load_cached_until_file_changes(self, tmp_path):
+        path = tmp_path / 'rclone.conf'
+        path.write_text(SAMPLE, encoding='utf-8')
+        conf = RCloneConfFile(path)
+
+        with patch('app.core.rclone_conf.parse_rclone_conf', wraps=parse_rclone_conf) as spy:
+            conf.load()
+            conf.load()
+            assert spy.call_count == 1
+
+            _bump(path, SAMPLE + '\n[new]\ntype = local\n')
+            data = conf.load()
+            assert spy.call_count == 2
+
+        assert 'new' in data
+
+    def test_load_returns_copy(self, tmp_path):
+        path = tmp_path / 'rclone.conf'
+        path.write_text(SAMPLE, encoding='utf-8')
+        conf = RCloneConfFile(path)
+
+        conf.load()['gdrive']['type'] = 'changed'
+
+        assert conf.load()['gdrive']['type'] == 'drive'
+
+    def test_section(self, tmp_path):
+        path = tmp_path / 'rclone.conf'
+        path.write_text(SAMPLE, encoding='utf-8')
+        conf = RCloneConfFile(path)
+
+        assert conf.section('s3-backup')['provider'] == 'AWS'
+        assert conf.section('missing') == {}
+
+    def test_encrypted_file(self, tmp_path):
+        path = tmp_path / 'rclone.conf'
+        path.write_text('RCLONE_ENCRYPT_V0:\nxyz', encoding='utf-8')
+        conf = RCloneConfFile(path)
+
+        assert conf.load() is None
+        assert conf.section('gdrive') is None
+        assert conf.encrypted
+
+    def test_missing_file(self, tmp_path):
+        conf = RCloneConfFile(tmp_path / 'missing.conf')
+
+        assert conf.load() is None
+
+    def test_watch_invalidates_on_change(self, tmp_path, qtbot):
+        path = tmp_path / 'rclone.conf'
+        path.write_text(SAMPLE, encoding='utf-8')
+        conf = RCloneConfFile(path)
+        conf.load()
+        callback = MagicMock()
+        conf.watch(callback)
+
+        with qtbot.waitSignal(conf._watcher.fileChanged, timeout=3000):
+            path.write_text('[only]\ntype = local\n', encoding='utf-8')
+
+        callback.assert_called_once()
+        assert list(conf.load()) == ['only']
+
+
+class TestResolve:
+
+    def test_explicit_path(self, tmp_path):
+        path = tmp_path / 'my.conf'
+        path.write_text('', encoding='utf-8')
+
+        assert resolve_config_path(str(path)) == path
+        assert resolve_config_path(str(tmp_path / 'missing.conf')) is None
+
+    def test_portable_config_preferred(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('RCLONE_CONFIG', raising=False)
+        exe = tmp_path / 'rclone.exe'
+        exe.write_text('', encoding='utf-8')
+        (tmp_path / 'rclone.conf').write_text('', encoding='utf-8')
+
+        assert resolve_config_path(None, str(exe)) == (tmp_path / 'rclone.conf').resolve()
+
+    def test_rclone_config_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('RCLONE_CONFIG', str(tmp_path / 'env.conf'))
+
+        assert candidate_paths('/usr/bin/rclone') == [tmp_path / 'env.conf']
+
+    def test_xdg_config_home(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('RCLONE_CONFIG', raising=False)
+        monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path))
+
+        assert tmp_path / 'rclone' / 'rclone.conf' in candidate_paths()
+
+    def test_env_defined_remotes_disable_native(self, tmp_path, monkeypatch):
+        path = tmp_path / 'rclone.conf'
+        path.write_text(SAMPLE, encoding='utf-8')
+        monkeypatch.setenv('RCLONE_CONFIG_MYS3_TYPE', 's3')
+
+        assert get_conf_file(str(path)) is None
+
+
+class TestRCloneNative:
+
+    @pytest.fixture
+    def rclone(self, tmp_path):
+        with patch('app.core.rclone.cfg') as mock_cfg:
+            mock_cfg.rclonePath.value = 'rclone'
+            mock_cfg.rcloneConfigPath.value = ''
+            mock_cfg.rcdBackend.value = False
+            from app.core.rclone import RClone
+            path = tmp_path / 'rclone.conf'
+            path.write_text(SAMPLE, encoding='utf-8')
+            yield RClone(config_path=str(path))
+
+    def test_config_dump_without_subprocess(self, rclone):
+        with patch('subprocess.run') as run:
+            data = rclone.config_dump()
+
+        run.assert_not_called()
+        assert data['s3-backup']['type'] == 's3'
+
+    def test_listremotes_and_config_get(self, rclone):
+        with patch('subprocess.run') as run:
+            assert rclone.listremotes() == ['gdrive', 's3-backup']
+            assert rclone.config_get('gdrive')['scope'] == 'drive'
+        run.assert_not_called()
+
+    def test_encrypted_falls_back_to_subprocess(self, rclone):
+        Path(rclone.config_path).write_text('RCLONE_ENCRYPT_V0:\nxyz', encoding='utf-8')
+        st = os.stat(rclone.config_path)
+        os.utime(rclone.config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        with patch.object(rclone, '_run_json', return_value=(True, {'x': {'type': 'local'}})) as run_json:
+            assert rclone.config_dump() == {'x': {'type': 'local'}}
+        run_json.assert_called_once_with('config', 'dump')
+
+    def test_config_manager_picks_up_external_edit(self, rclone):
+        from app.core.config_manager import ConfigManager
+        cm = ConfigManager(rclone)
+        assert len(cm.list_remotes()) == 2
+
+        _bump(Path(rclone.config_path), SAMPLE + '\n[added]\ntype = local\n')
+
+        assert cm.get_remote('added').type == 'local'
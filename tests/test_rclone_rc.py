@@ -0,0 +1,283 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.rclone_rc import (RCClient, RCDaemon, RCError, RCTransportError, get_rc_daemon,
+                                shutdown_rc_daemon)
+
+
+class FakeRCHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        params = json.loads(self.rfile.read(length) or b'{}')
+        method = self.path.lstrip('/')
+        server.calls.append((method, params, self.headers.get('Authorization')))
+        server.client_ports.add(self.client_address[1])
+
+        handler = server.routes.get(method)
+        if handler is None:
+            status, body = 404, {'error': f"couldn't find method {method!r}", 'status': 404}
+        else:
+            status, body = handler(params)
+
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def fake_rc():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeRCHandler)
+    server.calls = []
+    server.client_ports = set()
+    server.routes = {
+        'rc/noop': lambda p: (200, p),
+        'config/dump': lambda p: (200, {'mydav': {'type': 'webdav', 'url': 'https://dav'}}),
+        'config/listremotes': lambda p: (200, {'remotes': ['mydav', 's3']}),
+        'operations/list': lambda p: (200, {'list': [
+            {'Name': 'a.txt', 'Path': 'a.txt', 'Size': 3, 'IsDir': False},
+        ]}),
+        'operations/about': lambda p: (200, {'total': 100, 'used': 40, 'free': 60}),
+        'operations/mkdir': lambda p: (200, {}),
+        'operations/purge': lambda p: (500, {'error': 'directory not found', 'status': 500}),
+        'test/slow': lambda p: (time.sleep(1), (200, {}))[1],
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(fake_rc):
+    c = RCClient('127.0.0.1', fake_rc.server_address[1], 'user', 'secret')
+    yield c
+    c.close()
+
+
+class TestRCClient:
+
+    def test_call_returns_json(self, client, fake_rc):
+        assert client.call('rc/noop', {'x': 1}) == {'x': 1}
+        method, params, auth = fake_rc.calls[0]
+        assert method == 'rc/noop'
+        assert params == {'x': 1}
+        assert auth.startswith('Basic ')
+
+    def test_error_status_raises_rc_error(self, client):
+        with pytest.raises(RCError, match='directory not found'):
+            client.call('operations/purge', {'fs': 'r:', 'remote': 'x'})
+
+    def test_unknown_method_raises_rc_error(self, client):
+        with pytest.raises(RCError):
+            client.call('no/such')
+
+    def test_connections_are_reused(self, client, fake_rc):
+        for _ in range(5):
+            client.call('rc/noop')
+        assert len(fake_rc.client_ports) == 1
+
+    def test_per_call_timeout(self, client):
+        start = time.monotonic()
+        with pytest.raises(RCError, match='超时'):
+            client.call('test/slow', timeout=0.2)
+        assert time.monotonic() - start < 0.9
+        assert client.call('rc/noop', {'x': 2}) == {'x': 2}
+
+    def test_unreachable_server_raises_transport_error(self):
+        from app.core.rclone_rc import _find_free_port
+        c = RCClient('127.0.0.1', _find_free_port(), timeout=1)
+        with pytest.raises(RCTransportError):
+            c.call('rc/noop')
+
+
+class TestRCloneOverRC:
+
+    @pytest.fixture
+    def rclone(self, mocker, client):
+        mocker.patch('app.core.rclone._resolve_path', side_effect=lambda x: x)
+        mock_cfg = mocker.patch('app.core.rclone.cfg')
+        mock_cfg.rcloneConfigPath.value = ''
+        from app.core.rclone import RClone
+        return RClone(rclone_path='rclone.exe', config_path=None, rc=client)
+
+    def test_config_dump_uses_rc(self, rclone, fake_rc):
+        with patch('subprocess.run') as mock_run:
+            assert rclone.config_dump() == {'mydav': {'type': 'webdav', 'url': 'https://dav'}}
+            mock_run.assert_not_called()
+
+    def test_listremotes_uses_rc(self, rclone):
+        assert rclone.listremotes() == ['mydav', 's3']
+
+    def test_lsjson_splits_fs_and_remote(self, rclone, fake_rc):
+        success, files = rclone.lsjson('mydav:docs/sub/')
+        assert success is True
+        assert files[0]['Name'] == 'a.txt'
+        method, params, _ = fake_rc.calls[-1]
+        assert method == 'operations/list'
+        assert params == {'fs': 'mydav:', 'remote': 'docs/sub', 'opt': {'recurse': False}}
+
+    def test_about_uses_rc(self, rclone):
+        success, info = rclone.about('mydav')
+        assert success is True
+        assert info['free'] == 60
+
+    def test_probe_timeout_passed_to_rc(self, mocker):
+        mocker.patch('app.core.rclone._resolve_path', side_effect=lambda x: x)
+        mocker.patch('app.core.rclone.cfg').rcloneConfigPath.value = ''
+        from app.core.rclone import RClone
+        rc = MagicMock()
+        rc.call.return_value = {'free': 1}
+        rclone = RClone(rclone_path='rclone.exe', rc=rc)
+
+        rclone.about('mydav', timeout=5)
+        rclone.check('mydav', timeout=5)
+
+        assert [c.kwargs['timeout'] for c in rc.call.call_args_list] == [5, 5]
+
+    def test_mkdir_returns_rclone_result(self, rclone):
+        result = rclone.mkdir('mydav:new')
+        assert result.success is True
+        assert result.return_code == 0
+
+    def test_rc_error_returns_failed_result(self, rclone):
+        result = rclone.purge('mydav:missing')
+        assert result.success is False
+        assert 'directory not found' in result.stderr
+
+    def test_local_path_falls_back_to_cli(self, rclone):
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout='[]', stderr='')
+            rclone.lsjson('C:\\data')
+            mock_run.assert_called_once()
+
+    def test_transport_failure_falls_back_to_cli(self, mocker):
+        mocker.patch('app.core.rclone._resolve_path', side_effect=lambda x: x)
+        mock_cfg = mocker.patch('app.core.rclone.cfg')
+        mock_cfg.rcloneConfigPath.value = ''
+        from app.core.rclone import RClone
+        rc = MagicMock()
+        rc.call.side_effect = RCTransportError('down')
+        rclone = RClone(rclone_path='rclone.exe', rc=rc)
+
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout='{"r": {"type": "s3"}}', stderr='')
+            assert rclone.config_dump() == {'r': {'type': 's3'}}
+            mock_run.assert_called_once()
+
+    def test_rc_disabled_by_default(self, mocker):
+        mocker.patch('app.core.rclone._resolve_path', side_effect=lambda x: x)
+        mock_cfg = mocker.patch('app.core.rclone.cfg')
+        mock_cfg.rcdBackend.value = False
+        from app.core.rclone import RClone
+        assert RClone(rclone_path='rclone.exe').rc is None
+
+    def test_rc_enabled_uses_shared_daemon(self, mocker):
+        mocker.patch('app.core.rclone._resolve_path', side_effect=lambda x: x)
+        mock_cfg = mocker.patch('app.core.rclone.cfg')
+        mock_cfg.rcdBackend.value = True
+        daemon = MagicMock()
+        mock_get = mocker.patch('app.core.rclone.get_rc_daemon', return_value=daemon)
+        from app.core.rclone import RClone
+        rclone = RClone(rclone_path='rclone.exe', config_path='/c/rclone.conf')
+        assert rclone.rc is daemon
+        mock_get.assert_called_once_with('rclone.exe', '/c/rclone.conf')
+
+    def test_changing_path_rebinds_shared_daemon(self, mocker):
+        mocker.patch('app.core.rclone._resolve_path', side_effect=lambda x: x)
+        mocker.patch('app.core.rclone.cfg').rcdBackend.value = True
+        old, new = MagicMock(), MagicMock()
+        mocker.patch('app.core.rclone.get_rc_daemon', side_effect=[old, new])
+        release = mocker.patch('app.core.rclone.release_rc_daemon')
+        from app.core.rclone import RClone
+        rclone = RClone(rclone_path='rclone.exe', config_path='/c/rclone.conf')
+
+        rclone.set_rclone_path('/opt/rclone')
+
+        assert rclone.rclone_path == '/opt/rclone'
+        assert rclone.rc is new
+        release.assert_called_once_with('rclone.exe', '/c/rclone.conf')
+
+    def test_changing_path_keeps_injected_rc(self, mocker):
+        mocker.patch('app.core.rclone._resolve_path', side_effect=lambda x: x)
+        release = mocker.patch('app.core.rclone.release_rc_daemon')
+        from app.core.rclone import RClone
+        rc = MagicMock()
+        rclone = RClone(rclone_path='rclone.exe', rc=rc)
+
+        rclone.set_rclone_path('/opt/rclone')
+
+        assert rclone.rc is rc
+        release.assert_not_called()
+
+
+class TestRCDaemon:
+
+    def test_build_command(self):
+        daemon = RCDaemon('rclone.exe', '/c/rclone.conf')
+        cmd = daemon._build_command(5572, 'u')
+        assert cmd[:3] == ['rclone.exe', '--config', '/c/rclone.conf']
+        assert 'rcd' in cmd
+        assert cmd[cmd.index('--rc-addr') + 1] == '127.0.0.1:5572'
+        assert '--rc-pass' not in cmd
+
+    def test_start_waits_for_ready(self, mocker, fake_rc):
+        process = MagicMock()
+        process.poll.return_value = None
+        mock_popen = mocker.patch('subprocess.Popen', return_value=process)
+        mocker.patch('app.core.rclone_rc._find_free_port', return_value=fake_rc.server_address[1])
+
+        daemon = RCDaemon('rclone.exe')
+        assert daemon.start() is True
+        assert daemon.call('config/listremotes') == {'remotes': ['mydav', 's3']}
+        assert daemon.start() is True
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args.kwargs['env']['RCLONE_RC_PASS']
+
+    def test_start_failure_is_not_retried(self, mocker):
+        mock_popen = mocker.patch('subprocess.Popen', side_effect=OSError('missing'))
+        daemon = RCDaemon('rclone.exe')
+        assert daemon.start() is False
+        assert daemon.start() is False
+        mock_popen.assert_called_once()
+        with pytest.raises(RCTransportError):
+            daemon.call('rc/noop')
+
+    def test_stop_terminates_process(self, mocker, fake_rc):
+        process = MagicMock()
+        process.poll.return_value = None
+        mocker.patch('subprocess.Popen', return_value=process)
+        mocker.patch('app.core.rclone_rc._find_free_port', return_value=fake_rc.server_address[1])
+
+        daemon = RCDaemon('rclone.exe')
+        daemon.start()
+        daemon.stop()
+        process.terminate.assert_called_once()
+        assert daemon.client is None
+
+
+class TestSharedDaemons:
+
+    def test_daemons_keyed_by_path_and_config(self):
+        try:
+            first = get_rc_daemon('rclone', '/a.conf')
+            other = get_rc_daemon('rclone', '/b.conf')
+
+            assert get_rc_daemon('rclone', '/a.conf') is first
+            assert other is not first
+        finally:
+            shutdown_rc_daemon()
@@ -0,0 +1,62 @@
+import json
+
+from app.core.rclone_stats import StatsDecoder, TransferStats
+
+
+def _stats_line(**stats):
+    return json.dumps({'level': 'notice', 'msg': 'stats', 'stats': stats})
+
+
+class TestStatsDecoder:
+
+    def test_decodes_exact_counts(self):
+        decoder = StatsDecoder()
+        snapshot = decoder.feed(_stats_line(
+            bytes=1536, totalBytes=4096, transfers=3, totalTransfers=10,
+            checks=7, totalChecks=12, errors=1, deletes=2, speed=2048.5, eta=5,
+            elapsedTime=1.5,
+            transferring=[{'name': 'a.bin', 'bytes': 512, 'size': 1024, 'percentage': 50, 'speed': 300.0}],
+        ))
+        assert snapshot.bytes == 1536
+        assert snapshot.total_bytes == 4096
+        assert snapshot.percentage == 37
+        assert (snapshot.transfers, snapshot.total_transfers) == (3, 10)
+        assert (snapshot.checks, snapshot.total_checks) == (7, 12)
+        assert snapshot.errors == 1
+        assert snapshot.eta == 5
+        assert snapshot.transferring == [
+            {'name': 'a.bin', 'bytes': 512, 'size': 1024, 'percentage': 50, 'speed': 300.0}
+        ]
+
+    def test_missing_fields_default_to_zero(self):
+        snapshot = StatsDecoder().feed(_stats_line(bytes=10, eta=None))
+        assert snapshot.total_bytes == 0
+        assert snapshot.percentage == 0
+        assert snapshot.eta is None
+        assert 'eta' not in snapshot.to_dict()
+
+    def test_counts_retries_and_errors(self):
+        decoder = StatsDecoder()
+        assert decoder.feed(json.dumps({'level': 'error', 'msg': 'Failed to copy: denied', 'object': 'x.txt'})) is None
+        decoder.feed(json.dumps({'level': 'error', 'msg': 'Attempt 1/3 failed with 1 errors and: denied'}))
+        decoder.feed(json.dumps({'level': 'error', 'msg': 'Attempt 2/3 failed with 1 errors and: denied'}))
+        snapshot = decoder.feed(_stats_line(bytes=0, errors=1))
+        assert snapshot.retries == 2
+        assert decoder.errors[0] == 'x.txt: Failed to copy: denied'
+        assert snapshot.last_error.startswith('Attempt 2/3')
+
+    def test_non_json_and_garbage_lines(self):
+        decoder = StatsDecoder()
+        assert decoder.feed('Transferred: 1 B / 2 B, 50%') is None
+        assert decoder.feed('{not json') is None
+        assert decoder.feed('[1, 2]') is None
+        assert decoder.last is None
+
+    def test_to_dict_keeps_legacy_keys(self):
+        stats = TransferStats(bytes=50, total_bytes=100, transfers=1, total_transfers=2, speed=10.7).to_dict()
+        assert stats['percentage'] == 50
+        assert stats['bytes_transferred'] == 50
+        assert stats['bytes_total'] == 100
+        assert stats['files_transferred'] == 1
+        assert stats['files_total'] == 2
+        assert stats['speed'] == 10
@@ -0,0 +1,216 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.remote_index import FTS_TRIGRAM_AVAILABLE, RemoteIndex, stores_hashes
+
+
+class FakeStream:
+
+    def __init__(self, batches, success=True, error=''):
+        self.batches = batches
+        self.success = success
+        self.error = error
+        self.cancelled = False
+
+    def __iter__(self):
+        for batch in self.batches:
+            if self.cancelled:
+                return
+            yield batch
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def _entry(path, size=0, is_dir=False, hashes=None):
+    entry = {'Path': path, 'Name': path.rpartition('/')[2], 'Size': size,
+             'ModTime': '2024-01-01T00:00:00Z', 'IsDir': is_dir}
+    if hashes:
+        entry['Hashes'] = hashes
+    return entry
+
+
+def _rclone(*streams):
+    rclone = MagicMock()
+    rclone.lsjson_stream.side_effect = list(streams)
+    return rclone
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = RemoteIndex('gd', tmp_path / 'gd.sqlite')
+    yield idx
+    idx.close()
+
+
+TREE = [
+    _entry('docs', is_dir=True),
+    _entry('docs/Report-2024.pdf', 100, hashes={'md5': 'abc'}),
+    _entry('docs/notes.txt', 5),
+    _entry('photos', is_dir=True),
+    _entry('photos/holiday_report.jpg', 2000),
+]
+
+
+class TestCrawl:
+
+    def test_full_crawl_uses_streaming_fast_list(self, index):
+        rclone = _rclone(FakeStream([TREE[:2], TREE[2:]]))
+        progress = []
+
+        assert index.crawl(rclone, progress=progress.append) == (True, '')
+
+        rclone.lsjson_stream.assert_called_once_with(
+            'gd:', recursive=True, fast_list=True, no_mimetype=True)
+        assert progress == [2, 5]
+        assert index.count() == 5
+        assert index.last_crawl() is not None
+
+    def test_hashes_requested_only_when_asked(self, index):
+        rclone = _rclone(FakeStream([TREE]))
+
+        index.crawl(rclone, hashes=True)
+
+        assert rclone.lsjson_stream.call_args.kwargs['hash'] is True
+
+    def test_stores_hashes_by_backend(self):
+        assert stores_hashes('drive')
+        assert stores_hashes('S3')
+        assert not stores_hashes('local')
+        assert not stores_hashes('crypt')
+        assert not stores_hashes(None)
+
+    def test_recrawl_removes_missing_and_updates_changed(self, index):
+        index.crawl(_rclone(FakeStream([TREE])))
+        changed = [_entry('docs', is_dir=True), _entry('docs/Report-2024.pdf', 999),
+                   _entry('docs/new.txt', 1)]
+
+        index.crawl(_rclone(FakeStream([changed])))
+
+        assert index.count() == 3
+        names = {e['Name']: e for e in index.list_dir('docs')}
+        assert set(names) == {'Report-2024.pdf', 'new.txt'}
+        assert names['Report-2024.pdf']['Size'] == 999
+        assert index.search('holiday') == []
+
+    def test_failed_crawl_keeps_existing_entries(self, index):
+        index.crawl(_rclone(FakeStream([TREE])))
+
+        ok, error = index.crawl(_rclone(FakeStream([TREE[:1]], success=False, error='boom')))
+
+        assert (ok, error) == (False, 'boom')
+        assert index.count() == 5
+
+    def test_subtree_crawl_only_touches_subtree(self, index):
+        index.crawl(_rclone(FakeStream([TREE])))
+        rclone = _rclone(FakeStream([[_entry('fresh.txt', 3)]]))
+
+        index.crawl(rclone, path='/docs/')
+
+        assert rclone.lsjson_stream.call_args[0][0] == 'gd:docs'
+        assert {e['Name'] for e in index.list_dir('docs')} == {'fresh.txt'}
+        assert {e['Name'] for e in index.list_dir('')} == {'docs', 'photos'}
+        assert index.list_dir('photos')[0]['Name'] == 'holiday_report.jpg'
+
+    def test_cancel_stops_stream(self, index):
+        stream = FakeStream([TREE[:1], TREE[1:]], success=False, error='操作已取消')
+
+        def progress(_):
+            index.cancel()
+
+        ok, _ = index.crawl(_rclone(stream), progress=progress)
+
+        assert not ok
+        assert stream.cancelled
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / 'gd.sqlite'
+        first = RemoteIndex('gd', path)
+        first.crawl(_rclone(FakeStream([TREE])))
+        first.close()
+
+        second = RemoteIndex('gd', path)
+        assert second.count() == 5
+        assert second.search('notes')[0]['Path'] == 'docs/notes.txt'
+        second.close()
+
+
+class TestSearch:
+
+    @pytest.fixture(autouse=True)
+    def crawled(self, index):
+        index.crawl(_rclone(FakeStream([TREE])))
+
+    def test_substring_case_insensitive(self, index):
+        results = index.search('REPORT')
+
+        assert sorted(r['Path'] for r in results) == ['docs/Report-2024.pdf',
+                                                       'photos/holiday_report.jpg']
+
+    def test_short_query_falls_back_to_like(self, index):
+        assert [r['Path'] for r in index.search('_r')] == ['photos/holiday_report.jpg']
+
+    def test_quotes_and_operators_are_literal(self, index):
+        assert index.search('"report" OR x') == []
+        assert index.search('') == []
+
+    def test_result_shape(self, index):
+        result = index.search('notes.txt')[0]
+
+        assert result == {'Path': 'docs/notes.txt', 'Name': 'notes.txt', 'Size': 5,
+                          'ModTime': '2024-01-01T00:00:00Z', 'IsDir': False}
+
+    def test_limit(self, index):
+        assert len(index.search('o', limit=2)) == 2
+
+    @pytest.mark.skipif(not FTS_TRIGRAM_AVAILABLE, reason='SQLite 不支持 trigram 分词')
+    def test_fts_stays_in_sync_after_delete(self, index):
+        index.crawl(_rclone(FakeStream([TREE[:3]])))
+
+        assert index.search('holiday') == []
+        assert index._conn.execute(
+            "SELECT COUNT(*) FROM names WHERE names MATCH '\"holiday\"'").fetchone()[0] == 0
+
+
+class TestBrowserSearch:
+
+    @pytest.fixture
+    def browser(self, qtbot, mocker, tmp_path):
+        mocker.patch('app.core.remote_index.INDEX_DIR', tmp_path)
+        mocker.patch('app.core.remote_index._indexes', {})
+        rclone = MagicMock()
+        rclone.lsjson.return_value = (True, [])
+        from app.models.remote import Remote
+        cm = MagicMock()
+        cm.list_remotes.return_value = [Remote(name='gd', type='drive')]
+        from app.core.services import Services, set_services
+        set_services(Services(rclone=rclone, configManager=cm))
+        mocker.patch('app.views.browser_interface.get_listing_cache', return_value=MagicMock(
+            get=MagicMock(return_value=None)))
+        from app.views.browser_interface import BrowserInterface
+        widget = BrowserInterface()
+        qtbot.addWidget(widget)
+        widget._cancel_current_worker()
+        return widget
+
+    def test_search_without_index_warns(self, browser, mocker):
+        warning = mocker.patch('app.views.browser_interface.InfoBar.warning')
+
+        browser.searchIndex('report')
+
+        warning.assert_called_once()
+        assert not browser._searching
+
+    def test_search_shows_full_paths_and_double_click_navigates(self, browser, mocker):
+        from app.core.remote_index import get_remote_index
+        get_remote_index('gd').crawl(_rclone(FakeStream([TREE])))
+        refresh = mocker.patch.object(browser, 'refresh')
+
+        browser.searchIndex('notes')
+
+        assert browser._searching
+        assert browser.fileModel.entry(0)['Name'] == 'docs/notes.txt'
+        browser.onItemDoubleClicked(browser.fileModel.index(0, 0))
+        assert browser.currentPath == 'docs'
+        refresh.assert_called_once()
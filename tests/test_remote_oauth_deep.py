@@ -24,12 +24,12 @@ def _mock_remote_deps(mocker):
     mock_rclone.config_path = '/tmp/rclone.conf'
     mock_rclone.config_dump.return_value = {}
     mock_rclone.listremotes.return_value = []
-    mocker.patch('app.views.remote_interface.RClone', return_value=mock_rclone)
 
     mock_cm = MagicMock()
     mock_cm.list_remotes.return_value = []
     mock_cm.refresh.return_value = None
-    mocker.patch('app.views.remote_interface.ConfigManager', return_value=mock_cm)
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone, configManager=mock_cm))
 
     return {
         'rclone': mock_rclone,
@@ -222,17 +222,26 @@ class TestRemoteInterface:
         interface.loadRemotes()
         assert interface.listLayout.count() == 2
 
-    def test_interface_testRemote_success(self, mocker):
+    def test_interface_testRemote_success(self, mocker, qtbot):
+        from app.core.rclone import RCloneResult
         interface, deps = self._make_interface(mocker)
-        deps['config_manager'].test_remote.return_value = (True, 'Connection successful')
-        interface.testRemote('myremote')
-        deps['config_manager'].test_remote.assert_called_once_with('myremote')
-
-    def test_interface_testRemote_failure(self, mocker):
+        deps['rclone'].check.return_value = RCloneResult(True, '', '', 0)
+        success = mocker.patch('app.views.remote_interface.InfoBar.success')
+        with qtbot.waitSignal(interface.healthChecker.resultReady, timeout=3000):
+            interface.testRemote('myremote')
+        qtbot.waitUntil(lambda: success.called, timeout=3000)
+        deps['rclone'].check.assert_called_once_with('myremote', timeout=20)
+        deps['config_manager'].test_remote.assert_not_called()
+
+    def test_interface_testRemote_failure(self, mocker, qtbot):
+        from app.core.rclone import RCloneResult
         interface, deps = self._make_interface(mocker)
-        deps['config_manager'].test_remote.return_value = (False, 'Connection failed')
-        interface.testRemote('myremote')
-        deps['config_manager'].test_remote.assert_called_once_with('myremote')
+        deps['rclone'].check.return_value = RCloneResult(False, '', 'Connection failed', 1)
+        error = mocker.patch('app.views.remote_interface.InfoBar.error')
+        with qtbot.waitSignal(interface.healthChecker.resultReady, timeout=3000):
+            interface.testRemote('myremote')
+        qtbot.waitUntil(lambda: error.called, timeout=3000)
+        assert error.call_args[0][1] == 'Connection failed'
 
     def test_interface_has_add_button(self, mocker):
         interface, _ = self._make_interface(mocker)
@@ -0,0 +1,237 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.run_history import RunHistory, RunRecord, recorded_flags
+from app.models.sync_task import SyncMode, SyncTask
+
+START = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _record(task_id='t1', minutes=0, success=True, **kwargs):
+    started = START + timedelta(minutes=minutes)
+    return RunRecord(task_id=task_id, started_at=started,
+                     finished_at=started + timedelta(seconds=30), success=success, **kwargs)
+
+
+def _task(**kwargs):
+    return SyncTask(id='t1', name='Backup', source='/data', destination='gd:backup',
+                    mode=SyncMode.COPY, **kwargs)
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = RunHistory(tmp_path / 'history.sqlite')
+    yield store
+    store.close()
+
+
+class TestRunHistory:
+
+    def test_roundtrip(self, history):
+        record = _record(task_name='Backup', mode='copy', bytes=2048, files=3, checks=7,
+                         errors=1, avg_speed=68.3, peak_speed=120.0, exit_code=0,
+                         message='完成', flags=['--transfers', '8'])
+
+        history.add(record)
+        [restored] = history.runs('t1')
+
+        assert restored.id == record.id
+        assert restored.started_at == record.started_at
+        assert restored.duration == 30.0
+        assert (restored.bytes, restored.files, restored.checks, restored.errors) == (2048, 3, 7, 1)
+        assert restored.peak_speed == 120.0
+        assert restored.flags == ['--transfers', '8']
+        assert restored.success and restored.exit_code == 0
+
+    def test_runs_newest_first_per_task(self, history):
+        for minutes in (0, 10, 5):
+            history.add(_record(minutes=minutes))
+        history.add(_record(task_id='other'))
+
+        runs = history.runs('t1')
+
+        assert [r.started_at.minute for r in runs] == [10, 5, 0]
+        assert len(history.runs('t1', limit=2)) == 2
+
+    def test_prune_by_count(self, history):
+        for minutes in range(5):
+            history.add(_record(minutes=minutes))
+            history.add(_record(task_id='other', minutes=minutes))
+
+        deleted = history.prune(max_runs=2, task_id='t1')
+
+        assert deleted == 3
+        assert [r.started_at.minute for r in history.runs('t1')] == [4, 3]
+        assert history.count('other') == 5
+
+    def test_prune_by_age(self, history):
+        history.add(_record())
+        history.add(_record(minutes=60 * 24 * 10))
+        now = (START + timedelta(days=12)).timestamp()
+
+        assert history.prune(max_age_days=5, now=now) == 1
+        assert history.prune(max_age_days=0, max_runs=0) == 0
+        assert history.count() == 1
+
+    def test_delete_task(self, history):
+        history.add(_record())
+        history.add(_record(task_id='other'))
+
+        history.delete_task('t1')
+
+        assert history.count('t1') == 0
+        assert history.count() == 1
+
+    def test_recorded_flags_hide_local_paths(self):
+        args = ['--config', '/home/u/rclone.conf', '--transfers', '8',
+                '--files-from', '/tmp/rclonegui-files-1.txt', '--no-traverse']
+
+        assert recorded_flags(args) == ['--config', '--transfers', '8', '--files-from', '--no-traverse']
+
+
+class TestWorkerRecord:
+
+    def test_run_record_from_stats(self, mocker):
+        from app.core.sync_manager import SyncWorker
+        rclone = MagicMock()
+        rclone.rclone_path = 'rclone'
+        rclone.config_path = '/secret/rclone.conf'
+        lines = [json.dumps({'stats': {'bytes': 1000, 'speed': 500.0, 'transfers': 2,
+                                       'checks': 4, 'errors': 0, 'transferTime': 4.0}}) + '\n',
+                 json.dumps({'stats': {'bytes': 4000, 'speed': 200.0, 'transfers': 5,
+                                       'checks': 9, 'errors': 1, 'transferTime': 8.0}}) + '\n',
+                 '']
+        process = MagicMock()
+        process.stderr.readline.side_effect = lines
+        process.wait.return_value = 0
+        mocker.patch('subprocess.Popen', return_value=process)
+        worker = SyncWorker(rclone, _task(transfers=8))
+
+        worker.run()
+        record = worker.run_record(True, '完成')
+
+        assert (record.bytes, record.files, record.checks, record.errors) == (4000, 5, 9, 1)
+        assert record.avg_speed == 500.0
+        assert record.peak_speed == 500.0
+        assert record.exit_code == 0
+        assert record.mode == 'copy'
+        assert '/secret/rclone.conf' not in record.flags
+        assert record.flags[record.flags.index('--transfers') + 1] == '8'
+        assert 'gd:backup' not in record.flags
+
+
+class TestManagerHistory:
+
+    @pytest.fixture
+    def manager(self, tmp_path, mocker):
+        from app.core.sync_manager import SyncManager
+        mocker.patch('app.core.sync_manager.APP_PATH', tmp_path)
+        mocker.patch('app.core.sync_manager.SyncWorker')
+        mock_cfg = mocker.patch('app.core.sync_manager.cfg')
+        mock_cfg.historyRetentionDays.value = 0
+        mock_cfg.historyMaxRuns.value = 2
+        mgr = SyncManager(MagicMock())
+        yield mgr
+        mgr.shutdown()
+
+    def test_finished_runs_are_recorded_and_pruned(self, manager):
+        task = _task()
+        manager.tasks[task.id] = task
+        for minutes, success in ((0, True), (1, False), (2, True)):
+            manager.run_task(task.id)
+            worker = manager.workers[task.id]
+            worker.run_record.return_value = _record(minutes=minutes, success=success)
+            manager._on_task_finished(task.id, success, '完成' if success else '失败')
+
+        runs = manager.history.runs(task.id)
+        assert [r.started_at.minute for r in runs] == [2, 1]
+        assert not runs[1].success
+
+    def test_cancelled_run_is_recorded_once(self, manager):
+        task = _task()
+        manager.tasks[task.id] = task
+        manager.run_task(task.id)
+        worker = manager.workers[task.id]
+        worker.run_record.return_value = _record(success=False)
+
+        manager.cancel_task(task.id)
+        manager._on_task_finished(task.id, False, '已取消')
+
+        worker.run_record.assert_called_once_with(False, '已取消')
+        assert manager.history.count() == 1
+
+    def test_removing_task_drops_history(self, manager):
+        task = _task()
+        manager.tasks[task.id] = task
+        manager.history.add(_record())
+
+        manager.remove_task(task.id)
+
+        assert manager.history.count() == 0
+
+    def test_history_failure_does_not_break_finish(self, manager):
+        task = _task()
+        manager.tasks[task.id] = task
+        manager.run_task(task.id)
+        manager.workers[task.id].run_record.side_effect = RuntimeError('boom')
+
+        manager._on_task_finished(task.id, True, '完成')
+
+        assert task.id not in manager.workers
+        assert task.last_run is not None
+
+
+class TestHistoryView:
+
+    def test_dialog_fills_table_and_chart(self, qtbot):
+        from app.views.run_history_view import RunHistoryDialog
+        records = [_record(minutes=1, success=False, bytes=10, avg_speed=5.0, message='失败'),
+                   _record(bytes=20, avg_speed=10.0, dry_run=True)]
+
+        dialog = RunHistoryDialog('Backup', records)
+        qtbot.addWidget(dialog)
+
+        assert dialog.table.rowCount() == 2
+        assert dialog.table.item(0, 1).text() == '失败'
+        assert dialog.table.item(1, 1).text() == '成功 (预览)'
+        # 趋势图从旧到新
+        assert dialog.chart.values == [10.0, 5.0]
+        assert dialog.chart.failed == [False, True]
+        assert '1 次失败' in dialog.summaryLabel.text()
+
+        dialog.metricCombo.setCurrentText('传输量')
+        assert dialog.chart.values == [20.0, 10.0]
+
+    def test_empty_history(self, qtbot):
+        from app.views.run_history_view import RunHistoryDialog
+        dialog = RunHistoryDialog('Backup', [])
+        qtbot.addWidget(dialog)
+        dialog.chart.grab()
+
+        assert dialog.table.rowCount() == 0
+
+    def test_format_duration(self):
+        from app.views.run_history_view import format_duration
+        assert format_duration(42) == '42s'
+        assert format_duration(125) == '2m05s'
+        assert format_duration(3 * 3600 + 60) == '3h01m'
+
+    def test_interface_opens_history(self, qtbot, mocker):
+        sm = MagicMock()
+        task = _task()
+        sm.tasks = {task.id: task}
+        sm.history.runs.return_value = [_record()]
+        from app.core.services import Services, set_services
+        set_services(Services(rclone=MagicMock(), configManager=MagicMock(), syncManager=sm))
+        from app.views.sync_interface import SyncInterface
+        exec_ = mocker.patch('app.views.sync_interface.RunHistoryDialog.exec')
+        widget = SyncInterface()
+        qtbot.addWidget(widget)
+
+        widget.taskCards['t1'].historyBtn.click()
+
+        sm.history.runs.assert_called_once_with('t1')
+        exec_.assert_called_once()
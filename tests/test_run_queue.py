@@ -0,0 +1,54 @@
+from app.core.run_queue import RunPriority, RunQueue, task_remotes
+
+
+def test_task_remotes():
+    assert task_remotes('s3:bucket', '/home/data') == frozenset({'s3', 'local'})
+    assert task_remotes('C:\\data', 'D:/backup') == frozenset({'local'})
+
+
+class TestRunQueue:
+
+    def test_global_limit(self):
+        q = RunQueue(max_concurrent=2, per_remote=10)
+        for i in range(5):
+            q.push(f't{i}', frozenset({f'r{i}'}))
+        assert q.pop_runnable() == ['t0', 't1']
+        assert len(q) == 3
+        q.finish('t0')
+        assert q.pop_runnable() == ['t2']
+
+    def test_manual_runs_before_scheduled(self):
+        q = RunQueue(max_concurrent=1)
+        q.push('nightly', frozenset({'a'}), RunPriority.SCHEDULED)
+        q.push('manual', frozenset({'b'}), RunPriority.MANUAL)
+        assert q.pop_runnable() == ['manual']
+
+    def test_per_remote_cap_does_not_block_other_remotes(self):
+        q = RunQueue(max_concurrent=10, per_remote=1)
+        q.push('a1', frozenset({'s3', 'local'}))
+        q.push('a2', frozenset({'s3', 'local'}))
+        q.push('b1', frozenset({'dav'}))
+        assert q.pop_runnable() == ['a1', 'b1']
+        assert 'a2' in q
+        q.finish('a1')
+        assert q.pop_runnable() == ['a2']
+
+    def test_push_again_only_upgrades_priority(self):
+        q = RunQueue(max_concurrent=1)
+        q.mark_running('busy', frozenset({'x'}))
+        assert q.push('first', frozenset({'a'}), RunPriority.MANUAL) is True
+        assert q.push('late', frozenset({'b'}), RunPriority.SCHEDULED) is True
+        assert q.push('late', frozenset({'b'}), RunPriority.SCHEDULED) is False
+        assert q.position('late') == 2
+        q.push('late', frozenset({'b'}), RunPriority.MANUAL)
+        assert q.position('late') == 2
+        assert len(q) == 2
+
+    def test_remove_drops_stale_heap_entry(self):
+        q = RunQueue(max_concurrent=1)
+        q.push('t1', frozenset({'a'}))
+        q.push('t2', frozenset({'b'}))
+        assert q.remove('t1') is True
+        assert q.position('t2') == 1
+        assert q.pop_runnable() == ['t2']
+        assert q.pop_runnable() == []
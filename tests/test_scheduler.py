@@ -10,7 +10,8 @@ class TestSchedulerThread:
 
         thread = SchedulerThread()
         assert thread._timer.interval() == 60000
-        assert thread._last_minute == -1
+        assert thread._timer.isSingleShot()
+        assert thread._running is False
 
     def test_start(self, qtbot):
         from app.core.scheduler import SchedulerThread
@@ -23,6 +24,29 @@ class TestSchedulerThread:
                     thread.start()
                     mock_start.assert_called_once()
 
+    def test_arm_clamps_delay(self, qtbot):
+        from app.core.scheduler import SchedulerThread
+
+        thread = SchedulerThread()
+        thread.start()
+
+        thread.arm(datetime.now() + timedelta(hours=5))
+        assert thread._timer.interval() == SchedulerThread.MAX_WAIT_MS
+
+        thread.arm(datetime.now() - timedelta(minutes=1))
+        assert thread._timer.interval() == 0
+
+        thread.arm(None)
+        assert thread._timer.interval() == SchedulerThread.MAX_WAIT_MS
+        thread.stop()
+
+    def test_arm_ignored_when_stopped(self, qtbot):
+        from app.core.scheduler import SchedulerThread
+
+        thread = SchedulerThread()
+        thread.arm(datetime.now())
+        assert not thread._timer.isActive()
+
     def test_stop(self, qtbot):
         from app.core.scheduler import SchedulerThread
 
@@ -230,6 +254,7 @@ class TestSyncScheduler:
                 scheduler._scheduled_tasks['task1'] = '0 2 * * *'
 
                 with qtbot.waitSignal(scheduler.taskDue, timeout=1000):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
     def test_on_tick_time_rewind(self, scheduler):
@@ -250,6 +275,7 @@ class TestSyncScheduler:
                 scheduler._scheduled_tasks['task1'] = '0 2 * * *'
                 scheduler._check_callback = MagicMock(side_effect=Exception('Callback error'))
 
+                scheduler._rebuild(datetime.now())
                 scheduler._on_tick()
 
     def test_on_tick_invalid_cron(self, scheduler):
@@ -257,4 +283,100 @@ class TestSyncScheduler:
             with patch('app.core.scheduler.croniter', side_effect=ValueError('Invalid')):
                 scheduler._scheduled_tasks['task1'] = 'invalid'
 
+                scheduler._rebuild(datetime.now())
                 scheduler._on_tick()
+
+
+class TestSchedulerHeap:
+
+    @pytest.fixture
+    def scheduler(self, qtbot):
+        pytest.importorskip('croniter')
+        from app.core.scheduler import SyncScheduler
+        return SyncScheduler()
+
+    def test_add_task_precomputes_next_run(self, scheduler):
+        last_run = datetime(2024, 1, 1, 12, 0)
+        scheduler.add_task('task1', '0 2 * * *', last_run)
+
+        assert scheduler._next_runs['task1'][0] == datetime(2024, 1, 2, 2, 0)
+        assert scheduler._peek() == datetime(2024, 1, 2, 2, 0)
+
+    def test_never_run_task_is_due_immediately(self, scheduler, qtbot):
+        scheduler.add_task('task1', '0 2 * * *')
+
+        with qtbot.waitSignal(scheduler.taskDue, timeout=1000):
+            scheduler._on_tick()
+
+        next_run = scheduler._next_runs['task1'][0]
+        assert next_run > datetime.now()
+
+    def test_peek_returns_earliest_deadline(self, scheduler):
+        now = datetime.now()
+        scheduler.add_task('late', '0 0 1 1 *', now)
+        scheduler.add_task('soon', '* * * * *', now)
+
+        assert scheduler._peek() == scheduler._next_runs['soon'][0]
+
+    def test_remove_task_leaves_stale_entry_skipped(self, scheduler, qtbot):
+        scheduler.add_task('task1', '0 2 * * *')
+        scheduler.remove_task('task1')
+
+        spy = MagicMock()
+        scheduler.taskDue.connect(spy)
+        scheduler._on_tick()
+
+        spy.assert_not_called()
+        assert scheduler._heap == []
+
+    def test_update_task_replaces_entry(self, scheduler):
+        now = datetime.now()
+        scheduler.add_task('task1', '0 0 1 1 *', now)
+        scheduler.update_task('task1', '* * * * *')
+
+        live = [entry for entry in scheduler._heap if scheduler._is_live(entry)]
+        assert len(live) == 1
+        assert scheduler._peek() <= now + timedelta(minutes=1)
+
+    def test_update_last_run_reschedules_triggered_task(self, scheduler):
+        scheduler.add_task('task1', '*/5 * * * *')
+        scheduler._on_tick()
+        assert 'task1' in scheduler._triggered_tasks
+
+        run_time = datetime.now()
+        scheduler.update_last_run('task1', run_time)
+
+        assert 'task1' not in scheduler._triggered_tasks
+        assert scheduler._next_runs['task1'][0] > run_time
+
+    def test_tick_only_processes_due_entries(self, scheduler):
+        now = datetime.now()
+        for i in range(2000):
+            scheduler.add_task(f'task{i}', '0 0 1 1 *', now)
+        scheduler.add_task('due', '0 2 * * *')
+
+        fired = []
+        scheduler.taskDue.connect(fired.append)
+        with patch('app.core.scheduler.croniter', wraps=__import__('croniter').croniter) as spy:
+            scheduler._on_tick()
+
+        assert fired == ['due']
+        assert spy.call_count == 1
+
+    def test_compacts_stale_entries(self, scheduler):
+        now = datetime.now()
+        scheduler.add_task('task1', '0 0 1 1 *', now)
+        for _ in range(200):
+            scheduler.update_task('task1', '0 0 1 1 *')
+
+        scheduler._peek()
+        assert len(scheduler._heap) <= 2 * len(scheduler._next_runs) + 64
+
+    def test_time_rollback_rebuilds_from_now(self, scheduler):
+        future = datetime.now() + timedelta(days=2)
+        scheduler.add_task('task1', '0 * * * *', future)
+        scheduler._last_check_time = future
+
+        scheduler._on_tick()
+
+        assert scheduler._next_runs['task1'][0] <= datetime.now() + timedelta(hours=1)
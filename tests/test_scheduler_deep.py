@@ -58,6 +58,7 @@ class TestSchedulerDeep:
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', side_effect=croniter_side_effect):
                 with qtbot.waitSignal(scheduler.taskDue, timeout=1000):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
         assert 'good_task' in scheduler._triggered_tasks
@@ -68,6 +69,7 @@ class TestSchedulerDeep:
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', side_effect=ValueError("Invalid")):
                 with caplog.at_level(logging.ERROR, logger='app.core.scheduler'):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
         assert any('bad_task' in record.message for record in caplog.records)
@@ -84,6 +86,7 @@ class TestSchedulerDeep:
 
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', return_value=mock_itr):
+                scheduler._rebuild(datetime.now())
                 scheduler._on_tick()
 
         mock_callback.assert_called_once_with('task1')
@@ -100,6 +103,7 @@ class TestSchedulerDeep:
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', return_value=mock_itr):
                 with caplog.at_level(logging.ERROR, logger='app.core.scheduler'):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
         error_callback.assert_called_once_with('task1')
@@ -117,6 +121,7 @@ class TestSchedulerDeep:
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', return_value=mock_itr):
                 with qtbot.waitSignal(scheduler.taskDue, timeout=1000):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
     def test_on_tick_no_callback_set(self, scheduler, qtbot):
@@ -130,6 +135,7 @@ class TestSchedulerDeep:
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', return_value=mock_itr):
                 with qtbot.waitSignal(scheduler.taskDue, timeout=1000):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
 
@@ -139,6 +145,7 @@ class TestSchedulerDeep:
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', side_effect=TypeError("bad type")):
                 with caplog.at_level(logging.ERROR, logger='app.core.scheduler'):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
         assert any('类型错误' in record.message for record in caplog.records)
@@ -150,6 +157,7 @@ class TestSchedulerDeep:
         with patch('app.core.scheduler.CRONITER_AVAILABLE', True):
             with patch('app.core.scheduler.croniter', side_effect=RuntimeError("unexpected")):
                 with caplog.at_level(logging.ERROR, logger='app.core.scheduler'):
+                    scheduler._rebuild(datetime.now())
                     scheduler._on_tick()
 
         assert any('未知错误' in record.message for record in caplog.records)
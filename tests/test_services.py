@@ -0,0 +1,111 @@
+from unittest.mock import MagicMock, PropertyMock
+
+import pytest
+
+from app.core.services import Services, get_services, set_services
+
+
+class TestServices:
+
+    def test_injected_instances_are_used(self):
+        rclone, cm, mm, sm = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+        services = Services(rclone=rclone, configManager=cm, mountManager=mm, syncManager=sm)
+
+        assert services.rclone is rclone
+        assert services.configManager is cm
+        assert services.mountManager is mm
+        assert services.syncManager is sm
+
+    def test_managers_created_lazily_and_shared(self, mocker):
+        rclone = MagicMock()
+        cm_cls = mocker.patch('app.core.services.ConfigManager')
+        mm_cls = mocker.patch('app.core.services.MountManager')
+        sm_cls = mocker.patch('app.core.services.SyncManager')
+        services = Services(rclone=rclone)
+
+        cm_cls.assert_not_called()
+        mm_cls.assert_not_called()
+        sm_cls.assert_not_called()
+
+        assert services.configManager is services.configManager
+        assert services.mountManager is services.mountManager
+        cm_cls.assert_called_once_with(rclone)
+        mm_cls.assert_called_once_with(rclone)
+        mm_cls.return_value.load_mounts.assert_called_once()
+        sm_cls.assert_not_called()
+
+    def test_rclone_created_once(self, mocker):
+        rclone_cls = mocker.patch('app.core.services.RClone')
+        services = Services()
+
+        assert services.rclone is services.rclone
+        rclone_cls.assert_called_once()
+
+    def test_shutdown_only_touches_created_managers(self, mocker):
+        sm_cls = mocker.patch('app.core.services.SyncManager')
+        mm = MagicMock()
+        services = Services(rclone=MagicMock(), mountManager=mm)
+
+        services.shutdown()
+
+        mm.unmount_all.assert_called_once()
+        sm_cls.assert_not_called()
+
+    def test_shutdown_continues_after_error(self):
+        sm, mm = MagicMock(), MagicMock()
+        sm.shutdown.side_effect = RuntimeError('boom')
+        services = Services(rclone=MagicMock(), mountManager=mm, syncManager=sm)
+
+        services.shutdown()
+
+        mm.unmount_all.assert_called_once()
+
+    def test_get_services_singleton(self):
+        services = Services(rclone=MagicMock())
+        set_services(services)
+
+        assert get_services() is services
+        assert get_services() is get_services()
+
+    def test_set_services_none_recreates(self, mocker):
+        mocker.patch('app.core.services.RClone')
+        first = get_services()
+        set_services(None)
+
+        assert get_services() is not first
+
+
+class TestViewsShareServices:
+
+    @pytest.fixture
+    def services(self, qtbot):
+        rclone = MagicMock()
+        rclone.version.return_value = 'rclone v1.0.0'
+        cm = MagicMock()
+        cm.list_remotes.return_value = []
+        from app.core.mount_manager import MountManager
+        mm = MountManager(rclone)
+        services = Services(rclone=rclone, configManager=cm, mountManager=mm)
+        set_services(services)
+        return services
+
+    def test_home_updates_mount_count_from_signal(self, services, mocker):
+        from app.models.mount import Mount, MountStatus
+        from app.views.home_interface import HomeInterface
+        mocker.patch.object(Mount, 'is_mounted', new_callable=PropertyMock, return_value=True)
+        home = HomeInterface()
+        assert home.mountCard.valueLabel.text() == '0'
+
+        mount = Mount(remote_name='gd', remote_path='', drive_letter='X')
+        mount.status = MountStatus.MOUNTED
+        services.mountManager.mounts['gd'] = mount
+        services.mountManager.mountStatusChanged.emit('gd', MountStatus.MOUNTED)
+
+        assert home.mountCard.valueLabel.text() == '1'
+
+    def test_home_and_mount_interface_share_manager(self, services, mocker):
+        mocker.patch.object(services.mountManager, 'refresh_mount_status')
+        from app.views.home_interface import HomeInterface
+        from app.views.mount_interface import MountInterface
+
+        assert HomeInterface().mountManager is MountInterface().mountManager
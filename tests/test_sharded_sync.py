@@ -0,0 +1,218 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.rclone import RCloneResult
+from app.core.rclone_stats import TransferStats
+from app.core.sharded_sync import (ProcessSlots, aggregate_stats, dirs_to_purge, join_path,
+                                   shard_dirs, shard_excludes, split_bwlimit)
+from app.models.sync_task import SyncMode, SyncTask
+
+
+class FakeStream:
+
+    def __init__(self, paths, success=True, error=''):
+        self.entries = [{'Path': p, 'IsDir': True} for p in paths]
+        self.success = success
+        self.error = error
+
+    def __iter__(self):
+        yield self.entries
+
+    def cancel(self):
+        pass
+
+
+def _task(mode=SyncMode.SYNC, **kwargs):
+    options = {'shards': 2}
+    options.update(kwargs)
+    return SyncTask(id='t1', name='Backup', source='/data', destination='gd:backup',
+                    mode=mode, **options)
+
+
+def _stats_line(bytes_, total):
+    return json.dumps({'stats': {'bytes': bytes_, 'totalBytes': total, 'transfers': 1}}) + '\n'
+
+
+class TestHelpers:
+
+    def test_join_path(self):
+        assert join_path('gd:', 'a') == 'gd:a'
+        assert join_path('gd:backup', 'a/b') == 'gd:backup/a/b'
+        assert join_path('/data/', 'a') == '/data/a'
+        assert join_path('/data', '') == '/data'
+
+    def test_shard_dirs_takes_exact_depth(self):
+        dirs = {'a', 'b', 'a/x', 'a/y', 'b/z/q'}
+
+        assert shard_dirs(dirs, 1) == ['a', 'b']
+        assert shard_dirs(dirs, 2) == ['a/x', 'a/y']
+
+    def test_dirs_to_purge_skips_nested(self):
+        assert dirs_to_purge({'a'}, {'a', 'old', 'old/x', 'other'}) == ['old', 'other']
+
+    def test_shard_excludes(self):
+        patterns = ['*.tmp', '/a/cache/**', '/b/**', 'node_modules/**', 'a/y/*.log', '/**/build/']
+
+        assert shard_excludes(patterns, 'a') == [
+            '*.tmp', '/cache/**', 'node_modules/**', 'a/y/*.log', '/y/*.log', '/**/build/']
+        assert '/cache/**' not in shard_excludes(patterns, 'b')
+        # 整个分片都被排除的规则在分片内不再需要
+        assert shard_excludes(['/b/**'], 'b') == ['/**']
+
+    def test_split_bwlimit(self):
+        assert split_bwlimit('10M', 4) == '2560K'
+        assert split_bwlimit('8M', 2) == '4M'
+        assert split_bwlimit('10M', 1) == '10M'
+        assert split_bwlimit('08:00,512k 19:00,off', 4) == '08:00,512k 19:00,off'
+        assert split_bwlimit('', 4) == ''
+
+    def test_aggregate_stats(self):
+        total = aggregate_stats([
+            TransferStats(bytes=10, total_bytes=100, transfers=1, speed=5.0),
+            TransferStats(bytes=30, total_bytes=100, transfers=2, speed=5.0, last_error='boom'),
+        ], elapsed=3.0)
+
+        assert (total.bytes, total.total_bytes, total.transfers) == (40, 200, 3)
+        assert total.eta == 16
+        assert total.last_error == 'boom'
+        assert total.elapsed == 3.0
+
+    def test_process_slots_limit(self):
+        slots = ProcessSlots(lambda: 1)
+        assert slots.acquire()
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(slots.acquire()))
+        thread.start()
+        thread.join(0.5)
+        assert acquired == []
+
+        slots.release()
+        thread.join(2)
+        assert acquired == [True]
+        assert not ProcessSlots(lambda: 1).acquire(cancelled=lambda: True)
+
+
+class TestShardedWorker:
+
+    @pytest.fixture
+    def rclone(self):
+        rclone = MagicMock()
+        rclone.rclone_path = 'rclone'
+        rclone.config_path = None
+        rclone.purge.return_value = RCloneResult(True, '', '', 0)
+        return rclone
+
+    @pytest.fixture
+    def popen(self, mocker):
+        self.return_codes = {}
+
+        def create(cmd, **kwargs):
+            process = MagicMock()
+            process.stderr.readline.side_effect = [_stats_line(50, 100), '']
+            process.wait.return_value = self.return_codes.get(cmd[-2], 0)
+            return process
+
+        return mocker.patch('subprocess.Popen', side_effect=create)
+
+    def _run(self, rclone, task):
+        from app.core.sync_manager import ShardedSyncWorker
+        worker = ShardedSyncWorker(rclone, task, slots=ProcessSlots(lambda: 2))
+        finished, stats = [], []
+        worker.finished.connect(lambda *args: finished.append(args))
+        worker.stats_update.connect(lambda task_id, data: stats.append(data))
+        worker.run()
+        return worker, finished, stats
+
+    def test_runs_shards_then_reconciles(self, rclone, popen):
+        rclone.lsjson_stream.side_effect = [FakeStream(['a', 'b', 'c']),
+                                            FakeStream(['a', 'b', 'old'])]
+        task = _task(exclude_patterns=['/a/cache/**'], bandwidth_limit='8M')
+
+        worker, finished, stats = self._run(rclone, task)
+
+        commands = [call.args[0] for call in popen.call_args_list]
+        targets = sorted(tuple(cmd[-3:]) for cmd in commands[:3])
+        assert targets == [('sync', '/data/a', 'gd:backup/a'), ('sync', '/data/b', 'gd:backup/b'),
+                           ('sync', '/data/c', 'gd:backup/c')]
+        shard_a = next(cmd for cmd in commands if cmd[-2] == '/data/a')
+        assert shard_a[shard_a.index('--exclude') + 1] == '/cache/**'
+        assert shard_a[shard_a.index('--bwlimit') + 1] == '4M'
+        reconcile = commands[-1]
+        assert reconcile[-3:] == ['sync', '/data', 'gd:backup']
+        assert reconcile[reconcile.index('--max-depth') + 1] == '1'
+        rclone.purge.assert_called_once_with('gd:backup/old')
+        assert finished == [('t1', True, '完成')]
+        assert stats[-1]['shards_done'] == stats[-1]['shards_total'] == 4
+        assert stats[-1]['percentage'] == 100
+        assert worker.run_sample() is None
+
+    def test_copy_does_not_purge(self, rclone, popen):
+        rclone.lsjson_stream.side_effect = [FakeStream(['a', 'b'])]
+
+        _, finished, _ = self._run(rclone, _task(SyncMode.COPY))
+
+        assert popen.call_count == 3
+        assert rclone.lsjson_stream.call_count == 1
+        rclone.purge.assert_not_called()
+        assert finished[-1][1] is True
+
+    def test_shard_failure_reported(self, rclone, popen):
+        rclone.lsjson_stream.side_effect = [FakeStream(['a', 'b']), FakeStream(['a', 'b'])]
+        self.return_codes['/data/b'] = 1
+
+        _, finished, _ = self._run(rclone, _task())
+
+        assert finished[-1][1] is False
+        assert '1 个分片出错' in finished[-1][2]
+
+    def test_single_directory_falls_back(self, rclone, popen):
+        rclone.lsjson_stream.side_effect = [FakeStream(['only'])]
+
+        _, finished, _ = self._run(rclone, _task())
+
+        assert popen.call_count == 1
+        assert popen.call_args.args[0][-3:] == ['sync', '/data', 'gd:backup']
+        assert finished[-1] == ('t1', True, '完成')
+
+    def test_listing_failure(self, rclone, popen):
+        rclone.lsjson_stream.side_effect = [FakeStream([], success=False, error='not found')]
+
+        _, finished, _ = self._run(rclone, _task())
+
+        popen.assert_not_called()
+        assert finished[-1][1] is False
+
+
+class TestManagerSelection:
+
+    @pytest.fixture
+    def manager(self, tmp_path, mocker):
+        from app.core.sync_manager import SyncManager
+        mocker.patch('app.core.sync_manager.APP_PATH', tmp_path)
+        self.worker_cls = mocker.patch('app.core.sync_manager.SyncWorker')
+        self.sharded_cls = mocker.patch('app.core.sync_manager.ShardedSyncWorker')
+        mgr = SyncManager(MagicMock())
+        yield mgr
+        mgr.shutdown()
+
+    def test_sharded_task_uses_sharded_worker(self, manager):
+        task = _task(shards=4)
+        manager.tasks[task.id] = task
+
+        manager.run_task(task.id)
+
+        self.sharded_cls.assert_called_once_with(manager.rclone, task)
+        self.worker_cls.assert_not_called()
+
+    @pytest.mark.parametrize('options', [{'shards': 1}, {'shards': 4, 'mode': SyncMode.BISYNC}])
+    def test_other_tasks_use_plain_worker(self, manager, options):
+        task = _task(**options)
+        manager.tasks[task.id] = task
+
+        manager.run_task(task.id)
+
+        self.worker_cls.assert_called_once_with(manager.rclone, task, None)
+        self.sharded_cls.assert_not_called()
@@ -0,0 +1,176 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from PySide6.QtCore import Qt
+
+from app.core.storage_analyzer import ROOT, DirTree
+
+
+def _file(path, size):
+    return {'Path': path, 'Name': path.rpartition('/')[2], 'Size': size, 'IsDir': False}
+
+
+def _dir(path):
+    return {'Path': path, 'Name': path.rpartition('/')[2], 'Size': -1, 'IsDir': True}
+
+
+ENTRIES = [
+    _dir('media'),
+    _file('media/video/a.mp4', 1000),
+    _file('media/video/b.mp4', 3000),
+    _file('media/cover.jpg', 50),
+    _dir('docs'),
+    _file('docs/readme.txt', 10),
+    _file('top.bin', 500),
+    _dir('empty'),
+]
+
+
+class FakeStream:
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.success = True
+        self.error = ''
+        self.count = 0
+
+    def __iter__(self):
+        for batch in self.batches:
+            self.count += len(batch)
+            yield batch
+
+    def cancel(self):
+        pass
+
+
+class TestDirTree:
+
+    def test_aggregates_sizes_up_the_tree(self):
+        tree = DirTree()
+        tree.add_entries(ENTRIES)
+
+        media = tree.find('media')
+        video = tree.find('media/video')
+        assert tree.sizes[video] == 4000 and tree.files[video] == 2
+        assert tree.sizes[media] == 4050 and tree.files[media] == 3
+        assert tree.own_sizes[media] == 50
+        assert tree.total_size == 4560
+        assert tree.total_files == 5
+        assert tree.own_files[ROOT] == 1
+
+    def test_nodes_only_for_directories(self):
+        tree = DirTree()
+        tree.add_entries(_file(f'a/b/f{i}', 1) for i in range(1000))
+
+        assert len(tree) == 3
+        assert tree.total_files == 1000
+
+    def test_implicit_parents_created(self):
+        tree = DirTree()
+        tree.add_entries([_file('x/y/z/deep.bin', 7)])
+
+        assert tree.path(tree.find('x/y/z')) == 'x/y/z'
+        assert tree.sizes[tree.find('x')] == 7
+
+    def test_unknown_size_counts_as_zero(self):
+        tree = DirTree()
+        tree.add_entries([_file('a.bin', -1), _file('b.bin', None)])
+
+        assert tree.total_size == 0
+        assert tree.total_files == 2
+
+    def test_incremental_batches_match_single_pass(self):
+        whole = DirTree()
+        whole.add_entries(ENTRIES)
+        batched = DirTree()
+        for entry in ENTRIES:
+            batched.add_entries([entry])
+
+        assert list(whole.sizes) == list(batched.sizes)
+        assert list(whole.files) == list(batched.files)
+
+    def test_children_and_largest(self):
+        tree = DirTree()
+        tree.add_entries(ENTRIES)
+
+        names = {tree.names[c] for c in tree.children(ROOT)}
+        assert names == {'media', 'docs', 'empty'}
+        assert [tree.names[c] for c in tree.largest(ROOT, limit=2)] == ['media', 'docs']
+
+    def test_children_readable_while_growing(self):
+        tree = DirTree()
+        done = threading.Event()
+        errors = []
+
+        def write():
+            for i in range(200):
+                tree.add_entries(_file(f'd{i}/s{j}/f', 1) for j in range(50))
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            while not done.is_set():
+                for node in tree.children(ROOT):
+                    tree.sizes[node], tree.files[node], tree.children(node)
+        except IndexError as e:
+            errors.append(e)
+        writer.join()
+
+        assert not errors
+        assert tree.total_files == 10000
+
+
+class TestDirUsageModel:
+
+    @pytest.fixture
+    def model(self, qtbot):
+        from app.views.storage_analyzer import DirUsageModel
+        tree = DirTree()
+        tree.add_entries(ENTRIES)
+        model = DirUsageModel(tree)
+        model.reload()
+        return model
+
+    def _column(self, model, column):
+        return [model.data(model.index(r, column)) for r in range(model.rowCount())]
+
+    def test_sorted_by_size_with_files_row(self, model):
+        assert self._column(model, 0) == ['media', '<1 个文件>', 'docs', 'empty']
+        assert self._column(model, 2)[0] == f'{4050 * 100 / 4560:.1f}%'
+
+    def test_sort_by_name(self, model):
+        model.sort(0, Qt.AscendingOrder)
+
+        assert self._column(model, 0) == ['<1 个文件>', 'docs', 'empty', 'media']
+
+    def test_drill_down(self, model):
+        model.setNode(model.nodeAt(0))
+
+        assert self._column(model, 0) == ['video', '<1 个文件>']
+        assert self._column(model, 3) == ['2', '1']
+
+
+class TestStorageAnalyzerWindow:
+
+    def test_streams_and_drills_down(self, qtbot):
+        from app.views.storage_analyzer import StorageAnalyzerWindow
+        rclone = MagicMock()
+        rclone.lsjson_stream.return_value = FakeStream([ENTRIES[:3], ENTRIES[3:]])
+        window = StorageAnalyzerWindow(rclone, 'gd:backup')
+        qtbot.addWidget(window)
+
+        window.start()
+        qtbot.waitUntil(lambda: window._worker is None, timeout=3000)
+
+        assert rclone.lsjson_stream.call_args[0] == ('gd:backup',)
+        assert rclone.lsjson_stream.call_args[1]['recursive'] is True
+        assert '分析完成' in window.statusLabel.text()
+        assert window.model.rowCount() == 4
+
+        window.onDoubleClicked(window.model.index(0, 0))
+        assert window.pathLabel.text() == 'gd:backup/media'
+        assert window.upBtn.isEnabled()
+        window.goUp()
+        assert window.pathLabel.text() == 'gd:backup'
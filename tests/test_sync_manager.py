@@ -123,6 +123,89 @@ class TestSyncManager:
 
         assert result is False
 
+    @pytest.fixture
+    def queued_manager(self, sync_manager, mocker):
+        from app.models.sync_task import SyncTask
+        mock_cfg = mocker.patch('app.core.sync_manager.cfg')
+        mock_cfg.maxConcurrentTasks.value = 2
+        mock_cfg.perRemoteTasks.value = 1
+        mocker.patch('app.core.sync_manager.SyncWorker')
+        for tid, src in (('a', 's3:x'), ('b', 's3:y'), ('c', 'dav:z'), ('d', 'box:w')):
+            sync_manager.tasks[tid] = SyncTask(id=tid, name=tid, source=src, destination=f'/dst/{tid}')
+        return sync_manager
+
+    def test_run_task_beyond_limit_is_queued(self, queued_manager):
+        from app.models.sync_task import SyncStatus
+        for tid in ('a', 'b', 'c'):
+            assert queued_manager.run_task(tid) is True
+
+        # local 目标也计入单存储上限，c 同样要等待
+        assert queued_manager.tasks['a'].status == SyncStatus.RUNNING
+        assert queued_manager.tasks['b'].status == SyncStatus.QUEUED
+        assert queued_manager.tasks['c'].status == SyncStatus.QUEUED
+        assert set(queued_manager.workers) == {'a'}
+
+    def test_finished_task_starts_next_queued(self, queued_manager, mocker):
+        from app.models.sync_task import SyncStatus
+        mock_cfg = mocker.patch('app.core.sync_manager.cfg')
+        mock_cfg.maxConcurrentTasks.value = 2
+        mock_cfg.perRemoteTasks.value = 5
+        queued_manager.run_task('a')
+        queued_manager.run_task('b')
+        queued_manager.run_task('c')
+        assert queued_manager.tasks['c'].status == SyncStatus.QUEUED
+
+        queued_manager._on_task_finished('a', True, '完成')
+
+        assert queued_manager.tasks['c'].status == SyncStatus.RUNNING
+        assert 'a' not in queued_manager.runQueue.running
+
+    def test_scheduled_runs_yield_to_manual(self, queued_manager, mocker):
+        from app.core.run_queue import RunPriority
+        from app.models.sync_task import SyncStatus
+        mock_cfg = mocker.patch('app.core.sync_manager.cfg')
+        mock_cfg.maxConcurrentTasks.value = 1
+        mock_cfg.perRemoteTasks.value = 5
+        queued_manager.run_task('a')
+        queued_manager.run_task('c', RunPriority.SCHEDULED)
+        queued_manager.run_task('d', RunPriority.MANUAL)
+
+        queued_manager._on_task_finished('a', True, '完成')
+
+        assert queued_manager.tasks['d'].status == SyncStatus.RUNNING
+        assert queued_manager.tasks['c'].status == SyncStatus.QUEUED
+
+    def test_cancel_queued_task(self, queued_manager):
+        from app.models.sync_task import SyncStatus
+        queued_manager.run_task('a')
+        queued_manager.run_task('b')
+        queued_manager.cancel_task('b')
+        assert queued_manager.tasks['b'].status == SyncStatus.IDLE
+        assert 'b' not in queued_manager.runQueue
+
+    def test_late_finish_from_cancelled_worker_is_ignored(self, queued_manager, mocker):
+        mocker.patch('app.core.sync_manager.SyncWorker', side_effect=lambda *a, **k: MagicMock())
+        queued_manager.run_task('a')
+        old = queued_manager.workers['a']
+        queued_manager.cancel_task('a')
+        queued_manager.run_task('a')
+        new = queued_manager.workers['a']
+
+        queued_manager._on_worker_finished(old, 'a', False, '已取消')
+
+        assert queued_manager.workers['a'] is new
+        assert 'a' in queued_manager.runQueue.running
+
+    def test_cancel_queued_scheduled_task_reschedules(self, queued_manager, mocker):
+        update = mocker.patch.object(queued_manager.scheduler, 'update_last_run')
+        queued_manager.tasks['b'].scheduled = True
+        queued_manager.run_task('a')
+        queued_manager.run_task('b')
+
+        queued_manager.cancel_task('b')
+
+        update.assert_called_once_with('b', None)
+
     def test_cancel_task(self, sync_manager):
         from app.models.sync_task import SyncTask, SyncStatus
         sync_manager.tasks['test'] = SyncTask(
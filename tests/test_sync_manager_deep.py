@@ -150,6 +150,49 @@ class TestSyncWorkerDeep:
         progress_spy.assert_not_called()
         stats_spy.assert_not_called()
 
+    def test_parse_progress_json_stats(self, worker, mocker):
+        progress_spy = mocker.MagicMock()
+        worker.progress.connect(progress_spy)
+        stats_spy = mocker.MagicMock()
+        worker.stats_update.connect(stats_spy)
+
+        line = ('{"level":"notice","msg":"stats","stats":{"bytes":2500,"totalBytes":10000,'
+                '"transfers":4,"totalTransfers":9,"checks":3,"totalChecks":3,"errors":0,'
+                '"speed":1024,"eta":7,"transferring":[]}}')
+        worker._parse_progress(line)
+
+        progress_spy.assert_called_once_with('test-task', 25, 4, 2500)
+        stats = stats_spy.call_args[0][1]
+        assert stats['files_total'] == 9
+        assert stats['checks'] == 3
+        assert stats['eta'] == 7
+
+    def test_parse_progress_json_log_without_stats(self, worker, mocker):
+        progress_spy = mocker.MagicMock()
+        worker.progress.connect(progress_spy)
+        worker._parse_progress('{"level":"error","msg":"Failed to copy: denied","object":"a.txt"}')
+        progress_spy.assert_not_called()
+        assert worker._stats.last_error == 'a.txt: Failed to copy: denied'
+
+    def test_run_uses_json_stats_flags_and_reports_last_error(self, worker, mocker):
+        mock_process = MagicMock()
+        mock_process.stderr.readline.side_effect = [
+            '{"level":"error","msg":"Failed to copy: quota exceeded","object":"big.iso"}\n', ''
+        ]
+        mock_process.wait.return_value = 1
+        mock_popen = mocker.patch('subprocess.Popen', return_value=mock_process)
+        finished_spy = mocker.MagicMock()
+        worker.finished.connect(finished_spy)
+
+        worker.run()
+
+        cmd = mock_popen.call_args[0][0]
+        assert '--use-json-log' in cmd
+        assert cmd[cmd.index('--stats-log-level') + 1] == 'NOTICE'
+        assert '--stats-one-line' not in cmd
+        message = finished_spy.call_args[0][2]
+        assert message == '失败 (返回码: 1): big.iso: Failed to copy: quota exceeded'
+
     def test_parse_progress_speed_kib(self, worker, mocker):
         stats_spy = mocker.MagicMock()
         worker.stats_update.connect(stats_spy)
@@ -398,6 +441,96 @@ class TestSyncWorkerDeep:
         assert '--delete-excluded' not in cmd
         assert '--exclude' not in cmd
 
+    def test_run_incremental_copy_adds_max_age(self, worker, mocker):
+        from datetime import datetime, timedelta
+        from app.models.sync_task import SyncMode
+        worker.task.mode = SyncMode.COPY
+        worker.task.incremental = True
+        worker.task.no_traverse = True
+        worker.task.incremental_overlap = 60
+        worker.task.last_success = datetime.now() - timedelta(hours=2)
+        worker.task.last_full_run = datetime.now() - timedelta(hours=3)
+
+        mock_process = MagicMock()
+        mock_process.stderr.readline.return_value = ''
+        mock_process.wait.return_value = 0
+        mock_popen = mocker.patch('subprocess.Popen', return_value=mock_process)
+
+        worker.run()
+
+        cmd = mock_popen.call_args[0][0]
+        max_age = int(cmd[cmd.index('--max-age') + 1].rstrip('s'))
+        assert 7260 <= max_age <= 7265
+        assert '--no-traverse' in cmd
+        assert not worker.full_pass
+
+    def test_run_incremental_due_for_full_check(self, worker, mocker):
+        from datetime import datetime, timedelta
+        from app.models.sync_task import SyncMode
+        worker.task.mode = SyncMode.COPY
+        worker.task.incremental = True
+        worker.task.no_traverse = True
+        worker.task.last_success = datetime.now() - timedelta(hours=1)
+        worker.task.last_full_run = datetime.now() - timedelta(hours=25)
+
+        mock_process = MagicMock()
+        mock_process.stderr.readline.return_value = ''
+        mock_process.wait.return_value = 0
+        mock_popen = mocker.patch('subprocess.Popen', return_value=mock_process)
+
+        worker.run()
+
+        cmd = mock_popen.call_args[0][0]
+        assert '--max-age' not in cmd
+        assert '--no-traverse' not in cmd
+        assert worker.full_pass
+
+    def test_run_adds_perf_profile_args(self, worker, mocker):
+        from app.models.perf_profile import PerfProfile
+        from app.models.sync_task import SyncMode
+        worker.task.mode = SyncMode.COPY
+        worker.task.perf = PerfProfile(fast_list=True, buffer_size='64M', track_renames=True)
+
+        mock_process = MagicMock()
+        mock_process.stderr.readline.return_value = ''
+        mock_process.wait.return_value = 0
+        mock_popen = mocker.patch('subprocess.Popen', return_value=mock_process)
+
+        worker.run()
+
+        cmd = mock_popen.call_args[0][0]
+        assert '--fast-list' in cmd
+        assert cmd[cmd.index('--buffer-size') + 1] == '64M'
+        # --track-renames 只用于 sync
+        assert '--track-renames' not in cmd
+
+    def test_run_targeted_files_uses_files_from(self, mock_rclone, sync_task, mocker):
+        from app.core.sync_manager import SyncWorker
+        worker = SyncWorker(mock_rclone, sync_task, ['a.txt', 'sub/b.txt'])
+        listed = {}
+
+        def popen(cmd, **kwargs):
+            path = cmd[cmd.index('--files-from') + 1]
+            with open(path, encoding='utf-8') as f:
+                listed['files'] = f.read().splitlines()
+            listed['path'] = path
+            process = MagicMock()
+            process.stderr.readline.return_value = ''
+            process.wait.return_value = 0
+            return process
+
+        mock_popen = mocker.patch('subprocess.Popen', side_effect=popen)
+
+        worker.run()
+
+        cmd = mock_popen.call_args[0][0]
+        assert listed['files'] == ['a.txt', 'sub/b.txt']
+        assert '--no-traverse' in cmd
+        assert cmd[-3:] == ['copy', 'remote:src', '/dst']
+        assert not worker.full_pass
+        import os
+        assert not os.path.exists(listed['path'])
+
     def test_run_with_config_path(self, worker, mocker):
         mock_process = MagicMock()
         mock_process.stderr.readline.return_value = ''
@@ -611,6 +744,38 @@ class TestSyncManagerDeep:
 
         assert 'task-1' not in manager.workers
 
+    def test_on_task_finished_records_last_success_from_worker_start(self, manager, task_in_manager):
+        from datetime import datetime
+        started = datetime(2024, 5, 1, 8, 0, 0)
+        worker = MagicMock(started_at=started, full_pass=False, partial=False)
+        manager.workers['task-1'] = worker
+
+        manager._on_task_finished('task-1', True, '完成')
+
+        assert task_in_manager.last_success == started
+        assert task_in_manager.last_full_run is None
+
+    def test_on_task_finished_full_pass_records_last_full_run(self, manager, task_in_manager):
+        from datetime import datetime
+        started = datetime(2024, 5, 1, 8, 0, 0)
+        manager.workers['task-1'] = MagicMock(started_at=started, full_pass=True, partial=False)
+
+        manager._on_task_finished('task-1', True, '完成')
+
+        assert task_in_manager.last_full_run == started
+
+    def test_on_task_finished_skips_last_success_on_failure_or_dry_run(self, manager, task_in_manager):
+        from datetime import datetime
+        started = datetime(2024, 5, 1, 8, 0, 0)
+        manager.workers['task-1'] = MagicMock(started_at=started, full_pass=True, partial=False)
+        manager._on_task_finished('task-1', False, '失败')
+        assert task_in_manager.last_success is None
+
+        task_in_manager.dry_run = True
+        manager.workers['task-1'] = MagicMock(started_at=started, full_pass=True, partial=False)
+        manager._on_task_finished('task-1', True, '完成')
+        assert task_in_manager.last_success is None
+
     def test_on_task_finished_exception_caught(self, manager, task_in_manager, mocker):
         mocker.patch.object(manager, 'save_tasks', side_effect=RuntimeError("DB error"))
 
@@ -630,7 +795,8 @@ class TestSyncManagerDeep:
         manager._on_scheduled_task_due('task-1')
 
         signal_spy.scheduledTaskDue.emit.assert_called_once_with('task-1', 'Test Task')
-        run_spy.assert_called_once_with('task-1')
+        from app.core.run_queue import RunPriority
+        run_spy.assert_called_once_with('task-1', RunPriority.SCHEDULED)
 
     def test_on_scheduled_task_due_nonexistent_task(self, manager, mocker):
         signal_spy = mocker.patch('app.core.sync_manager.signalBus')
@@ -29,29 +29,21 @@ def _mock_view_deps(mocker):
     mock_rclone.config_path = "/tmp/rclone.conf"
     mock_rclone.config_dump.return_value = {}
     mock_rclone.listremotes.return_value = []
-    for mod in [
-        "app.views.sync_interface.RClone",
-        "app.views.mount_interface.RClone",
-    ]:
-        mocker.patch(mod, return_value=mock_rclone)
 
     mock_cm = MagicMock()
     mock_cm.list_remotes.return_value = []
-    for mod in [
-        "app.views.sync_interface.ConfigManager",
-        "app.views.mount_interface.ConfigManager",
-    ]:
-        mocker.patch(mod, return_value=mock_cm)
 
     mock_mm = MagicMock()
     mock_mm.mounts = {}
     mock_mm.load_mounts.return_value = None
-    mocker.patch("app.views.mount_interface.MountManager", return_value=mock_mm)
 
     mock_sm = MagicMock()
     mock_sm.tasks = {}
     mock_sm.load_tasks.return_value = True
-    mocker.patch("app.views.sync_interface.SyncManager", return_value=mock_sm)
+
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone, configManager=mock_cm,
+                          mountManager=mock_mm, syncManager=mock_sm))
 
     return {
         "rclone": mock_rclone,
@@ -425,6 +417,40 @@ class TestAddSyncDialog:
         data = dlg.getData()
         assert data["exclude_patterns"] == ["*.tmp", "*.log"]
 
+    def test_perf_preset_fills_editor(self):
+        from app.views.sync_interface import AddSyncDialog
+        dlg = AddSyncDialog([], None)
+        dlg.perfPresetCombo.setCurrentIndex(dlg.perfPresetCombo.findData('huge_files'))
+        assert dlg.bufferSizeEdit.text() == "64M"
+        assert dlg.s3ConcurrencySpin.value() == 8
+        assert dlg.getData()["perf"].preset == "huge_files"
+
+        dlg.fastListSwitch.setChecked(True)
+        assert dlg.perfPresetCombo.currentIndex() == 0
+        assert dlg.getData()["perf"].preset == ""
+
+    def test_perf_loaded_from_task(self):
+        from app.models.perf_profile import preset_profile
+        from app.views.sync_interface import AddSyncDialog
+        task = _make_task(perf=preset_profile('small_files'))
+        dlg = AddSyncDialog([], None, task)
+        assert dlg.fastListSwitch.isChecked()
+        assert dlg.perfPresetCombo.currentData() == "small_files"
+        assert dlg.getData()["perf"] == task.perf
+
+    def test_invalid_perf_blocks_accept(self, mocker):
+        from app.views.sync_interface import AddSyncDialog
+        dlg = AddSyncDialog([], None)
+        accept = mocker.patch('app.views.sync_interface.Dialog.accept')
+        dlg.bufferSizeEdit.setText("lots")
+        dlg.accept()
+        accept.assert_not_called()
+        assert "无效的大小" in dlg.perfStatusLabel.text()
+
+        dlg.bufferSizeEdit.setText("32M")
+        dlg.accept()
+        accept.assert_called_once()
+
 
 class TestSyncInterface:
 
@@ -0,0 +1,264 @@
+import os
+import stat
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.rclone import RCloneResult
+from app.core.sync_planner import SyncPlan, build_plan, parse_combined
+from app.models.sync_task import SyncMode, SyncTask
+
+
+class FakeStream:
+
+    def __init__(self, entries, success=True, error=''):
+        self.entries = entries
+        self.success = success
+        self.error = error
+        self.cancelled = False
+
+    def __iter__(self):
+        yield self.entries
+
+    def cancel(self):
+        self.cancelled = True
+
+
+COMBINED = ['+ new.txt', '* docs/changed.txt', '- stale.txt', '= same.txt',
+            '= docs/same2.txt', '! broken.bin', 'garbage']
+
+
+def _rclone(combined, return_code=1, stderr='ERROR : 3 differences found', streams=None):
+    rclone = MagicMock()
+
+    def check_combined(source, dest, output_path, **kwargs):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(combined) + '\n')
+        return RCloneResult(success=return_code == 0, stdout='', stderr=stderr,
+                            return_code=return_code)
+
+    rclone.check_combined.side_effect = check_combined
+    rclone.lsjson_stream.side_effect = streams or []
+    return rclone
+
+
+def _task(mode=SyncMode.SYNC, **kwargs):
+    return SyncTask(id='t1', name='Backup', source='/data', destination='gd:backup',
+                    mode=mode, **kwargs)
+
+
+class TestParse:
+
+    def test_categories(self):
+        plan = SyncPlan('t1', SyncMode.SYNC)
+
+        parse_combined(COMBINED, plan)
+
+        assert plan.new == ['new.txt']
+        assert plan.changed == ['docs/changed.txt']
+        assert plan.deleted == ['stale.txt']
+        assert plan.identical == 2
+        assert plan.identical_files == []
+        assert plan.errors == ['broken.bin']
+
+    def test_move_keeps_identical_paths(self):
+        plan = SyncPlan('t1', SyncMode.MOVE)
+
+        parse_combined(['= a.txt\n', '+ b.txt\n'], plan)
+
+        assert plan.files_for_run() == ['a.txt', 'b.txt']
+
+    def test_files_for_run(self):
+        plan = SyncPlan('t1', SyncMode.SYNC, new=['b'], changed=['a'])
+        assert plan.files_for_run() == ['a', 'b']
+
+        plan.deleted = ['c']
+        assert plan.files_for_run() is None
+
+        copy_plan = SyncPlan('t1', SyncMode.COPY, new=['b'], errors=['x'])
+        assert copy_plan.files_for_run() is None
+
+    def test_is_empty(self):
+        assert SyncPlan('t1', SyncMode.SYNC, identical=10).is_empty
+        assert not SyncPlan('t1', SyncMode.MOVE, identical_files=['a']).is_empty
+
+
+class TestBuildPlan:
+
+    def test_sync_plan_with_sizes(self):
+        rclone = _rclone(COMBINED[:5], streams=[
+            FakeStream([{'Path': 'new.txt', 'Size': 10}, {'Path': 'docs/changed.txt', 'Size': 5},
+                        {'Path': 'same.txt', 'Size': 99}]),
+            FakeStream([{'Path': 'stale.txt', 'Size': 7}]),
+        ])
+
+        plan, error = build_plan(rclone, _task(exclude_patterns=['*.tmp']))
+
+        assert error == ''
+        assert (plan.new_bytes, plan.changed_bytes, plan.deleted_bytes) == (10, 5, 7)
+        assert plan.transfer_bytes == 15
+        kwargs = rclone.check_combined.call_args.kwargs
+        assert kwargs['one_way'] is False
+        assert kwargs['excludes'] == ['*.tmp']
+        assert rclone.lsjson_stream.call_args_list[0].args[0] == '/data'
+        assert rclone.lsjson_stream.call_args_list[1].args[0] == 'gd:backup'
+
+    def test_copy_is_one_way_and_skips_dest_listing(self):
+        rclone = _rclone(['+ new.txt'], streams=[FakeStream([{'Path': 'new.txt', 'Size': 3}])])
+
+        plan, _ = build_plan(rclone, _task(SyncMode.COPY))
+
+        assert rclone.check_combined.call_args.kwargs['one_way'] is True
+        assert rclone.lsjson_stream.call_count == 1
+        assert plan.new_bytes == 3
+
+    def test_identical_tree_needs_no_listing(self):
+        rclone = _rclone(['= a.txt'], return_code=0, stderr='')
+
+        plan, _ = build_plan(rclone, _task())
+
+        assert plan.is_empty
+        rclone.lsjson_stream.assert_not_called()
+
+    def test_missing_destination_lists_source(self):
+        rclone = _rclone([], return_code=3, stderr='directory not found', streams=[
+            FakeStream([{'Path': 'a', 'Size': 1}, {'Path': 'b/c', 'Size': 2}])])
+
+        plan, _ = build_plan(rclone, _task())
+
+        assert plan.new == ['a', 'b/c']
+        assert plan.new_bytes == 3
+
+    def test_check_failure(self):
+        rclone = _rclone([], return_code=2, stderr='Failed to create file system: bad remote')
+
+        plan, error = build_plan(rclone, _task())
+
+        assert plan is None
+        assert 'bad remote' in error
+
+    def test_bisync_not_supported(self):
+        plan, error = build_plan(MagicMock(), _task(SyncMode.BISYNC))
+
+        assert plan is None and error
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='使用 shell 脚本模拟 rclone')
+class TestCheckCombined:
+
+    def test_writes_combined_file_and_reports_differences(self, tmp_path):
+        from app.core.rclone import RClone
+        script = tmp_path / 'rclone'
+        script.write_text('#!/bin/sh\n'
+                          'while [ "$1" != "--combined" ]; do shift; done\n'
+                          'printf "+ a.txt\\n= b.txt\\n" > "$2"\n'
+                          'echo "NOTICE: 1 differences found" >&2\n'
+                          'exit 1\n', encoding='utf-8')
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        rclone = RClone(rclone_path=str(script))
+        output = tmp_path / 'combined.txt'
+
+        result = rclone.check_combined('/src', 'gd:dst', str(output), one_way=True)
+
+        assert result.return_code == 1
+        assert 'differences found' in result.stderr
+        assert output.read_text(encoding='utf-8').splitlines() == ['+ a.txt', '= b.txt']
+
+    def test_cancel_kills_process(self, tmp_path):
+        from app.core.rclone import RClone
+        script = tmp_path / 'rclone'
+        script.write_text('#!/bin/sh\nsleep 30\n', encoding='utf-8')
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        rclone = RClone(rclone_path=str(script))
+
+        result = rclone.check_combined('/src', 'gd:dst', str(tmp_path / 'o.txt'),
+                                       cancelled=lambda: True)
+
+        assert not result.success
+        assert result.stderr == '操作已取消'
+
+
+class TestRunPlan:
+
+    @pytest.fixture
+    def manager(self, tmp_path, mocker):
+        from app.core.sync_manager import SyncManager
+        mocker.patch('app.core.sync_manager.APP_PATH', tmp_path)
+        self.worker_cls = mocker.patch('app.core.sync_manager.SyncWorker')
+        mgr = SyncManager(MagicMock())
+        yield mgr
+        mgr.shutdown()
+
+    def test_reusable_plan_runs_listed_files(self, manager):
+        task = _task(SyncMode.SYNC)
+        manager.tasks[task.id] = task
+
+        assert manager.run_plan(SyncPlan('t1', SyncMode.SYNC, new=['b'], changed=['a']))
+
+        self.worker_cls.assert_called_once_with(manager.rclone, task, ['a', 'b'], checksum=True)
+
+    def test_plan_with_deletions_runs_full(self, manager):
+        task = _task(SyncMode.SYNC)
+        manager.tasks[task.id] = task
+
+        manager.run_plan(SyncPlan('t1', SyncMode.SYNC, new=['b'], deleted=['c']))
+
+        self.worker_cls.assert_called_once_with(manager.rclone, task, None)
+
+    def test_empty_plan_does_nothing(self, manager):
+        manager.tasks['t1'] = _task(SyncMode.COPY)
+
+        assert not manager.run_plan(SyncPlan('t1', SyncMode.COPY, identical=3))
+        self.worker_cls.assert_not_called()
+
+
+class TestSyncInterfacePlan:
+
+    @pytest.fixture
+    def iface(self, qtbot):
+        sm = MagicMock()
+        task = _task(SyncMode.SYNC)
+        sm.tasks = {task.id: task}
+        from app.core.services import Services, set_services
+        set_services(Services(rclone=MagicMock(), configManager=MagicMock(), syncManager=sm))
+        from app.views.sync_interface import SyncInterface
+        widget = SyncInterface()
+        qtbot.addWidget(widget)
+        return widget
+
+    def test_plan_button_hidden_for_bisync(self, qtbot):
+        from app.views.sync_interface import SyncTaskCard
+        card = SyncTaskCard(_task(SyncMode.BISYNC))
+        qtbot.addWidget(card)
+
+        assert card.planBtn.isHidden()
+
+    def test_plan_dialog_accept_runs_plan(self, iface, mocker):
+        exec_ = mocker.patch('app.views.sync_interface.SyncPlanDialog.exec', return_value=True)
+        plan = SyncPlan('t1', SyncMode.SYNC, new=['a'], new_bytes=2048)
+        iface.taskCards['t1'].setPlanning(True)
+
+        iface.onPlanFinished('t1', plan, '')
+
+        exec_.assert_called_once()
+        iface.syncManager.run_plan.assert_called_once_with(plan)
+        assert iface.taskCards['t1'].planBtn.isEnabled()
+
+    def test_plan_failure_shows_error(self, iface, mocker):
+        error = mocker.patch('app.views.sync_interface.InfoBar.error')
+
+        iface.onPlanFinished('t1', None, 'boom')
+
+        error.assert_called_once()
+        iface.syncManager.run_plan.assert_not_called()
+
+    def test_plan_text_summarizes(self):
+        from app.views.sync_interface import _plan_text
+        plan = SyncPlan('t1', SyncMode.SYNC, new=['a', 'b'], deleted=['c'],
+                        new_bytes=1536, identical=4)
+
+        text = _plan_text(plan)
+
+        assert '新增: 2 个文件，1.5 KB' in text
+        assert '删除: 1 个文件' in text
+        assert '将完整运行' in text
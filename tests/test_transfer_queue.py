@@ -0,0 +1,218 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from PySide6.QtWidgets import QApplication
+
+from app.core.transfer_queue import (
+    TransferItem, TransferJob, TransferJobWorker, TransferQueue, TransferState,
+    group_items, split_parent
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+class TestSplitParent:
+
+    def test_remote_path(self):
+        assert split_parent('myremote:docs/a.txt') == ('myremote:docs', 'a.txt')
+
+    def test_remote_root(self):
+        assert split_parent('myremote:a.txt') == ('myremote:', 'a.txt')
+
+    def test_posix_path(self):
+        assert split_parent('/tmp/up/a.txt') == ('/tmp/up', 'a.txt')
+
+    def test_windows_path(self):
+        assert split_parent('C:\\Users\\me\\a.txt') == ('C:\\Users\\me', 'a.txt')
+
+
+class TestGroupItems:
+
+    def test_files_with_same_parent_and_dest_share_a_job(self):
+        items = [TransferItem(f'/tmp/up/{i}.txt', 'r2:dst') for i in range(500)]
+        jobs = group_items(items)
+        assert len(jobs) == 1
+        assert jobs[0].source == '/tmp/up'
+        assert len(jobs[0].items) == 500
+
+    def test_directories_get_their_own_job(self):
+        items = [
+            TransferItem('myremote:docs/a.txt', '/dl'),
+            TransferItem('myremote:docs/sub', '/dl', is_dir=True),
+            TransferItem('myremote:docs/b.txt', '/dl'),
+        ]
+        jobs = group_items(items)
+        assert [(j.source, j.is_dir, len(j.items)) for j in jobs] == [
+            ('myremote:docs', False, 2),
+            ('myremote:docs/sub', True, 1),
+        ]
+
+    def test_different_destinations_are_split(self):
+        items = [TransferItem('/a/x', 'r2:one'), TransferItem('/a/y', 'r2:two')]
+        assert len(group_items(items)) == 2
+
+
+def _fake_rclone(stderr_lines, exit_code=0):
+    script = (
+        'import sys\n'
+        f'for line in {stderr_lines!r}:\n'
+        '    sys.stderr.write(line + "\\n")\n'
+        f'sys.exit({exit_code})\n'
+    )
+    rclone = MagicMock()
+    rclone._build_command.side_effect = lambda *args, **kwargs: [sys.executable, '-c', script]
+    return rclone
+
+
+def _log(**record):
+    return json.dumps(record)
+
+
+class TestTransferJobWorker:
+
+    def _run(self, rclone, job):
+        worker = TransferJobWorker(rclone, job)
+        events = []
+        worker.itemProgress.connect(lambda i, b: events.append(('progress', i, b)))
+        worker.itemFinished.connect(lambda i, ok, err: events.append(('done', i, ok, err)))
+        worker.run()
+        return worker, events
+
+    def test_build_command_uses_files_from(self):
+        rclone = MagicMock()
+        job = TransferJob('/tmp/up', 'r2:dst', [TransferItem('/tmp/up/a', 'r2:dst')])
+        TransferJobWorker(rclone, job, transfers=8).build_command('/tmp/list.txt')
+        args, kwargs = rclone._build_command.call_args
+        assert args == ('copy', '/tmp/up', 'r2:dst')
+        assert kwargs['files_from_raw'] == '/tmp/list.txt'
+        assert kwargs['use_json_log'] is True
+        assert kwargs['transfers'] == 8
+
+    def test_transfers_default_left_to_rclone(self):
+        rclone = MagicMock()
+        job = TransferJob('/tmp/up', 'r2:dst', [TransferItem('/tmp/up/a', 'r2:dst')])
+        TransferJobWorker(rclone, job).build_command('/tmp/list.txt')
+        assert rclone._build_command.call_args.kwargs['transfers'] is None
+
+    def test_per_item_results_from_json_log(self):
+        a = TransferItem('/tmp/up/a.txt', 'r2:dst', size=10)
+        b = TransferItem('/tmp/up/b.txt', 'r2:dst', size=10)
+        rclone = _fake_rclone([
+            _log(level='notice', msg='stats', stats={'transferring': [{'name': 'a.txt', 'bytes': 5}]}),
+            _log(level='info', msg='Copied (new)', object='a.txt'),
+            _log(level='error', msg='Failed to copy: denied', object='b.txt'),
+            'not json',
+        ], exit_code=1)
+
+        _, events = self._run(rclone, TransferJob('/tmp/up', 'r2:dst', [a, b]))
+
+        assert ('progress', a.id, 5) in events
+        assert ('done', a.id, True, '') in events
+        assert ('done', b.id, False, 'Failed to copy: denied') in events
+        assert len([e for e in events if e[0] == 'done']) == 2
+
+    def test_unreported_items_follow_exit_code(self):
+        a = TransferItem('/tmp/up/a.txt', 'r2:dst')
+        _, events = self._run(_fake_rclone([]), TransferJob('/tmp/up', 'r2:dst', [a]))
+        assert events == [('done', a.id, True, '')]
+
+    def test_files_from_is_written_and_removed(self):
+        rclone = MagicMock()
+        captured = {}
+
+        def build(*args, **kwargs):
+            path = kwargs['files_from_raw']
+            with open(path, encoding='utf-8') as f:
+                captured['names'] = f.read().splitlines()
+            captured['path'] = path
+            return [sys.executable, '-c', 'pass']
+
+        rclone._build_command.side_effect = build
+        items = [TransferItem('/tmp/up/a.txt', 'r2:dst'), TransferItem('/tmp/up/文件.txt', 'r2:dst')]
+        self._run(rclone, TransferJob('/tmp/up', 'r2:dst', items))
+        assert captured['names'] == ['a.txt', '文件.txt']
+        assert not os.path.exists(captured['path'])
+
+
+class TestTransferQueue:
+
+    @pytest.fixture
+    def queue(self, mocker):
+        workers = []
+
+        def make_worker(rclone, job, transfers=None):
+            worker = MagicMock()
+            worker.job = job
+            worker._cancelled = False
+            workers.append(worker)
+            return worker
+
+        mocker.patch('app.core.transfer_queue.TransferJobWorker', side_effect=make_worker)
+        cache = MagicMock()
+        q = TransferQueue(MagicMock(), cache, max_concurrent=1, max_retries=1)
+        q.started_workers = workers
+        return q
+
+    def test_concurrency_limit(self, queue):
+        queue.enqueue([TransferItem('/a/x', 'r2:one'), TransferItem('/b/y', 'r2:two')])
+        assert len(queue.started_workers) == 1
+        assert queue.started_workers[0].start.called
+
+    def test_job_finish_starts_next_and_invalidates_cache(self, queue):
+        finished = []
+        queue.jobFinished.connect(finished.append)
+        x, y = TransferItem('/a/x', 'r2:one'), TransferItem('/b/y', 'r2:two')
+        queue.enqueue([x, y])
+
+        queue._on_item_finished(x.id, True, '')
+        queue._on_job_finished(queue.started_workers[0])
+
+        assert x.state == TransferState.DONE
+        assert finished == ['r2:one']
+        queue.cache.invalidate_for_operation.assert_called_with(('copy', '/a', 'r2:one'))
+        assert len(queue.started_workers) == 2
+        assert y.state == TransferState.RUNNING
+
+    def test_failed_item_is_retried_then_fails(self, queue):
+        summary = []
+        queue.allFinished.connect(lambda done, failed: summary.append((done, failed)))
+        item = TransferItem('/a/x', 'r2:one')
+        queue.enqueue([item])
+
+        queue._on_item_finished(item.id, False, 'boom')
+        assert item.state == TransferState.PENDING
+        queue._on_job_finished(queue.started_workers[0])
+        assert len(queue.started_workers) == 2
+        assert item.attempts == 2
+
+        queue._on_item_finished(item.id, False, 'boom again')
+        queue._on_job_finished(queue.started_workers[1])
+        assert item.state == TransferState.FAILED
+        assert item.error == 'boom again'
+        assert summary == [(0, 1)]
+
+    def test_cancel_all(self, queue):
+        x, y = TransferItem('/a/x', 'r2:one'), TransferItem('/b/y', 'r2:two')
+        queue.enqueue([x, y])
+        queue.cancel_all()
+        assert y.state == TransferState.CANCELLED
+        queue.started_workers[0].cancel.assert_called_once()
+
+    def test_clear_finished(self, queue):
+        x = TransferItem('/a/x', 'r2:one')
+        queue.enqueue([x])
+        queue._on_item_finished(x.id, True, '')
+        assert queue.clear_finished() == [x.id]
+        assert queue.items == {}
@@ -27,40 +27,20 @@ def _mock_view_deps(mocker):
     mock_rclone_instance.config_dump.return_value = {}
     mock_rclone_instance.listremotes.return_value = []
 
-    for mod in [
-        'app.views.home_interface.RClone',
-        'app.views.mount_interface.RClone',
-        'app.views.remote_interface.RClone',
-        'app.views.browser_interface.RClone',
-        'app.views.sync_interface.RClone',
-        'app.views.settings_interface.RClone',
-    ]:
-        mocker.patch(mod, return_value=mock_rclone_instance)
-
     mock_cm_instance = MagicMock()
     mock_cm_instance.list_remotes.return_value = []
-    for mod in [
-        'app.views.home_interface.ConfigManager',
-        'app.views.mount_interface.ConfigManager',
-        'app.views.remote_interface.ConfigManager',
-        'app.views.browser_interface.ConfigManager',
-        'app.views.sync_interface.ConfigManager',
-    ]:
-        mocker.patch(mod, return_value=mock_cm_instance)
 
     mock_mm_instance = MagicMock()
     mock_mm_instance.mounts = {}
     mock_mm_instance.load_mounts.return_value = None
-    for mod in [
-        'app.views.home_interface.MountManager',
-        'app.views.mount_interface.MountManager',
-    ]:
-        mocker.patch(mod, return_value=mock_mm_instance)
 
     mock_sm_instance = MagicMock()
     mock_sm_instance.tasks = {}
     mock_sm_instance.load_tasks.return_value = True
-    mocker.patch('app.views.sync_interface.SyncManager', return_value=mock_sm_instance)
+
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone_instance, configManager=mock_cm_instance,
+                          mountManager=mock_mm_instance, syncManager=mock_sm_instance))
 
     mocker.patch('app.views.settings_interface.is_auto_start_enabled', return_value=False)
     mocker.patch('app.views.settings_interface.set_auto_start', return_value=True)
@@ -174,15 +154,16 @@ class TestHomeInterface:
     def test_load_data_exception(self, mocker):
         mock_rclone_instance = MagicMock()
         mock_rclone_instance.version.return_value = 'rclone v1.0.0'
-        mocker.patch('app.views.home_interface.RClone', return_value=mock_rclone_instance)
 
         mock_cm_instance = MagicMock()
         mock_cm_instance.list_remotes.side_effect = RuntimeError("Connection failed")
-        mocker.patch('app.views.home_interface.ConfigManager', return_value=mock_cm_instance)
 
         mock_mm_instance = MagicMock()
         mock_mm_instance.mounts = {}
-        mocker.patch('app.views.home_interface.MountManager', return_value=mock_mm_instance)
+
+        from app.core.services import Services, set_services
+        set_services(Services(rclone=mock_rclone_instance, configManager=mock_cm_instance,
+                              mountManager=mock_mm_instance))
 
         mock_infobar = mocker.patch('app.views.home_interface.InfoBar')
 
@@ -205,11 +186,9 @@ class TestHomeInterface:
     def test_load_data_success(self, mocker):
         mock_rclone_instance = MagicMock()
         mock_rclone_instance.version.return_value = 'rclone v1.0.0'
-        mocker.patch('app.views.home_interface.RClone', return_value=mock_rclone_instance)
 
         mock_cm_instance = MagicMock()
         mock_cm_instance.list_remotes.return_value = [MagicMock(), MagicMock(), MagicMock()]
-        mocker.patch('app.views.home_interface.ConfigManager', return_value=mock_cm_instance)
 
         mock_mm_instance = MagicMock()
         mock_mount1 = MagicMock()
@@ -217,7 +196,10 @@ class TestHomeInterface:
         mock_mount2 = MagicMock()
         mock_mount2.is_mounted = False
         mock_mm_instance.mounts = {'m1': mock_mount1, 'm2': mock_mount2}
-        mocker.patch('app.views.home_interface.MountManager', return_value=mock_mm_instance)
+
+        from app.core.services import Services, set_services
+        set_services(Services(rclone=mock_rclone_instance, configManager=mock_cm_instance,
+                              mountManager=mock_mm_instance))
 
         from app.views.home_interface import HomeInterface
         interface = HomeInterface()
@@ -33,12 +33,12 @@ def _mock_remote_deps(mocker):
     mock_rclone.config_path = '/tmp/rclone.conf'
     mock_rclone.config_dump.return_value = {}
     mock_rclone.listremotes.return_value = []
-    mocker.patch('app.views.remote_interface.RClone', return_value=mock_rclone)
 
     mock_cm = MagicMock()
     mock_cm.list_remotes.return_value = []
     mock_cm.refresh.return_value = None
-    mocker.patch('app.views.remote_interface.ConfigManager', return_value=mock_cm)
+    from app.core.services import Services, set_services
+    set_services(Services(rclone=mock_rclone, configManager=mock_cm))
 
     return {'rclone': mock_rclone, 'config_manager': mock_cm}
 